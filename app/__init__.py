@@ -3,6 +3,7 @@ from flask import Flask
 from app.config import Config
 from app.controllers import user_bp, admin_bp, auth_bp, contact_bp
 from app.extensions import db, jwt, ma
+from app.commands import index_cli, lottery_cli, snapshot_cli, job_cli, outbox_cli
 from flask_cors import CORS
 
 
@@ -29,6 +30,9 @@ def create_app() -> Flask:
             - `admin_bp`: routes pour les fonctionnalités administratives.
             - `auth_bp`: routes pour l'authentification et la gestion des sessions.
             - `contact_bp`: routes pour les fonctionnalités de contact.
+        6. Enregistre les commandes en ligne de commande (`flask ticket-index rebuild`,
+           `flask lottery simulate`, `flask ticket-snapshot rebuild`, `flask jobs run`,
+           `flask outbox run`).
 
     Exemple d'utilisation:
         >>> app = create_app()  # Crée l'application Flask
@@ -51,4 +55,11 @@ def create_app() -> Flask:
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(contact_bp, url_prefix="/contact")
 
+    # Init CLI
+    app.cli.add_command(index_cli)
+    app.cli.add_command(lottery_cli)
+    app.cli.add_command(snapshot_cli)
+    app.cli.add_command(job_cli)
+    app.cli.add_command(outbox_cli)
+
     return app
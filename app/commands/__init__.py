@@ -0,0 +1,5 @@
+from .index_commands import index_cli
+from .lottery_commands import lottery_cli
+from .snapshot_commands import snapshot_cli
+from .job_commands import job_cli
+from .outbox_commands import outbox_cli
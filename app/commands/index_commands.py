@@ -0,0 +1,61 @@
+import click
+from flask.cli import AppGroup
+from app.extensions import db
+from app.models import Lottery
+from app.helpers import rebuild_ticket_index, compact_ticket_index
+
+index_cli = AppGroup("ticket-index", help="Gestion de l'index inversé des tickets.")
+
+
+@index_cli.command("rebuild")
+@click.option(
+    "--lottery-id",
+    type=int,
+    default=None,
+    help="Identifiant du tirage à réindexer. Par défaut, tous les tirages.",
+)
+def rebuild(lottery_id):
+    """
+    Reconstruit l'index inversé des tickets à partir de la table `entries`.
+
+    Chaque tirage est réindexé et validé dans sa propre transaction.
+
+    Example:
+        $ flask ticket-index rebuild --lottery-id 1
+    """
+    if lottery_id is None:
+        lottery_ids = [lottery.id for lottery in Lottery.query.order_by(Lottery.id)]
+    else:
+        lottery_ids = [lottery_id]
+
+    for current_id in lottery_ids:
+        total = rebuild_ticket_index(current_id, db)
+        db.session.commit()
+        click.echo(f"Tirage {current_id} : {total} inscriptions indexées.")
+
+
+@index_cli.command("compact")
+@click.option(
+    "--lottery-id",
+    type=int,
+    default=None,
+    help="Identifiant du tirage à compacter. Par défaut, tous les tirages.",
+)
+def compact(lottery_id):
+    """
+    Fusionne les segments ajoutés par les inscriptions dans les listes de l'index.
+
+    Chaque tirage est compacté et validé dans sa propre transaction.
+
+    Example:
+        $ flask ticket-index compact --lottery-id 1
+    """
+    if lottery_id is None:
+        lottery_ids = [lottery.id for lottery in Lottery.query.order_by(Lottery.id)]
+    else:
+        lottery_ids = [lottery_id]
+
+    for current_id in lottery_ids:
+        merged = compact_ticket_index(current_id, db)
+        db.session.commit()
+        click.echo(f"Tirage {current_id} : {merged} segments fusionnés.")
@@ -0,0 +1,41 @@
+import time
+import click
+from flask.cli import AppGroup
+from app.extensions import db
+from app.models import Job
+from app.helpers import pending_job_ids, run_job
+
+job_cli = AppGroup("jobs", help="Exécution des tâches de fond.")
+
+
+@job_cli.command("run")
+@click.option(
+    "--loop",
+    is_flag=True,
+    default=False,
+    help="Continue à attendre de nouvelles tâches au lieu de s'arrêter.",
+)
+@click.option(
+    "--interval",
+    type=float,
+    default=5.0,
+    help="Délai en secondes entre deux recherches de tâches avec --loop.",
+)
+def run(loop, interval):
+    """
+    Exécute les tâches en attente ou abandonnées par un processus arrêté.
+
+    Les tâches sont réservées une à une (`claim_job`) : plusieurs processus de travail
+    peuvent tourner en même temps sans exécuter deux fois la même tâche.
+
+    Example:
+        $ flask jobs run --loop
+    """
+    while True:
+        for job_id in pending_job_ids(db):
+            if run_job(job_id, db):
+                job = db.session.get(Job, job_id)
+                click.echo(f"Tâche {job_id} : {job.status} ({job.stage}).")
+        if not loop:
+            break
+        time.sleep(interval)
@@ -0,0 +1,27 @@
+import json
+import click
+from flask.cli import AppGroup
+from app.extensions import db
+from app.models import Lottery
+from app.helpers import simulate_lottery
+
+lottery_cli = AppGroup("lottery", help="Outils d'analyse des tirages.")
+
+
+@lottery_cli.command("simulate")
+@click.argument("lottery_id", type=int)
+@click.option("--draws", type=int, default=None, help="Nombre de tirages simulés.")
+@click.option("--seed", type=int, default=None, help="Graine du générateur aléatoire.")
+def simulate(lottery_id, draws, seed):
+    """
+    Simule des tirages aléatoires sur les tickets d'un tirage et affiche le rapport.
+
+    Example:
+        $ flask lottery simulate 1 --draws 10000 --seed 42
+    """
+    lottery = db.session.get(Lottery, lottery_id)
+    if lottery is None:
+        raise click.ClickException(f"Le tirage {lottery_id} n'existe pas.")
+
+    report = simulate_lottery(lottery, db, draws=draws, seed=seed)
+    click.echo(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,60 @@
+import time
+import click
+from flask.cli import AppGroup
+from app import Config
+from app.extensions import db
+from app.helpers import deliver_outbox_batch, requeue_dead_emails
+from app.tools import RateLimiter, SMTPPool
+
+outbox_cli = AppGroup("outbox", help="Envoi des emails de la file d'envoi.")
+
+
+@outbox_cli.command("run")
+@click.option(
+    "--loop",
+    is_flag=True,
+    default=False,
+    help="Continue à attendre de nouveaux emails au lieu de s'arrêter.",
+)
+@click.option(
+    "--interval",
+    type=float,
+    default=5.0,
+    help="Délai en secondes entre deux recherches d'emails avec --loop.",
+)
+def run(loop, interval):
+    """
+    Envoie les emails en attente, par lots, jusqu'à vider la file.
+
+    Les lots partagent une même réserve de connexions SMTP et un même limiteur de
+    débit (`Config.OUTBOX_RATE_LIMIT`). Les emails sont réservés par lot
+    (`claim_outbox_batch`) : plusieurs processus d'envoi peuvent tourner en même temps
+    sans envoyer deux fois le même email.
+
+    Example:
+        $ flask outbox run --loop
+    """
+    rate_limiter = RateLimiter(Config.OUTBOX_RATE_LIMIT)
+    with SMTPPool.from_config(size=1) as smtp_pool:
+        while True:
+            counts = deliver_outbox_batch(db, smtp_pool, rate_limiter)
+            if any(counts.values()):
+                click.echo(
+                    f"{counts['sent']} envoyé(s), {counts['retried']} à réessayer, "
+                    f"{counts['dead']} mis à l'écart."
+                )
+                continue
+            if not loop:
+                break
+            time.sleep(interval)
+
+
+@outbox_cli.command("requeue")
+def requeue():
+    """
+    Remet en attente les emails mis à l'écart.
+
+    Example:
+        $ flask outbox requeue
+    """
+    click.echo(f"{requeue_dead_emails(db)} email(s) remis en attente.")
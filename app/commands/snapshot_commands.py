@@ -0,0 +1,72 @@
+import click
+from flask.cli import AppGroup
+from app.extensions import db
+from app.models import Lottery
+from app.helpers import snapshot_path, write_lottery_snapshot
+from app.helpers.snapshot_helpers import SNAPSHOT_STATUSES
+from app.tools import TicketSnapshot
+
+snapshot_cli = AppGroup(
+    "ticket-snapshot", help="Gestion des instantanés en colonnes des tickets."
+)
+
+
+def _lottery_ids(lottery_id):
+    """
+    Retourne le tirage demandé ou, par défaut, tous les tirages clos.
+    """
+    if lottery_id is not None:
+        return [lottery_id]
+    return [
+        lottery.id
+        for lottery in Lottery.query.filter(
+            Lottery._status.in_(SNAPSHOT_STATUSES)
+        ).order_by(Lottery.id)
+    ]
+
+
+@snapshot_cli.command("rebuild")
+@click.option(
+    "--lottery-id",
+    type=int,
+    default=None,
+    help="Identifiant du tirage à figer. Par défaut, tous les tirages clos.",
+)
+def rebuild(lottery_id):
+    """
+    Réécrit l'instantané des tickets à partir de la table `entries`.
+
+    Example:
+        $ flask ticket-snapshot rebuild --lottery-id 1
+    """
+    for current_id in _lottery_ids(lottery_id):
+        total = write_lottery_snapshot(current_id, db)
+        click.echo(f"Tirage {current_id} : {total} tickets figés.")
+
+
+@snapshot_cli.command("verify")
+@click.option(
+    "--lottery-id",
+    type=int,
+    default=None,
+    help="Identifiant du tirage à vérifier. Par défaut, tous les tirages clos.",
+)
+def verify(lottery_id):
+    """
+    Vérifie les empreintes des instantanés des tickets.
+
+    Le code de sortie vaut 1 si un instantané est absent ou corrompu.
+
+    Example:
+        $ flask ticket-snapshot verify
+    """
+    failed = False
+    for current_id in _lottery_ids(lottery_id):
+        try:
+            snapshot = TicketSnapshot(snapshot_path(current_id))
+            click.echo(f"Tirage {current_id} : {snapshot.rows} tickets vérifiés.")
+        except (FileNotFoundError, ValueError) as error:
+            failed = True
+            click.echo(f"Tirage {current_id} : {error}", err=True)
+    if failed:
+        raise click.ClickException("Des instantanés sont absents ou corrompus.")
@@ -39,13 +39,163 @@ class Config:
         JWT_ACCESS_TOKEN_EXPIRES (timedelta): Durée de validité du token d'accès JWT.
                                                 Par défaut, il expire après 20 minutes.
 
+        TOKEN_CACHE_SIZE (int): Nombre de jetons dont l'état de révocation est gardé
+                                en mémoire par chaque processus de l'application.
+
+        TOKEN_CACHE_TTL (float): Durée en secondes pendant laquelle un jeton non
+                                 révoqué est considéré valide sans relire la base
+                                 de données. Un jeton révoqué reste en cache jusqu'à
+                                 son expiration. 0 pour toujours relire la base.
+
+        TOKEN_REVOCATION_LOG (str): Fichier par lequel les processus de l'application
+                                    se signalent les révocations de jetons. Il peut
+                                    être vidé à tout moment ; il est remplacé par un
+                                    fichier vide dès que sa plus ancienne ligne
+                                    dépasse la durée de vie du jeton le plus durable
+                                    (accès ou rafraîchissement). Vide pour désactiver
+                                    le canal : une révocation n'est alors vue par
+                                    les autres processus qu'après `TOKEN_CACHE_TTL`.
+                                    Par défaut "token_revocations.log".
+
         APP_EMAIL_PASSWORD (str): Mot de passe de l'application pour l'envoi d'emails,
                                   extrait des variables d'environnement pour des raisons de sécurité.
 
         MAIL_APP (str): Adresse email de l'application, utilisée pour l'envoi d'emails.
 
+        SMTP_HOST (str): Serveur SMTP d'envoi des emails. Par défaut "smtp.gmail.com".
+
+        SMTP_PORT (int): Port du serveur SMTP. Par défaut 465.
+
+        SMTP_SSL (bool): Indique si la connexion au serveur SMTP est chiffrée dès
+                         l'ouverture (SMTP_SSL) ou en clair ("0", pour un serveur local).
+
+        SMTP_POOL_SIZE (int): Nombre maximal de connexions SMTP ouvertes en même temps
+                              par une réserve de connexions.
+
+        SMTP_MAX_MESSAGES (int): Nombre de messages envoyés sur une connexion SMTP
+                                 avant qu'elle ne soit fermée et remplacée.
+
+        ANNOUNCEMENT_CHUNK_SIZE (int): Nombre de destinataires par email, en copie
+                                       cachée, lors de l'annonce d'un nouveau tirage.
+
+        RESULTS_NOTIFICATION_WINDOW (int): Durée en secondes sur laquelle les emails
+                                           de résultats d'un tirage sont répartis,
+                                           les premiers rangs en premier. 0 pour
+                                           tout envoyer immédiatement.
+
+        LEADERBOARD_CACHE_SIZE (int): Nombre de classements publiés gardés en mémoire
+                                      par chaque processus de l'application. Le
+                                      classement d'un tirage validé est préchargé
+                                      dans le processus qui exécute la validation
+                                      seulement ; les autres le chargent à leur
+                                      première lecture.
+
+        LIVE_BOARD_CACHE_SIZE (int): Nombre de classements provisoires de tirages en
+                                     direct gardés en mémoire par chaque processus
+                                     de l'application.
+
+        OUTBOX_BATCH_SIZE (int): Nombre d'emails de la file d'envoi réservés et envoyés
+                                 par lot.
+
+        OUTBOX_RATE_LIMIT (float): Nombre maximal d'emails envoyés par seconde par un
+                                   processus d'envoi. 0 pour ne pas limiter le débit.
+
+        OUTBOX_MAX_ATTEMPTS (int): Nombre de tentatives d'envoi d'un email avant sa
+                                   mise à l'écart.
+
+        OUTBOX_RETRY_SECONDS (int): Délai avant le premier nouvel essai d'un email en
+                                    échec, doublé à chaque tentative.
+
+        OUTBOX_LEASE_SECONDS (int): Durée de réservation d'un email par un processus
+                                    d'envoi, après laquelle il est repris.
+
         PATH_WHHTMLTOPDF (str): Chemin de l'executable wkhtmltopdf
 
+        PDF_CSS_PATH (str): Chemin de la feuille de style des PDF de récompense, lue
+                            une fois au démarrage. Par défaut "app/static/pdf.css".
+
+        PDF_RENDER_WARM (int): Nombre de processus wkhtmltopdf démarrés à l'avance,
+                               en attente d'un document à rendre.
+
+        PDF_RENDER_CONCURRENCY (int): Nombre maximal de PDF rendus en même temps par
+                                      chaque processus de l'application.
+
+        PDF_RENDER_QUEUE_TIMEOUT (float): Délai en secondes pendant lequel une demande
+                                          de PDF attend une place libre avant d'être
+                                          refusée.
+
+        PDF_RENDER_TIMEOUT (float): Durée maximale en secondes d'un rendu, après
+                                    laquelle le processus wkhtmltopdf est arrêté.
+
+        PDF_BACKEND (str): Moteur de rendu des PDF de récompense ("wkhtmltopdf" pour
+                           un rendu de `pdf.html`, "native" pour une écriture
+                           directe du PDF, sans processus externe). Par défaut
+                           "wkhtmltopdf".
+
+        PDF_CACHE_DIR (str): Répertoire des PDF de récompense générés, nommés d'après
+                             l'empreinte de leur contenu. Par défaut "reward_pdfs".
+
+        PDF_OFFLOAD_HEADER (str): En-tête de redirection interne par lequel le proxy
+                                  envoie les PDF de récompense ("X-Accel-Redirect"
+                                  pour nginx, "X-Sendfile" pour Apache ou lighttpd).
+                                  Vide par défaut : l'application envoie le fichier.
+
+        PDF_ACCEL_PREFIX (str): Emplacement interne de nginx servant
+                                `PDF_CACHE_DIR`, utilisé avec X-Accel-Redirect.
+                                Par défaut "/protected/reward_pdfs".
+
+        PDF_SIGNED_URLS (bool): Répond à une demande de PDF par une URL de
+                                téléchargement signée et de courte durée ("1"),
+                                plutôt que par le fichier. Désactivé par défaut.
+
+        PDF_URL_TTL (int): Durée de validité en secondes d'une URL de téléchargement
+                           signée.
+
+        PDF_URL_SECRET (str): Clé de signature des URL de téléchargement. Par défaut
+                              `JWT_SECRET_KEY`.
+
+        PDF_PRERENDER (bool): Génère les PDF de récompense de tous les gagnants à la
+                              validation d'un tirage ("1"), plutôt qu'à leur première
+                              demande. Désactivé par défaut.
+
+        QR_CACHE_SIZE (int): Nombre de codes QR de récompense gardés en mémoire par
+                             chaque processus de l'application.
+
+        SCORING_ENGINE (str): Moteur de calcul des scores utilisé lors de la validation
+                              d'un tirage ("python", "numpy", "sql" pour un calcul
+                              dans la base de données, "stream" pour un parcours
+                              par blocs à mémoire constante, "parallel" pour une
+                              répartition sur plusieurs processus, "index" pour une
+                              lecture de l'index inversé des numéros ou "snapshot" pour
+                              une lecture de l'instantané en colonnes des tickets).
+                              Par défaut "python".
+
+        SCORING_CHUNK_SIZE (int): Nombre d'inscriptions lues par bloc par les moteurs
+                                  "stream" et "parallel" et lors de la reconstruction
+                                  de l'index inversé.
+
+        SCORING_WORKERS (int): Nombre de processus utilisés par le moteur "parallel".
+                               Par défaut le nombre de cœurs de la machine.
+
+        SCORING_SHARD_SIZE (int): Largeur des plages d'identifiants d'inscriptions
+                                  confiées à chaque processus du moteur "parallel".
+
+        SIMULATION_DRAWS (int): Nombre de tirages aléatoires d'une simulation des gains
+                                lorsqu'il n'est pas précisé.
+
+        SIMULATION_MAX_DRAWS (int): Nombre maximal de tirages d'une simulation des gains.
+
+        SIMULATION_BATCH_SIZE (int): Nombre de tirages simulés évalués ensemble.
+
+        SNAPSHOT_DIR (str): Répertoire des instantanés en colonnes des tickets des
+                            tirages clos. Par défaut "snapshots".
+
+        JOB_WORKERS (int): Nombre de threads exécutant les tâches de fond (validation
+                           des tirages) dans chaque processus de l'application.
+
+        JOB_STALE_SECONDS (int): Délai sans signe de vie après lequel une tâche en
+                                 cours est considérée comme abandonnée et reprise.
+
     Exemple:
         >>> config = Config()
         >>> print(config.SQLALCHEMY_DATABASE_URI)
@@ -59,8 +209,54 @@ class Config:
     JWT_IDENTITY_CLAIM: str = "user_id"
     JWT_TOKEN_LOCATION: str = ["headers"]
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=20)
+    TOKEN_CACHE_SIZE: int = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
+    TOKEN_CACHE_TTL: float = float(os.environ.get("TOKEN_CACHE_TTL", 60))
+    TOKEN_REVOCATION_LOG: str = os.environ.get(
+        "TOKEN_REVOCATION_LOG", "token_revocations.log"
+    )
     APP_EMAIL_PASSWORD: str = os.environ.get("APP_PASSWORD")
     MAIL_APP: str = os.environ.get("MAIL_APP")
+    SMTP_HOST: str = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+    SMTP_PORT: int = int(os.environ.get("SMTP_PORT", 465))
+    SMTP_SSL: bool = os.environ.get("SMTP_SSL", "1") != "0"
+    SMTP_POOL_SIZE: int = int(os.environ.get("SMTP_POOL_SIZE", 2))
+    SMTP_MAX_MESSAGES: int = int(os.environ.get("SMTP_MAX_MESSAGES", 100))
+    ANNOUNCEMENT_CHUNK_SIZE: int = int(os.environ.get("ANNOUNCEMENT_CHUNK_SIZE", 50))
+    RESULTS_NOTIFICATION_WINDOW: int = int(
+        os.environ.get("RESULTS_NOTIFICATION_WINDOW", 900)
+    )
+    LEADERBOARD_CACHE_SIZE: int = int(os.environ.get("LEADERBOARD_CACHE_SIZE", 32))
+    LIVE_BOARD_CACHE_SIZE: int = int(os.environ.get("LIVE_BOARD_CACHE_SIZE", 8))
+    OUTBOX_BATCH_SIZE: int = int(os.environ.get("OUTBOX_BATCH_SIZE", 100))
+    OUTBOX_RATE_LIMIT: float = float(os.environ.get("OUTBOX_RATE_LIMIT", 10))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 5))
+    OUTBOX_RETRY_SECONDS: int = int(os.environ.get("OUTBOX_RETRY_SECONDS", 60))
+    OUTBOX_LEASE_SECONDS: int = int(os.environ.get("OUTBOX_LEASE_SECONDS", 300))
     PATH_WHHTMLTOPDF: str = os.environ.get("PATH_WHHTMLTOPDF")
     PDF_HTML_PATH: str = os.environ.get("PDF_HTML_PATH")
     PDF_CSS_PATH: str = os.environ.get("PDF_CSS_PATH")
+    PDF_RENDER_WARM: int = int(os.environ.get("PDF_RENDER_WARM", 2))
+    PDF_RENDER_CONCURRENCY: int = int(os.environ.get("PDF_RENDER_CONCURRENCY", 4))
+    PDF_RENDER_QUEUE_TIMEOUT: float = float(
+        os.environ.get("PDF_RENDER_QUEUE_TIMEOUT", 10)
+    )
+    PDF_RENDER_TIMEOUT: float = float(os.environ.get("PDF_RENDER_TIMEOUT", 30))
+    PDF_BACKEND: str = os.environ.get("PDF_BACKEND", "wkhtmltopdf")
+    PDF_CACHE_DIR: str = os.environ.get("PDF_CACHE_DIR", "reward_pdfs")
+    PDF_PRERENDER: bool = os.environ.get("PDF_PRERENDER", "0") == "1"
+    PDF_OFFLOAD_HEADER: str = os.environ.get("PDF_OFFLOAD_HEADER", "")
+    PDF_ACCEL_PREFIX: str = os.environ.get("PDF_ACCEL_PREFIX", "/protected/reward_pdfs")
+    PDF_SIGNED_URLS: bool = os.environ.get("PDF_SIGNED_URLS", "0") == "1"
+    PDF_URL_TTL: int = int(os.environ.get("PDF_URL_TTL", 60))
+    PDF_URL_SECRET: str = os.environ.get("PDF_URL_SECRET")
+    QR_CACHE_SIZE: int = int(os.environ.get("QR_CACHE_SIZE", 256))
+    SCORING_ENGINE: str = os.environ.get("SCORING_ENGINE", "python")
+    SCORING_CHUNK_SIZE: int = int(os.environ.get("SCORING_CHUNK_SIZE", 10000))
+    SCORING_WORKERS: int = int(os.environ.get("SCORING_WORKERS", os.cpu_count() or 1))
+    SCORING_SHARD_SIZE: int = int(os.environ.get("SCORING_SHARD_SIZE", 250000))
+    SIMULATION_DRAWS: int = int(os.environ.get("SIMULATION_DRAWS", 10000))
+    SIMULATION_MAX_DRAWS: int = int(os.environ.get("SIMULATION_MAX_DRAWS", 100000))
+    SIMULATION_BATCH_SIZE: int = int(os.environ.get("SIMULATION_BATCH_SIZE", 1000))
+    SNAPSHOT_DIR: str = os.environ.get("SNAPSHOT_DIR", "snapshots")
+    JOB_WORKERS: int = int(os.environ.get("JOB_WORKERS", 2))
+    JOB_STALE_SECONDS: int = int(os.environ.get("JOB_STALE_SECONDS", 600))
@@ -1,6 +1,6 @@
 from flask import jsonify, request, Blueprint
 from app.extensions import db, pwd_context
-from app.helpers import admin_role_required, send_email_to_users
+from app.helpers import admin_role_required
 from app.schemas import (
     UserLoginSchema,
     UserOverviewInfoSchema,
@@ -11,6 +11,8 @@ from app.schemas import (
     EntryAdminAddUserSchema,
     LotteryUpdateSchema,
     UserCreateSchema,
+    LotterySimulationSchema,
+    LiveDrawRevealSchema,
 )
 from flask_jwt_extended import (
     jwt_required,
@@ -21,21 +23,45 @@ from flask_jwt_extended import (
     get_jwt_identity,
 )
 from marshmallow import ValidationError
-from app.models import User, Lottery, Entry, LotteryResult, LotteryRanking
+from app.models import User, Lottery, Entry, LotteryResult, LotteryRanking, Job
 from app.helpers import (
     add_token_to_database,
     revoke_token,
     generate_random_user,
     generate_wining_numbers,
     generate_luck_numbers,
-    get_formatted_results,
+    add_entries_to_index,
+    remove_entries_from_index,
+    delete_ticket_index,
+    start_ticket_index,
+    number_statistics,
+    count_tickets_containing,
+    simulate_lottery,
+    estimate_lottery,
+    get_live_leaderboard,
+    reveal_live_number,
+    get_live_draw_numbers,
+    discard_live_board,
+    delete_lottery_snapshot,
+    delete_reward_pdfs,
+    cached_leaderboard,
+    invalidate_leaderboard_cache,
+    find_validation_job,
+    create_validation_job,
+    validation_numbers,
+    validation_numbers_match,
+    create_announcement_job,
+    retry_job,
+    submit_job,
+    resume_job,
+    token_cache_info,
 )
 from app.schemas import (
     LotteryOverviewSchema,
-    LotteryRankingSchema,
     LotteryWinerSchema,
+    JobOverviewSchema,
 )
-from app.tools import Status, email_sender_results_available, Roles
+from app.tools import Status, qr_cache_info
 from datetime import datetime
 
 admin_bp = Blueprint("admin", __name__)
@@ -461,7 +487,7 @@ def delete_lottery(lottery_id):
     2. Récupère tous les utilisateurs ayant un rôle de participant (rôle 3) et qui ont des entrées pour cette loterie, et les supprime de la base de données.
     3. Supprime toutes les entrées liées à cette loterie de la base de données.
     4. Supprime les résultats de la loterie, s'ils existent.
-    5. Supprime la loterie elle-même.
+    5. Supprime l'index inversé des tickets puis la loterie elle-même.
     6. Valide toutes les suppressions en effectuant des commits dans la base de données après chaque suppression.
 
     En cas d'erreur, renvoie un message approprié avec le code HTTP correspondant :
@@ -507,9 +533,14 @@ def delete_lottery(lottery_id):
         if lottery_result:
             db.session.delete(lottery_result)
             db.session.commit()
+            invalidate_leaderboard_cache(lottery_result.id)
+            delete_reward_pdfs(lottery_id)
 
+        delete_ticket_index(lottery_id, db)
         db.session.delete(lottery)
         db.session.commit()
+        delete_lottery_snapshot(lottery_id)
+        discard_live_board(lottery_id)
 
         return (
             jsonify({"message": "La loterie a été supprimée avec succès."}),
@@ -545,9 +576,9 @@ def lottery_create():
     2. Vérifie s'il existe déjà une loterie en cours (statut "EN_COUR"). Si une loterie est active, aucune nouvelle loterie ne peut être créée tant que celle-ci n'est pas terminée, sauf si le nouveau tirage est de type "SIMULATION".
     3. Valide les dates de début et de fin. La date de fin ne peut pas être antérieure ou égale à la date de début, et la date de début ne peut pas être dans le passé.
     4. Si le statut est "SIMULATION", la loterie est créée sans dates de début et de fin, sinon, les dates sont obligatoires.
-    5. Enregistre la nouvelle loterie dans la base de données.
-    6. Envoie un email aux utilisateurs pour les informer de la création du tirage.
-    7. Valide et sauvegarde les modifications dans la base de données.
+    5. Enregistre la nouvelle loterie dans la base de données, avec son index inversé vide (`start_ticket_index`).
+    6. Crée la tâche d'annonce du tirage aux utilisateurs (`create_announcement_job`).
+    7. Valide et sauvegarde le tirage et la tâche dans une seule transaction, puis confie la tâche à l'exécuteur de fond ; les emails sont envoyés par `flask outbox run`.
 
     En cas d'erreur, renvoie un message approprié avec le code HTTP correspondant :
     - 404 si les données sont invalides ou si un tirage est déjà en cours.
@@ -617,13 +648,18 @@ def lottery_create():
                 _reward_price=data["reward_price"],
                 _max_participants=data["max_participants"],
             )
+        db.session.add(new_lottery)
+        db.session.flush()
+        start_ticket_index(new_lottery.id, db)
+        announcement = None
         if data["status"] not in [
             Status.SIMULATION.value,
             Status.SIMULATION_TERMINE.value,
         ]:
-            send_email_to_users()
-        db.session.add(new_lottery)
+            announcement = create_announcement_job(new_lottery.id, db)
         db.session.commit()
+        if announcement is not None:
+            submit_job(announcement.id, db)
         return (
             jsonify({"message": "Le tirage a été créé avec succès."}),
             201,
@@ -1116,6 +1152,79 @@ def participants_list(lottery_id):
         )
 
 
+@admin_bp.route("/lottery-number-stats/<int:lottery_id>", methods=["GET"])
+@jwt_required()
+@admin_role_required
+def lottery_number_stats(lottery_id):
+    """
+    Récupère le nombre de tickets d'un tirage contenant chaque numéro.
+
+    Les compteurs sont lus dans l'index inversé des tickets du tirage, sans parcourir
+    les inscriptions. Les paramètres optionnels `numbers` et `lucky_numbers` (numéros
+    séparés par des virgules) permettent en plus de compter les tickets qui contiennent
+    tous les numéros demandés.
+
+    Args:
+        lottery_id (int): L'identifiant unique du tirage de loterie.
+
+    Returns:
+        tuple: Un tuple contenant un objet JSON et un code de statut HTTP.
+               - En cas de succès (200):
+                   - 'message': Un message confirmant la récupération des statistiques.
+                   - 'data': Les compteurs par numéro (`numbers`) et par numéro chance
+                     (`lucky_numbers`), et `matching_tickets` si des numéros sont demandés.
+               - En cas d'erreur (404):
+                   - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                   - 'message': Un message décrivant l'erreur.
+                   - 'details': Des informations supplémentaires sur l'erreur (le cas échéant).
+
+    Example:
+        GET /admin/lottery-number-stats/1?numbers=7,21&lucky_numbers=3
+    """
+    try:
+        lottery = Lottery.query.filter_by(id=lottery_id).one_or_none()
+        if lottery is None:
+            return (
+                jsonify({"errors": True, "message": "Loterie non trouvée."}),
+                404,
+            )
+
+        statistics = number_statistics(lottery_id, db)
+
+        numbers = request.args.get("numbers", "")
+        lucky_numbers = request.args.get("lucky_numbers", "")
+        if numbers or lucky_numbers:
+            statistics["matching_tickets"] = count_tickets_containing(
+                lottery_id,
+                [int(number) for number in numbers.split(",") if number],
+                [int(number) for number in lucky_numbers.split(",") if number],
+                db,
+            )
+        db.session.commit()
+
+        return (
+            jsonify(
+                {
+                    "message": "Statistiques des numéros du tirage",
+                    "data": statistics,
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
 @admin_bp.route("/lottery-rank/<int:lottery_id>", methods=["GET"])
 @jwt_required()
 @admin_role_required
@@ -1158,13 +1267,9 @@ def lottery_rank(lottery_id):
         if lottery_result is None:
             return jsonify({"message": "Aucun résultat pour se tirage"})
 
-        rankings = (
-            db.session.query(LotteryRanking)
-            .filter_by(lottery_result_id=lottery_result.id)
-            .all()
-        )
+        leaderboard = cached_leaderboard(lottery_result.id, db)
 
-        if not rankings:
+        if not leaderboard:
             return (
                 jsonify(
                     {
@@ -1174,23 +1279,8 @@ def lottery_rank(lottery_id):
                 ),
                 404,
             )
-        schema = LotteryWinerSchema(many=True)
-        results = []
-        for ranking in rankings:
-            user = db.session.query(User).filter_by(id=ranking.player_id).one_or_none()
-            if user is None:
-                name = "Inconnu"
-            name = user.full_name
-            results.append(
-                {
-                    "name": name,
-                    "rank": ranking.rank,
-                    "score": ranking.score,
-                    "winnings": ranking.winnings,
-                }
-            )
-
-        validated_results = schema.dump(results)
+        schema = LotteryWinerSchema(many=True, exclude=("player_id",))
+        validated_results = schema.dump(leaderboard)
 
         return (
             jsonify(
@@ -1292,6 +1382,8 @@ def manage_participants_remove():
                 404,
             )
 
+        remove_entries_from_index([entry], db)
+
         user = User.query.filter_by(id=user_id, _role_id=3).one_or_none()
         if user:
             db.session.delete(user)
@@ -1301,6 +1393,8 @@ def manage_participants_remove():
         if lottery_result:
             db.session.delete(lottery_result)
             db.session.commit()
+            invalidate_leaderboard_cache(lottery_result.id)
+            delete_reward_pdfs(lottery_id)
 
         db.session.delete(entry)
         db.session.commit()
@@ -1417,6 +1511,7 @@ def manage_particiants_add(lottery_id):
         )
 
         db.session.add(new_entry)
+        add_entries_to_index([new_entry], db)
         db.session.commit()
 
         return (
@@ -1461,16 +1556,30 @@ def validate_lottery(lottery_id):
     Valide un tirage de loterie et génère les résultats.
 
     Cette méthode permet de valider un tirage de loterie en vérifiant les numéros gagnants et les numéros chanceux fournis.
-    Si les numéros ne sont pas fournis, des numéros aléatoires sont générés.
-    La méthode met également à jour le statut de la loterie et enregistre les résultats des participants.
+    Si les numéros ne sont pas fournis, ceux du tirage en direct sont repris s'ils ont tous
+    été dévoilés ; sinon des numéros aléatoires sont générés.
+    Les numéros retenus sont enregistrés dans une tâche de validation (`create_validation_job`),
+    exécutée en arrière-plan : le calcul du classement, l'enregistrement du résultat, du
+    classement et du nouveau statut (dans une seule transaction) et l'envoi des emails aux
+    gagnants ne bloquent pas la requête. Leur avancement est suivi sur `/admin/jobs/<id>`.
+    Si le tirage a déjà une tâche de validation non terminée, elle est reprise (relancée si
+    elle a échoué) au lieu d'en créer une seconde, avec les numéros fixés à sa création :
+    des numéros fournis qui en diffèrent sont refusés (409).
 
     Args:
         lottery_id (int): L'identifiant unique du tirage de loterie à valider.
 
     Returns:
         tuple: Un tuple contenant un objet JSON avec un message de confirmation et un code de statut HTTP.
-            - En cas de succès (200):
-                - 'message': Un message confirmant que la génération des résultats a réussi.
+            - En cas de succès (202):
+                - 'message': Un message confirmant que la validation a été lancée.
+                - 'job_id': L'identifiant de la tâche de validation.
+                - 'winning_numbers', 'lucky_numbers': Les numéros retenus par la tâche.
+            - En cas de conflit (409):
+                - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                - 'message': Un message indiquant qu'une validation est déjà lancée avec
+                  d'autres numéros.
+                - 'details': Les numéros retenus par la tâche et son identifiant.
             - En cas d'erreur (404):
                 - 'errors': Un booléen indiquant qu'une erreur s'est produite.
                 - 'message': Un message décrivant l'erreur.
@@ -1489,6 +1598,44 @@ def validate_lottery(lottery_id):
                 404,
             )
 
+        requested_numbers = (
+            data["lucky_numbers"] != "" and data["winning_numbers"] != ""
+        )
+        job = find_validation_job(lottery_id, db)
+        if job is not None:
+            if requested_numbers and not validation_numbers_match(
+                job, data["winning_numbers"], data["lucky_numbers"]
+            ):
+                job_winning_numbers, job_lucky_numbers = validation_numbers(job)
+                return (
+                    jsonify(
+                        {
+                            "errors": True,
+                            "message": "La validation de ce tirage est déjà lancée avec d'autres numéros.",
+                            "details": {
+                                "job_id": job.id,
+                                "winning_numbers": job_winning_numbers,
+                                "lucky_numbers": job_lucky_numbers,
+                            },
+                        }
+                    ),
+                    409,
+                )
+            retry_job(job, db)
+            submit_job(job.id, db)
+            winning_numbers, lucky_numbers = validation_numbers(job)
+            return (
+                jsonify(
+                    {
+                        "message": "La validation de ce tirage est déjà lancée.",
+                        "job_id": job.id,
+                        "winning_numbers": winning_numbers,
+                        "lucky_numbers": lucky_numbers,
+                    }
+                ),
+                202,
+            )
+
         if (
             lottery.status == Status.EN_VALIDATION.value
             or lottery.status == Status.SIMULATION.value
@@ -1602,37 +1749,17 @@ def validate_lottery(lottery_id):
                 winning_numbers = data["winning_numbers"]
                 lucky_numbers = data["lucky_numbers"]
             else:
-                winning_numbers = ",".join(map(str, generate_wining_numbers()))
-                lucky_numbers = ",".join(map(str, generate_luck_numbers()))
-
-            lottery_result = LotteryResult(
-                lottery_id=lottery_id,
-                winning_numbers=winning_numbers,
-                winning_lucky_numbers=lucky_numbers,
-            )
-
-            db.session.add(lottery_result)
-            db.session.commit()
-
-            if lottery.status == Status.EN_VALIDATION.value:
-                lottery.status = Status.TERMINE.value
-                db.session.commit()
-            elif lottery.status == Status.SIMULATION.value:
-                lottery.status = Status.SIMULATION_TERMINE.value
-                db.session.commit()
-
-            lottery_result = (
-                db.session.query(LotteryResult).filter_by(lottery_id=lottery_id).first()
-            )
-
-            draw_numbers = set(map(int, lottery_result.winning_numbers.split(",")))
-            draw_stars = set(map(int, lottery_result.winning_lucky_numbers.split(",")))
-
-            participants = (
-                db.session.query(Entry).filter_by(lottery_id=lottery_id).all()
+                live_numbers = get_live_draw_numbers(lottery_id, db)
+                if live_numbers:
+                    winning_numbers, lucky_numbers = live_numbers
+                else:
+                    winning_numbers = ",".join(map(str, generate_wining_numbers()))
+                    lucky_numbers = ",".join(map(str, generate_luck_numbers()))
+
+            has_participants = (
+                db.session.query(Entry.id).filter_by(lottery_id=lottery_id).first()
             )
-
-            if not participants:
+            if not has_participants:
                 return (
                     jsonify(
                         {
@@ -1643,39 +1770,329 @@ def validate_lottery(lottery_id):
                     404,
                 )
 
-            lottery = db.session.query(Lottery).filter_by(id=lottery_id).first()
-            reward_price = lottery.reward_price
+            job = create_validation_job(lottery_id, winning_numbers, lucky_numbers, db)
+            if requested_numbers and not validation_numbers_match(
+                job, winning_numbers, lucky_numbers
+            ):
+                job_winning_numbers, job_lucky_numbers = validation_numbers(job)
+                return (
+                    jsonify(
+                        {
+                            "errors": True,
+                            "message": "La validation de ce tirage est déjà lancée avec d'autres numéros.",
+                            "details": {
+                                "job_id": job.id,
+                                "winning_numbers": job_winning_numbers,
+                                "lucky_numbers": job_lucky_numbers,
+                            },
+                        }
+                    ),
+                    409,
+                )
+            submit_job(job.id, db)
+            winning_numbers, lucky_numbers = validation_numbers(job)
 
-            formatted_results = get_formatted_results(
-                participants, draw_numbers, draw_stars, reward_price, db
+            return (
+                jsonify(
+                    {
+                        "message": "La validation du tirage a été lancée.",
+                        "job_id": job.id,
+                        "winning_numbers": winning_numbers,
+                        "lucky_numbers": lucky_numbers,
+                    }
+                ),
+                202,
             )
 
-            players_ids = []
-            for result in formatted_results:
-                players_ids.append(result["player_id"])
-                schema = LotteryRankingSchema()
-                ranking_data = schema.load(
+        else:
+            return (
+                jsonify(
                     {
-                        "lottery_result_id": lottery_result.id,
-                        "player_id": result["player_id"],
-                        "rank": result["rank"],
-                        "score": result["score"],
-                        "winnings": result["winnings"],
+                        "errors": True,
+                        "message": "Le tirage doit etre en validation ou en simulation",
                     }
-                )
+                ),
+                404,
+            )
 
-                new_ranking = LotteryRanking(**ranking_data)
-                db.session.add(new_ranking)
-                db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
 
-            for player_id in players_ids:
-                user = User.query.filter_by(id=player_id).one_or_none()
-                if user and user.role_name == Roles.USER.value:
-                    email_sender_results_available(user.email, lottery.name)
 
-            return jsonify({"message": "La generation des résultats est resussi"}), 200
+@admin_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@jwt_required()
+@admin_role_required
+def get_job(job_id):
+    """
+    Récupère l'état et l'avancement d'une tâche de fond.
 
-        else:
+    Une tâche en attente, ou abandonnée par un processus arrêté, est soumise à nouveau
+    à l'exécuteur du processus qui répond (`resume_job`) : le suivi d'une tâche suffit
+    à la reprendre après un redémarrage.
+
+    Args:
+        job_id (int): L'identifiant de la tâche.
+
+    Returns:
+        tuple: Un tuple contenant un objet JSON et un code de statut HTTP.
+               - En cas de succès (200):
+                   - 'message': Un message confirmant la récupération de la tâche.
+                   - 'data': L'état de la tâche (voir `JobOverviewSchema`), dont l'étape
+                     (`stage`) et les compteurs de chaque étape (`progress`).
+               - En cas d'erreur (404):
+                   - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                   - 'message': Un message décrivant l'erreur.
+
+    Example:
+        GET /admin/jobs/1
+        {
+            "message": "État de la tâche récupéré avec succès.",
+            "data": {
+                "id": 1,
+                "kind": "validate_lottery",
+                "lottery_id": 3,
+                "status": "RUNNING",
+                "stage": "PERSISTED",
+                "progress": {"fetched": 250000, "scored": 12, "persisted": 12, "notified": 4},
+                ...
+            }
+        }
+    """
+    try:
+        job = db.session.get(Job, job_id)
+        if job is None:
+            return (
+                jsonify({"errors": True, "message": "Tâche non trouvée."}),
+                404,
+            )
+
+        resume_job(job, db)
+
+        return (
+            jsonify(
+                {
+                    "message": "État de la tâche récupéré avec succès.",
+                    "data": JobOverviewSchema().dump(job),
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
+@admin_bp.route("/lottery/simulate/<int:lottery_id>", methods=["POST"])
+@jwt_required()
+@admin_role_required
+def simulate_lottery_payouts(lottery_id):
+    """
+    Simule des tirages aléatoires sur les tickets d'une loterie et résume les gains.
+
+    Contrairement à la validation d'un tirage, la simulation n'écrit ni résultat ni
+    classement : des milliers de tirages sont générés et évalués en mémoire, afin
+    d'estimer la distribution des gagnants par rang, des gains et la probabilité que
+    le premier prix soit partagé. Elle est destinée aux tirages en `SIMULATION`,
+    mais peut être lancée sur n'importe quel tirage.
+
+    Args:
+        lottery_id (int): L'identifiant unique du tirage de loterie.
+
+    Returns:
+        tuple: Un tuple contenant un objet JSON et un code de statut HTTP.
+               - En cas de succès (200):
+                   - 'message': Un message confirmant la simulation.
+                   - 'data': Le rapport de simulation (voir `simulate_lottery`).
+               - En cas d'erreur (404):
+                   - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                   - 'message': Un message décrivant l'erreur.
+                   - 'details': Des informations supplémentaires sur l'erreur (le cas échéant).
+
+    Example:
+        POST /admin/lottery/simulate/1
+        {
+            "draws": 10000,
+            "seed": 42
+        }
+    """
+    try:
+        lottery = Lottery.query.filter_by(id=lottery_id).one_or_none()
+        if lottery is None:
+            return (
+                jsonify({"errors": True, "message": "Loterie non trouvée."}),
+                404,
+            )
+
+        lotterySimulationSchema = LotterySimulationSchema()
+        simulation_data = lotterySimulationSchema.load(
+            request.get_json(silent=True) or {}
+        )
+
+        report = simulate_lottery(
+            lottery,
+            db,
+            draws=simulation_data.get("draws"),
+            seed=simulation_data.get("seed"),
+        )
+
+        return (
+            jsonify({"message": "Simulation du tirage", "data": report}),
+            200,
+        )
+
+    except ValidationError as err:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Erreur de simulation",
+                    "details": err.messages,
+                }
+            ),
+            404,
+        )
+    except Exception as e:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
+@admin_bp.route("/lottery/estimate/<int:lottery_id>", methods=["GET"])
+@jwt_required()
+@admin_role_required
+def estimate_lottery_payouts(lottery_id):
+    """
+    Calcule la distribution exacte des scores des tickets d'un tirage clos.
+
+    Pour chaque format de ticket, la probabilité de chaque classe de résultat (numéros
+    et numéros chance trouvés) sur l'ensemble des tirages possibles est obtenue par
+    dénombrement, puis agrégée en nombre moyen de tickets par score, en gagnants
+    attendus par rang et en exposition aux gains. Les inscriptions devant être closes,
+    le calcul est refusé pour un tirage en cours.
+
+    Args:
+        lottery_id (int): L'identifiant unique du tirage de loterie.
+
+    Returns:
+        tuple: Un tuple contenant un objet JSON et un code de statut HTTP.
+               - En cas de succès (200):
+                   - 'message': Un message confirmant le calcul.
+                   - 'data': Le rapport de distribution (voir `estimate_lottery`).
+               - En cas d'erreur (404):
+                   - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                   - 'message': Un message décrivant l'erreur.
+                   - 'details': Des informations supplémentaires sur l'erreur (le cas échéant).
+
+    Example:
+        GET /admin/lottery/estimate/1
+    """
+    try:
+        lottery = Lottery.query.filter_by(id=lottery_id).one_or_none()
+        if lottery is None:
+            return (
+                jsonify({"errors": True, "message": "Loterie non trouvée."}),
+                404,
+            )
+
+        if lottery.status == Status.EN_COUR.value:
+            return (
+                jsonify(
+                    {
+                        "errors": True,
+                        "message": "Les inscriptions de ce tirage ne sont pas closes.",
+                    }
+                ),
+                404,
+            )
+
+        report = estimate_lottery(lottery, db)
+        db.session.commit()
+
+        return (
+            jsonify({"message": "Distribution des scores du tirage", "data": report}),
+            200,
+        )
+
+    except Exception as e:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
+@admin_bp.route("/live-draw/<int:lottery_id>/reveal", methods=["POST"])
+@jwt_required()
+@admin_role_required
+def reveal_live_draw_number(lottery_id):
+    """
+    Dévoile un numéro d'un tirage en direct et renvoie le classement provisoire.
+
+    Seuls les tickets contenant le numéro dévoilé sont mis à jour. Une fois les 5
+    numéros et les 2 numéros chance dévoilés, le classement est celui que produira la
+    validation du tirage ; `validate_lottery` appelée sans numéros reprend alors les
+    numéros du tirage en direct.
+
+    Args:
+        lottery_id (int): L'identifiant unique du tirage de loterie.
+
+    Returns:
+        tuple: Un tuple contenant un objet JSON et un code de statut HTTP.
+               - En cas de succès (200):
+                   - 'message': Un message confirmant le numéro dévoilé.
+                   - 'data': Le classement provisoire (voir `LiveLeaderboard.leaderboard`).
+               - En cas d'erreur (404):
+                   - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                   - 'message': Un message décrivant l'erreur.
+                   - 'details': Des informations supplémentaires sur l'erreur (le cas échéant).
+
+    Example:
+        POST /admin/live-draw/1/reveal
+        {
+            "number": 7,
+            "lucky": false
+        }
+    """
+    try:
+        lottery = Lottery.query.filter_by(id=lottery_id).one_or_none()
+        if lottery is None:
+            return (
+                jsonify({"errors": True, "message": "Loterie non trouvée."}),
+                404,
+            )
+
+        if lottery.status not in [Status.EN_VALIDATION.value, Status.SIMULATION.value]:
             return (
                 jsonify(
                     {
@@ -1686,6 +2103,84 @@ def validate_lottery(lottery_id):
                 404,
             )
 
+        liveDrawRevealSchema = LiveDrawRevealSchema()
+        reveal_data = liveDrawRevealSchema.load(request.get_json(silent=True) or {})
+
+        board = reveal_live_number(
+            lottery_id, reveal_data["number"], reveal_data["lucky"], db
+        )
+        db.session.commit()
+
+        return (
+            jsonify({"message": "Numéro dévoilé", "data": board.leaderboard()}),
+            200,
+        )
+
+    except ValidationError as err:
+        db.session.rollback()
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Erreur de tirage en direct",
+                    "details": err.messages,
+                }
+            ),
+            404,
+        )
+    except Exception as e:
+        db.session.rollback()
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
+@admin_bp.route("/live-draw/<int:lottery_id>", methods=["GET"])
+@jwt_required()
+@admin_role_required
+def live_draw_leaderboard(lottery_id):
+    """
+    Récupère le classement provisoire d'un tirage en direct.
+
+    Args:
+        lottery_id (int): L'identifiant unique du tirage de loterie.
+
+    Returns:
+        tuple: Un tuple contenant un objet JSON et un code de statut HTTP.
+               - En cas de succès (200):
+                   - 'message': Un message confirmant la récupération du classement.
+                   - 'data': Le classement provisoire (voir `LiveLeaderboard.leaderboard`).
+               - En cas d'erreur (404):
+                   - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                   - 'message': Un message décrivant l'erreur.
+                   - 'details': Des informations supplémentaires sur l'erreur (le cas échéant).
+
+    Example:
+        GET /admin/live-draw/1
+    """
+    try:
+        lottery = Lottery.query.filter_by(id=lottery_id).one_or_none()
+        if lottery is None:
+            return (
+                jsonify({"errors": True, "message": "Loterie non trouvée."}),
+                404,
+            )
+
+        board = get_live_leaderboard(lottery_id, db)
+        db.session.commit()
+
+        return (
+            jsonify({"message": "Classement provisoire", "data": board.leaderboard()}),
+            200,
+        )
+
     except Exception as e:
         return (
             jsonify(
@@ -1820,6 +2315,7 @@ def populate_fake_users(lottery_id):
                 404,
             )
         i = 0
+        new_entries = []
         while i <= (lottery.max_participants - lottery.participant_count):
             (
                 fake_name,
@@ -1853,8 +2349,10 @@ def populate_fake_users(lottery_id):
             )
 
             db.session.add(new_entry)
+            new_entries.append(new_entry)
             i += 1
 
+        add_entries_to_index(new_entries, db)
         db.session.commit()
 
         return (
@@ -1880,6 +2378,64 @@ def populate_fake_users(lottery_id):
         )
 
 
+@admin_bp.route("/cache-stats", methods=["GET"])
+@jwt_required()
+@admin_role_required
+def cache_stats():
+    """
+    Récupère les compteurs des caches en mémoire du processus qui répond.
+
+    Chaque processus de l'application a ses propres caches : les compteurs sont ceux
+    du processus qui traite la requête, depuis son démarrage.
+
+    Returns:
+        tuple: Un tuple contenant un objet JSON et un code de statut HTTP.
+               - En cas de succès (200):
+                   - 'message': Un message confirmant la récupération des compteurs.
+                   - 'data': Les compteurs du cache des jetons révoqués
+                     (`token_blocklist`, voir `token_cache_info`) et du cache des
+                     codes QR (`qr_codes`, voir `qr_cache_info`).
+               - En cas d'erreur (404):
+                   - 'errors': Un booléen indiquant qu'une erreur s'est produite.
+                   - 'message': Un message décrivant l'erreur.
+
+    Example:
+        GET /admin/cache-stats
+        {
+            "message": "Compteurs des caches récupérés avec succès.",
+            "data": {
+                "token_blocklist": {"hits": 980, "misses": 20, "hit_rate": 0.98, "invalidations": 3, "size": 17},
+                "qr_codes": {"hits": 12, "misses": 4, "size": 4}
+            }
+        }
+    """
+    try:
+        return (
+            jsonify(
+                {
+                    "message": "Compteurs des caches récupérés avec succès.",
+                    "data": {
+                        "token_blocklist": token_cache_info(),
+                        "qr_codes": qr_cache_info(),
+                    },
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
 @admin_bp.route("/logout", methods=["POST"])
 @jwt_required()
 @admin_role_required
@@ -1,7 +1,10 @@
 from flask import request, Blueprint, jsonify
 from app.schemas import ContactUsSchema
 from marshmallow import ValidationError
-from app.tools import email_sender_contact_us
+from app import Config
+from app.extensions import db
+from app.helpers import enqueue_email
+from app.tools import contact_us_message
 
 contact_bp = Blueprint("contact", __name__)
 
@@ -12,8 +15,9 @@ def contact_us():
     Envoie un message de contact à l'administrateur.
 
     Cette fonction permet aux utilisateurs d'envoyer un message via un formulaire de contact.
-    Elle valide les données reçues, envoie un email à l'administrateur avec les informations
-    fournies, et renvoie une réponse appropriée.
+    Elle valide les données reçues, place dans la file d'envoi un email à l'administrateur
+    avec les informations fournies, et renvoie une réponse appropriée sans attendre le
+    serveur SMTP.
 
     Returns:
         Response:
@@ -32,13 +36,19 @@ def contact_us():
 
     Raises:
         ValidationError: Si les données de contact ne respectent pas le schéma défini.
-        Exception: Pour toutes les autres erreurs survenant lors de l'envoi de l'email.
+        Exception: Pour toutes les autres erreurs survenant lors de l'enregistrement de l'email.
     """
     try:
         data = request.get_json()
         schema = ContactUsSchema()
         data = schema.load(data)
-        email_sender_contact_us(data["email"], data["message"])
+        enqueue_email(
+            "contact_us",
+            contact_us_message(data["email"], data["message"]),
+            Config.MAIL_APP,
+            db,
+        )
+        db.session.commit()
         return jsonify({"message": "Merci pour votre message"}), 200
     except ValidationError as e:
         return (
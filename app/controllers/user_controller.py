@@ -21,8 +21,20 @@ from flask_jwt_extended import (
     get_current_user,
 )
 from app.extensions import db, pwd_context
-from app.helpers import add_token_to_database, revoke_token
-from app.tools import Status, generate_pdf
+from app.helpers import (
+    add_token_to_database,
+    revoke_token,
+    add_entries_to_index,
+    get_live_leaderboard,
+    get_ticket_result,
+    cached_leaderboard,
+    ensure_reward_pdf,
+    reward_pdf_response,
+    signed_reward_pdf_url,
+    check_reward_pdf_signature,
+)
+from app.tools import Status
+from app import Config
 from datetime import datetime
 
 user_bp = Blueprint("user", __name__)
@@ -621,6 +633,7 @@ def lottery_registry():
         )
 
         db.session.add(new_entry)
+        add_entries_to_index([new_entry], db)
         db.session.commit()
 
         return (
@@ -737,6 +750,67 @@ def get_lottery_results(lottery_id):
         )
 
 
+@user_bp.route("/live-draw/<int:lottery_id>", methods=["GET"])
+@jwt_required()
+def live_draw_leaderboard(lottery_id):
+    """
+    Récupère les numéros dévoilés et le classement provisoire d'un tirage en direct.
+
+    Le classement est mis à jour à chaque numéro dévoilé ; sa lecture ne recalcule
+    aucun score.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage en direct.
+
+    Returns:
+        Response:
+            - 200 OK: Le classement provisoire (voir `LiveLeaderboard.leaderboard`).
+            - 404 Not Found: Si le tirage n'est pas trouvé ou pour toute erreur.
+
+    Example:
+        Pour utiliser cette fonction, envoyez une requête GET à l'URL
+        `/live-draw/1`. La réponse en cas de succès sera :
+
+        {
+            "message": "Classement provisoire",
+            "data": {
+                "numbers": [12, 5],
+                "lucky_numbers": [],
+                "complete": false,
+                "ranking": [{"rank": 1, "score": 20, "player_ids": [3, 8]}]
+            }
+        }
+    """
+    try:
+        lottery = Lottery.query.filter_by(id=lottery_id).one_or_none()
+
+        if not lottery:
+            return (
+                jsonify({"errors": True, "message": "Tirage non trouvé."}),
+                404,
+            )
+
+        board = get_live_leaderboard(lottery_id, db)
+        db.session.commit()
+
+        return (
+            jsonify({"message": "Classement provisoire", "data": board.leaderboard()}),
+            200,
+        )
+
+    except Exception as e:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue lors de la récupération du classement provisoire.",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
 @user_bp.route("/lottery-history", methods=["GET"])
 @jwt_required()
 def lottery_history_user():
@@ -1126,13 +1200,9 @@ def lottery_rank(lottery_id):
         if lottery_result is None:
             return jsonify({"message": "Aucun résultat pour se tirage"})
 
-        rankings = (
-            db.session.query(LotteryRanking)
-            .filter_by(lottery_result_id=lottery_result.id)
-            .all()
-        )
+        leaderboard = cached_leaderboard(lottery_result.id, db)
 
-        if not rankings:
+        if not leaderboard:
             return (
                 jsonify(
                     {
@@ -1142,33 +1212,17 @@ def lottery_rank(lottery_id):
                 ),
                 400,
             )
-        schema = LotteryWinerSchema(many=True)
-        schemaCurrentUser = LotteryWinerSchema()
-        results = []
+        schema = LotteryWinerSchema(many=True, exclude=("player_id",))
+        schemaCurrentUser = LotteryWinerSchema(exclude=("player_id",))
 
         current_user_id = get_jwt_identity()
-
-        results = []
-        user_result = None
         validated_user_results = {}
 
-        for ranking in rankings:
-            user = db.session.query(User).filter_by(id=ranking.player_id).one_or_none()
-            name = user.full_name if user else "Unknown"
-
-            result_data = {
-                "name": name,
-                "rank": ranking.rank,
-                "score": ranking.score,
-                "winnings": ranking.winnings,
-            }
-
-            results.append(result_data)
-
-            if ranking.player_id == current_user_id:
-                user_result = result_data
+        user_result = next(
+            (row for row in leaderboard if row["player_id"] == current_user_id), None
+        )
 
-        validated_results = schema.dump(results)
+        validated_results = schema.dump(leaderboard)
         if user_result is not None:
             validated_user_results = schemaCurrentUser.dump(user_result)
         return (
@@ -1195,17 +1249,94 @@ def lottery_rank(lottery_id):
         )
 
 
-@user_bp.route("/reward-pdf/<int:lottery_id>", methods=["POST"])
+@user_bp.route("/lottery/<int:lottery_id>/my-ticket", methods=["GET"])
+@jwt_required()
+def my_ticket(lottery_id):
+    """
+    Récupère le résultat du ticket de l'utilisateur courant pour un tirage publié.
+
+    Le score est calculé à partir du seul ticket de l'utilisateur et des numéros du
+    tirage, puis son rang et ses gains sont lus par une requête indexée : le coût de
+    la requête ne dépend pas de la taille du classement.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+
+    Returns:
+        Response:
+            - 200 OK: Le résultat du ticket de l'utilisateur.
+            - 404 Not Found: Si l'utilisateur n'a pas participé au tirage, si les
+              résultats ne sont pas publiés, ou pour toute erreur survenant lors du
+              traitement.
+
+    Example:
+        Pour utiliser cette fonction, envoyez une requête GET à l'URL
+        `/user/lottery/1/my-ticket`. La réponse en cas de succès sera :
+
+        {
+            "message": "Résultat de votre ticket.",
+            "data": {
+                "numbers": [3, 12, 23, 34, 45],
+                "lucky_numbers": [2, 7],
+                "winning_numbers": [3, 12, 25, 34, 47],
+                "winning_lucky_numbers": [2, 9],
+                "matched_numbers": [3, 12, 34],
+                "matched_lucky_numbers": [2],
+                "score": 41,
+                "rank": 2,
+                "winnings": 250.0
+            }
+        }
+
+    Raises:
+        Exception: Pour toute erreur survenant lors de la récupération du résultat.
+    """
+    try:
+        result = get_ticket_result(lottery_id, get_jwt_identity(), db)
+        if result is None:
+            return (
+                jsonify(
+                    {
+                        "errors": True,
+                        "message": "Aucun résultat publié pour votre ticket dans ce tirage.",
+                    }
+                ),
+                404,
+            )
+
+        return (
+            jsonify({"message": "Résultat de votre ticket.", "data": result}),
+            200,
+        )
+
+    except Exception as e:
+        return (
+            jsonify(
+                {
+                    "errors": True,
+                    "message": "Une erreur est survenue lors de la récupération du résultat.",
+                    "details": str(e),
+                }
+            ),
+            404,
+        )
+
+
+@user_bp.route("/reward-pdf/<int:lottery_id>", methods=["GET", "POST"])
 @jwt_required()
 def reward_pdf(lottery_id):
     """
     Génère un PDF de récompense pour l'utilisateur actuel basé sur l'identifiant du tirage.
 
-    Cette fonction traite une requête POST pour générer un PDF qui contient les détails de la
+    Cette fonction traite une requête GET ou POST pour générer un PDF qui contient les détails de la
     récompense d'un utilisateur pour un tirage de loterie spécifique. Elle vérifie d'abord si
     le tirage et les résultats sont disponibles pour l'utilisateur, puis appelle la fonction
-    `generate_pdf` pour créer le PDF. Si des erreurs surviennent à n'importe quelle étape,
-    un message d'erreur approprié est retourné.
+    `ensure_reward_pdf`, qui ne génère le PDF qu'à sa première demande. Le fichier est livré
+    par `reward_pdf_response`, directement ou par le proxy, avec son empreinte comme `ETag`.
+    Si `Config.PDF_SIGNED_URLS` est activé, la réponse contient à la place une URL de
+    téléchargement signée et de courte durée (`reward_pdf_file`). Si des erreurs surviennent
+    à n'importe quelle étape, un message d'erreur approprié est retourné ; si trop de PDF
+    sont déjà en cours de génération, la demande est refusée avec une erreur 503.
 
     Args:
         lottery_id (int): L'identifiant du tirage de loterie pour lequel le PDF de récompense est demandé.
@@ -1246,6 +1377,56 @@ def reward_pdf(lottery_id):
                 ),
                 404,
             )
-        return generate_pdf(user.full_name, ranking.winnings, lottery.name)
+        _, digest = ensure_reward_pdf(
+            lottery.id, user.full_name, ranking.winnings, lottery.name
+        )
+        download_name = f"recompense_{lottery.name}_{user.full_name}.pdf"
+        if Config.PDF_SIGNED_URLS:
+            url, expires_at = signed_reward_pdf_url(lottery.id, digest, download_name)
+            return jsonify({"url": url, "expires_at": expires_at.isoformat()}), 200
+        return reward_pdf_response(lottery.id, digest, download_name)
+    except TimeoutError as e:
+        return jsonify({"message": str(e), "errors": True}), 503
+    except Exception as e:
+        return jsonify({"message": str(e), "errors": True}), 404
+
+
+@user_bp.route("/reward-pdf/<int:lottery_id>/<digest>", methods=["GET"])
+def reward_pdf_file(lottery_id, digest):
+    """
+    Envoie un PDF de récompense à partir d'une URL signée par `reward_pdf`.
+
+    Cette route ne demande pas de token : la signature de l'URL, valable
+    `Config.PDF_URL_TTL` secondes, autorise le téléchargement de ce seul fichier.
+    Le fichier est envoyé comme par `reward_pdf`, par l'application ou par le proxy
+    selon `Config.PDF_OFFLOAD_HEADER`.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        digest (str): L'empreinte du PDF.
+
+    Returns:
+        Response: Le PDF à télécharger, ou un message d'erreur (403 si la signature est
+        invalide ou expirée, 404 si le PDF n'existe plus).
+    """
+    try:
+        download_name = request.args.get("filename", "")
+        if not check_reward_pdf_signature(
+            lottery_id,
+            digest,
+            download_name,
+            request.args.get("expires"),
+            request.args.get("signature"),
+        ):
+            return (
+                jsonify(
+                    {
+                        "message": "Lien de téléchargement invalide ou expiré.",
+                        "errors": True,
+                    }
+                ),
+                403,
+            )
+        return reward_pdf_response(lottery_id, digest, download_name)
     except Exception as e:
         return jsonify({"message": str(e), "errors": True}), 404
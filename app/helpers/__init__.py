@@ -2,11 +2,90 @@ from .token_helpers import (
     add_token_to_database,
     revoke_token,
     is_token_revoked,
+    invalidate_token_cache,
+    token_cache_info,
+    clear_token_cache,
 )
-from .admin_helpers import admin_role_required, send_email_to_users
+from .outbox_helpers import (
+    enqueue_email,
+    claim_outbox_batch,
+    deliver_outbox_batch,
+    requeue_dead_emails,
+)
+from .admin_helpers import admin_role_required
 from .lottery_helpers import (
     get_formatted_results,
+    format_ranking_results,
+    rank_lottery_entries,
+    get_ticket_result,
+    save_lottery_rankings,
     generate_random_user,
     generate_luck_numbers,
     generate_wining_numbers,
 )
+from .leaderboard_helpers import (
+    load_player_names,
+    load_leaderboard,
+    cached_leaderboard,
+    warm_leaderboard_cache,
+    invalidate_leaderboard_cache,
+)
+from .reward_pdf_helpers import (
+    reward_pdf_dir,
+    reward_pdf_path,
+    ensure_reward_pdf,
+    prerender_reward_pdfs,
+    delete_reward_pdfs,
+    reward_pdf_response,
+    signed_reward_pdf_url,
+    check_reward_pdf_signature,
+)
+from .scoring_helpers import (
+    structure_scores_sql,
+    structure_scores_stream,
+    structure_scores_parallel,
+    LOTTERY_SCORING_ENGINES,
+)
+from .index_helpers import (
+    add_entries_to_index,
+    remove_entries_from_index,
+    delete_ticket_index,
+    start_ticket_index,
+    rebuild_ticket_index,
+    compact_ticket_index,
+    ensure_ticket_index,
+    number_statistics,
+    count_tickets_containing,
+    structure_scores_index,
+    ticket_format_counts,
+    posting_entry_ids,
+)
+from .snapshot_helpers import (
+    snapshot_path,
+    write_lottery_snapshot,
+    ensure_lottery_snapshot,
+    delete_lottery_snapshot,
+    open_lottery_snapshot,
+    lottery_ticket_columns,
+    structure_scores_snapshot,
+)
+from .simulation_helpers import load_lottery_masks, simulate_lottery, estimate_lottery
+from .job_helpers import (
+    create_announcement_job,
+    find_validation_job,
+    create_validation_job,
+    validation_numbers,
+    validation_numbers_match,
+    retry_job,
+    claim_job,
+    run_job,
+    submit_job,
+    pending_job_ids,
+    resume_job,
+)
+from .live_draw_helpers import (
+    get_live_leaderboard,
+    reveal_live_number,
+    get_live_draw_numbers,
+    discard_live_board,
+)
@@ -1,9 +1,7 @@
 from functools import wraps
 from flask_jwt_extended import get_jwt_identity
 from flask import jsonify
-from app.models import User, Role
-from app.tools.roles_tools import Roles
-from app.tools import email_sender_new_tirage
+from app.models import User
 
 
 def admin_role_required(func):
@@ -49,36 +47,3 @@ def admin_role_required(func):
         return func(*args, **kwargs)
 
     return wrapper
-
-
-def send_email_to_users():
-    """
-    Envoie des emails aux utilisateurs ayant activé les notifications.
-
-    Cette fonction récupère tous les utilisateurs ayant le rôle d'utilisateur (USER)
-    et qui ont activé les notifications. Pour chaque utilisateur, un email est envoyé
-    via la fonction `email_sender_new_tirage`.
-
-    Raises:
-        Exception: Si une erreur se produit lors de la récupération des utilisateurs
-        ou de l'envoi des emails, une exception est levée avec un message d'erreur.
-
-    Returns:
-        None: La fonction ne retourne rien. Si aucun utilisateur n'est trouvé,
-        aucun email n'est envoyé.
-
-    Example:
-        send_email_to_users()
-    """
-    try:
-        users = (
-            User.query.join(Role)
-            .filter(Role.role_name == Roles.USER.value, User.notification)
-            .all()
-        )
-        if not users:
-            return
-        for user in users:
-            email_sender_new_tirage(user.email)
-    except Exception as e:
-        raise Exception(f"Une erreur est survenue lors de l'envoie des mails {str(e)}")
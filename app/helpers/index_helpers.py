@@ -0,0 +1,622 @@
+import numpy as np
+from sqlalchemy import and_, func, or_, select
+from app import Config
+from app.models import Entry, TicketIndex
+from app.tools import (
+    PostingKind,
+    encode_postings,
+    decode_postings,
+    mask_to_numbers,
+    numbers_to_mask,
+    score_table,
+    calculate_mask_similarity,
+    build_ranking,
+)
+from app.tools.rank_tools import STANDARD_NUMBER_COUNT, STANDARD_STAR_COUNT
+
+
+def _posting_keys(numbers_mask, lucky_numbers_mask):
+    """
+    Retourne les clés `(type, numéro)` des listes de l'index contenant un ticket.
+    """
+    keys = [(PostingKind.NUMBER.value, n) for n in mask_to_numbers(numbers_mask)]
+    keys += [(PostingKind.LUCKY.value, n) for n in mask_to_numbers(lucky_numbers_mask)]
+    if (
+        numbers_mask.bit_count() != STANDARD_NUMBER_COUNT
+        or lucky_numbers_mask.bit_count() != STANDARD_STAR_COUNT
+    ):
+        keys.append((PostingKind.IRREGULAR.value, 0))
+    return keys
+
+
+def _group_by_posting(entries):
+    """
+    Regroupe des inscriptions `(id, lottery_id, numbers_mask, lucky_numbers_mask)`
+    par liste de l'index, sous la forme `{lottery_id: {(type, numéro): [ids]}}`.
+    """
+    grouped = {}
+    for entry_id, lottery_id, numbers_mask, lucky_numbers_mask in entries:
+        postings = grouped.setdefault(lottery_id, {})
+        for key in _posting_keys(numbers_mask, lucky_numbers_mask):
+            postings.setdefault(key, []).append(entry_id)
+    return grouped
+
+
+def _load_segments(lottery_id, keys, db):
+    """
+    Charge et verrouille, dans l'ordre des clés, tous les segments des listes d'une
+    loterie correspondant aux clés, sous la forme `{(type, numéro): [segments]}`.
+    """
+    if not keys:
+        return {}
+    rows = (
+        db.session.query(TicketIndex)
+        .filter(
+            TicketIndex.lottery_id == lottery_id,
+            or_(
+                *(
+                    and_(TicketIndex.kind == kind, TicketIndex.number == number)
+                    for kind, number in keys
+                )
+            ),
+        )
+        .order_by(TicketIndex.kind, TicketIndex.number, TicketIndex.segment)
+        .with_for_update()
+        .all()
+    )
+    segments = {}
+    for row in rows:
+        segments.setdefault((row.kind, row.number), []).append(row)
+    return segments
+
+
+def add_entries_to_index(entries, db):
+    """
+    Ajoute des inscriptions à l'index inversé de leur loterie.
+
+    Chaque liste concernée reçoit un nouveau segment, numéroté par le plus petit
+    identifiant ajouté : une inscription n'écrit que ses propres petites lignes, sans
+    relire, réécrire ni verrouiller les listes existantes, et deux inscriptions
+    simultanées n'entrent jamais en conflit. Les segments sont fusionnés plus tard
+    par `compact_ticket_index`. La validation de la transaction reste à la charge
+    de l'appelant.
+
+    Args:
+        entries (list): Les inscriptions (`Entry`) à indexer. Elles sont envoyées à la
+            base (`flush`) si elles n'ont pas encore d'identifiant.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Example:
+        db.session.add(new_entry)
+        add_entries_to_index([new_entry], db)
+        db.session.commit()
+    """
+    if any(entry.id is None for entry in entries):
+        db.session.flush()
+
+    grouped = _group_by_posting(
+        (entry.id, entry.lottery_id, entry.numbers_mask, entry.lucky_numbers_mask)
+        for entry in entries
+    )
+
+    for lottery_id, postings in grouped.items():
+        for (kind, number), entry_ids in sorted(postings.items()):
+            entry_ids = sorted(set(entry_ids))
+            db.session.add(
+                TicketIndex(
+                    lottery_id=lottery_id,
+                    kind=kind,
+                    number=number,
+                    segment=entry_ids[0],
+                    entry_count=len(entry_ids),
+                    last_entry_id=entry_ids[-1],
+                    postings=encode_postings(entry_ids),
+                )
+            )
+
+
+def remove_entries_from_index(entries, db):
+    """
+    Retire des inscriptions de l'index inversé de leur loterie.
+
+    Les segments des listes concernées sont verrouillés dans l'ordre des clés ; les
+    segments ajoutés devenus vides sont supprimés.
+
+    Args:
+        entries (list): Les inscriptions (`Entry`) à retirer.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Example:
+        remove_entries_from_index([entry], db)
+        db.session.delete(entry)
+        db.session.commit()
+    """
+    grouped = _group_by_posting(
+        (entry.id, entry.lottery_id, entry.numbers_mask, entry.lucky_numbers_mask)
+        for entry in entries
+    )
+
+    for lottery_id, postings in grouped.items():
+        segments = _load_segments(lottery_id, sorted(postings), db)
+
+        for key, entry_ids in postings.items():
+            for row in segments.get(key, []):
+                remaining = np.setdiff1d(decode_postings(row.postings), entry_ids)
+                if len(remaining) == row.entry_count:
+                    continue
+                if not len(remaining) and row.segment:
+                    db.session.delete(row)
+                    continue
+                row.postings = encode_postings(remaining.tolist())
+                row.entry_count = len(remaining)
+                row.last_entry_id = int(remaining[-1]) if len(remaining) else 0
+
+
+def compact_ticket_index(lottery_id, db):
+    """
+    Fusionne les segments de chaque liste de l'index d'une loterie en un seul.
+
+    Appelée avant la validation d'un tirage, et par `flask ticket-index compact`.
+    Les segments sont verrouillés dans l'ordre des clés ; une inscription simultanée
+    ajoute un nouveau segment, fusionné à la compaction suivante. La validation de
+    la transaction reste à la charge de l'appelant.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        int: Le nombre de segments fusionnés puis supprimés.
+
+    Example:
+        compact_ticket_index(1, db)
+        db.session.commit()
+    """
+    rows = (
+        db.session.query(TicketIndex)
+        .filter(TicketIndex.lottery_id == lottery_id)
+        .order_by(TicketIndex.kind, TicketIndex.number, TicketIndex.segment)
+        .with_for_update()
+        .all()
+    )
+    segments = {}
+    for row in rows:
+        segments.setdefault((row.kind, row.number), []).append(row)
+
+    merged_count = 0
+    for key_rows in segments.values():
+        if len(key_rows) == 1 and key_rows[0].segment == 0:
+            continue
+        base, others = key_rows[0], key_rows[1:]
+        merged = np.unique(
+            np.concatenate([decode_postings(row.postings) for row in key_rows])
+        )
+        for row in others:
+            db.session.delete(row)
+        if others:
+            db.session.flush()
+        base.segment = 0
+        base.postings = encode_postings(merged.tolist())
+        base.entry_count = len(merged)
+        base.last_entry_id = int(merged[-1]) if len(merged) else 0
+        merged_count += len(others)
+    return merged_count
+
+
+def delete_ticket_index(lottery_id, db):
+    """
+    Supprime l'index inversé d'une loterie.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+    """
+    db.session.query(TicketIndex).filter_by(lottery_id=lottery_id).delete(
+        synchronize_session=False
+    )
+
+
+def start_ticket_index(lottery_id, db):
+    """
+    Marque l'index d'une loterie comme construit, par une ligne témoin
+    (`PostingKind.BUILT`).
+
+    Appelée à la création d'une loterie, avant sa première inscription, et par
+    `rebuild_ticket_index`. Une loterie sans ligne témoin (antérieure à l'index) est
+    reconstruite par `ensure_ticket_index`, même si des inscriptions récentes y ont
+    déjà ajouté des segments. La validation de la transaction reste à la charge de
+    l'appelant.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Example:
+        db.session.add(lottery)
+        db.session.flush()
+        start_ticket_index(lottery.id, db)
+        db.session.commit()
+    """
+    db.session.add(
+        TicketIndex(
+            lottery_id=lottery_id,
+            kind=PostingKind.BUILT.value,
+            number=0,
+            segment=0,
+            entry_count=0,
+            last_entry_id=0,
+            postings=b"",
+        )
+    )
+
+
+def rebuild_ticket_index(lottery_id, db, chunk_size=None):
+    """
+    Reconstruit l'index inversé d'une loterie à partir de la table `entries`.
+
+    Les inscriptions sont parcourues par identifiant croissant et par blocs de
+    `chunk_size` lignes ; seules les listes compressées sont gardées en mémoire.
+    L'ancien index est remplacé dans la même transaction, validée par l'appelant.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        chunk_size (int, optional): Le nombre de lignes par bloc. Par défaut
+            `Config.SCORING_CHUNK_SIZE`.
+
+    Returns:
+        int: Le nombre d'inscriptions indexées.
+
+    Example:
+        rebuild_ticket_index(1, db)
+        db.session.commit()
+    """
+    chunk_size = chunk_size or Config.SCORING_CHUNK_SIZE
+    delete_ticket_index(lottery_id, db)
+
+    result = db.session.execute(
+        select(Entry.id, Entry.lottery_id, Entry.numbers_mask, Entry.lucky_numbers_mask)
+        .where(Entry.lottery_id == lottery_id)
+        .order_by(Entry.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    rows = {}
+    total = 0
+    for partition in result.partitions():
+        total += len(partition)
+        for key, entry_ids in _group_by_posting(partition).get(lottery_id, {}).items():
+            if key not in rows:
+                rows[key] = [bytearray(), 0, 0]
+            row = rows[key]
+            row[0] += encode_postings(entry_ids, row[2])
+            row[1] += len(entry_ids)
+            row[2] = entry_ids[-1]
+
+    start_ticket_index(lottery_id, db)
+    db.session.add_all(
+        TicketIndex(
+            lottery_id=lottery_id,
+            kind=kind,
+            number=number,
+            segment=0,
+            entry_count=entry_count,
+            last_entry_id=last_entry_id,
+            postings=bytes(postings),
+        )
+        for (kind, number), (postings, entry_count, last_entry_id) in rows.items()
+    )
+    return total
+
+
+def ensure_ticket_index(lottery_id, db):
+    """
+    Construit l'index d'une loterie qui n'a jamais été construit entièrement
+    (tirages antérieurs à l'index), c'est-à-dire sans ligne témoin
+    (`start_ticket_index`) : les segments ajoutés par les inscriptions postérieures
+    ne couvrent pas les anciennes. La validation de la transaction reste à la charge
+    de l'appelant.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+    """
+    indexed = (
+        db.session.query(TicketIndex.id)
+        .filter_by(lottery_id=lottery_id, kind=PostingKind.BUILT.value)
+        .first()
+    )
+    if indexed is None:
+        rebuild_ticket_index(lottery_id, db)
+
+
+def _read_postings(lottery_id, kind, numbers, db):
+    """
+    Retourne les listes décompressées d'une loterie pour les numéros demandés, une
+    par numéro présent dans l'index, segments réunis et triés.
+    """
+    rows = (
+        db.session.query(TicketIndex.number, TicketIndex.postings)
+        .filter(
+            TicketIndex.lottery_id == lottery_id,
+            TicketIndex.kind == kind,
+            TicketIndex.number.in_(list(numbers)),
+        )
+        .order_by(TicketIndex.number, TicketIndex.segment)
+        .all()
+    )
+    segments = {}
+    for number, postings in rows:
+        segments.setdefault(number, []).append(decode_postings(postings))
+    return [
+        parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+        for parts in segments.values()
+    ]
+
+
+def posting_entry_ids(lottery_id, kind, number, db):
+    """
+    Retourne les identifiants des inscriptions d'une liste de l'index inversé.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        kind (str): Le type de liste (voir `PostingKind`).
+        number (int): Le numéro de la liste.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        numpy.ndarray: Les identifiants, dans l'ordre croissant.
+
+    Example:
+        posting_entry_ids(1, PostingKind.NUMBER.value, 7, db)
+    """
+    ensure_ticket_index(lottery_id, db)
+    posting_lists = _read_postings(lottery_id, kind, [number], db)
+    return posting_lists[0] if posting_lists else np.empty(0, dtype=np.int64)
+
+
+def _match_counts(posting_lists):
+    """
+    Retourne les identifiants présents dans au moins une liste et le nombre de listes
+    qui contiennent chacun d'eux.
+    """
+    if not posting_lists:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(posting_lists), return_counts=True)
+
+
+def number_statistics(lottery_id, db):
+    """
+    Retourne le nombre de tickets d'une loterie contenant chaque numéro.
+
+    Les compteurs sont lus directement dans l'index, sans parcourir les inscriptions.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        dict: `{"numbers": {numéro: nombre}, "lucky_numbers": {numéro: nombre}}`,
+        les numéros absents de tous les tickets valant 0.
+
+    Example:
+        stats = number_statistics(1, db)
+        stats["numbers"][7]
+    """
+    ensure_ticket_index(lottery_id, db)
+
+    statistics = {
+        "numbers": {number: 0 for number in range(1, 50)},
+        "lucky_numbers": {number: 0 for number in range(1, 10)},
+    }
+    sections = {
+        PostingKind.NUMBER.value: "numbers",
+        PostingKind.LUCKY.value: "lucky_numbers",
+    }
+
+    rows = (
+        db.session.query(TicketIndex.kind, TicketIndex.number, TicketIndex.entry_count)
+        .filter(
+            TicketIndex.lottery_id == lottery_id,
+            TicketIndex.kind.in_(list(sections)),
+        )
+        .all()
+    )
+    for kind, number, entry_count in rows:
+        statistics[sections[kind]][number] += entry_count
+
+    return statistics
+
+
+def count_tickets_containing(lottery_id, numbers, lucky_numbers, db):
+    """
+    Compte les tickets d'une loterie contenant tous les numéros demandés.
+
+    Le résultat est l'intersection des listes de l'index des numéros demandés.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        numbers (iterable): Les numéros que les tickets doivent contenir.
+        lucky_numbers (iterable): Les numéros chance que les tickets doivent contenir.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        int: Le nombre de tickets contenant tous ces numéros.
+
+    Example:
+        count_tickets_containing(1, [7, 21], [3], db)
+    """
+    ensure_ticket_index(lottery_id, db)
+
+    numbers, lucky_numbers = set(numbers), set(lucky_numbers)
+    posting_lists = _read_postings(
+        lottery_id, PostingKind.NUMBER.value, numbers, db
+    ) + _read_postings(lottery_id, PostingKind.LUCKY.value, lucky_numbers, db)
+
+    if not posting_lists or len(posting_lists) < len(numbers) + len(lucky_numbers):
+        return 0
+
+    matching = posting_lists[0]
+    for posting_list in posting_lists[1:]:
+        matching = np.intersect1d(matching, posting_list, assume_unique=True)
+    return len(matching)
+
+
+def _irregular_masks(lottery_id, db):
+    """
+    Relit les masques des tickets hors format d'une loterie à partir de l'index.
+    """
+    irregular = np.concatenate(
+        [np.empty(0, dtype=np.int64)]
+        + _read_postings(lottery_id, PostingKind.IRREGULAR.value, [0], db)
+    )
+    rows = []
+    for start in range(0, len(irregular), Config.SCORING_CHUNK_SIZE):
+        rows += db.session.execute(
+            select(Entry.id, Entry.numbers_mask, Entry.lucky_numbers_mask).where(
+                Entry.id.in_(
+                    irregular[start : start + Config.SCORING_CHUNK_SIZE].tolist()
+                )
+            )
+        ).all()
+    return rows
+
+
+def ticket_format_counts(lottery_id, db):
+    """
+    Compte les tickets d'une loterie par format (nombre de numéros et de numéros chance).
+
+    Seuls les tickets hors format, listés dans l'index, sont relus : tous les autres
+    sont au format standard. Le comptage ne parcourt donc pas les inscriptions.
+
+    Args:
+        lottery_id (int): L'identifiant de la loterie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        dict: `{(nombre de numéros, nombre de numéros chance): nombre de tickets}`.
+
+    Example:
+        ticket_format_counts(1, db)
+        # {(5, 2): 99998, (6, 2): 2}
+    """
+    ensure_ticket_index(lottery_id, db)
+
+    total = (
+        db.session.query(func.count(Entry.id))
+        .filter(Entry.lottery_id == lottery_id)
+        .scalar()
+    )
+    irregular_rows = _irregular_masks(lottery_id, db)
+
+    counts = {}
+    if total > len(irregular_rows):
+        counts[(STANDARD_NUMBER_COUNT, STANDARD_STAR_COUNT)] = total - len(
+            irregular_rows
+        )
+    for _, numbers_mask, lucky_numbers_mask in irregular_rows:
+        key = (numbers_mask.bit_count(), lucky_numbers_mask.bit_count())
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _entry_users(entry_ids, db, chunk_size=None):
+    """
+    Retourne `{entry_id: user_id}` pour les inscriptions existantes parmi `entry_ids`.
+    """
+    chunk_size = chunk_size or Config.SCORING_CHUNK_SIZE
+    users = {}
+    for start in range(0, len(entry_ids), chunk_size):
+        chunk = entry_ids[start : start + chunk_size]
+        users.update(
+            db.session.execute(
+                select(Entry.id, Entry.user_id).where(Entry.id.in_(chunk))
+            ).all()
+        )
+    return users
+
+
+def structure_scores_index(lottery_id, draw_numbers, draw_stars, db, limit=10):
+    """
+    Calcule le classement d'un tirage à partir de l'index inversé de ses inscriptions.
+
+    Seules les 7 listes des numéros et numéros chance tirés sont lues : le nombre de
+    listes contenant une inscription donne ses numéros trouvés, et le score d'un ticket
+    au format standard est lu dans `score_table`. Les tickets hors format sont relus
+    et notés individuellement. Les joueurs ne sont chargés que pour les groupes de
+    scores nécessaires au classement. Le résultat est celui de `structure_scores`
+    appliqué aux inscriptions triées par identifiant.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        draw_numbers (iterable): Numéros gagnants du tirage.
+        draw_stars (iterable): Numéros chance gagnants du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+
+    Returns:
+        dict: Le classement au format `{rang: [identifiants, score]}`.
+
+    Example:
+        ranking = structure_scores_index(1, [5, 12, 23, 34, 45], [2, 7], db)
+    """
+    ensure_ticket_index(lottery_id, db)
+
+    draw_mask = numbers_to_mask(draw_numbers)
+    draw_stars_mask = numbers_to_mask(draw_stars)
+    table = np.array(score_table(draw_mask.bit_count(), draw_stars_mask.bit_count()))
+
+    number_ids, number_matches = _match_counts(
+        _read_postings(
+            lottery_id, PostingKind.NUMBER.value, mask_to_numbers(draw_mask), db
+        )
+    )
+    star_ids, star_matches = _match_counts(
+        _read_postings(
+            lottery_id, PostingKind.LUCKY.value, mask_to_numbers(draw_stars_mask), db
+        )
+    )
+    irregular_rows = _irregular_masks(lottery_id, db)
+    irregular = np.array(
+        [entry_id for entry_id, _, _ in irregular_rows], dtype=np.int64
+    )
+
+    candidates = np.union1d(number_ids, star_ids)
+    matches = np.zeros((2, len(candidates)), dtype=np.int64)
+    matches[0, np.searchsorted(candidates, number_ids)] = number_matches
+    matches[1, np.searchsorted(candidates, star_ids)] = star_matches
+
+    regular = ~np.isin(candidates, irregular)
+    candidates = candidates[regular]
+    scores = table[matches[0, regular], matches[1, regular]]
+
+    if len(irregular):
+        candidates = np.concatenate(
+            (candidates, [entry_id for entry_id, _, _ in irregular_rows])
+        ).astype(np.int64)
+        scores = np.concatenate(
+            (
+                scores,
+                [
+                    calculate_mask_similarity(
+                        draw_mask, draw_stars_mask, numbers_mask, lucky_numbers_mask
+                    )
+                    for _, numbers_mask, lucky_numbers_mask in irregular_rows
+                ],
+            )
+        ).astype(np.int64)
+
+    scores_dict = {}
+    total_ranked = 0
+
+    for score in np.unique(scores[scores >= 10])[::-1]:
+        if total_ranked >= limit:
+            break
+        entry_ids = np.sort(candidates[scores == score]).tolist()
+        users = _entry_users(entry_ids, db)
+        players = [users[entry_id] for entry_id in entry_ids if entry_id in users]
+        if players:
+            scores_dict[int(score)] = players
+            total_ranked += len(players)
+
+    return build_ranking(scores_dict, limit)
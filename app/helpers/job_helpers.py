@@ -0,0 +1,567 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import joinedload
+from app import Config
+from app.models import Entry, Job, Lottery, LotteryRanking, LotteryResult, Role, User
+from app.tools import (
+    JobStage,
+    JobStatus,
+    Roles,
+    Status,
+    stagger_offsets,
+    new_tirage_message,
+    results_available_message,
+)
+from app.helpers.outbox_helpers import enqueue_email
+from app.helpers.leaderboard_helpers import warm_leaderboard_cache
+from app.helpers.index_helpers import compact_ticket_index
+from app.helpers.live_draw_helpers import discard_live_board
+from app.helpers.reward_pdf_helpers import delete_reward_pdfs, prerender_reward_pdfs
+from app.helpers.lottery_helpers import (
+    rank_lottery_entries,
+    format_ranking_results,
+    save_lottery_rankings,
+)
+
+VALIDATE_LOTTERY = "validate_lottery"
+ANNOUNCE_LOTTERY = "announce_lottery"
+
+# Exécuteur des tâches de fond de ce processus, créé à la première soumission, et
+# identifiants des tâches qui lui ont été confiées et ne sont pas encore terminées.
+_executor = None
+_submitted = set()
+_lock = threading.Lock()
+
+
+def find_validation_job(lottery_id, db):
+    """
+    Retourne la tâche de validation non terminée d'un tirage, s'il en existe une.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        Job: La tâche en attente, en cours ou en échec du tirage, ou `None`.
+    """
+    return (
+        db.session.query(Job)
+        .filter(
+            Job.kind == VALIDATE_LOTTERY,
+            Job.lottery_id == lottery_id,
+            Job.status != JobStatus.DONE.value,
+        )
+        .order_by(Job.id.desc())
+        .first()
+    )
+
+
+def create_validation_job(lottery_id, winning_numbers, lucky_numbers, db):
+    """
+    Crée la tâche de validation d'un tirage, ou reprend celle qui existe déjà.
+
+    Un tirage n'a qu'une tâche de validation non terminée : une tâche en attente ou
+    en cours est retournée telle quelle, une tâche en échec est remise en attente et
+    repartira de sa dernière étape enregistrée. La ligne du tirage est verrouillée
+    (`SELECT ... FOR UPDATE`) jusqu'au `commit`, pour que deux requêtes simultanées ne
+    créent pas chacune une tâche. Les numéros du tirage sont fixés à la création de la
+    tâche, pour qu'une tâche relancée calcule le même classement : ceux d'une tâche
+    existante sont conservés (voir `validation_numbers_match`).
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        winning_numbers (str): Les numéros gagnants, séparés par des virgules.
+        lucky_numbers (str): Les numéros chance gagnants, séparés par des virgules.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        Job: La tâche de validation du tirage.
+
+    Example:
+        job = create_validation_job(1, "5,12,23,34,45", "2,7", db)
+        submit_job(job.id, db)
+    """
+    db.session.query(Lottery.id).filter_by(id=lottery_id).with_for_update().one()
+    job = find_validation_job(lottery_id, db)
+    if job is not None:
+        db.session.commit()
+        return retry_job(job, db)
+
+    job = Job(
+        kind=VALIDATE_LOTTERY,
+        lottery_id=lottery_id,
+        payload=json.dumps(
+            {"winning_numbers": winning_numbers, "lucky_numbers": lucky_numbers}
+        ),
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def validation_numbers(job):
+    """
+    Retourne les numéros fixés à la création d'une tâche de validation.
+
+    Args:
+        job (Job): La tâche de validation.
+
+    Returns:
+        tuple: Les numéros gagnants et les numéros chance, séparés par des virgules.
+    """
+    payload = json.loads(job.payload)
+    return payload["winning_numbers"], payload["lucky_numbers"]
+
+
+def validation_numbers_match(job, winning_numbers, lucky_numbers):
+    """
+    Indique si une tâche de validation calcule le classement des numéros donnés,
+    quel que soit leur ordre.
+
+    Args:
+        job (Job): La tâche de validation.
+        winning_numbers (str): Les numéros gagnants, séparés par des virgules.
+        lucky_numbers (str): Les numéros chance, séparés par des virgules.
+
+    Returns:
+        bool: `True` si la tâche a été créée avec les mêmes numéros.
+
+    Example:
+        job = create_validation_job(1, "5,12,23,34,45", "2,7", db)
+        validation_numbers_match(job, "45,34,23,12,5", "7,2")  # True
+    """
+
+    def number_set(numbers):
+        return {int(number) for number in numbers.split(",") if number.strip()}
+
+    job_winning, job_lucky = validation_numbers(job)
+    return number_set(job_winning) == number_set(winning_numbers) and number_set(
+        job_lucky
+    ) == number_set(lucky_numbers)
+
+
+def retry_job(job, db):
+    """
+    Remet en attente une tâche en échec ; les autres tâches sont laissées
+    telles quelles.
+
+    Args:
+        job (Job): La tâche.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        Job: La tâche.
+    """
+    if job.status == JobStatus.FAILED.value:
+        job.status = JobStatus.PENDING.value
+        job.error = None
+        job.finished_at = None
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+    return job
+
+
+def claim_job(job_id, db):
+    """
+    Réserve une tâche pour le processus courant.
+
+    La réservation est une seule instruction `UPDATE` conditionnelle : une tâche en
+    attente, ou en cours mais sans signe de vie depuis `Config.JOB_STALE_SECONDS`
+    secondes (processus arrêté), ne peut être réservée que par un seul processus.
+
+    Args:
+        job_id (int): L'identifiant de la tâche.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        bool: `True` si la tâche a été réservée.
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=Config.JOB_STALE_SECONDS)
+    result = db.session.execute(
+        update(Job)
+        .where(
+            Job.id == job_id,
+            or_(
+                Job.status == JobStatus.PENDING.value,
+                and_(Job.status == JobStatus.RUNNING.value, Job.updated_at < stale),
+            ),
+        )
+        .values(
+            status=JobStatus.RUNNING.value, attempts=Job.attempts + 1, updated_at=now
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def _checkpoint(job, db, **values):
+    """
+    Enregistre l'avancement d'une tâche et son signe de vie.
+    """
+    for name, value in values.items():
+        setattr(job, name, value)
+    job.updated_at = datetime.utcnow()
+    db.session.commit()
+
+
+def run_validation_job(job, db):
+    """
+    Exécute la validation d'un tirage, étape par étape, à partir de la dernière étape
+    enregistrée.
+
+    Les segments de l'index inversé des tickets sont d'abord fusionnés
+    (`compact_ticket_index`), les inscriptions étant closes. Le résultat, le
+    classement, le nouveau statut du tirage et l'étape `PERSISTED` sont validés dans
+    une seule transaction : une tâche reprise après cette étape ne recalcule rien, et
+    l'index unique sur `lottery_results.lottery_id` empêche tout second résultat. Les
+    PDF de récompense d'un classement précédent du tirage et son classement
+    provisoire en direct (`discard_live_board`) sont alors supprimés.
+
+    Le classement est ensuite chargé dans le cache du processus qui exécute la tâche
+    (`warm_leaderboard_cache`) ; les autres processus le chargent à leur première
+    lecture. Si `Config.PDF_PRERENDER` est activé, les PDF de récompense des gagnants
+    sont générés (`prerender_reward_pdfs`). Les emails des gagnants sont enfin placés
+    dans la file d'envoi et validés avec l'étape `NOTIFIED` : une tâche reprise ne
+    les ajoute pas une seconde fois. Les emails sont répartis sur
+    `Config.RESULTS_NOTIFICATION_WINDOW` secondes, les premiers rangs en premier,
+    pour que les gagnants ne consultent pas tous leurs résultats au même moment ; le
+    débit d'arrivée attendu est enregistré avec la tâche (`notification`).
+
+    Args:
+        job (Job): La tâche réservée par `claim_job`.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Raises:
+        ValueError: Si le tirage n'est ni en validation ni en simulation.
+    """
+    lottery = db.session.get(Lottery, job.lottery_id)
+    lottery_result = (
+        db.session.query(LotteryResult)
+        .filter_by(lottery_id=job.lottery_id)
+        .one_or_none()
+    )
+
+    if lottery_result is None:
+        if lottery.status not in [Status.EN_VALIDATION.value, Status.SIMULATION.value]:
+            raise ValueError("Le tirage doit etre en validation ou en simulation")
+
+        payload = json.loads(job.payload)
+        lottery_result = LotteryResult(
+            lottery_id=job.lottery_id,
+            winning_numbers=payload["winning_numbers"],
+            winning_lucky_numbers=payload["lucky_numbers"],
+        )
+        draw_numbers = set(map(int, lottery_result.winning_numbers.split(",")))
+        draw_stars = set(map(int, lottery_result.winning_lucky_numbers.split(",")))
+
+        compact_ticket_index(lottery.id, db)
+        entry_count = db.session.query(Entry).filter_by(lottery_id=lottery.id).count()
+        _checkpoint(job, db, stage=JobStage.FETCHED.value, entry_count=entry_count)
+
+        formatted_results = []
+        if entry_count:
+            ranking_results = rank_lottery_entries(
+                lottery.id, draw_numbers, draw_stars, db
+            )
+            formatted_results = format_ranking_results(
+                ranking_results, lottery.reward_price, db
+            )
+        _checkpoint(
+            job, db, stage=JobStage.SCORED.value, winner_count=len(formatted_results)
+        )
+
+        db.session.add(lottery_result)
+        if lottery.status == Status.EN_VALIDATION.value:
+            lottery.status = Status.TERMINE.value
+        elif lottery.status == Status.SIMULATION.value:
+            lottery.status = Status.SIMULATION_TERMINE.value
+        db.session.flush()
+        persisted = save_lottery_rankings(lottery_result.id, formatted_results, db)
+        _checkpoint(job, db, stage=JobStage.PERSISTED.value, persisted_count=persisted)
+        delete_reward_pdfs(lottery.id)
+        discard_live_board(lottery.id)
+
+    elif job.stage not in [JobStage.PERSISTED.value, JobStage.NOTIFIED.value]:
+        persisted = (
+            db.session.query(LotteryRanking)
+            .filter_by(lottery_result_id=lottery_result.id)
+            .count()
+        )
+        _checkpoint(
+            job,
+            db,
+            stage=JobStage.PERSISTED.value,
+            winner_count=persisted,
+            persisted_count=persisted,
+        )
+
+    warm_leaderboard_cache(lottery_result.id, db)
+    if Config.PDF_PRERENDER:
+        prerender_reward_pdfs(lottery, lottery_result.id, db)
+
+    winners = (
+        db.session.query(User)
+        .options(joinedload(User.role))
+        .join(LotteryRanking, LotteryRanking.player_id == User.id)
+        .filter(LotteryRanking.lottery_result_id == lottery_result.id)
+        .order_by(LotteryRanking.rank, LotteryRanking.id)
+        .offset(job.notified_count)
+        .all()
+    )
+    receivers = [user.email for user in winners if user.role_name == Roles.USER.value]
+    window = Config.RESULTS_NOTIFICATION_WINDOW
+    start = datetime.utcnow()
+    for receiver, offset in zip(receivers, stagger_offsets(len(receivers), window)):
+        enqueue_email(
+            "results_available",
+            results_available_message(receiver, lottery.name),
+            receiver,
+            db,
+            available_at=start + timedelta(seconds=offset),
+        )
+
+    payload = json.loads(job.payload)
+    payload["notification"] = {
+        "emails": len(receivers),
+        "starts_at": start.isoformat(),
+        "window_seconds": window,
+        "expected_per_minute": (
+            round(len(receivers) * 60 / window, 2) if window > 0 else None
+        ),
+    }
+    _checkpoint(
+        job,
+        db,
+        stage=JobStage.NOTIFIED.value,
+        status=JobStatus.DONE.value,
+        payload=json.dumps(payload),
+        notified_count=job.notified_count + len(winners),
+        finished_at=datetime.utcnow(),
+    )
+
+
+def create_announcement_job(lottery_id, db):
+    """
+    Crée la tâche d'annonce d'un nouveau tirage aux utilisateurs, dans la transaction
+    en cours.
+
+    La tâche est enregistrée avec le tirage lors du `commit` de l'appelant, puis
+    confiée à `submit_job`.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage annoncé.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        Job: La tâche ajoutée à la session.
+
+    Example:
+        job = create_announcement_job(lottery.id, db)
+        db.session.commit()
+        submit_job(job.id, db)
+    """
+    job = Job(
+        kind=ANNOUNCE_LOTTERY,
+        lottery_id=lottery_id,
+        payload=json.dumps({"last_user_id": 0}),
+    )
+    db.session.add(job)
+    return job
+
+
+def run_announcement_job(job, db):
+    """
+    Annonce un nouveau tirage aux utilisateurs ayant activé les notifications.
+
+    Le message est composé une seule fois. Les destinataires sont lus par blocs de
+    `Config.ANNOUNCEMENT_CHUNK_SIZE`, par identifiant croissant à partir du dernier
+    identifiant traité (pagination par clé, sans `OFFSET`), et chaque bloc est placé
+    dans la file d'envoi comme un seul email en copie cachée. Le dernier identifiant
+    traité est enregistré dans la même transaction que l'email du bloc : une tâche
+    reprise après un arrêt repart du bloc suivant sans annoncer deux fois le tirage
+    au même utilisateur.
+
+    Args:
+        job (Job): La tâche réservée par `claim_job`.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+    """
+    message = new_tirage_message(Config.MAIL_APP)
+    last_user_id = json.loads(job.payload).get("last_user_id", 0)
+
+    while True:
+        recipients = db.session.execute(
+            select(User.id, User._email)
+            .join(Role, Role.id == User._role_id)
+            .where(
+                Role.role_name == Roles.USER.value,
+                User._notification.is_(True),
+                User.id > last_user_id,
+            )
+            .order_by(User.id)
+            .limit(Config.ANNOUNCEMENT_CHUNK_SIZE)
+        ).all()
+        if not recipients:
+            break
+
+        enqueue_email("new_tirage", message, [email for _, email in recipients], db)
+        last_user_id = recipients[-1].id
+        _checkpoint(
+            job,
+            db,
+            payload=json.dumps({"last_user_id": last_user_id}),
+            notified_count=job.notified_count + len(recipients),
+        )
+
+    _checkpoint(
+        job,
+        db,
+        stage=JobStage.NOTIFIED.value,
+        status=JobStatus.DONE.value,
+        finished_at=datetime.utcnow(),
+    )
+
+
+# Dictionnaire `JOB_RUNNERS` :
+#     Fonction d'exécution de chaque type de tâche de fond.
+JOB_RUNNERS = {
+    VALIDATE_LOTTERY: run_validation_job,
+    ANNOUNCE_LOTTERY: run_announcement_job,
+}
+
+
+def run_job(job_id, db):
+    """
+    Réserve et exécute une tâche de fond dans le processus courant.
+
+    Une erreur annule la transaction en cours et marque la tâche en échec, avec son
+    message ; l'avancement déjà enregistré est conservé pour une reprise.
+
+    Args:
+        job_id (int): L'identifiant de la tâche.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        bool: `True` si la tâche a été réservée et exécutée, `False` si elle est déjà
+        terminée ou prise en charge par un autre processus.
+
+    Example:
+        run_job(job.id, db)
+    """
+    if not claim_job(job_id, db):
+        return False
+
+    job = db.session.get(Job, job_id)
+    try:
+        JOB_RUNNERS[job.kind](job, db)
+    except Exception as e:
+        db.session.rollback()
+        _checkpoint(
+            job,
+            db,
+            status=JobStatus.FAILED.value,
+            error=str(e),
+            finished_at=datetime.utcnow(),
+        )
+    return True
+
+
+def _run_in_app(app, job_id, db):
+    """
+    Exécute une tâche dans un thread de l'exécuteur, avec son propre contexte
+    d'application et donc sa propre session.
+    """
+    try:
+        with app.app_context():
+            run_job(job_id, db)
+    finally:
+        with _lock:
+            _submitted.discard(job_id)
+
+
+def submit_job(job_id, db):
+    """
+    Confie une tâche à l'exécuteur de fond du processus courant.
+
+    Une tâche déjà confiée et non terminée n'est pas soumise une seconde fois.
+    L'exécuteur (`Config.JOB_WORKERS` threads) est créé à la première soumission ;
+    les tâches en attente ou abandonnées (`pending_job_ids`), laissées par un
+    processus arrêté, lui sont alors confiées aussi.
+
+    Args:
+        job_id (int): L'identifiant de la tâche.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        bool: `True` si la tâche a été soumise.
+    """
+    global _executor
+    app = current_app._get_current_object()
+
+    with _lock:
+        if job_id in _submitted:
+            return False
+        _submitted.add(job_id)
+        starting = _executor is None
+        if starting:
+            _executor = ThreadPoolExecutor(
+                max_workers=Config.JOB_WORKERS, thread_name_prefix="job"
+            )
+
+    _executor.submit(_run_in_app, app, job_id, db)
+    if starting:
+        for pending_id in pending_job_ids(db):
+            submit_job(pending_id, db)
+    return True
+
+
+def pending_job_ids(db):
+    """
+    Retourne les tâches à exécuter : en attente, ou en cours sans signe de vie depuis
+    `Config.JOB_STALE_SECONDS` secondes.
+
+    Args:
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        list: Les identifiants des tâches, par ordre de création.
+    """
+    stale = datetime.utcnow() - timedelta(seconds=Config.JOB_STALE_SECONDS)
+    return [
+        job_id
+        for (job_id,) in db.session.query(Job.id)
+        .filter(
+            or_(
+                Job.status == JobStatus.PENDING.value,
+                and_(Job.status == JobStatus.RUNNING.value, Job.updated_at < stale),
+            )
+        )
+        .order_by(Job.id)
+    ]
+
+
+def resume_job(job, db):
+    """
+    Soumet à nouveau une tâche en attente ou abandonnée par son processus.
+
+    Appelée lors du suivi d'une tâche : une tâche créée par un processus arrêté depuis
+    est reprise par le processus qui répond.
+
+    Args:
+        job (Job): La tâche suivie.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        bool: `True` si la tâche a été soumise.
+    """
+    stale = datetime.utcnow() - timedelta(seconds=Config.JOB_STALE_SECONDS)
+    if job.status == JobStatus.PENDING.value or (
+        job.status == JobStatus.RUNNING.value and job.updated_at < stale
+    ):
+        return submit_job(job.id, db)
+    return False
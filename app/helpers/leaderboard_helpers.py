@@ -0,0 +1,168 @@
+import threading
+from collections import OrderedDict
+from sqlalchemy import literal, select
+from app import Config
+from app.models import LotteryRanking, User
+
+# Nom affiché pour un joueur classé dont le compte n'existe plus.
+UNKNOWN_PLAYER_NAME = "Inconnu"
+
+# Classements publiés déjà chargés par ce processus, du moins au plus récemment lu.
+_leaderboards = OrderedDict()
+_leaderboards_lock = threading.Lock()
+
+
+def _full_name():
+    """
+    Expression SQL du nom complet d'un joueur, identique à `User.full_name`.
+    """
+    return (User._first_name + literal(" ") + User._last_name).label("name")
+
+
+def load_player_names(player_ids, db):
+    """
+    Charge en une seule requête le nom complet de plusieurs joueurs.
+
+    Seuls l'identifiant et le nom sont lus, sans charger d'objet `User`.
+
+    Args:
+        player_ids (iterable): Les identifiants des joueurs.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        dict: Un dictionnaire associant l'identifiant de chaque joueur trouvé à son
+        nom complet.
+
+    Example:
+        names = load_player_names([4, 8], db)
+        names[4]  # "John Doe"
+    """
+    player_ids = list(set(player_ids))
+    if not player_ids:
+        return {}
+    return dict(
+        db.session.execute(
+            select(User.id, _full_name()).where(User.id.in_(player_ids))
+        ).all()
+    )
+
+
+def load_leaderboard(lottery_result_id, db):
+    """
+    Charge le classement d'un tirage avec le nom de chaque joueur, en une seule requête.
+
+    Les lignes de classement sont jointes aux joueurs (jointure externe, un joueur
+    supprimé apparaissant sous `UNKNOWN_PLAYER_NAME`) et seules les colonnes affichées
+    sont lues. Le nombre de requêtes ne dépend pas du nombre de gagnants.
+
+    Args:
+        lottery_result_id (int): L'identifiant du résultat du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        list: Les lignes du classement, triées par rang, sous forme de dictionnaires
+        contenant `player_id`, `name`, `rank`, `score` et `winnings`.
+
+    Example:
+        leaderboard = load_leaderboard(lottery_result.id, db)
+        LotteryWinerSchema(many=True).dump(leaderboard)
+    """
+    rows = db.session.execute(
+        select(
+            LotteryRanking.player_id,
+            _full_name(),
+            LotteryRanking.rank,
+            LotteryRanking.score,
+            LotteryRanking.winnings,
+        )
+        .outerjoin(User, User.id == LotteryRanking.player_id)
+        .where(LotteryRanking.lottery_result_id == lottery_result_id)
+        .order_by(LotteryRanking.rank, LotteryRanking.id)
+    ).all()
+
+    return [
+        {
+            "player_id": row.player_id,
+            "name": row.name if row.name is not None else UNKNOWN_PLAYER_NAME,
+            "rank": row.rank,
+            "score": row.score,
+            "winnings": row.winnings,
+        }
+        for row in rows
+    ]
+
+
+def _store_leaderboard(lottery_result_id, leaderboard):
+    """
+    Garde un classement en cache, en retirant les moins récemment lus au-delà de
+    `Config.LEADERBOARD_CACHE_SIZE` classements.
+    """
+    with _leaderboards_lock:
+        _leaderboards[lottery_result_id] = leaderboard
+        _leaderboards.move_to_end(lottery_result_id)
+        while len(_leaderboards) > Config.LEADERBOARD_CACHE_SIZE:
+            _leaderboards.popitem(last=False)
+
+
+def cached_leaderboard(lottery_result_id, db):
+    """
+    Retourne le classement d'un tirage, depuis le cache du processus si possible.
+
+    Un classement publié ne change plus : il est chargé une fois par
+    `load_leaderboard` puis servi depuis la mémoire. Les lignes retournées sont
+    partagées entre les appels et ne doivent pas être modifiées.
+
+    Args:
+        lottery_result_id (int): L'identifiant du résultat du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        list: Les lignes du classement, comme `load_leaderboard`.
+
+    Example:
+        leaderboard = cached_leaderboard(lottery_result.id, db)
+    """
+    with _leaderboards_lock:
+        if lottery_result_id in _leaderboards:
+            _leaderboards.move_to_end(lottery_result_id)
+            return _leaderboards[lottery_result_id]
+    leaderboard = load_leaderboard(lottery_result_id, db)
+    _store_leaderboard(lottery_result_id, leaderboard)
+    return leaderboard
+
+
+def warm_leaderboard_cache(lottery_result_id, db):
+    """
+    Charge le classement d'un tirage dans le cache du processus.
+
+    Appelée après l'enregistrement des résultats, avant l'envoi des premiers
+    emails, pour que les premières consultations du classement ne touchent pas la
+    base de données. Seul le cache du processus appelant est chargé : avec
+    plusieurs processus serveur, chacun des autres lit le classement dans la base
+    à sa première consultation (`cached_leaderboard`), une seule fois.
+
+    Args:
+        lottery_result_id (int): L'identifiant du résultat du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        int: Le nombre de lignes du classement.
+    """
+    leaderboard = load_leaderboard(lottery_result_id, db)
+    _store_leaderboard(lottery_result_id, leaderboard)
+    return len(leaderboard)
+
+
+def invalidate_leaderboard_cache(lottery_result_id=None):
+    """
+    Retire un classement du cache du processus, ou tous les classements.
+
+    Args:
+        lottery_result_id (int, optional): L'identifiant du résultat du tirage. Par
+            défaut tout le cache est vidé.
+    """
+    with _leaderboards_lock:
+        if lottery_result_id is None:
+            _leaderboards.clear()
+        else:
+            _leaderboards.pop(lottery_result_id, None)
@@ -0,0 +1,229 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from marshmallow import ValidationError
+from sqlalchemy import func
+from app import Config
+from app.models import LiveDraw, Lottery, TicketIndex
+from app.tools import LiveLeaderboard, PostingKind, Status
+from app.tools.live_tools import LIVE_DRAW_NUMBER_COUNT, LIVE_DRAW_STAR_COUNT
+from app.helpers.index_helpers import posting_entry_ids, ensure_ticket_index
+from app.helpers.snapshot_helpers import lottery_ticket_columns
+
+# Classements provisoires des tirages en direct de ce processus, par loterie, avec la
+# signature des tickets à partir desquels ils ont été construits, du moins au plus
+# récemment lu. Ils sont resynchronisés avec la table `live_draws` à chaque lecture.
+_live_boards = OrderedDict()
+_live_boards_lock = threading.Lock()
+
+
+def _parse_numbers(value):
+    """
+    Convertit une chaîne de numéros séparés par des virgules en liste d'entiers.
+    """
+    return [int(number) for number in (value or "").split(",") if number]
+
+
+def _tickets_signature(lottery_id, db):
+    """
+    Retourne une signature des tickets d'une loterie, lue dans les 9 listes des numéros
+    chance de l'index : elle change dès qu'un ticket est ajouté ou retiré.
+    """
+    return tuple(
+        db.session.query(
+            func.coalesce(func.sum(TicketIndex.entry_count), 0),
+            func.coalesce(func.max(TicketIndex.last_entry_id), 0),
+        )
+        .filter(
+            TicketIndex.lottery_id == lottery_id,
+            TicketIndex.kind == PostingKind.LUCKY.value,
+        )
+        .one()
+    )
+
+
+def _build_live_board(lottery_id, db):
+    """
+    Construit le classement provisoire, sans numéro dévoilé, des tickets d'une loterie.
+    """
+    columns = lottery_ticket_columns(lottery_id, db)
+    return LiveLeaderboard(
+        columns["entry_ids"],
+        columns["user_ids"],
+        np.bitwise_count(columns["number_masks"]),
+        np.bitwise_count(columns["star_masks"]),
+    )
+
+
+def get_live_leaderboard(lottery_id, db):
+    """
+    Retourne le classement provisoire d'un tirage en direct.
+
+    Le classement de ce processus est réutilisé et seuls les numéros dévoilés depuis
+    sa dernière lecture lui sont appliqués, à partir des listes de l'index inversé.
+    Il n'est reconstruit que s'il n'existe pas encore, si les tickets ont changé
+    depuis sa construction, ou s'il ne correspond plus aux numéros enregistrés
+    (tirage réinitialisé, dévoilement annulé). L'index inversé est construit au
+    premier numéro dévoilé (`reveal_live_number`), jamais lors d'une lecture.
+
+    Les classements sont gardés dans la limite de `Config.LIVE_BOARD_CACHE_SIZE`
+    tirages, en retirant les moins récemment lus ; celui d'un tirage validé n'est
+    plus gardé.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        LiveLeaderboard: Le classement provisoire, à jour des numéros dévoilés.
+
+    Example:
+        board = get_live_leaderboard(1, db)
+        board.leaderboard()
+    """
+    live_draw = (
+        db.session.query(LiveDraw).filter_by(lottery_id=lottery_id).one_or_none()
+    )
+    numbers = _parse_numbers(live_draw.numbers if live_draw else "")
+    lucky_numbers = _parse_numbers(live_draw.lucky_numbers if live_draw else "")
+
+    signature = _tickets_signature(lottery_id, db)
+    with _live_boards_lock:
+        cached_signature, board = _live_boards.get(lottery_id, (None, None))
+    if (
+        board is None
+        or cached_signature != signature
+        or board.numbers != numbers[: len(board.numbers)]
+        or board.lucky_numbers != lucky_numbers[: len(board.lucky_numbers)]
+    ):
+        board = _build_live_board(lottery_id, db)
+
+    for number in numbers[len(board.numbers) :]:
+        board.reveal_number(
+            number,
+            posting_entry_ids(lottery_id, PostingKind.NUMBER.value, number, db),
+        )
+    for number in lucky_numbers[len(board.lucky_numbers) :]:
+        board.reveal_lucky_number(
+            number,
+            posting_entry_ids(lottery_id, PostingKind.LUCKY.value, number, db),
+        )
+
+    lottery = db.session.get(Lottery, lottery_id)
+    with _live_boards_lock:
+        if lottery is None or lottery.status not in [
+            Status.EN_VALIDATION.value,
+            Status.SIMULATION.value,
+        ]:
+            _live_boards.pop(lottery_id, None)
+            return board
+        _live_boards[lottery_id] = (signature, board)
+        _live_boards.move_to_end(lottery_id)
+        while len(_live_boards) > Config.LIVE_BOARD_CACHE_SIZE:
+            _live_boards.popitem(last=False)
+    return board
+
+
+def discard_live_board(lottery_id):
+    """
+    Retire de ce processus le classement provisoire d'un tirage en direct.
+
+    Appelée lorsque le tirage est validé ou supprimé : son classement provisoire ne
+    sera plus lu.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+    """
+    with _live_boards_lock:
+        _live_boards.pop(lottery_id, None)
+
+
+def reveal_live_number(lottery_id, number, lucky, db):
+    """
+    Dévoile un numéro d'un tirage en direct et met à jour son classement provisoire.
+
+    La ligne du tirage en direct est verrouillée (`SELECT ... FOR UPDATE`) le temps
+    d'ajouter le numéro ; la validation de la transaction reste à la charge de
+    l'appelant. Au premier numéro, l'index inversé des tickets est construit s'il
+    n'existe pas encore (`ensure_ticket_index`).
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        number (int): Le numéro dévoilé.
+        lucky (bool): `True` s'il s'agit d'un numéro chance.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        LiveLeaderboard: Le classement provisoire après ce numéro.
+
+    Raises:
+        ValidationError: Si le numéro est hors limites, déjà dévoilé, ou si tous les
+            numéros de ce type ont déjà été dévoilés.
+
+    Example:
+        board = reveal_live_number(1, 7, False, db)
+        db.session.commit()
+    """
+    live_draw = (
+        db.session.query(LiveDraw)
+        .filter_by(lottery_id=lottery_id)
+        .with_for_update()
+        .one_or_none()
+    )
+    if live_draw is None:
+        ensure_ticket_index(lottery_id, db)
+        live_draw = LiveDraw(lottery_id=lottery_id, numbers="", lucky_numbers="")
+        db.session.add(live_draw)
+
+    if lucky:
+        revealed = _parse_numbers(live_draw.lucky_numbers)
+        maximum, count = 9, LIVE_DRAW_STAR_COUNT
+        label = "numéros chance"
+    else:
+        revealed = _parse_numbers(live_draw.numbers)
+        maximum, count = 49, LIVE_DRAW_NUMBER_COUNT
+        label = "numéros"
+
+    if not 1 <= number <= maximum:
+        raise ValidationError(
+            {"number": [f"Les {label} doivent être entre 1 et {maximum}."]}
+        )
+    if number in revealed:
+        raise ValidationError({"number": ["Ce numéro a déjà été dévoilé."]})
+    if len(revealed) >= count:
+        raise ValidationError(
+            {"number": [f"Les {count} {label} ont déjà été dévoilés."]}
+        )
+
+    revealed.append(number)
+    if lucky:
+        live_draw.lucky_numbers = ",".join(map(str, revealed))
+    else:
+        live_draw.numbers = ",".join(map(str, revealed))
+    db.session.flush()
+
+    return get_live_leaderboard(lottery_id, db)
+
+
+def get_live_draw_numbers(lottery_id, db):
+    """
+    Retourne les numéros d'un tirage en direct dont tous les numéros sont dévoilés.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        tuple: `(numéros, numéros chance)` sous forme de chaînes séparées par des
+        virgules, ou `None` si le tirage en direct n'est pas complet.
+    """
+    live_draw = (
+        db.session.query(LiveDraw).filter_by(lottery_id=lottery_id).one_or_none()
+    )
+    if (
+        live_draw is None
+        or len(_parse_numbers(live_draw.numbers)) != LIVE_DRAW_NUMBER_COUNT
+        or len(_parse_numbers(live_draw.lucky_numbers)) != LIVE_DRAW_STAR_COUNT
+    ):
+        return None
+    return live_draw.numbers, live_draw.lucky_numbers
@@ -1,12 +1,239 @@
 import random
-from app.schemas import LotteryWinerSchema
-from app.tools import distribute_remainder, compute_gain, structure_scores
-from app.models import User
+from app import Config
+from app.schemas import LotteryWinerSchema, LotteryRankingSchema
+from sqlalchemy import and_, insert, select
+from app.tools import (
+    distribute_remainder,
+    compute_gain,
+    get_scoring_engine,
+    ticket_score,
+    mask_to_numbers,
+)
+from app.models import Entry, LotteryResult, LotteryRanking
+from app.helpers.leaderboard_helpers import load_player_names
+from app.helpers.scoring_helpers import LOTTERY_SCORING_ENGINES
 from faker import Faker
 
 fake = Faker()
 
 
+def rank_lottery_entries(lottery_id, draw_numbers, draw_stars, db, engine=None):
+    """
+    Calcule le classement des inscriptions d'un tirage avec le moteur configuré.
+
+    Le moteur "sql" calcule les scores et le classement dans la base de données et
+    ne renvoie que les joueurs classés, le moteur "stream" parcourt les inscriptions
+    par blocs à mémoire constante, le moteur "parallel" répartit les inscriptions
+    sur plusieurs processus, le moteur "index" lit l'index inversé des numéros et le
+    moteur "snapshot" l'instantané en colonnes des tickets. Les autres moteurs chargent
+    les inscriptions du tirage, triées par identifiant, et les classent dans
+    l'application.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        draw_numbers (iterable): Numéros gagnants du tirage.
+        draw_stars (iterable): Numéros chance gagnants du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        engine (str, optional): Le nom du moteur. Par défaut `Config.SCORING_ENGINE`.
+
+    Returns:
+        dict: Le classement au format `{rang: [identifiants, score]}`.
+
+    Raises:
+        ValueError: Si le moteur demandé n'existe pas.
+
+    Example:
+        ranking = rank_lottery_entries(1, [5, 12, 23, 34, 45], [2, 7], db)
+    """
+    engine = engine or Config.SCORING_ENGINE
+
+    if engine in LOTTERY_SCORING_ENGINES:
+        structure_scores = LOTTERY_SCORING_ENGINES[engine]
+        return structure_scores(lottery_id, draw_numbers, draw_stars, db)
+
+    structure_scores = get_scoring_engine(engine)
+    participants = (
+        db.session.query(Entry)
+        .filter_by(lottery_id=lottery_id)
+        .order_by(Entry.id)
+        .all()
+    )
+    return structure_scores(participants, draw_numbers, draw_stars)
+
+
+def format_ranking_results(ranking_results, reward_price, db):
+    """
+    Calcule les gains d'un classement et le met en forme pour chaque joueur.
+
+    Les noms des joueurs classés sont chargés en une seule requête (`load_player_names`).
+
+    Args:
+        ranking_results (dict): Le classement au format `{rang: [identifiants, score]}`.
+        reward_price (float): Montant total des récompenses à distribuer.
+        db (SQLAlchemy Session): Session de la base de données pour les requêtes.
+
+    Returns:
+        list: Une liste de dictionnaires contenant `player_id`, `rank`, `name`,
+        `score` et `winnings` pour chaque joueur classé.
+
+    Raises:
+        Exception: Lève une exception si un joueur classé est introuvable.
+
+    Example:
+        results = format_ranking_results({1: [[4], 80]}, 1000, db)
+    """
+    player_winnings, total_sum, remainder = compute_gain(ranking_results, reward_price)
+
+    if remainder > 0:
+        distribute_remainder(player_winnings, remainder)
+
+    formatted_results = []
+
+    schema = LotteryWinerSchema(many=True)
+    names = load_player_names(
+        (
+            player_id
+            for players_ids, _ in ranking_results.values()
+            for player_id in players_ids
+        ),
+        db,
+    )
+
+    for rank, (players_ids, score) in ranking_results.items():
+        for player_id in players_ids:
+            winnings = player_winnings.get(player_id, 0)
+
+            if player_id not in names:
+                raise Exception(
+                    "Une erreur est survenue lors de la récupération de l'utilisateur"
+                )
+
+            formatted_results.append(
+                {
+                    "player_id": player_id,
+                    "rank": rank,
+                    "name": names[player_id],
+                    "score": score,
+                    "winnings": winnings,
+                }
+            )
+
+    return schema.dump(formatted_results)
+
+
+def save_lottery_rankings(lottery_result_id, formatted_results, db):
+    """
+    Enregistre en une seule fois le classement d'un tirage.
+
+    Toutes les lignes sont validées ensemble par `LotteryRankingSchema(many=True)`,
+    puis insérées par une seule instruction `INSERT` exécutée en lot (`executemany`),
+    sans créer d'objet `LotteryRanking`. La validation de la transaction reste à la
+    charge de l'appelant : le classement n'est visible qu'avec le résultat du tirage.
+
+    Args:
+        lottery_result_id (int): L'identifiant du résultat du tirage.
+        formatted_results (list): Les résultats de `format_ranking_results`.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        int: Le nombre de lignes insérées.
+
+    Raises:
+        ValidationError: Si une ligne du classement est invalide ; rien n'est inséré.
+
+    Example:
+        save_lottery_rankings(lottery_result.id, formatted_results, db)
+        db.session.commit()
+    """
+    rows = LotteryRankingSchema(many=True).load(
+        [
+            {
+                "lottery_result_id": lottery_result_id,
+                "player_id": result["player_id"],
+                "rank": result["rank"],
+                "score": result["score"],
+                "winnings": result["winnings"],
+            }
+            for result in formatted_results
+        ]
+    )
+    if rows:
+        db.session.execute(insert(LotteryRanking), rows)
+    return len(rows)
+
+
+def get_ticket_result(lottery_id, user_id, db):
+    """
+    Retourne le résultat du ticket d'un joueur pour un tirage publié.
+
+    Le score est calculé à partir des masques de l'inscription du joueur et du
+    résultat du tirage (`ticket_score`), sans parcourir les autres tickets. Le
+    résultat du tirage et la ligne de classement du joueur sont lus en une seule
+    requête indexée ; les deux requêtes ne dépendent pas de la taille du classement.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        user_id (int): L'identifiant du joueur.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        dict: Les numéros du ticket et du tirage, les numéros trouvés, le score, le
+        rang (`None` si le joueur n'est pas classé) et les gains du joueur, ou `None`
+        si le joueur n'a pas participé au tirage ou si ses résultats ne sont pas
+        encore publiés.
+
+    Example:
+        result = get_ticket_result(1, 4, db)
+        result["score"], result["rank"], result["winnings"]
+    """
+    entry = (
+        db.session.query(Entry)
+        .filter_by(user_id=user_id, lottery_id=lottery_id)
+        .one_or_none()
+    )
+    if entry is None:
+        return None
+
+    row = db.session.execute(
+        select(LotteryResult, LotteryRanking.rank, LotteryRanking.winnings)
+        .outerjoin(
+            LotteryRanking,
+            and_(
+                LotteryRanking.lottery_result_id == LotteryResult.id,
+                LotteryRanking.player_id == user_id,
+            ),
+        )
+        .where(LotteryResult.lottery_id == lottery_id)
+    ).first()
+    if row is None:
+        return None
+
+    lottery_result, rank, winnings = row
+    matched_mask = entry.numbers_mask & lottery_result.winning_numbers_mask
+    matched_stars_mask = (
+        entry.lucky_numbers_mask & lottery_result.winning_lucky_numbers_mask
+    )
+
+    return {
+        "numbers": mask_to_numbers(entry.numbers_mask),
+        "lucky_numbers": mask_to_numbers(entry.lucky_numbers_mask),
+        "winning_numbers": mask_to_numbers(lottery_result.winning_numbers_mask),
+        "winning_lucky_numbers": mask_to_numbers(
+            lottery_result.winning_lucky_numbers_mask
+        ),
+        "matched_numbers": mask_to_numbers(matched_mask),
+        "matched_lucky_numbers": mask_to_numbers(matched_stars_mask),
+        "score": ticket_score(
+            lottery_result.winning_numbers_mask,
+            lottery_result.winning_lucky_numbers_mask,
+            entry.numbers_mask,
+            entry.lucky_numbers_mask,
+        ),
+        "rank": rank,
+        "winnings": winnings or 0,
+    }
+
+
 def get_formatted_results(participants, draw_numbers, draw_stars, reward_price, db):
     """
     Génére les résultats formatés des participants à un tirage de loterie.
@@ -15,6 +242,7 @@ def get_formatted_results(participants, draw_numbers, draw_stars, reward_price,
     participants, en calculant les gains et en formatant les résultats pour chaque
     joueur. Les résultats sont retournés sous forme de liste de dictionnaires
     contenant les informations des joueurs, leur rang, leur score et leurs gains.
+    Le moteur de calcul des scores est choisi par `Config.SCORING_ENGINE`.
 
     Args:
         participants (list): Liste des participants au tirage.
@@ -40,43 +268,10 @@ def get_formatted_results(participants, draw_numbers, draw_stars, reward_price,
         results = get_formatted_results(participants, draw_numbers, draw_stars, reward_price, db)
     """
     try:
+        structure_scores = get_scoring_engine()
         ranking_results = structure_scores(participants, draw_numbers, draw_stars)
 
-        player_winnings, total_sum, remainder = compute_gain(
-            ranking_results, reward_price
-        )
-
-        if remainder > 0:
-            distribute_remainder(player_winnings, remainder)
-
-        formatted_results = []
-
-        schema = LotteryWinerSchema(many=True)
-
-        for rank, (players_ids, score) in ranking_results.items():
-            for player_id in players_ids:
-                winnings = player_winnings.get(player_id, 0)
-
-                user = db.session.query(User).filter_by(id=player_id).one_or_none()
-                if user is None:
-                    raise Exception(
-                        "Une erreur est survenue lors de la récupération de l'utilisateur"
-                    )
-                score = score
-
-                formatted_results.append(
-                    {
-                        "player_id": player_id,
-                        "rank": rank,
-                        "name": user.full_name,
-                        "score": score,
-                        "winnings": winnings,
-                    }
-                )
-
-        validated_results = schema.dump(formatted_results)
-
-        return validated_results
+        return format_ranking_results(ranking_results, reward_price, db)
     except Exception as e:
         raise Exception(str(e))
 
@@ -111,13 +306,17 @@ def generate_random_user():
     return fake_name, fake_email, numbers, lucky_numbers
 
 
-def generate_wining_numbers():
+def generate_wining_numbers(rng=random):
     """
     Génère des numéros de loterie gagnants.
 
     Cette fonction tire au sort 5 numéros distincts parmi les nombres allant de
     1 à 49, représentant les numéros gagnants d'un tirage de loterie.
 
+    Args:
+        rng (random.Random, optional): Le générateur aléatoire à utiliser. Par défaut
+            le générateur global du module `random`.
+
     Returns:
         list: Une liste de 5 entiers uniques représentant les numéros gagnants
         de la loterie, triés dans l'ordre croissant.
@@ -126,16 +325,20 @@ def generate_wining_numbers():
         winning_numbers = generate_winning_numbers()
         print(winning_numbers)  # [3, 12, 25, 34, 47]
     """
-    return random.sample(range(1, 50), 5)
+    return rng.sample(range(1, 50), 5)
 
 
-def generate_luck_numbers():
+def generate_luck_numbers(rng=random):
     """
     Génère des numéros chance pour la loterie.
 
     Cette fonction tire au sort 2 numéros distincts parmi les nombres allant de
     1 à 9, représentant les numéros chance d'un tirage de loterie.
 
+    Args:
+        rng (random.Random, optional): Le générateur aléatoire à utiliser. Par défaut
+            le générateur global du module `random`.
+
     Returns:
         list: Une liste de 2 entiers uniques représentant les numéros chance
         de la loterie.
@@ -144,4 +347,4 @@ def generate_luck_numbers():
         luck_numbers = generate_luck_numbers()
         print(luck_numbers)  # [4, 8]
     """
-    return random.sample(range(1, 10), 2)
+    return rng.sample(range(1, 10), 2)
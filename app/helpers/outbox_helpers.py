@@ -0,0 +1,214 @@
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, select, update
+from app import Config
+from app.models import OutboxEmail
+from app.tools import (
+    OutboxStatus,
+    RateLimiter,
+    SMTPPool,
+    is_permanent_smtp_error,
+    retry_delay,
+)
+
+
+def enqueue_email(kind, message, receiver, db, available_at=None):
+    """
+    Ajoute un email à la file d'envoi, dans la transaction en cours.
+
+    L'email n'est pas validé ici : il est enregistré avec l'opération qui le
+    déclenche, lors du `commit` de l'appelant, et envoyé ensuite par
+    `deliver_outbox_batch`. Une opération annulée n'envoie donc aucun email.
+
+    Args:
+        kind (str): Le type d'email (ex: "new_tirage").
+        message (EmailMessage): Le message à envoyer.
+        receiver (str | list): L'adresse du destinataire, ou la liste des
+            destinataires d'un envoi groupé en copie cachée.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        available_at (datetime, optional): La date d'envoi au plus tôt. Par défaut
+            immédiatement.
+
+    Returns:
+        OutboxEmail: L'email ajouté à la session.
+
+    Example:
+        enqueue_email("contact_us", contact_us_message(email, text), Config.MAIL_APP, db)
+        db.session.commit()
+    """
+    email = OutboxEmail(
+        kind=kind,
+        receiver=receiver if isinstance(receiver, str) else ",".join(receiver),
+        message=message.as_string(),
+        available_at=available_at or datetime.utcnow(),
+    )
+    db.session.add(email)
+    return email
+
+
+def _claimable(now):
+    """
+    Condition des emails pouvant être réservés : en attente et disponibles, ou
+    réservés par un processus dont la réservation a expiré.
+    """
+    return or_(
+        and_(
+            OutboxEmail.status == OutboxStatus.PENDING.value,
+            OutboxEmail.available_at <= now,
+        ),
+        and_(
+            OutboxEmail.status == OutboxStatus.SENDING.value,
+            OutboxEmail.claimed_until < now,
+        ),
+    )
+
+
+def claim_outbox_batch(db, batch_size=None):
+    """
+    Réserve un lot d'emails à envoyer pour le processus courant.
+
+    Les emails sont marqués `SENDING` par une seule instruction `UPDATE`
+    conditionnelle portant un jeton propre à l'appel : deux processus ne peuvent pas
+    réserver le même email. La réservation expire après
+    `Config.OUTBOX_LEASE_SECONDS` secondes, pour qu'un email réservé par un processus
+    arrêté soit repris.
+
+    Args:
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        batch_size (int, optional): La taille maximale du lot. Par défaut
+            `Config.OUTBOX_BATCH_SIZE`.
+
+    Returns:
+        list: Les emails réservés, par date de disponibilité.
+    """
+    now = datetime.utcnow()
+    candidates = select(OutboxEmail.id).where(_claimable(now))
+    candidate_ids = [
+        email_id
+        for (email_id,) in db.session.execute(
+            candidates.order_by(OutboxEmail.available_at, OutboxEmail.id).limit(
+                batch_size or Config.OUTBOX_BATCH_SIZE
+            )
+        )
+    ]
+    if not candidate_ids:
+        return []
+
+    token = uuid.uuid4().hex
+    db.session.execute(
+        update(OutboxEmail)
+        .where(OutboxEmail.id.in_(candidate_ids), _claimable(now))
+        .values(
+            status=OutboxStatus.SENDING.value,
+            claim_token=token,
+            claimed_until=now + timedelta(seconds=Config.OUTBOX_LEASE_SECONDS),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return (
+        db.session.query(OutboxEmail)
+        .filter_by(claim_token=token, status=OutboxStatus.SENDING.value)
+        .order_by(OutboxEmail.available_at, OutboxEmail.id)
+        .all()
+    )
+
+
+def _record_failure(email, error):
+    """
+    Enregistre l'échec d'envoi d'un email : nouvel essai différé, ou mise à l'écart
+    si l'erreur est définitive ou si les tentatives sont épuisées.
+    """
+    email.attempts += 1
+    email.last_error = str(error)
+    email.claim_token = None
+    if is_permanent_smtp_error(error) or email.attempts >= Config.OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxStatus.DEAD.value
+        return OutboxStatus.DEAD
+    email.status = OutboxStatus.PENDING.value
+    email.available_at = datetime.utcnow() + timedelta(
+        seconds=retry_delay(email.attempts, Config.OUTBOX_RETRY_SECONDS)
+    )
+    return OutboxStatus.PENDING
+
+
+def deliver_outbox_batch(db, smtp_pool=None, rate_limiter=None, batch_size=None):
+    """
+    Réserve et envoie un lot d'emails de la file d'envoi.
+
+    Les emails sont envoyés sur une même réserve de connexions SMTP et espacés par
+    `rate_limiter`. Le statut de chaque email est validé dès son envoi : un processus
+    arrêté en cours de lot ne renvoie pas les emails déjà partis. Un email en échec
+    est réessayé après un délai doublé à chaque tentative, et mis à l'écart (`DEAD`)
+    si l'erreur est définitive ou après `Config.OUTBOX_MAX_ATTEMPTS` tentatives.
+
+    Args:
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        smtp_pool (SMTPPool, optional): La réserve de connexions. Par défaut une
+            réserve créée pour le lot à partir de la configuration.
+        rate_limiter (RateLimiter, optional): Le limiteur de débit, partagé entre les
+            lots d'un même processus. Par défaut `Config.OUTBOX_RATE_LIMIT` emails par
+            seconde pour ce lot.
+        batch_size (int, optional): La taille maximale du lot.
+
+    Returns:
+        dict: Le nombre d'emails envoyés (`sent`), à réessayer (`retried`) et mis à
+        l'écart (`dead`).
+
+    Example:
+        deliver_outbox_batch(db)
+    """
+    counts = {"sent": 0, "retried": 0, "dead": 0}
+    emails = claim_outbox_batch(db, batch_size)
+    if not emails:
+        return counts
+
+    rate_limiter = rate_limiter or RateLimiter(Config.OUTBOX_RATE_LIMIT)
+    own_pool = smtp_pool is None
+    smtp_pool = smtp_pool or SMTPPool.from_config(size=1)
+    try:
+        for email in emails:
+            rate_limiter.wait()
+            try:
+                smtp_pool.sendmail(
+                    Config.MAIL_APP, email.receiver.split(","), email.message
+                )
+            except Exception as e:
+                if _record_failure(email, e) == OutboxStatus.DEAD:
+                    counts["dead"] += 1
+                else:
+                    counts["retried"] += 1
+            else:
+                email.status = OutboxStatus.SENT.value
+                email.sent_at = datetime.utcnow()
+                email.claim_token = None
+                counts["sent"] += 1
+            db.session.commit()
+    finally:
+        if own_pool:
+            smtp_pool.close()
+    return counts
+
+
+def requeue_dead_emails(db):
+    """
+    Remet en attente les emails mis à l'écart, pour un nouvel envoi immédiat.
+
+    Args:
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        int: Le nombre d'emails remis en attente.
+    """
+    result = db.session.execute(
+        update(OutboxEmail)
+        .where(OutboxEmail.status == OutboxStatus.DEAD.value)
+        .values(
+            status=OutboxStatus.PENDING.value,
+            attempts=0,
+            available_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,274 @@
+import os
+import shutil
+import threading
+import time
+import unicodedata
+from datetime import datetime, timezone
+from urllib.parse import quote
+from flask import current_app, request, send_file, url_for
+from app import Config
+from app.helpers.leaderboard_helpers import UNKNOWN_PLAYER_NAME, cached_leaderboard
+from app.tools import (
+    get_pdf_backend,
+    reward_pdf_digest,
+    url_signature,
+    check_url_signature,
+    offload_header,
+)
+
+
+def reward_pdf_dir(lottery_id):
+    """
+    Retourne le répertoire des PDF de récompense générés pour un tirage.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+
+    Returns:
+        str: Le chemin du répertoire, dans `Config.PDF_CACHE_DIR`.
+    """
+    return os.path.join(Config.PDF_CACHE_DIR, f"lottery_{lottery_id}")
+
+
+def reward_pdf_path(lottery_id, digest):
+    """
+    Retourne le chemin du PDF de récompense d'empreinte `digest` d'un tirage.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        digest (str): L'empreinte du PDF (voir `reward_pdf_digest`).
+
+    Returns:
+        str: Le chemin du fichier.
+    """
+    return os.path.join(reward_pdf_dir(lottery_id), f"{digest}.pdf")
+
+
+def ensure_reward_pdf(lottery_id, user_name, reward, draw_name):
+    """
+    Retourne le PDF de récompense d'un gagnant, en le générant s'il n'existe pas.
+
+    Le PDF est rendu par le moteur `Config.PDF_BACKEND`. Le fichier est nommé
+    d'après l'empreinte de son contenu : il n'est généré qu'une fois, puis relu tel
+    quel tant que le nom, le montant, le tirage, le modèle et le moteur ne changent
+    pas. Le PDF est écrit dans un fichier temporaire puis renommé : un fichier
+    présent est toujours complet, même si deux requêtes le génèrent en même temps.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        user_name (str): Le nom de l'utilisateur qui a gagné.
+        reward (float): Le montant de la récompense gagnée.
+        draw_name (str): Le nom du tirage.
+
+    Returns:
+        tuple: Le chemin du fichier et son empreinte.
+
+    Raises:
+        TimeoutError: Si trop de PDF sont déjà en cours de génération.
+        RuntimeError: Si la génération du PDF échoue.
+
+    Example:
+        path, digest = ensure_reward_pdf(1, user.full_name, ranking.winnings, lottery.name)
+    """
+    digest = reward_pdf_digest(user_name, reward, draw_name)
+    path = reward_pdf_path(lottery_id, digest)
+    if os.path.exists(path):
+        return path, digest
+
+    os.makedirs(reward_pdf_dir(lottery_id), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    chunks = get_pdf_backend()(user_name, reward, draw_name)
+    try:
+        with open(temporary_path, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temporary_path, path)
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return path, digest
+
+
+def prerender_reward_pdfs(lottery, lottery_result_id, db):
+    """
+    Génère à l'avance le PDF de récompense de chaque gagnant d'un tirage.
+
+    Appelée à la validation d'un tirage, lorsque `Config.PDF_PRERENDER` est activé,
+    pour que le premier téléchargement n'attende pas le rendu. Les PDF déjà présents
+    ne sont pas régénérés. Un échec n'interrompt pas la génération des suivants : le
+    PDF manquant sera généré à sa première demande.
+
+    Args:
+        lottery (Lottery): Le tirage validé.
+        lottery_result_id (int): L'identifiant du résultat du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        int: Le nombre de PDF disponibles pour les gagnants.
+    """
+    available = 0
+    for row in cached_leaderboard(lottery_result_id, db):
+        if row["winnings"] <= 0 or row["name"] == UNKNOWN_PLAYER_NAME:
+            continue
+        try:
+            ensure_reward_pdf(lottery.id, row["name"], row["winnings"], lottery.name)
+        except Exception:
+            continue
+        available += 1
+    return available
+
+
+def delete_reward_pdfs(lottery_id):
+    """
+    Supprime les PDF de récompense générés pour un tirage.
+
+    Appelée lorsque le classement du tirage est supprimé ou recalculé.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+    """
+    shutil.rmtree(reward_pdf_dir(lottery_id), ignore_errors=True)
+
+
+def _attachment_disposition(download_name):
+    """
+    Valeur de l'en-tête `Content-Disposition` d'un téléchargement, avec un nom ASCII
+    de repli et le nom complet encodé en UTF-8, comme `send_file`.
+    """
+    try:
+        download_name.encode("ascii")
+        return f'attachment; filename="{download_name}"'
+    except UnicodeEncodeError:
+        simple = (
+            unicodedata.normalize("NFKD", download_name)
+            .encode("ascii", "ignore")
+            .decode("ascii")
+        )
+        quoted = quote(download_name, safe="!#$&+^`|~")
+        return f"attachment; filename=\"{simple}\"; filename*=UTF-8''{quoted}"
+
+
+def reward_pdf_response(lottery_id, digest, download_name):
+    """
+    Construit la réponse qui livre un PDF de récompense déjà généré.
+
+    Sans `Config.PDF_OFFLOAD_HEADER`, le fichier est envoyé par l'application
+    (`send_file`). Avec "X-Accel-Redirect" ou "X-Sendfile", la réponse est vide et
+    porte l'en-tête de redirection interne : le proxy envoie lui-même le fichier et
+    le processus de l'application est libéré dès la réponse rendue. Dans les deux
+    cas, l'empreinte du PDF sert d'`ETag` et une requête GET portant la même
+    empreinte dans `If-None-Match` reçoit une réponse 304.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        digest (str): L'empreinte du PDF.
+        download_name (str): Le nom du fichier proposé au téléchargement.
+
+    Returns:
+        Response: La réponse Flask.
+
+    Raises:
+        FileNotFoundError: Si le PDF n'existe pas.
+        ValueError: Si `Config.PDF_OFFLOAD_HEADER` n'est pas reconnu.
+    """
+    path = reward_pdf_path(lottery_id, digest)
+    if not os.path.exists(path):
+        raise FileNotFoundError("Ce PDF de récompense n'existe plus.")
+    if not Config.PDF_OFFLOAD_HEADER:
+        response = send_file(
+            path,
+            mimetype="application/pdf",
+            as_attachment=True,
+            download_name=download_name,
+            etag=digest,
+            conditional=True,
+        )
+    else:
+        if Config.PDF_OFFLOAD_HEADER == "X-Sendfile":
+            target = os.path.abspath(path)
+        else:
+            target = os.path.relpath(path, Config.PDF_CACHE_DIR).replace(os.sep, "/")
+        name, value = offload_header(
+            Config.PDF_OFFLOAD_HEADER, target, Config.PDF_ACCEL_PREFIX
+        )
+        response = current_app.response_class(mimetype="application/pdf")
+        response.automatically_set_content_length = False
+        response.headers[name] = value
+        response.headers["Content-Disposition"] = _attachment_disposition(download_name)
+        response.set_etag(digest)
+        response.make_conditional(request)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def _signed_message(lottery_id, digest, download_name):
+    """
+    Message signé d'une URL de téléchargement : le fichier et le nom proposé.
+    """
+    return f"{lottery_id}/{digest}/{download_name}"
+
+
+def _url_secret():
+    """
+    Clé de signature des URL de téléchargement.
+    """
+    return Config.PDF_URL_SECRET or Config.JWT_SECRET_KEY
+
+
+def signed_reward_pdf_url(lottery_id, digest, download_name):
+    """
+    Construit une URL de téléchargement d'un PDF de récompense, signée et valable
+    `Config.PDF_URL_TTL` secondes.
+
+    L'URL ne demande pas de token : la signature vaut autorisation, pour ce fichier
+    et jusqu'à son expiration. Elle est vérifiée par `check_reward_pdf_signature`.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        digest (str): L'empreinte du PDF.
+        download_name (str): Le nom du fichier proposé au téléchargement.
+
+    Returns:
+        tuple: L'URL et sa date d'expiration (datetime UTC).
+
+    Example:
+        url, expires_at = signed_reward_pdf_url(1, digest, "recompense.pdf")
+    """
+    expires = int(time.time()) + Config.PDF_URL_TTL
+    url = url_for(
+        "user.reward_pdf_file",
+        lottery_id=lottery_id,
+        digest=digest,
+        filename=download_name,
+        expires=expires,
+        signature=url_signature(
+            _signed_message(lottery_id, digest, download_name), expires, _url_secret()
+        ),
+        _external=True,
+    )
+    return url, datetime.fromtimestamp(expires, timezone.utc)
+
+
+def check_reward_pdf_signature(lottery_id, digest, download_name, expires, signature):
+    """
+    Vérifie la signature et l'expiration d'une URL de téléchargement.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        digest (str): L'empreinte du PDF.
+        download_name (str): Le nom du fichier proposé au téléchargement.
+        expires (str): La date d'expiration reçue dans l'URL.
+        signature (str): La signature reçue dans l'URL.
+
+    Returns:
+        bool: `True` si l'URL est valide et n'a pas expiré.
+    """
+    return check_url_signature(
+        _signed_message(lottery_id, digest, download_name),
+        expires,
+        signature,
+        _url_secret(),
+    )
@@ -0,0 +1,349 @@
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    Integer,
+    Text,
+    case,
+    cast,
+    create_engine,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.engine import make_url
+from app import Config
+from app.models import Entry
+from app.tools import numbers_to_mask, compute_scores, StreamingRanker
+from app.tools.rank_tools import NUMBER_WEIGHT, STAR_WEIGHT
+from app.helpers.index_helpers import structure_scores_index
+from app.helpers.snapshot_helpers import structure_scores_snapshot
+
+
+def _popcount(expression, width, dialect_name):
+    """
+    Construit l'expression SQL du nombre de bits à 1 d'un masque.
+
+    PostgreSQL compte les "1" de la représentation `BIT(64)` du masque. Pour les autres
+    bases (SQLite), les `width` premiers bits sont additionnés un à un.
+    """
+    if dialect_name == "postgresql":
+        bits = cast(cast(cast(expression, BigInteger), BIT(64)), Text)
+        return func.length(func.replace(bits, "0", ""))
+
+    total = literal(0)
+    for bit in range(width):
+        total = total + expression.op(">>")(bit).op("&")(1)
+    return total
+
+
+def _round_half_even(expression, dialect_name):
+    """
+    Construit l'expression SQL de l'arrondi au pair le plus proche, comme `round`.
+
+    `round(double precision)` de PostgreSQL arrondit déjà au pair le plus proche.
+    Le `ROUND` de SQLite arrondissant les demis vers l'infini, l'arrondi y est
+    reconstruit à partir de la troncature.
+    """
+    if dialect_name == "postgresql":
+        return cast(func.round(expression), Integer)
+
+    truncated = cast(expression, Integer)
+    fraction = expression - truncated
+    return case(
+        (fraction > 0.5, truncated + 1),
+        (fraction < 0.5, truncated),
+        else_=truncated + truncated % 2,
+    )
+
+
+def _jaccard(mask_column, draw_mask, width, dialect_name):
+    """
+    Construit l'expression SQL de la similarité de Jaccard entre un masque et le tirage.
+    """
+    intersection = _popcount(mask_column.op("&")(draw_mask), width, dialect_name)
+    union = _popcount(mask_column.op("|")(draw_mask), width, dialect_name)
+    return case(
+        (union == 0, cast(literal(0), Float)),
+        else_=cast(intersection, Float) / cast(union, Float),
+    )
+
+
+def structure_scores_sql(lottery_id, draw_numbers, draw_stars, db, limit=10):
+    """
+    Calcule le classement d'un tirage directement dans la base de données.
+
+    Les intersections et unions sont calculées sur les masques binaires des inscriptions,
+    puis le score de Jaccard pondéré, le seuil de 10 points et le classement avec
+    ex aequo (`RANK() OVER`) sont évalués par la base. Seuls les joueurs classés sont
+    renvoyés à l'application. Les opérations flottantes et l'arrondi reproduisent
+    `calculate_jaccard_similarity`, le résultat est donc celui de `structure_scores`
+    appliqué aux inscriptions triées par identifiant.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        draw_numbers (iterable): Numéros gagnants du tirage.
+        draw_stars (iterable): Numéros chance gagnants du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+
+    Returns:
+        dict: Le classement au format `{rang: [identifiants, score]}`.
+
+    Example:
+        ranking = structure_scores_sql(1, [5, 12, 23, 34, 45], [2, 7], db)
+    """
+    dialect_name = db.session.get_bind().dialect.name
+    draw_mask = numbers_to_mask(draw_numbers)
+    draw_stars_mask = numbers_to_mask(draw_stars)
+
+    number_similarity = _jaccard(Entry.numbers_mask, draw_mask, 50, dialect_name)
+    star_similarity = _jaccard(
+        Entry.lucky_numbers_mask, draw_stars_mask, 16, dialect_name
+    )
+    similarity = (
+        number_similarity * cast(literal(NUMBER_WEIGHT), Float)
+        + star_similarity * cast(literal(STAR_WEIGHT), Float)
+    ) * cast(literal(100), Float)
+
+    similarities = (
+        db.session.query(
+            Entry.id.label("entry_id"),
+            Entry.user_id.label("user_id"),
+            similarity.label("similarity"),
+        )
+        .filter(Entry.lottery_id == lottery_id)
+        .cte("similarities")
+    )
+
+    scores = db.session.query(
+        similarities.c.entry_id,
+        similarities.c.user_id,
+        _round_half_even(similarities.c.similarity, dialect_name).label("score"),
+    ).cte("scores")
+
+    ranked = (
+        db.session.query(
+            scores.c.entry_id,
+            scores.c.user_id,
+            scores.c.score,
+            func.rank().over(order_by=scores.c.score.desc()).label("rank"),
+        )
+        .filter(scores.c.score >= 10)
+        .cte("ranked")
+    )
+
+    rows = (
+        db.session.query(ranked.c.rank, ranked.c.user_id, ranked.c.score)
+        .filter(ranked.c.rank <= limit)
+        .order_by(ranked.c.rank, ranked.c.entry_id)
+        .all()
+    )
+
+    final_ranking = {}
+    for rank, user_id, score in rows:
+        if rank not in final_ranking:
+            final_ranking[rank] = [[], score]
+        final_ranking[rank][0].append(user_id)
+
+    return final_ranking
+
+
+def structure_scores_stream(lottery_id, draw_numbers, draw_stars, db, chunk_size=None):
+    """
+    Calcule le classement d'un tirage en parcourant ses inscriptions par blocs.
+
+    Les inscriptions sont lues par un curseur côté serveur (`yield_per`), par blocs de
+    `chunk_size` lignes ne contenant que l'identifiant du joueur et les masques. Chaque
+    bloc est noté en une seule opération NumPy, puis seuls les tickets pouvant encore
+    atteindre un rang payé sont transmis au `StreamingRanker`. La mémoire utilisée
+    reste constante quel que soit le nombre de tickets vendus.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        draw_numbers (iterable): Numéros gagnants du tirage.
+        draw_stars (iterable): Numéros chance gagnants du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        chunk_size (int, optional): Le nombre de lignes par bloc. Par défaut
+            `Config.SCORING_CHUNK_SIZE`.
+
+    Returns:
+        dict: Le classement au format `{rang: [identifiants, score]}`, identique à celui
+        de `structure_scores` sur les inscriptions triées par identifiant.
+
+    Example:
+        ranking = structure_scores_stream(1, [5, 12, 23, 34, 45], [2, 7], db, 5000)
+    """
+    chunk_size = chunk_size or Config.SCORING_CHUNK_SIZE
+
+    result = db.session.execute(
+        _ticket_rows_query(lottery_id).execution_options(yield_per=chunk_size)
+    )
+    ranker = _rank_partitions(result.partitions(), draw_numbers, draw_stars)
+
+    return ranker.ranking()
+
+
+def _ticket_rows_query(lottery_id, first_id=None, last_id=None):
+    """
+    Construit la requête des colonnes nécessaires au calcul des scores, triées par id.
+    """
+    query = (
+        select(Entry.user_id, Entry.numbers_mask, Entry.lucky_numbers_mask)
+        .where(Entry.lottery_id == lottery_id)
+        .order_by(Entry.id)
+    )
+    if first_id is not None:
+        query = query.where(Entry.id.between(first_id, last_id))
+    return query
+
+
+def _rank_partitions(partitions, draw_numbers, draw_stars):
+    """
+    Note des blocs de lignes `(user_id, numbers_mask, lucky_numbers_mask)` et retourne
+    le `StreamingRanker` alimenté par les tickets pouvant atteindre un rang payé.
+    """
+    ranker = StreamingRanker()
+
+    for rows in partitions:
+        user_ids, number_masks, star_masks = zip(*rows)
+        scores = compute_scores(
+            np.array(number_masks, dtype=np.uint64),
+            np.array(star_masks, dtype=np.uint16),
+            draw_numbers,
+            draw_stars,
+        )
+
+        for index in np.flatnonzero(scores >= ranker.floor):
+            ranker.add(user_ids[index], int(scores[index]))
+
+    return ranker
+
+
+def _worker_database_url(database_uri):
+    """
+    Complète l'URI sans mot de passe reçue par un processus de travail.
+
+    Le mot de passe n'est pas transmis aux processus : il est relu dans
+    `Config.SQLALCHEMY_DATABASE_URI`, chargée depuis l'environnement par le processus.
+    """
+    url = make_url(database_uri)
+    if url.password is None and Config.SQLALCHEMY_DATABASE_URI:
+        url = url.set(password=make_url(Config.SQLALCHEMY_DATABASE_URI).password)
+    return url
+
+
+def _score_shard(
+    database_uri, lottery_id, first_id, last_id, draw_numbers, draw_stars, chunk_size
+):
+    """
+    Note les inscriptions d'une plage d'identifiants dans un processus de travail.
+
+    Chaque processus ouvre sa propre connexion et retourne les groupes de scores
+    partiels `{score: [identifiants]}` pouvant encore atteindre un rang payé.
+    """
+    engine = create_engine(_worker_database_url(database_uri))
+    try:
+        with engine.connect() as connection:
+            result = connection.execution_options(yield_per=chunk_size).execute(
+                _ticket_rows_query(lottery_id, first_id, last_id)
+            )
+            return _rank_partitions(
+                result.partitions(), draw_numbers, draw_stars
+            ).buckets
+    finally:
+        engine.dispose()
+
+
+def structure_scores_parallel(
+    lottery_id, draw_numbers, draw_stars, db, workers=None, shard_size=None
+):
+    """
+    Calcule le classement d'un tirage en répartissant les inscriptions sur plusieurs processus.
+
+    Les inscriptions du tirage sont découpées en plages d'identifiants de `shard_size`
+    valeurs. Chaque plage est notée par un processus d'un `ProcessPoolExecutor`, qui
+    renvoie ses groupes de scores partiels. Les groupes sont fusionnés dans l'ordre des
+    plages, ce qui conserve l'ordre des ex aequo de `structure_scores`.
+
+    Les processus sont démarrés par "forkserver" (ou "spawn" si la plateforme ne le
+    permet pas) et non par copie du processus appelant, dont les connexions, verrous et
+    threads (exécuteur des tâches de fond) ne doivent pas être hérités. L'URI de la
+    base leur est transmise sans mot de passe.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        draw_numbers (iterable): Numéros gagnants du tirage.
+        draw_stars (iterable): Numéros chance gagnants du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        workers (int, optional): Le nombre de processus. Par défaut `Config.SCORING_WORKERS`.
+        shard_size (int, optional): La largeur d'une plage d'identifiants. Par défaut
+            `Config.SCORING_SHARD_SIZE`.
+
+    Returns:
+        dict: Le classement au format `{rang: [identifiants, score]}`.
+
+    Example:
+        ranking = structure_scores_parallel(1, [5, 12, 23, 34, 45], [2, 7], db, workers=8)
+    """
+    workers = workers or Config.SCORING_WORKERS
+    shard_size = shard_size or Config.SCORING_SHARD_SIZE
+
+    first_id, last_id = (
+        db.session.query(func.min(Entry.id), func.max(Entry.id))
+        .filter(Entry.lottery_id == lottery_id)
+        .one()
+    )
+    if first_id is None:
+        return {}
+
+    database_uri = db.engine.url.set(password=None).render_as_string()
+    shards = [
+        (start, min(start + shard_size - 1, last_id))
+        for start in range(first_id, last_id + 1, shard_size)
+    ]
+
+    start_method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)),
+        mp_context=multiprocessing.get_context(start_method),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _score_shard,
+                database_uri,
+                lottery_id,
+                start,
+                end,
+                list(draw_numbers),
+                list(draw_stars),
+                Config.SCORING_CHUNK_SIZE,
+            )
+            for start, end in shards
+        ]
+
+        ranker = StreamingRanker()
+        for future in futures:
+            for score, players in future.result().items():
+                ranker.add_bucket(score, players)
+
+    return ranker.ranking()
+
+
+# Dictionnaire `LOTTERY_SCORING_ENGINES` :
+#     Moteurs de calcul des scores qui lisent eux-mêmes les inscriptions d'un tirage
+#     dans la base de données, avec la signature `(lottery_id, draw_numbers, draw_stars, db)`.
+LOTTERY_SCORING_ENGINES = {
+    "sql": structure_scores_sql,
+    "stream": structure_scores_stream,
+    "parallel": structure_scores_parallel,
+    "index": structure_scores_index,
+    "snapshot": structure_scores_snapshot,
+}
@@ -0,0 +1,105 @@
+import random
+import numpy as np
+from app import Config
+from app.tools import (
+    numbers_to_mask,
+    TicketSubsetCounts,
+    summarize_simulation,
+    estimate_score_distribution,
+)
+from app.helpers.lottery_helpers import generate_wining_numbers, generate_luck_numbers
+from app.helpers.index_helpers import ticket_format_counts
+from app.helpers.snapshot_helpers import lottery_ticket_columns
+
+
+def load_lottery_masks(lottery_id, db):
+    """
+    Charge les masques des tickets d'un tirage dans des tableaux NumPy.
+
+    Les masques d'un tirage clos sont ceux de son instantané, projetés en mémoire
+    (`lottery_ticket_columns`).
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        tuple: Un tuple `(number_masks, star_masks)` de tableaux `uint64` et `uint16`.
+    """
+    columns = lottery_ticket_columns(lottery_id, db)
+    return columns["number_masks"], columns["star_masks"]
+
+
+def simulate_lottery(lottery, db, draws=None, seed=None, batch_size=None):
+    """
+    Simule des milliers de tirages aléatoires sur les tickets d'une loterie.
+
+    Les tickets sont chargés une seule fois et leurs sous-ensembles de numéros comptés
+    (`TicketSubsetCounts`). Les tirages, générés par `generate_wining_numbers` et
+    `generate_luck_numbers`, sont ensuite évalués par lots de `batch_size` : chaque
+    lot produit directement le nombre de tickets par score de chaque tirage, sans
+    parcourir les tickets. Rien n'est écrit dans la base de données.
+
+    Args:
+        lottery (Lottery): La loterie dont les tickets sont simulés.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        draws (int, optional): Le nombre de tirages. Par défaut `Config.SIMULATION_DRAWS`.
+        seed (int, optional): La graine du générateur aléatoire.
+        batch_size (int, optional): Le nombre de tirages par lot. Par défaut
+            `Config.SIMULATION_BATCH_SIZE`.
+
+    Returns:
+        dict: Le rapport de `summarize_simulation`, complété par le nombre de tickets
+        (`tickets`) et la récompense du tirage (`reward_price`).
+
+    Example:
+        report = simulate_lottery(lottery, db, draws=10000, seed=42)
+        report["top_prize_split_probability"]
+    """
+    draws = draws or Config.SIMULATION_DRAWS
+    batch_size = batch_size or Config.SIMULATION_BATCH_SIZE
+    rng = random.Random(seed)
+
+    counts = TicketSubsetCounts(*load_lottery_masks(lottery.id, db))
+
+    histograms = []
+    for start in range(0, draws, batch_size):
+        size = min(batch_size, draws - start)
+        draw_masks, draw_star_masks = [], []
+        for _ in range(size):
+            draw_masks.append(numbers_to_mask(generate_wining_numbers(rng)))
+            draw_star_masks.append(numbers_to_mask(generate_luck_numbers(rng)))
+        histograms.append(counts.score_histograms(draw_masks, draw_star_masks))
+
+    report = summarize_simulation(np.concatenate(histograms), lottery.reward_price)
+    report["tickets"] = counts.ticket_count
+    report["reward_price"] = lottery.reward_price
+    return report
+
+
+def estimate_lottery(lottery, db):
+    """
+    Calcule la distribution exacte des scores des tickets d'une loterie sur tous les
+    tirages possibles.
+
+    Les tickets sont comptés par format à partir de l'index inversé
+    (`ticket_format_counts`), puis la distribution est obtenue par dénombrement
+    (`estimate_score_distribution`), sans tirage ni parcours des inscriptions.
+
+    Args:
+        lottery (Lottery): La loterie dont les tickets sont évalués.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        dict: Le rapport de `estimate_score_distribution`, complété par la récompense
+        du tirage (`reward_price`).
+
+    Example:
+        report = estimate_lottery(lottery, db)
+        report["payout_exposure"]["expected_jackpot_winners"]
+    """
+    report = estimate_score_distribution(
+        ticket_format_counts(lottery.id, db), lottery.reward_price
+    )
+    report["reward_price"] = lottery.reward_price
+    return report
@@ -0,0 +1,213 @@
+import os
+import numpy as np
+from sqlalchemy import func, select
+from app import Config
+from app.models import Entry, Lottery
+from app.tools import Status, TicketSnapshot, write_snapshot, rank_ticket_arrays
+
+# Liste `SNAPSHOT_STATUSES` :
+#     Statuts des tirages dont les inscriptions sont closes et qui disposent d'un
+#     instantané en colonnes de leurs tickets.
+SNAPSHOT_STATUSES = [
+    Status.EN_VALIDATION.value,
+    Status.TERMINE.value,
+    Status.SIMULATION_TERMINE.value,
+]
+
+
+def snapshot_path(lottery_id):
+    """
+    Retourne le chemin de l'instantané des tickets d'un tirage.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+
+    Returns:
+        str: Le chemin du fichier, dans `Config.SNAPSHOT_DIR`.
+    """
+    return os.path.join(Config.SNAPSHOT_DIR, f"lottery_{lottery_id}.snapshot")
+
+
+def _load_ticket_columns(lottery_id, db, chunk_size=None):
+    """
+    Lit les colonnes des tickets d'un tirage dans la base de données, triées par id.
+    """
+    chunk_size = chunk_size or Config.SCORING_CHUNK_SIZE
+    result = db.session.execute(
+        select(Entry.id, Entry.user_id, Entry.numbers_mask, Entry.lucky_numbers_mask)
+        .where(Entry.lottery_id == lottery_id)
+        .order_by(Entry.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    blocks = [np.array(rows, dtype=np.int64) for rows in result.partitions()]
+    rows = np.concatenate(blocks) if blocks else np.empty((0, 4), dtype=np.int64)
+    return {
+        "entry_ids": rows[:, 0],
+        "user_ids": rows[:, 1],
+        "number_masks": rows[:, 2].astype(np.uint64),
+        "star_masks": rows[:, 3].astype(np.uint16),
+    }
+
+
+def write_lottery_snapshot(lottery_id, db, chunk_size=None):
+    """
+    Écrit l'instantané en colonnes des tickets d'un tirage.
+
+    Les inscriptions sont lues par blocs de `chunk_size` lignes, triées par
+    identifiant, puis écrites par `write_snapshot`. Un instantané existant est
+    remplacé.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        chunk_size (int, optional): Le nombre de lignes par bloc. Par défaut
+            `Config.SCORING_CHUNK_SIZE`.
+
+    Returns:
+        int: Le nombre de tickets écrits.
+
+    Example:
+        write_lottery_snapshot(1, db)
+    """
+    return write_snapshot(
+        snapshot_path(lottery_id), _load_ticket_columns(lottery_id, db, chunk_size)
+    )
+
+
+def ensure_lottery_snapshot(lottery_id, db):
+    """
+    Écrit l'instantané des tickets d'un tirage s'il n'existe pas encore.
+
+    Les lectures d'un tirage clos construisent son instantané à la première demande
+    (`open_lottery_snapshot`) ; cette fonction permet de le préparer à l'avance, hors
+    d'une requête (tâche de fond, commande).
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+    """
+    if not os.path.exists(snapshot_path(lottery_id)):
+        write_lottery_snapshot(lottery_id, db)
+
+
+def delete_lottery_snapshot(lottery_id):
+    """
+    Supprime l'instantané des tickets d'un tirage, s'il existe.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+    """
+    try:
+        os.remove(snapshot_path(lottery_id))
+    except FileNotFoundError:
+        pass
+
+
+def _snapshot_is_current(snapshot, lottery_id, db):
+    """
+    Vérifie qu'un instantané contient encore les tickets du tirage. Les identifiants
+    des inscriptions étant croissants, tout ajout ou retrait change leur nombre ou
+    le plus grand d'entre eux.
+    """
+    count, last_id = (
+        db.session.query(func.count(Entry.id), func.max(Entry.id))
+        .filter(Entry.lottery_id == lottery_id)
+        .one()
+    )
+    if count != snapshot.rows:
+        return False
+    return count == 0 or int(snapshot.entry_ids[-1]) == last_id
+
+
+def open_lottery_snapshot(lottery_id, db, verify=False):
+    """
+    Ouvre l'instantané des tickets d'un tirage clos, en le reconstruisant au besoin.
+
+    L'instantané est reconstruit s'il est absent, illisible, corrompu (avec `verify`)
+    ou si les inscriptions du tirage ont changé depuis son écriture.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+        verify (bool): `True` pour vérifier les empreintes des colonnes.
+
+    Returns:
+        TicketSnapshot: L'instantané projeté en mémoire.
+
+    Example:
+        snapshot = open_lottery_snapshot(1, db)
+        snapshot.number_masks
+    """
+    path = snapshot_path(lottery_id)
+    try:
+        snapshot = TicketSnapshot(path, verify=verify)
+        if _snapshot_is_current(snapshot, lottery_id, db):
+            return snapshot
+    except (FileNotFoundError, ValueError):
+        pass
+
+    write_lottery_snapshot(lottery_id, db)
+    return TicketSnapshot(path, verify=False)
+
+
+def lottery_ticket_columns(lottery_id, db):
+    """
+    Retourne les colonnes des tickets d'un tirage, triées par identifiant d'inscription.
+
+    Pour un tirage clos (`SNAPSHOT_STATUSES`), les colonnes sont celles de son
+    instantané, projetées en mémoire sans copie ; sinon elles sont lues dans la base.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        dict: Les tableaux `entry_ids`, `user_ids`, `number_masks` (`uint64`) et
+        `star_masks` (`uint16`).
+
+    Example:
+        columns = lottery_ticket_columns(1, db)
+        columns["number_masks"]
+    """
+    lottery = db.session.get(Lottery, lottery_id)
+    if lottery is None or lottery.status not in SNAPSHOT_STATUSES:
+        return _load_ticket_columns(lottery_id, db)
+
+    snapshot = open_lottery_snapshot(lottery_id, db)
+    return {
+        "entry_ids": snapshot.entry_ids,
+        "user_ids": snapshot.user_ids,
+        "number_masks": snapshot.number_masks,
+        "star_masks": snapshot.star_masks,
+    }
+
+
+def structure_scores_snapshot(lottery_id, draw_numbers, draw_stars, db):
+    """
+    Calcule le classement d'un tirage à partir de l'instantané en colonnes de ses tickets.
+
+    Les masques sont lus dans l'instantané projeté en mémoire (`lottery_ticket_columns`)
+    et notés en une seule opération NumPy par `rank_ticket_arrays`, sans requête sur
+    les inscriptions.
+
+    Args:
+        lottery_id (int): L'identifiant du tirage.
+        draw_numbers (iterable): Numéros gagnants du tirage.
+        draw_stars (iterable): Numéros chance gagnants du tirage.
+        db (SQLAlchemy): L'instance SQLAlchemy donnant accès à la session.
+
+    Returns:
+        dict: Le classement au format `{rang: [identifiants, score]}`, identique à celui
+        de `structure_scores` sur les inscriptions triées par identifiant.
+
+    Example:
+        ranking = structure_scores_snapshot(1, [5, 12, 23, 34, 45], [2, 7], db)
+    """
+    columns = lottery_ticket_columns(lottery_id, db)
+    return rank_ticket_arrays(
+        columns["user_ids"],
+        columns["number_masks"],
+        columns["star_masks"],
+        draw_numbers,
+        draw_stars,
+    )
@@ -1,10 +1,25 @@
+import threading
+import time
+from collections import OrderedDict
 from flask_jwt_extended import decode_token
-from flask import current_app as app
-from datetime import datetime
+from flask import current_app as app, has_app_context
+from datetime import datetime, timedelta
+from app import Config
 from app.models import TokenBlockList
 from app.extensions import db
+from app.tools import InvalidationChannel
 from sqlalchemy.exc import NoResultFound
 
+# États de révocation déjà lus par ce processus, par JTI, du moins au plus récemment
+# lu : (révoqué, identifiant de l'utilisateur, date d'expiration de l'entrée).
+_token_states = OrderedDict()
+_token_states_lock = threading.Lock()
+_token_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+# Canal d'invalidation partagé avec les autres processus, ouvert à la première
+# vérification (voir `Config.TOKEN_REVOCATION_LOG`).
+_revocation_channel = None
+
 
 def add_token_to_database(encoded_token):
     """
@@ -76,6 +91,7 @@ def revoke_token(token_jti, user_id):
         db.session.commit()
     except NoResultFound:
         raise Exception(f"Impossible de trouver le token {token_jti}")
+    invalidate_token_cache(token_jti)
 
 
 def is_token_revoked(jwt_payload):
@@ -87,6 +103,13 @@ def is_token_revoked(jwt_payload):
     Elle interroge ensuite la table `TokenBlockList` pour déterminer si
     le jeton est marqué comme révoqué.
 
+    La réponse est gardée dans le cache du processus, par JTI : les vérifications
+    suivantes du même jeton ne touchent pas la base de données. Un jeton révoqué
+    le reste jusqu'à son expiration ; un jeton valide est vérifié à nouveau au plus
+    tard après `Config.TOKEN_CACHE_TTL` secondes, ou dès que sa révocation est
+    publiée sur le canal d'invalidation (voir `invalidate_token_cache`). Aucune
+    entrée ne survit à l'expiration du jeton.
+
     Args:
         jwt_payload (dict): La charge utile du jeton JWT, contenant des
         informations sur l'utilisateur et le jeton.
@@ -113,8 +136,147 @@ def is_token_revoked(jwt_payload):
     """
     jti = jwt_payload["jti"]
     user_id = jwt_payload[app.config.get("JWT_IDENTITY_CLAIM")]
+    _apply_invalidations()
+    now = time.time()
+    with _token_states_lock:
+        state = _token_states.get(jti)
+        if state is not None and state[1] == user_id and state[2] > now:
+            _token_states.move_to_end(jti)
+            _token_stats["hits"] += 1
+            return state[0]
+        _token_stats["misses"] += 1
+
     try:
         token = TokenBlockList.query.filter_by(jti=jti, user_id=user_id).one()
-        return token.revoked_at is not None
+        revoked = token.revoked_at is not None
     except NoResultFound:
         raise Exception(f"Impossible de trouver le token {jti}")
+
+    expires = jwt_payload.get("exp", now)
+    if not revoked:
+        expires = min(expires, now + Config.TOKEN_CACHE_TTL)
+    if expires > now:
+        _store_token_state(jti, (revoked, user_id, expires))
+        # Une révocation publiée pendant la lecture retire aussitôt l'entrée.
+        _apply_invalidations()
+    return revoked
+
+
+def _store_token_state(jti, state):
+    """
+    Garde l'état de révocation d'un jeton en cache, en retirant les moins récemment
+    lus au-delà de `Config.TOKEN_CACHE_SIZE` jetons.
+    """
+    with _token_states_lock:
+        _token_states[jti] = state
+        _token_states.move_to_end(jti)
+        while len(_token_states) > Config.TOKEN_CACHE_SIZE:
+            _token_states.popitem(last=False)
+
+
+def _max_token_lifetime():
+    """
+    Retourne la durée de vie en secondes du jeton le plus durable (accès ou
+    rafraîchissement) : au-delà, une révocation ne concerne plus aucun jeton valide.
+    """
+    lifetimes = [Config.JWT_ACCESS_TOKEN_EXPIRES]
+    if has_app_context():
+        lifetimes += [
+            app.config.get("JWT_ACCESS_TOKEN_EXPIRES"),
+            app.config.get("JWT_REFRESH_TOKEN_EXPIRES"),
+        ]
+    return max(
+        lifetime.total_seconds()
+        for lifetime in lifetimes
+        if isinstance(lifetime, timedelta)
+    )
+
+
+def _get_revocation_channel():
+    """
+    Retourne le canal d'invalidation de `Config.TOKEN_REVOCATION_LOG`, ou `None`
+    s'il est désactivé. Un changement de chemin ouvre un nouveau canal et vide le
+    cache, dont les entrées n'ont pas suivi le nouveau canal. Le fichier du canal
+    est remplacé une fois ses lignes plus anciennes que le jeton le plus durable.
+    """
+    global _revocation_channel
+    path = Config.TOKEN_REVOCATION_LOG
+    with _token_states_lock:
+        if not path:
+            _revocation_channel = None
+        elif _revocation_channel is None or _revocation_channel.path != path:
+            _revocation_channel = InvalidationChannel(
+                path, max_age=_max_token_lifetime()
+            )
+            _token_states.clear()
+        return _revocation_channel
+
+
+def _apply_invalidations():
+    """
+    Retire du cache les jetons révoqués par les autres processus depuis la dernière
+    lecture du canal, ou vide le cache si le canal a été vidé ou remplacé.
+    """
+    channel = _get_revocation_channel()
+    if channel is None:
+        return
+    jtis = channel.poll()
+    with _token_states_lock:
+        if jtis is None:
+            _token_stats["invalidations"] += len(_token_states)
+            _token_states.clear()
+            return
+        for jti in jtis:
+            if _token_states.pop(jti, None) is not None:
+                _token_stats["invalidations"] += 1
+
+
+def invalidate_token_cache(jti):
+    """
+    Retire un jeton du cache de ce processus et publie son invalidation aux autres.
+
+    Appelée après chaque révocation, une fois la base de données à jour : la
+    vérification suivante du jeton, dans n'importe quel processus lisant le même
+    canal, relit son état dans la base de données.
+
+    Args:
+        jti (str): L'identifiant unique du jeton.
+    """
+    with _token_states_lock:
+        if _token_states.pop(jti, None) is not None:
+            _token_stats["invalidations"] += 1
+    channel = _get_revocation_channel()
+    if channel is not None:
+        channel.publish(jti)
+
+
+def token_cache_info():
+    """
+    Retourne l'état du cache des vérifications de révocation de ce processus.
+
+    Returns:
+        dict: Les vérifications servies par le cache (`hits`), celles qui ont
+              interrogé la base de données (`misses`), la part des premières
+              (`hit_rate`), les entrées retirées par une révocation
+              (`invalidations`) et le nombre de jetons gardés (`size`).
+
+    Example:
+        token_cache_info()  # {"hits": 980, "misses": 20, "hit_rate": 0.98, ...}
+    """
+    with _token_states_lock:
+        checks = _token_stats["hits"] + _token_stats["misses"]
+        return {
+            **_token_stats,
+            "hit_rate": _token_stats["hits"] / checks if checks else 0.0,
+            "size": len(_token_states),
+        }
+
+
+def clear_token_cache():
+    """
+    Vide le cache des vérifications de révocation de ce processus et remet ses
+    compteurs à zéro.
+    """
+    with _token_states_lock:
+        _token_states.clear()
+        _token_stats.update(hits=0, misses=0, invalidations=0)
@@ -6,3 +6,7 @@ from .entry_model import Entry
 from .lotteryResult_model import LotteryResult
 from .token_block_list import TokenBlockList
 from .lotteryRanking_model import LotteryRanking
+from .ticketIndex_model import TicketIndex
+from .liveDraw_model import LiveDraw
+from .job_model import Job
+from .outbox_model import OutboxEmail
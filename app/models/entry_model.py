@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, ForeignKey, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, ForeignKey, String
+from sqlalchemy.orm import relationship, validates
 from app.extensions import db
+from app.tools.mask_tools import numbers_to_mask
 
 
 class Entry(db.Model):
@@ -17,6 +18,10 @@ class Entry(db.Model):
         lottery_id (int): Identifiant de la loterie à laquelle l'utilisateur s'inscrit (clé étrangère).
         numbers (str): Numéros choisis par l'utilisateur pour la loterie.
         lucky_numbers (str): Numéros chance choisis par l'utilisateur.
+        numbers_mask (int): Masque binaire des numéros (bit `n` pour le numéro `n`),
+                            renseigné automatiquement à partir de `numbers`.
+        lucky_numbers_mask (int): Masque binaire des numéros chance, renseigné
+                                  automatiquement à partir de `lucky_numbers`.
 
     Relationships:
         user (User): Relation vers l'utilisateur qui a fait l'inscription.
@@ -36,6 +41,13 @@ class Entry(db.Model):
     lottery_id = Column(Integer, ForeignKey("lotteries.id"), nullable=False)
     numbers = Column(String, nullable=False)
     lucky_numbers = Column(String, nullable=False)
+    numbers_mask = Column(BigInteger, nullable=False)
+    lucky_numbers_mask = Column(SmallInteger, nullable=False)
 
     user = relationship("User", back_populates="entries")
     lottery = relationship("Lottery", back_populates="entries")
+
+    @validates("numbers", "lucky_numbers")
+    def _set_numbers_mask(self, key, value):
+        setattr(self, f"{key}_mask", numbers_to_mask(value))
+        return value
@@ -0,0 +1,54 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from app.extensions import db
+from app.tools.job_tools import JobStatus, JobStage
+
+
+class Job(db.Model):
+    """
+    Représente une tâche de fond, exécutée hors de la requête HTTP qui l'a créée.
+
+    Cette classe correspond à la table 'jobs' dans la base de données. L'état de la
+    tâche y est enregistré à chaque étape, ce qui permet de suivre sa progression
+    depuis n'importe quel processus et de la reprendre après un redémarrage.
+
+    Attributes:
+        id (int): Identifiant unique de la tâche (clé primaire).
+        kind (str): Type de tâche ("validate_lottery" ou "announce_lottery").
+        lottery_id (int): Identifiant de la loterie concernée (clé étrangère).
+        payload (str): Paramètres de la tâche, au format JSON (numéros du tirage, ou
+            dernier utilisateur traité pour une annonce).
+        status (str): Statut de la tâche (voir `JobStatus`).
+        stage (str): Dernière étape terminée (voir `JobStage`).
+        entry_count (int): Nombre d'inscriptions lues.
+        winner_count (int): Nombre de joueurs classés.
+        persisted_count (int): Nombre de lignes de classement enregistrées.
+        notified_count (int): Nombre de destinataires déjà traités lors de l'envoi des
+            emails (gagnants, ou utilisateurs prévenus d'un nouveau tirage).
+        attempts (int): Nombre de prises en charge de la tâche.
+        error (str): Message de la dernière erreur, le cas échéant.
+        created_at (datetime): Date et heure de création de la tâche.
+        updated_at (datetime): Date et heure du dernier signe de vie de la tâche.
+        finished_at (datetime): Date et heure de fin de la tâche.
+
+    Example:
+        job = Job(kind="validate_lottery", lottery_id=1, payload='{"winning_numbers": "1,2,3,4,5"}')
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    kind = Column(String, nullable=False)
+    lottery_id = Column(Integer, ForeignKey("lotteries.id"), nullable=False, index=True)
+    payload = Column(Text, nullable=False, default="{}")
+    status = Column(String, nullable=False, default=JobStatus.PENDING.value)
+    stage = Column(String, nullable=False, default=JobStage.QUEUED.value)
+    entry_count = Column(Integer, nullable=False, default=0)
+    winner_count = Column(Integer, nullable=False, default=0)
+    persisted_count = Column(Integer, nullable=False, default=0)
+    notified_count = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime)
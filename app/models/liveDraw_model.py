@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.extensions import db
+
+
+class LiveDraw(db.Model):
+    """
+    Représente un tirage en direct, dont les numéros sont dévoilés un par un.
+
+    Cette classe correspond à la table 'live_draws' dans la base de données.
+    Elle conserve les numéros déjà dévoilés d'un tirage, dans l'ordre, afin que le
+    classement provisoire puisse être reconstruit par n'importe quel processus.
+
+    Attributes:
+        id (int): Identifiant unique du tirage en direct (clé primaire).
+        lottery_id (int): Identifiant de la loterie tirée (clé étrangère, unique).
+        numbers (str): Numéros dévoilés, sous forme de chaîne (ex: "12,5").
+        lucky_numbers (str): Numéros chance dévoilés, sous forme de chaîne (ex: "7").
+
+    Example:
+        live_draw = LiveDraw(lottery_id=1, numbers="12,5", lucky_numbers="")
+    """
+
+    __tablename__ = "live_draws"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    lottery_id = Column(
+        Integer, ForeignKey("lotteries.id"), nullable=False, unique=True
+    )
+    numbers = Column(String, nullable=False, default="")
+    lucky_numbers = Column(String, nullable=False, default="")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float
+from sqlalchemy import Column, Integer, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from app.extensions import db
 
@@ -28,6 +28,9 @@ class LotteryRanking(db.Model):
     """
 
     __tablename__ = "lottery_rankings"
+    __table_args__ = (
+        Index("ix_lottery_rankings_result_player", "lottery_result_id", "player_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     lottery_result_id = Column(
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, ForeignKey
+from sqlalchemy.orm import relationship, validates
 from app.extensions import db
+from app.tools.mask_tools import numbers_to_mask
 
 
 class LotteryResult(db.Model):
@@ -13,11 +14,16 @@ class LotteryResult(db.Model):
 
     Attributes:
         id (int): Identifiant unique du résultat (clé primaire).
-        lottery_id (int): Identifiant de la loterie associée à ce résultat.
+        lottery_id (int): Identifiant de la loterie associée à ce résultat (unique).
         winning_numbers (str): Numéros gagnants du tirage, stockés sous forme de chaîne
                                (ex: "1,2,3,4,5").
         winning_lucky_numbers (str): Numéros chance du tirage, stockés sous forme de chaîne
                                       (ex: "1,2").
+        winning_numbers_mask (int): Masque binaire des numéros gagnants, renseigné
+                                    automatiquement à partir de `winning_numbers`.
+        winning_lucky_numbers_mask (int): Masque binaire des numéros chance gagnants,
+                                          renseigné automatiquement à partir de
+                                          `winning_lucky_numbers`.
 
     Relationships:
         lottery (Lottery): Loterie associée à ce résultat.
@@ -30,9 +36,18 @@ class LotteryResult(db.Model):
     __tablename__ = "lottery_results"
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    lottery_id = Column(Integer, ForeignKey("lotteries.id"), nullable=False)
+    lottery_id = Column(
+        Integer, ForeignKey("lotteries.id"), nullable=False, unique=True, index=True
+    )
     winning_numbers = Column(String, nullable=False)
     winning_lucky_numbers = Column(String, nullable=False)
+    winning_numbers_mask = Column(BigInteger, nullable=False)
+    winning_lucky_numbers_mask = Column(SmallInteger, nullable=False)
 
     lottery = relationship("Lottery", back_populates="results")
     rankings = relationship("LotteryRanking", back_populates="lottery_result")
+
+    @validates("winning_numbers", "winning_lucky_numbers")
+    def _set_numbers_mask(self, key, value):
+        setattr(self, f"{key}_mask", numbers_to_mask(value))
+        return value
@@ -0,0 +1,49 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.extensions import db
+from app.tools.outbox_tools import OutboxStatus
+
+
+class OutboxEmail(db.Model):
+    """
+    Représente un email de la file d'envoi, écrit dans la même transaction que
+    l'opération qui le déclenche puis envoyé par un processus de fond.
+
+    Cette classe correspond à la table 'email_outbox' dans la base de données.
+
+    Attributes:
+        id (int): Identifiant unique de l'email (clé primaire).
+        kind (str): Type d'email (ex: "new_tirage", "results_available").
+        receiver (str): Adresse du destinataire, ou adresses séparées par des virgules
+            pour un envoi groupé en copie cachée.
+        message (str): Message complet, en-têtes compris.
+        status (str): Statut de l'email (voir `OutboxStatus`).
+        attempts (int): Nombre de tentatives d'envoi.
+        available_at (datetime): Date à partir de laquelle l'email peut être envoyé.
+        claim_token (str): Jeton du processus qui a réservé l'email.
+        claimed_until (datetime): Date d'expiration de la réservation.
+        last_error (str): Message de la dernière erreur d'envoi, le cas échéant.
+        created_at (datetime): Date et heure de création de l'email.
+        sent_at (datetime): Date et heure de l'envoi.
+
+    Example:
+        email = OutboxEmail(kind="contact_us", receiver="app@example.com", message=message.as_string())
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_available_at", "status", "available_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    kind = Column(String, nullable=False)
+    receiver = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default=OutboxStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = Column(String)
+    claimed_until = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime)
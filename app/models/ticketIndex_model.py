@@ -0,0 +1,50 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    SmallInteger,
+    String,
+    LargeBinary,
+    ForeignKey,
+    UniqueConstraint,
+)
+from app.extensions import db
+
+
+class TicketIndex(db.Model):
+    """
+    Représente une liste de l'index inversé des inscriptions d'une loterie.
+
+    Cette classe correspond à la table 'ticket_index' dans la base de données.
+    Chaque ligne associe un numéro (ou un numéro chance) d'une loterie à la liste
+    compressée des identifiants des inscriptions qui le contiennent.
+
+    Une liste peut être répartie sur plusieurs segments : le segment 0 est la liste
+    construite ou compactée, et chaque inscription ajoute un petit segment numéroté
+    par son plus petit identifiant, sans réécrire ni verrouiller les autres. Les
+    segments sont fusionnés par `compact_ticket_index`.
+
+    Attributes:
+        id (int): Identifiant unique de la liste (clé primaire).
+        lottery_id (int): Identifiant de la loterie indexée (clé étrangère).
+        kind (str): Type de liste (voir `PostingKind` : "number", "lucky" ou "irregular").
+        number (int): Le numéro indexé (0 pour la liste "irregular").
+        segment (int): Le numéro du segment (0 pour la liste compactée).
+        entry_count (int): Nombre d'inscriptions du segment.
+        last_entry_id (int): Plus grand identifiant du segment.
+        postings (bytes): Identifiants des inscriptions, compressés par `encode_postings`.
+
+    Example:
+        index = TicketIndex(lottery_id=1, kind="number", number=7, segment=0, entry_count=0, last_entry_id=0, postings=b"")
+    """
+
+    __tablename__ = "ticket_index"
+    __table_args__ = (UniqueConstraint("lottery_id", "kind", "number", "segment"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    lottery_id = Column(Integer, ForeignKey("lotteries.id"), nullable=False)
+    kind = Column(String, nullable=False)
+    number = Column(SmallInteger, nullable=False)
+    segment = Column(Integer, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    last_entry_id = Column(Integer, nullable=False, default=0)
+    postings = Column(LargeBinary, nullable=False, default=b"")
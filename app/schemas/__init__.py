@@ -9,6 +9,8 @@ from .lottery_schemas import (
     LotteryUpdateSchema,
     LotteryOverviewSchema,
     LotteryHistorySchema,
+    LotterySimulationSchema,
+    LiveDrawRevealSchema,
 )
 from .lotteryResult_schemas import (
     LotteryResultOverviewSchema,
@@ -24,3 +26,4 @@ from .user_schemas import (
 )
 from .lotteryRanking_schema import LotteryRankingSchema
 from .contactUs_schema import ContactUsSchema
+from .job_schemas import JobOverviewSchema
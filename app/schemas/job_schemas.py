@@ -0,0 +1,71 @@
+import json
+from marshmallow import Schema, fields
+
+
+class JobOverviewSchema(Schema):
+    """
+    Schéma de sérialisation de l'état d'une tâche de fond.
+
+    Attributs:
+        id (int): L'identifiant unique de la tâche.
+        kind (str): Le type de tâche (par exemple, "validate_lottery").
+        lottery_id (int): L'identifiant du tirage concerné.
+        status (str): Le statut de la tâche (PENDING, RUNNING, DONE, FAILED).
+        stage (str): La dernière étape terminée (QUEUED, FETCHED, SCORED, PERSISTED,
+                     NOTIFIED).
+        progress (dict): Les compteurs de chaque étape : inscriptions lues (`fetched`),
+                         joueurs classés (`scored`), lignes enregistrées (`persisted`)
+                         et gagnants traités (`notified`).
+        notification (dict, facultatif): La répartition des emails de résultats :
+                         nombre d'emails (`emails`), début (`starts_at`), durée
+                         (`window_seconds`) et débit d'arrivée attendu par minute
+                         (`expected_per_minute`).
+        attempts (int): Le nombre de prises en charge de la tâche.
+        error (str, facultatif): La dernière erreur rencontrée.
+        created_at (DateTime): La date de création de la tâche.
+        updated_at (DateTime): La date du dernier signe de vie de la tâche.
+        finished_at (DateTime, facultatif): La date de fin de la tâche.
+
+    Meta:
+        fields (tuple): Les champs inclus dans la sérialisation des données.
+    """
+
+    id = fields.Int()
+    kind = fields.Str()
+    lottery_id = fields.Int()
+    status = fields.Str()
+    stage = fields.Str()
+    progress = fields.Method("get_progress")
+    notification = fields.Method("get_notification")
+    attempts = fields.Int()
+    error = fields.Str(allow_none=True)
+    created_at = fields.DateTime()
+    updated_at = fields.DateTime()
+    finished_at = fields.DateTime(allow_none=True)
+
+    class Meta:
+        fields = (
+            "id",
+            "kind",
+            "lottery_id",
+            "status",
+            "stage",
+            "progress",
+            "notification",
+            "attempts",
+            "error",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        )
+
+    def get_progress(self, job):
+        return {
+            "fetched": job.entry_count,
+            "scored": job.winner_count,
+            "persisted": job.persisted_count,
+            "notified": job.notified_count,
+        }
+
+    def get_notification(self, job):
+        return json.loads(job.payload or "{}").get("notification")
@@ -6,6 +6,7 @@ from marshmallow import (
 )
 from datetime import datetime
 from app.tools import Status
+from app.config import Config
 
 
 class LotteryCreateSchema(Schema):
@@ -227,3 +228,52 @@ class LotteryOverviewSchema(Schema):
             "participant_count",
             "max_participants",
         )
+
+
+class LotterySimulationSchema(Schema):
+    """
+    Schéma de validation d'une demande de simulation des gains d'un tirage.
+
+    Attributs:
+        draws (int, optionnel): Nombre de tirages aléatoires à simuler.
+                                Par défaut `Config.SIMULATION_DRAWS`.
+        seed (int, optionnel): Graine du générateur aléatoire, pour rejouer une simulation.
+
+    Validations:
+        - draws: Si fourni, doit être compris entre 1 et `Config.SIMULATION_MAX_DRAWS`.
+
+    Exceptions:
+        - ValidationError: Levée lorsque les champs ne respectent pas les règles de validation.
+    """
+
+    draws = fields.Int(required=False)
+    seed = fields.Int(required=False)
+
+    @validates("draws")
+    def validate_draws(self, value):
+        if value <= 0:
+            raise ValidationError("Le nombre de tirages doit etre superieur a 0")
+        if value > Config.SIMULATION_MAX_DRAWS:
+            raise ValidationError(
+                f"Le nombre de tirages ne peut pas depasser {Config.SIMULATION_MAX_DRAWS}"
+            )
+
+
+class LiveDrawRevealSchema(Schema):
+    """
+    Schéma de validation d'un numéro dévoilé lors d'un tirage en direct.
+
+    Attributs:
+        number (int): Le numéro dévoilé. Ce champ est requis.
+        lucky (bool, optionnel): `True` s'il s'agit d'un numéro chance. Par défaut `False`.
+
+    Validations:
+        - number: Les limites et les doublons sont vérifiés par `reveal_live_number`,
+          qui connaît les numéros déjà dévoilés.
+
+    Exceptions:
+        - ValidationError: Levée lorsque les champs ne respectent pas les règles de validation.
+    """
+
+    number = fields.Int(required=True)
+    lucky = fields.Bool(load_default=False)
@@ -1,7 +1,20 @@
 # app/tools/__init__.py
 from .roles_tools import Roles
 from .status_tools import Status
+from .job_tools import JobStatus, JobStage
+from .smtp_tools import SMTPPool
+from .outbox_tools import (
+    OutboxStatus,
+    RateLimiter,
+    retry_delay,
+    is_permanent_smtp_error,
+    stagger_offsets,
+)
 from .email_tools import (
+    send_email,
+    new_tirage_message,
+    results_available_message,
+    contact_us_message,
     email_sender_new_tirage,
     email_sender_contact_us,
     email_sender_results_available,
@@ -12,5 +25,60 @@ from .rank_tools import (
     structure_scores,
     calculate_jaccard_similarity,
     jaccard_similarity,
+    build_ranking,
+    mask_jaccard_similarity,
+    calculate_mask_similarity,
+    ticket_score,
+    StreamingRanker,
+    score_table,
+    build_rank_counts,
+    compute_rank_gains,
+)
+from .mask_tools import numbers_to_mask, mask_to_numbers, ticket_masks
+from .numpy_rank_tools import (
+    structure_scores_numpy,
+    load_ticket_arrays,
+    compute_scores,
+    rank_ticket_arrays,
+)
+from .index_tools import PostingKind, encode_postings, decode_postings
+from .simulation_tools import TicketSubsetCounts, summarize_simulation
+from .estimation_tools import (
+    class_draw_counts,
+    ticket_format_classes,
+    expected_score_counts,
+    expected_rank_payouts,
+    estimate_score_distribution,
+)
+from .live_tools import LiveLeaderboard
+from .snapshot_tools import TicketSnapshot, write_snapshot
+from .engine_tools import get_scoring_engine, SCORING_ENGINES
+from .delivery_tools import (
+    OFFLOAD_HEADERS,
+    url_signature,
+    check_url_signature,
+    offload_header,
+)
+from .qr_tools import (
+    QrCode,
+    qr_matrix,
+    qr_runs,
+    qr_svg,
+    svg_data_uri,
+    cached_qr_code,
+    qr_cache_info,
+    clear_qr_cache,
+)
+from .invalidation_tools import InvalidationChannel
+from .pdf_writer_tools import PdfPage, text_width, wrap_text
+from .render_tools import PdfRendererPool, PdfStream
+from .pdf_tools import (
+    generate_pdf,
+    render_pdf_html,
+    get_pdf_renderer,
+    reward_pdf_digest,
+    reward_qr_data,
+    write_reward_pdf,
+    get_pdf_backend,
+    PDF_BACKENDS,
 )
-from .pdf_tools import generate_pdf
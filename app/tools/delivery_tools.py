@@ -0,0 +1,96 @@
+import hashlib
+import hmac
+import time
+
+# En-têtes de redirection interne reconnus : le proxy (nginx pour X-Accel-Redirect,
+# Apache ou lighttpd pour X-Sendfile) remplace la réponse vide de l'application par
+# le fichier désigné.
+OFFLOAD_HEADERS = ("X-Accel-Redirect", "X-Sendfile")
+
+
+def url_signature(message, expires, secret):
+    """
+    Signe un message jusqu'à une date d'expiration.
+
+    Paramètres:
+        message (str): Le message à signer (ex: le chemin d'un fichier).
+        expires (int): La date d'expiration, en secondes depuis l'epoch.
+        secret (str): La clé secrète de signature.
+
+    Retourne:
+        str: La signature HMAC-SHA256, en hexadécimal.
+
+    Exemple:
+        >>> url_signature("1/9f86d0", 1700000000, "secret")
+        'c0b4...'
+    """
+    return hmac.new(
+        secret.encode("utf-8"),
+        f"{message}:{expires}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def check_url_signature(message, expires, signature, secret, now=None):
+    """
+    Vérifie la signature d'un message et qu'elle n'a pas expiré.
+
+    Paramètres:
+        message (str): Le message signé.
+        expires (int | str): La date d'expiration reçue avec la signature.
+        signature (str): La signature reçue.
+        secret (str): La clé secrète de signature.
+        now (float, optional): La date courante. Par défaut `time.time()`.
+
+    Retourne:
+        bool: `True` si la signature correspond et que la date d'expiration n'est
+              pas dépassée.
+
+    Exemple:
+        >>> expires = int(time.time()) + 60
+        >>> check_url_signature("1/9f86d0", expires, url_signature("1/9f86d0", expires, "secret"), "secret")
+        True
+    """
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(
+        url_signature(message, expires, secret), str(signature or "")
+    )
+
+
+def offload_header(header, path, prefix):
+    """
+    Construit l'en-tête de redirection interne désignant un fichier au proxy.
+
+    X-Accel-Redirect attend l'URI d'un emplacement interne de nginx : le chemin
+    relatif du fichier est ajouté à `prefix`. X-Sendfile attend le chemin absolu
+    du fichier.
+
+    Paramètres:
+        header (str): "X-Accel-Redirect" ou "X-Sendfile".
+        path (str): Le chemin du fichier, relatif au répertoire servi par le proxy
+                    pour X-Accel-Redirect.
+        prefix (str): L'emplacement interne de nginx correspondant à ce répertoire.
+
+    Retourne:
+        tuple: Le nom et la valeur de l'en-tête.
+
+    Lève:
+        ValueError: Si l'en-tête n'est pas reconnu.
+
+    Exemple:
+        >>> offload_header("X-Accel-Redirect", "lottery_1/9f86d0.pdf", "/protected/reward_pdfs")
+        ('X-Accel-Redirect', '/protected/reward_pdfs/lottery_1/9f86d0.pdf')
+    """
+    if header == "X-Accel-Redirect":
+        return header, f"{prefix.rstrip('/')}/{path.lstrip('/')}"
+    if header == "X-Sendfile":
+        return header, path
+    raise ValueError(
+        f"En-tête de redirection interne inconnu : {header} "
+        f"(attendu : {', '.join(OFFLOAD_HEADERS)})"
+    )
@@ -1,21 +1,41 @@
 from app import Config
 from email.message import EmailMessage
-import ssl
-import smtplib
+from app.tools.smtp_tools import SMTPPool
 
 
-def email_sender_new_tirage(receiver):
+def send_email(message, receiver, smtp_pool=None):
     """
-    Envoie un email informant de la disponibilité d'un nouveau tirage.
+    Envoie un email depuis l'adresse de l'application.
 
     Paramètres:
+        message (EmailMessage): Le message à envoyer.
         receiver (str): L'adresse email du destinataire.
+        smtp_pool (SMTPPool, optional): La réserve de connexions à utiliser. Sans
+                                        réserve, une connexion est ouverte pour ce seul
+                                        message.
 
     Lève:
         Exception: En cas d'échec de l'envoi de l'email.
     """
+    if smtp_pool is not None:
+        smtp_pool.sendmail(Config.MAIL_APP, receiver, message.as_string())
+        return
+
+    with SMTPPool.from_config(size=1) as pool:
+        pool.sendmail(Config.MAIL_APP, receiver, message.as_string())
+
+
+def new_tirage_message(receiver):
+    """
+    Compose l'email informant de la disponibilité d'un nouveau tirage.
+
+    Paramètres:
+        receiver (str): L'adresse email du destinataire.
+
+    Retourne:
+        EmailMessage: Le message.
+    """
     app_mail = Config.MAIL_APP
-    app_mail_password = Config.APP_EMAIL_PASSWORD
     subject = "Un nouveau tirage est disponible"
     body = """
     Bonjour,
@@ -36,26 +56,37 @@ def email_sender_new_tirage(receiver):
     em["To"] = receiver
     em["Subject"] = subject
     em.set_content(body)
-    context = ssl.create_default_context()
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as smtp:
-        smtp.login(app_mail, app_mail_password)
-        smtp.sendmail(app_mail, receiver, em.as_string())
+    return em
 
 
-def email_sender_results_available(receiver, tirage_name):
+def email_sender_new_tirage(receiver, smtp_pool=None):
     """
-    Envoie un email informant de la disponibilité des résultats d'un tirage.
+    Envoie un email informant de la disponibilité d'un nouveau tirage.
 
     Paramètres:
         receiver (str): L'adresse email du destinataire.
-        tirage_name (str): Le nom du tirage dont les résultats sont disponibles.
+        smtp_pool (SMTPPool, optional): La réserve de connexions à utiliser pour un
+                                        envoi en série.
 
     Lève:
         Exception: En cas d'échec de l'envoi de l'email.
     """
+    send_email(new_tirage_message(receiver), receiver, smtp_pool)
+
+
+def results_available_message(receiver, tirage_name):
+    """
+    Compose l'email informant de la disponibilité des résultats d'un tirage.
+
+    Paramètres:
+        receiver (str): L'adresse email du destinataire.
+        tirage_name (str): Le nom du tirage dont les résultats sont disponibles.
+
+    Retourne:
+        EmailMessage: Le message.
+    """
     app_mail = Config.MAIL_APP
-    app_mail_password = Config.APP_EMAIL_PASSWORD
     subject = "Les résultats du tirage sont disponibles"
     body = f"""
     Bonjour,
@@ -74,26 +105,38 @@ def email_sender_results_available(receiver, tirage_name):
     em["To"] = receiver
     em["Subject"] = subject
     em.set_content(body)
-    context = ssl.create_default_context()
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as smtp:
-        smtp.login(app_mail, app_mail_password)
-        smtp.sendmail(app_mail, receiver, em.as_string())
+    return em
 
 
-def email_sender_contact_us(user_email, user_message):
+def email_sender_results_available(receiver, tirage_name, smtp_pool=None):
     """
-    Envoie un email à l'adresse de l'application contenant un message d'un utilisateur.
+    Envoie un email informant de la disponibilité des résultats d'un tirage.
 
     Paramètres:
-        user_email (str): L'email de l'utilisateur qui a contacté.
-        user_message (str): Le message de l'utilisateur.
+        receiver (str): L'adresse email du destinataire.
+        tirage_name (str): Le nom du tirage dont les résultats sont disponibles.
+        smtp_pool (SMTPPool, optional): La réserve de connexions à utiliser pour un
+                                        envoi en série.
 
     Lève:
         Exception: En cas d'échec de l'envoi de l'email.
     """
+    send_email(results_available_message(receiver, tirage_name), receiver, smtp_pool)
+
+
+def contact_us_message(user_email, user_message):
+    """
+    Compose l'email adressé à l'application contenant un message d'un utilisateur.
+
+    Paramètres:
+        user_email (str): L'email de l'utilisateur qui a contacté.
+        user_message (str): Le message de l'utilisateur.
+
+    Retourne:
+        EmailMessage: Le message.
+    """
     app_mail = Config.MAIL_APP
-    app_mail_password = Config.APP_EMAIL_PASSWORD
     subject = "Nouveau message de Contactez-nous"
     body = f"""
     Vous avez reçu un nouveau message de l'utilisateur :
@@ -108,8 +151,19 @@ def email_sender_contact_us(user_email, user_message):
     em["To"] = app_mail  # L'adresse de l'application
     em["Subject"] = subject
     em.set_content(body)
-    context = ssl.create_default_context()
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as smtp:
-        smtp.login(app_mail, app_mail_password)
-        smtp.sendmail(app_mail, app_mail, em.as_string())
+    return em
+
+
+def email_sender_contact_us(user_email, user_message):
+    """
+    Envoie un email à l'adresse de l'application contenant un message d'un utilisateur.
+
+    Paramètres:
+        user_email (str): L'email de l'utilisateur qui a contacté.
+        user_message (str): Le message de l'utilisateur.
+
+    Lève:
+        Exception: En cas d'échec de l'envoi de l'email.
+    """
+    send_email(contact_us_message(user_email, user_message), Config.MAIL_APP)
@@ -0,0 +1,36 @@
+from app import Config
+from app.tools.rank_tools import structure_scores
+from app.tools.numpy_rank_tools import structure_scores_numpy
+
+# Dictionnaire `SCORING_ENGINES` :
+#     Associe le nom d'un moteur de calcul des scores (valeur de `Config.SCORING_ENGINE`)
+#     à la fonction qui produit le classement `{rang: [identifiants, score]}`.
+#     Tous les moteurs ont la signature de `structure_scores` et renvoient le même résultat.
+SCORING_ENGINES = {
+    "python": structure_scores,
+    "numpy": structure_scores_numpy,
+}
+
+
+def get_scoring_engine(name=None):
+    """
+    Retourne la fonction de calcul des scores correspondant au moteur demandé.
+
+    Paramètres:
+        name (str, optionnel): Le nom du moteur. Si absent, la valeur de
+                               `Config.SCORING_ENGINE` est utilisée.
+
+    Retourne:
+        Callable: Une fonction `(participants, draw_numbers, draw_stars) -> dict`.
+
+    Lève:
+        ValueError: Si le moteur demandé n'existe pas.
+
+    Exemple:
+        >>> get_scoring_engine("numpy")(participants, [1, 2, 3, 4, 5], [1, 2])
+    """
+    name = name or Config.SCORING_ENGINE
+    try:
+        return SCORING_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Moteur de calcul des scores inconnu : {name}")
@@ -0,0 +1,243 @@
+from fractions import Fraction
+from math import comb
+from app.constants import share_gain
+from app.tools.rank_tools import score_table
+
+# Format d'un tirage : 5 numéros parmi 49 et 2 numéros chance parmi 9.
+NUMBER_POOL = 49
+STAR_POOL = 9
+DRAW_NUMBER_COUNT = 5
+DRAW_STAR_COUNT = 2
+DRAW_COUNT = comb(NUMBER_POOL, DRAW_NUMBER_COUNT) * comb(STAR_POOL, DRAW_STAR_COUNT)
+
+
+def class_draw_counts(number_count, star_count):
+    """
+    Compte les tirages possibles donnant chaque classe de résultat à un ticket.
+
+    Le nombre de numéros trouvés suit une loi hypergéométrique : parmi les
+    `C(49, 5)` tirages de numéros, `C(n, k) * C(49 - n, 5 - k)` ont exactement `k`
+    numéros en commun avec un ticket de `n` numéros. Il en va de même pour les numéros
+    chance, et les deux tirages étant indépendants, les comptes se multiplient. Le
+    résultat ne dépend que du format du ticket, pas de ses numéros.
+
+    Paramètres:
+        number_count (int): Le nombre de numéros du ticket.
+        star_count (int): Le nombre de numéros chance du ticket.
+
+    Retourne:
+        list: La table `table[numéros trouvés][numéros chance trouvés]` du nombre exact
+              de tirages, dont la somme vaut `DRAW_COUNT`. Un ticket ne pouvant pas
+              trouver plus de numéros que le tirage n'en contient, la table s'arrête
+              à 5 numéros et 2 numéros chance trouvés.
+
+    Exemple:
+        >>> class_draw_counts(5, 2)[5][2]
+        1
+    """
+    return [
+        [
+            comb(number_count, matches)
+            * comb(NUMBER_POOL - number_count, DRAW_NUMBER_COUNT - matches)
+            * comb(star_count, star_matches)
+            * comb(STAR_POOL - star_count, DRAW_STAR_COUNT - star_matches)
+            for star_matches in range(min(star_count, DRAW_STAR_COUNT) + 1)
+        ]
+        for matches in range(min(number_count, DRAW_NUMBER_COUNT) + 1)
+    ]
+
+
+def ticket_format_classes(number_count, star_count):
+    """
+    Retourne la distribution exacte des classes de résultat d'un ticket d'un format.
+
+    Paramètres:
+        number_count (int): Le nombre de numéros du ticket.
+        star_count (int): Le nombre de numéros chance du ticket.
+
+    Retourne:
+        list: Pour chaque classe possible, un dictionnaire contenant le nombre de
+              numéros (`matched_numbers`) et de numéros chance (`matched_lucky_numbers`)
+              trouvés, le nombre de tirages (`draws`), la probabilité (`probability`)
+              et le score (`score`) de la classe.
+
+    Exemple:
+        >>> ticket_format_classes(5, 2)[-1]
+        {'matched_numbers': 5, 'matched_lucky_numbers': 2, 'draws': 1, ...}
+    """
+    draws = class_draw_counts(number_count, star_count)
+    scores = score_table(DRAW_NUMBER_COUNT, DRAW_STAR_COUNT, number_count, star_count)
+    return [
+        {
+            "matched_numbers": matches,
+            "matched_lucky_numbers": star_matches,
+            "draws": draws[matches][star_matches],
+            "probability": draws[matches][star_matches] / DRAW_COUNT,
+            "score": scores[matches][star_matches],
+        }
+        for matches, row in enumerate(draws)
+        for star_matches in range(len(row))
+        if draws[matches][star_matches]
+    ]
+
+
+def expected_score_counts(format_counts):
+    """
+    Calcule le nombre moyen exact de tickets obtenant chaque score sur tous les tirages.
+
+    Les tickets d'un même format ayant la même distribution de classes, l'espérance
+    du nombre de tickets par score est la somme, sur les formats, du nombre de tickets
+    multiplié par la probabilité de chaque classe. Le calcul est fait en fractions
+    exactes et ne dépend que du nombre de formats.
+
+    Paramètres:
+        format_counts (dict): Un dictionnaire associant un format
+                              `(nombre de numéros, nombre de numéros chance)` au
+                              nombre de tickets de ce format.
+
+    Retourne:
+        dict: Un dictionnaire associant chaque score atteignable au nombre moyen de
+              tickets l'obtenant (`Fraction`).
+
+    Exemple:
+        >>> expected_score_counts({(5, 2): 1000})[100]
+        Fraction(125, 8580978)
+    """
+    expected = {}
+    for (number_count, star_count), tickets in format_counts.items():
+        draws = class_draw_counts(number_count, star_count)
+        scores = score_table(
+            DRAW_NUMBER_COUNT, DRAW_STAR_COUNT, number_count, star_count
+        )
+        for matches, row in enumerate(draws):
+            for star_matches, count in enumerate(row):
+                if count:
+                    score = scores[matches][star_matches]
+                    expected[score] = expected.get(score, 0) + Fraction(
+                        tickets * count, DRAW_COUNT
+                    )
+    return expected
+
+
+def expected_rank_payouts(expected_counts, reward_price, limit=10):
+    """
+    Applique le classement et le partage des gains au nombre moyen de tickets par score.
+
+    Les scores sont classés comme dans `build_rank_counts`, chaque score occupant un
+    nombre (non entier) de places égal à son nombre moyen de tickets. Un score reçoit
+    les parts `share_gain` des places qu'il occupe, au prorata de la fraction de chaque
+    place couverte, puis le reliquat est redistribué proportionnellement comme dans
+    `compute_rank_gains`. Pour des effectifs entiers, le résultat est exactement celui
+    de `compute_rank_gains`.
+
+    Paramètres:
+        expected_counts (dict): Un dictionnaire associant un score au nombre moyen de
+                                tickets l'obtenant.
+        reward_price (float): Le montant total de la récompense.
+        limit (int): Le nombre de places à partir duquel le classement est clos.
+
+    Retourne:
+        list: Pour chaque score classé, par score décroissant, un dictionnaire contenant
+              la première place occupée (`rank`), le score (`score`), le nombre moyen de
+              gagnants (`expected_winners`), le montant versé à ce score (`payout`) et le
+              gain d'un gagnant (`payout_per_winner`).
+
+    Exemple:
+        >>> expected_rank_payouts({80: 2, 60: 1}, 1000)[0]["payout_per_winner"]
+        416.66...
+    """
+    levels = []
+    position = 0
+
+    for score in sorted(expected_counts, reverse=True):
+        count = expected_counts[score]
+        if score < 10 or count <= 0:
+            continue
+        if position >= limit:
+            break
+        share = sum(
+            share_gain.get(level, 0)
+            * max(0, min(position + count, level) - max(position, level - 1))
+            for level in range(1, limit + 1)
+        )
+        levels.append([position + 1, score, count, reward_price * share])
+        position += count
+
+    total_distributed = sum(payout for _, _, _, payout in levels)
+    scale = reward_price / total_distributed if total_distributed else 1
+
+    return [
+        {
+            "rank": float(rank),
+            "score": score,
+            "expected_winners": float(count),
+            "payout": float(payout * scale),
+            "payout_per_winner": float(payout * scale / count),
+        }
+        for rank, score, count, payout in levels
+    ]
+
+
+def estimate_score_distribution(format_counts, reward_price, limit=10):
+    """
+    Estime exactement la distribution des scores et l'exposition aux gains d'un tirage.
+
+    Aucun tirage n'est énuméré : pour chaque format de ticket, la distribution des
+    classes de résultat sur les `C(49, 5) x C(9, 2)` tirages possibles est obtenue par
+    dénombrement hypergéométrique (`class_draw_counts`), puis pondérée par le nombre de
+    tickets du format. Le temps de calcul ne dépend que du nombre de formats.
+
+    Les nombres moyens de tickets par score sont exacts. Le classement et les gains
+    (`expected_rank_payouts`) sont ceux du tirage « moyen » : l'espérance exacte du
+    nombre de gagnants par rang dépend des numéros communs aux tickets et n'a pas de
+    forme close, la simulation (`summarize_simulation`) en donne la distribution.
+
+    Paramètres:
+        format_counts (dict): Un dictionnaire associant un format
+                              `(nombre de numéros, nombre de numéros chance)` au
+                              nombre de tickets de ce format.
+        reward_price (float): Le montant total de la récompense.
+        limit (int): Le nombre de places à partir duquel le classement est clos.
+
+    Retourne:
+        dict: Un rapport contenant :
+            - draws: le nombre de tirages possibles.
+            - tickets: le nombre de tickets.
+            - ticket_formats: pour chaque format, son nombre de tickets et la
+              distribution de ses classes (`ticket_format_classes`).
+            - expected_tickets_per_score: le nombre moyen de tickets par score.
+            - expected_winners_per_rank: le classement du tirage moyen
+              (`expected_rank_payouts`).
+            - payout_exposure: le nombre moyen de joueurs payés et de tickets ayant tout
+              trouvé, le meilleur score moyen classé et le gain d'un joueur à ce score.
+    """
+    expected_counts = expected_score_counts(format_counts)
+    ranking = expected_rank_payouts(expected_counts, reward_price, limit)
+
+    return {
+        "draws": DRAW_COUNT,
+        "tickets": sum(format_counts.values()),
+        "ticket_formats": [
+            {
+                "numbers": number_count,
+                "lucky_numbers": star_count,
+                "tickets": tickets,
+                "classes": ticket_format_classes(number_count, star_count),
+            }
+            for (number_count, star_count), tickets in sorted(format_counts.items())
+        ],
+        "expected_tickets_per_score": {
+            score: float(count) for score, count in sorted(expected_counts.items())
+        },
+        "expected_winners_per_rank": ranking,
+        "payout_exposure": {
+            "expected_paid_players": sum(
+                level["expected_winners"] for level in ranking
+            ),
+            "expected_jackpot_winners": float(expected_counts.get(100, 0)),
+            "top_score": ranking[0]["score"] if ranking else None,
+            "top_prize_per_winner": (
+                ranking[0]["payout_per_winner"] if ranking else 0.0
+            ),
+        },
+    }
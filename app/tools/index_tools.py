@@ -0,0 +1,90 @@
+from enum import Enum
+import numpy as np
+
+
+class PostingKind(Enum):
+    """
+    Enumération des listes d'inscriptions de l'index inversé d'un tirage.
+
+    Attributs:
+        NUMBER (str): Inscriptions contenant un numéro donné (1 à 49).
+        LUCKY (str): Inscriptions contenant un numéro chance donné (1 à 9).
+        IRREGULAR (str): Inscriptions qui ne sont pas au format standard
+                         (5 numéros et 2 numéros chance), rangées sous le numéro 0.
+        BUILT (str): Ligne témoin, sans inscription, rangée sous le numéro 0 : sa
+                     présence indique que l'index du tirage couvre toutes ses
+                     inscriptions.
+
+    Exemple:
+        >>> PostingKind.NUMBER.value
+        'number'
+    """
+
+    NUMBER = "number"
+    LUCKY = "lucky"
+    IRREGULAR = "irregular"
+    BUILT = "built"
+
+
+def encode_postings(entry_ids, previous_id=0):
+    """
+    Compresse une liste croissante d'identifiants d'inscriptions.
+
+    Chaque identifiant est remplacé par son écart avec le précédent, puis l'écart est
+    écrit en entier de longueur variable (7 bits par octet, le bit de poids fort indiquant
+    qu'un octet suit). Un identifiant coûte ainsi le plus souvent un seul octet.
+    En passant le dernier identifiant déjà encodé dans `previous_id`, le résultat peut
+    être concaténé à une liste existante.
+
+    Paramètres:
+        entry_ids (iterable): Les identifiants, strictement croissants et supérieurs
+                              à `previous_id`.
+        previous_id (int): Le dernier identifiant de la liste à compléter.
+
+    Retourne:
+        bytes: La liste compressée.
+
+    Exemple:
+        >>> encode_postings([3, 5, 300])
+        b'\\x03\\x02\\xa7\\x02'
+    """
+    data = bytearray()
+    for entry_id in entry_ids:
+        delta = entry_id - previous_id
+        if delta <= 0:
+            raise ValueError("Les identifiants doivent être strictement croissants.")
+        while delta >= 0x80:
+            data.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        data.append(delta)
+        previous_id = entry_id
+    return bytes(data)
+
+
+def decode_postings(data):
+    """
+    Décompresse une liste d'identifiants produite par `encode_postings`.
+
+    Le décodage est vectorisé : les octets de fin de chaque entier sont repérés en une
+    passe, les groupes de 7 bits sont recomposés par `np.add.reduceat` et les
+    identifiants sont retrouvés par somme cumulée des écarts.
+
+    Paramètres:
+        data (bytes): La liste compressée.
+
+    Retourne:
+        numpy.ndarray: Les identifiants (`int64`), dans l'ordre croissant.
+
+    Exemple:
+        >>> decode_postings(b'\\x03\\x02\\xa7\\x02').tolist()
+        [3, 5, 300]
+    """
+    raw = np.frombuffer(data or b"", dtype=np.uint8)
+    if raw.size == 0:
+        return np.empty(0, dtype=np.int64)
+
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    positions = np.arange(raw.size) - np.repeat(starts, ends - starts + 1)
+    chunks = (raw & 0x7F).astype(np.int64) << (7 * positions)
+    return np.cumsum(np.add.reduceat(chunks, starts))
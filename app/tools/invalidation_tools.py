@@ -0,0 +1,144 @@
+import os
+import tempfile
+import threading
+import time
+
+
+class InvalidationChannel:
+    """
+    Canal d'invalidation partagé entre les processus d'un même serveur.
+
+    Le canal est un fichier en ajout seul : chaque clé invalidée y est écrite sur
+    une ligne avec sa date de publication, en une seule écriture (`O_APPEND`), et
+    chaque processus relit les lignes ajoutées depuis sa dernière lecture. Une
+    lecture sans nouvelle ligne ne coûte qu'un appel à `os.stat`. Le fichier peut
+    être vidé ou remplacé à tout moment : les processus qui le remarquent doivent
+    alors vider leur cache.
+
+    Avec `max_age`, le fichier est remplacé par un fichier vide à la première
+    publication qui suit l'expiration de sa plus ancienne ligne : il ne grandit pas
+    indéfiniment, et les caches ne sont vidés qu'une fois par période.
+
+    Attributs:
+        path (str): Le chemin du fichier du canal.
+        max_age (float): L'âge en secondes au-delà duquel le fichier est remplacé,
+                         ou `None` pour ne jamais le remplacer.
+
+    Exemple:
+        >>> channel = InvalidationChannel("token_revocations.log")
+        >>> channel.poll()
+        []
+        >>> InvalidationChannel("token_revocations.log").publish("9f86d0")
+        >>> channel.poll()
+        ['9f86d0']
+    """
+
+    def __init__(self, path, max_age=None):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._file_id = None
+        self._offset = None
+
+    def _stat(self):
+        """Identifiant et taille du fichier, ou (None, 0) s'il n'existe pas."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None, 0
+        return (stat.st_dev, stat.st_ino), stat.st_size
+
+    def _expired(self):
+        """
+        Indique si la première ligne du fichier a été publiée il y a plus de
+        `max_age` secondes. Une ligne sans date (ancien format) est expirée.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                first_line = file.readline(256)
+        except FileNotFoundError:
+            return False
+        if not first_line.endswith(b"\n"):
+            return False
+        try:
+            published = float(first_line.split()[1])
+        except (IndexError, ValueError):
+            return True
+        return time.time() - published > self.max_age
+
+    def _rotate(self):
+        """
+        Remplace le fichier par un fichier vide, sous un nouvel identifiant : les
+        lecteurs le remarquent à leur lecture suivante (`poll` retourne `None`).
+        """
+        descriptor, temporary = tempfile.mkstemp(
+            dir=os.path.dirname(self.path) or ".",
+            prefix=f"{os.path.basename(self.path)}.",
+        )
+        os.close(descriptor)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, self.path)
+
+    def publish(self, key):
+        """
+        Publie l'invalidation d'une clé à tous les processus.
+
+        Le fichier est d'abord remplacé si sa plus ancienne ligne a plus de
+        `max_age` secondes. Une ligne écrite dans un fichier remplacé entre-temps
+        par un autre processus est écrite à nouveau dans le fichier courant.
+
+        Paramètres:
+            key (str): La clé invalidée, sans espace ni retour à la ligne.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.max_age is not None and self._expired():
+            self._rotate()
+
+        line = f"{key} {time.time():.0f}\n".encode("utf-8")
+        while True:
+            descriptor = os.open(
+                self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+            try:
+                os.write(descriptor, line)
+                stat = os.fstat(descriptor)
+            finally:
+                os.close(descriptor)
+            if self._stat()[0] == (stat.st_dev, stat.st_ino):
+                return
+
+    def poll(self):
+        """
+        Retourne les clés publiées depuis la lecture précédente.
+
+        La première lecture ne retourne rien : le cache d'un processus qui démarre
+        est vide, les invalidations passées ne le concernent pas.
+
+        Retourne:
+            list | None: Les clés invalidées, dans l'ordre de publication, ou
+                         `None` si le fichier a été vidé ou remplacé.
+        """
+        file_id, size = self._stat()
+        with self._lock:
+            if self._offset is None:
+                self._file_id, self._offset = file_id, size
+                return []
+            if self._file_id is None and file_id is not None:
+                self._file_id, self._offset = file_id, 0
+            if file_id != self._file_id or size < self._offset:
+                self._file_id, self._offset = file_id, size
+                return None
+            if size == self._offset:
+                return []
+            with open(self.path, "rb") as file:
+                file.seek(self._offset)
+                data = file.read(size - self._offset)
+            complete = data.rfind(b"\n") + 1
+            self._offset += complete
+            return [
+                line.split()[0]
+                for line in data[:complete].decode("utf-8").splitlines()
+                if line.strip()
+            ]
@@ -0,0 +1,58 @@
+from enum import Enum
+
+
+class JobStatus(Enum):
+    """
+    Enumération représentant les différents statuts d'une tâche de fond.
+
+    Attributs:
+        PENDING (str): La tâche attend qu'un processus de travail la prenne en charge.
+
+        RUNNING (str): La tâche est en cours d'exécution. Une tâche dont le dernier
+                       signe de vie est trop ancien est reprise par un autre processus.
+
+        DONE (str): La tâche est terminée.
+
+        FAILED (str): La tâche a échoué ; l'erreur est conservée avec la tâche.
+
+    Exemple:
+        >>> JobStatus.PENDING.value
+        'PENDING'
+    """
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class JobStage(Enum):
+    """
+    Enumération représentant les étapes successives de la validation d'un tirage.
+    L'annonce d'un tirage passe directement de `QUEUED` à `NOTIFIED`.
+
+    Chaque étape est enregistrée dès qu'elle est terminée : une tâche reprise après
+    l'arrêt de son processus repart de la dernière étape enregistrée.
+
+    Attributs:
+        QUEUED (str): La tâche n'a pas encore commencé.
+
+        FETCHED (str): Les inscriptions du tirage ont été comptées.
+
+        SCORED (str): Le classement et les gains ont été calculés.
+
+        PERSISTED (str): Le résultat, le classement et le statut du tirage ont été
+                         enregistrés dans une seule transaction.
+
+        NOTIFIED (str): Les emails des gagnants ont été placés dans la file d'envoi.
+
+    Exemple:
+        >>> JobStage.SCORED.value
+        'SCORED'
+    """
+
+    QUEUED = "QUEUED"
+    FETCHED = "FETCHED"
+    SCORED = "SCORED"
+    PERSISTED = "PERSISTED"
+    NOTIFIED = "NOTIFIED"
@@ -0,0 +1,203 @@
+import numpy as np
+from app.tools.rank_tools import score_table, build_rank_counts, build_ranking
+
+# Taille d'un tirage complet : 5 numéros et 2 numéros chance.
+LIVE_DRAW_NUMBER_COUNT = 5
+LIVE_DRAW_STAR_COUNT = 2
+
+
+class LiveLeaderboard:
+    """
+    Classement provisoire d'un tirage dont les numéros sont dévoilés un par un.
+
+    Chaque ticket garde son nombre de numéros et de numéros chance trouvés. Le score
+    provisoire est celui qu'aurait le ticket si aucun autre de ses numéros n'était
+    tiré : il est lu dans `score_table` pour un tirage complet, ne peut qu'augmenter
+    au fil des numéros et vaut le score final une fois les 7 numéros dévoilés.
+
+    Un numéro dévoilé ne modifie que les tickets qui le contiennent, fournis par
+    l'appelant (liste de l'index inversé). Le nombre de tickets par score est mis à
+    jour pour ces seuls tickets, ce qui donne le score limite du classement ; seuls
+    les tickets ayant au moins ce score sont gardés, par score. Le score limite ne
+    pouvant qu'augmenter, un ticket non modifié n'a jamais à entrer dans le classement.
+    Le coût d'un numéro est donc proportionnel au nombre de tickets qui le contiennent.
+
+    Attributs:
+        numbers (list): Les numéros dévoilés, dans l'ordre.
+        lucky_numbers (list): Les numéros chance dévoilés, dans l'ordre.
+
+    Exemple:
+        >>> board = LiveLeaderboard(entry_ids, user_ids, number_counts, star_counts)
+        >>> board.reveal_number(7, entries_containing_7)
+        >>> board.ranking()
+    """
+
+    def __init__(self, entry_ids, user_ids, number_counts, star_counts, limit=10):
+        entry_ids = np.asarray(entry_ids, dtype=np.int64)
+        order = np.argsort(entry_ids, kind="stable")
+
+        self.numbers = []
+        self.lucky_numbers = []
+        self._limit = limit
+        self._entry_ids = entry_ids[order]
+        self._user_ids = np.asarray(user_ids, dtype=np.int64)[order]
+        self._matches = np.zeros(len(order), dtype=np.int64)
+        self._star_matches = np.zeros(len(order), dtype=np.int64)
+
+        number_counts = np.asarray(number_counts, dtype=np.int64)[order]
+        star_counts = np.asarray(star_counts, dtype=np.int64)[order]
+        formats, self._formats = np.unique(
+            number_counts * 64 + star_counts, return_inverse=True
+        )
+        self._tables = np.zeros(
+            (len(formats), LIVE_DRAW_NUMBER_COUNT + 1, LIVE_DRAW_STAR_COUNT + 1),
+            dtype=np.int64,
+        )
+        for index, (number_count, star_count) in enumerate(
+            zip(formats // 64, formats % 64)
+        ):
+            table = np.array(
+                score_table(
+                    LIVE_DRAW_NUMBER_COUNT,
+                    LIVE_DRAW_STAR_COUNT,
+                    int(number_count),
+                    int(star_count),
+                )
+            )
+            rows = min(int(number_count), LIVE_DRAW_NUMBER_COUNT) + 1
+            columns = min(int(star_count), LIVE_DRAW_STAR_COUNT) + 1
+            self._tables[index, :rows, :columns] = table[:rows, :columns]
+
+        self._scores = np.zeros(len(order), dtype=np.int64)
+        self._histogram = np.bincount(self._scores, minlength=101)
+        self._floor = 101
+        self._leaders = {}
+        self._ranking = None
+
+    @property
+    def complete(self):
+        """
+        Indique si tous les numéros du tirage ont été dévoilés.
+        """
+        return (
+            len(self.numbers) == LIVE_DRAW_NUMBER_COUNT
+            and len(self.lucky_numbers) == LIVE_DRAW_STAR_COUNT
+        )
+
+    def reveal_number(self, number, entry_ids):
+        """
+        Dévoile un numéro du tirage.
+
+        Paramètres:
+            number (int): Le numéro dévoilé.
+            entry_ids (numpy.ndarray): Les identifiants triés des inscriptions qui le
+                                       contiennent. Les identifiants inconnus sont ignorés.
+        """
+        positions = self._positions(entry_ids)
+        self._matches[positions] += 1
+        self.numbers.append(number)
+        self._update(positions)
+
+    def reveal_lucky_number(self, number, entry_ids):
+        """
+        Dévoile un numéro chance du tirage.
+
+        Paramètres:
+            number (int): Le numéro chance dévoilé.
+            entry_ids (numpy.ndarray): Les identifiants triés des inscriptions qui le
+                                       contiennent. Les identifiants inconnus sont ignorés.
+        """
+        positions = self._positions(entry_ids)
+        self._star_matches[positions] += 1
+        self.lucky_numbers.append(number)
+        self._update(positions)
+
+    def _positions(self, entry_ids):
+        """
+        Retourne la position des inscriptions connues parmi `entry_ids`.
+        """
+        entry_ids = np.asarray(entry_ids, dtype=np.int64)
+        if len(self._entry_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        positions = np.minimum(
+            np.searchsorted(self._entry_ids, entry_ids), len(self._entry_ids) - 1
+        )
+        return positions[self._entry_ids[positions] == entry_ids]
+
+    def _update(self, positions):
+        """
+        Met à jour les scores, le nombre de tickets par score et les tickets classés
+        pour les seuls tickets modifiés.
+        """
+        previous = self._scores[positions]
+        scores = self._tables[
+            self._formats[positions],
+            self._matches[positions],
+            self._star_matches[positions],
+        ]
+        self._scores[positions] = scores
+        self._histogram += np.bincount(scores, minlength=101) - np.bincount(
+            previous, minlength=101
+        )
+
+        moved = previous >= self._floor
+        for position, score in zip(positions[moved].tolist(), previous[moved].tolist()):
+            self._leaders[score].discard(position)
+
+        rank_counts = build_rank_counts(
+            {
+                int(score): int(self._histogram[score])
+                for score in np.flatnonzero(self._histogram[10:]) + 10
+            },
+            self._limit,
+        )
+        self._floor = (
+            min(score for _, score in rank_counts.values()) if rank_counts else 101
+        )
+
+        for position in positions[scores >= self._floor].tolist():
+            self._leaders.setdefault(int(self._scores[position]), set()).add(position)
+        for score in list(self._leaders):
+            if score < self._floor or not self._leaders[score]:
+                del self._leaders[score]
+        self._ranking = None
+
+    def ranking(self):
+        """
+        Retourne le classement provisoire.
+
+        Les ex aequo sont rangés par identifiant d'inscription : une fois le tirage
+        complet, le classement est celui de `structure_scores` appliqué aux inscriptions
+        triées par identifiant. Le classement est mis en cache jusqu'au numéro suivant.
+
+        Retourne:
+            dict: Le classement au format `{rang: [identifiants, score]}`.
+        """
+        if self._ranking is None:
+            self._ranking = build_ranking(
+                {
+                    score: self._user_ids[np.sort(list(positions))].tolist()
+                    for score, positions in self._leaders.items()
+                },
+                self._limit,
+            )
+        return self._ranking
+
+    def leaderboard(self):
+        """
+        Retourne l'état du tirage en direct et son classement provisoire.
+
+        Retourne:
+            dict: Les numéros dévoilés (`numbers`, `lucky_numbers`), l'indicateur de
+                  tirage complet (`complete`) et, pour chaque rang du classement, le
+                  score et les identifiants des joueurs (`ranking`).
+        """
+        return {
+            "numbers": list(self.numbers),
+            "lucky_numbers": list(self.lucky_numbers),
+            "complete": self.complete,
+            "ranking": [
+                {"rank": rank, "score": score, "player_ids": players}
+                for rank, (players, score) in self.ranking().items()
+            ],
+        }
@@ -0,0 +1,76 @@
+def numbers_to_mask(numbers):
+    """
+    Convertit une liste de numéros en masque binaire.
+
+    Le numéro `n` est représenté par le bit `n` du masque, ce qui permet de calculer
+    intersections et unions avec des opérations bit à bit. Les doublons sont ignorés,
+    comme avec un ensemble. Les numéros de 1 à 49 tiennent dans un entier de 64 bits,
+    les numéros chance de 1 à 9 dans un entier de 16 bits. Une valeur absente ou vide
+    (`None`, "") donne le masque 0, comme la migration des masques existants.
+
+    Paramètres:
+        numbers (str | iterable | None): Les numéros, sous forme de chaîne séparée par
+                                         des virgules ("1,2,3") ou d'itérable
+                                         d'entiers.
+
+    Retourne:
+        int: Le masque binaire correspondant.
+
+    Exemple:
+        >>> numbers_to_mask("1,3")
+        10
+        >>> numbers_to_mask(None)
+        0
+    """
+    if numbers is None:
+        return 0
+    if isinstance(numbers, str):
+        numbers = [number for number in numbers.split(",") if number.strip()]
+
+    mask = 0
+    for number in numbers:
+        mask |= 1 << int(number)
+    return mask
+
+
+def mask_to_numbers(mask):
+    """
+    Convertit un masque binaire en liste triée de numéros.
+
+    Paramètres:
+        mask (int): Le masque binaire.
+
+    Retourne:
+        list: Les numéros dont le bit est positionné, dans l'ordre croissant.
+
+    Exemple:
+        >>> mask_to_numbers(10)
+        [1, 3]
+    """
+    return [number for number in range(mask.bit_length()) if mask >> number & 1]
+
+
+def ticket_masks(participant):
+    """
+    Retourne les masques des numéros et des numéros chance d'un ticket.
+
+    Les masques stockés sur l'inscription (`numbers_mask` et `lucky_numbers_mask`)
+    sont utilisés lorsqu'ils sont renseignés, sinon ils sont calculés à partir des
+    chaînes `numbers` et `lucky_numbers`.
+
+    Paramètres:
+        participant (object): Un objet possédant les attributs `numbers` et
+                              `lucky_numbers`, et éventuellement les masques.
+
+    Retourne:
+        tuple: Un tuple `(numbers_mask, lucky_numbers_mask)`.
+    """
+    numbers_mask = getattr(participant, "numbers_mask", None)
+    lucky_numbers_mask = getattr(participant, "lucky_numbers_mask", None)
+
+    if numbers_mask is None:
+        numbers_mask = numbers_to_mask(participant.numbers)
+    if lucky_numbers_mask is None:
+        lucky_numbers_mask = numbers_to_mask(participant.lucky_numbers)
+
+    return numbers_mask, lucky_numbers_mask
@@ -0,0 +1,130 @@
+import numpy as np
+from app.tools.rank_tools import build_ranking, NUMBER_WEIGHT, STAR_WEIGHT
+from app.tools.mask_tools import numbers_to_mask, ticket_masks
+
+
+def load_ticket_arrays(participants):
+    """
+    Charge les tickets des participants dans des tableaux NumPy compacts.
+
+    Chaque ticket est représenté par une ligne dans trois tableaux alignés : l'identifiant
+    du joueur, le masque de ses numéros (`uint64`) et le masque de ses numéros chance
+    (`uint16`). Les masques stockés sur les inscriptions sont repris tels quels.
+    L'ordre des participants est conservé.
+
+    Paramètres:
+        participants (list): Une liste d'objets participants possédant les attributs
+                             `user_id`, `numbers` et `lucky_numbers`.
+
+    Retourne:
+        tuple: Un tuple `(user_ids, number_masks, star_masks)` de tableaux NumPy.
+    """
+    count = len(participants)
+    user_ids = np.empty(count, dtype=np.int64)
+    number_masks = np.empty(count, dtype=np.uint64)
+    star_masks = np.empty(count, dtype=np.uint16)
+
+    for index, participant in enumerate(participants):
+        user_ids[index] = participant.user_id
+        number_masks[index], star_masks[index] = ticket_masks(participant)
+
+    return user_ids, number_masks, star_masks
+
+
+def _jaccard(masks, draw_mask):
+    """
+    Calcule la similarité de Jaccard de chaque masque avec le masque du tirage.
+    """
+    intersection = np.bitwise_count(masks & draw_mask).astype(np.float64)
+    union = np.bitwise_count(masks | draw_mask).astype(np.float64)
+    return np.divide(
+        intersection, union, out=np.zeros(len(masks), dtype=np.float64), where=union > 0
+    )
+
+
+def compute_scores(number_masks, star_masks, draw_numbers, draw_stars):
+    """
+    Calcule en une seule passe le score de Jaccard pondéré de tous les tickets.
+
+    Les opérations flottantes sont effectuées dans le même ordre que
+    `calculate_jaccard_similarity` et l'arrondi au pair le plus proche de `np.rint`
+    est celui de `round`, les scores obtenus sont donc identiques.
+
+    Paramètres:
+        number_masks (numpy.ndarray): Les masques des numéros des tickets.
+        star_masks (numpy.ndarray): Les masques des numéros chance des tickets.
+        draw_numbers (iterable): Les numéros du tirage.
+        draw_stars (iterable): Les étoiles du tirage.
+
+    Retourne:
+        numpy.ndarray: Le score (entre 0 et 100) de chaque ticket.
+    """
+    number_similarity = _jaccard(
+        number_masks, number_masks.dtype.type(numbers_to_mask(draw_numbers))
+    )
+    star_similarity = _jaccard(
+        star_masks, star_masks.dtype.type(numbers_to_mask(draw_stars))
+    )
+
+    final_similarity = (
+        number_similarity * NUMBER_WEIGHT + star_similarity * STAR_WEIGHT
+    ) * 100
+    return np.rint(final_similarity).astype(np.int64)
+
+
+def structure_scores_numpy(participants, draw_numbers, draw_stars, limit=10):
+    """
+    Variante vectorisée de `structure_scores`.
+
+    Les tickets sont chargés dans des tableaux NumPy puis tous les scores sont calculés
+    en une seule opération. Seuls les groupes de scores nécessaires pour atteindre
+    `limit` joueurs classés sont ensuite matérialisés en listes Python.
+
+    Paramètres:
+        participants (list): Une liste d'objets participants, où chaque objet contient
+                             un identifiant d'utilisateur et les numéros et étoiles du joueur.
+        draw_numbers (iterable): Les numéros du tirage (peut être une liste ou un ensemble).
+        draw_stars (iterable): Les étoiles du tirage (peut être une liste ou un ensemble).
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+
+    Retourne:
+        dict: Le même classement que `structure_scores`, au format
+              `{rang: [identifiants, score]}`.
+    """
+    user_ids, number_masks, star_masks = load_ticket_arrays(participants)
+    return rank_ticket_arrays(
+        user_ids, number_masks, star_masks, draw_numbers, draw_stars, limit
+    )
+
+
+def rank_ticket_arrays(
+    user_ids, number_masks, star_masks, draw_numbers, draw_stars, limit=10
+):
+    """
+    Calcule le classement de tickets déjà chargés dans des tableaux alignés.
+
+    Paramètres:
+        user_ids (numpy.ndarray): Les identifiants des joueurs, dans l'ordre des tickets.
+        number_masks (numpy.ndarray): Les masques des numéros (`uint64`).
+        star_masks (numpy.ndarray): Les masques des numéros chance (`uint16`).
+        draw_numbers (iterable): Les numéros du tirage.
+        draw_stars (iterable): Les étoiles du tirage.
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+
+    Retourne:
+        dict: Le classement au format `{rang: [identifiants, score]}`, les ex aequo
+              étant rangés dans l'ordre des tickets.
+    """
+    scores = compute_scores(number_masks, star_masks, draw_numbers, draw_stars)
+
+    scores_dict = {}
+    total_ranked = 0
+
+    for score in np.unique(scores[scores >= 10])[::-1]:
+        if total_ranked >= limit:
+            break
+        players = np.asarray(user_ids)[scores == score].tolist()
+        scores_dict[int(score)] = players
+        total_ranked += len(players)
+
+    return build_ranking(scores_dict, limit)
@@ -0,0 +1,135 @@
+import smtplib
+import threading
+import time
+from enum import Enum
+
+
+class OutboxStatus(Enum):
+    """
+    Enumération représentant les différents statuts d'un email de la file d'envoi.
+
+    Attributs:
+        PENDING (str): L'email attend son envoi, au plus tôt à sa date de disponibilité.
+
+        SENDING (str): L'email est réservé par un processus d'envoi. Un email dont la
+                       réservation a expiré est repris par un autre processus.
+
+        SENT (str): L'email a été accepté par le serveur SMTP.
+
+        DEAD (str): L'email a été refusé définitivement ou a épuisé ses tentatives ;
+                    il n'est plus envoyé sauf s'il est remis en attente.
+
+    Exemple:
+        >>> OutboxStatus.PENDING.value
+        'PENDING'
+    """
+
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    DEAD = "DEAD"
+
+
+def retry_delay(attempts, base_seconds, max_seconds=3600):
+    """
+    Calcule le délai avant une nouvelle tentative d'envoi, doublé à chaque échec.
+
+    Paramètres:
+        attempts (int): Le nombre de tentatives déjà effectuées (au moins 1).
+        base_seconds (float): Le délai après le premier échec.
+        max_seconds (float): Le délai maximal.
+
+    Retourne:
+        float: Le délai en secondes.
+
+    Exemple:
+        >>> retry_delay(3, 60)
+        240
+    """
+    return min(base_seconds * 2 ** (attempts - 1), max_seconds)
+
+
+def is_permanent_smtp_error(error):
+    """
+    Indique si une erreur d'envoi est définitive, c'est-à-dire qu'un nouvel essai
+    échouerait de la même façon (adresse refusée, réponse SMTP 5xx).
+
+    Paramètres:
+        error (Exception): L'erreur levée lors de l'envoi.
+
+    Retourne:
+        bool: `True` si l'erreur est définitive.
+
+    Exemple:
+        >>> is_permanent_smtp_error(smtplib.SMTPRecipientsRefused({}))
+        True
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+def stagger_offsets(count, window_seconds):
+    """
+    Répartit régulièrement des envois sur une fenêtre de temps.
+
+    Le premier envoi part immédiatement et les suivants sont espacés de
+    `window_seconds / count` secondes : le débit d'arrivée attendu est de
+    `count / window_seconds` envois par seconde. Une fenêtre nulle fait partir tous
+    les envois immédiatement.
+
+    Paramètres:
+        count (int): Le nombre d'envois.
+        window_seconds (float): La durée de la fenêtre, en secondes.
+
+    Retourne:
+        list: Le délai de chaque envoi depuis le début de la fenêtre, en secondes,
+              dans l'ordre des envois.
+
+    Exemple:
+        >>> stagger_offsets(4, 60)
+        [0.0, 15.0, 30.0, 45.0]
+    """
+    if count <= 0:
+        return []
+    if window_seconds <= 0:
+        return [0.0] * count
+    return [index * window_seconds / count for index in range(count)]
+
+
+class RateLimiter:
+    """
+    Limite le nombre d'opérations par seconde en espaçant régulièrement les appels.
+
+    Chaque appel à `wait` réserve le créneau suivant et attend son heure. Un débit nul
+    ou négatif désactive la limite.
+
+    Attributs:
+        rate (float): Le nombre maximal d'opérations par seconde.
+
+    Exemple:
+        >>> limiter = RateLimiter(10)
+        >>> for message in messages:
+        ...     limiter.wait()
+        ...     send(message)
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Attend le prochain créneau disponible.
+        """
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + 1 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
@@ -1,13 +1,133 @@
-import base64
-import pdfkit
-from flask import render_template, make_response
+import hashlib
+import json
+import threading
+from flask import render_template, Response
 from app import Config
 import random
 import os
-import qrcode
-from io import BytesIO
+from .render_tools import PdfRendererPool
+from .pdf_writer_tools import PdfPage, wrap_text, text_width
+from .qr_tools import cached_qr_code
 
-pdf_config = pdfkit.configuration(wkhtmltopdf=Config.PATH_WHHTMLTOPDF)
+# Feuille de style des PDF, lue une fois au démarrage et incluse dans le HTML rendu :
+# wkhtmltopdf n'a ainsi aucun fichier local à lire.
+PDF_CSS_PATH = Config.PDF_CSS_PATH or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "static", "pdf.css"
+)
+with open(PDF_CSS_PATH, encoding="utf-8") as css_file:
+    PDF_CSS = css_file.read()
+
+# Empreinte du modèle et de la feuille de style des PDF : une modification de l'un
+# ou de l'autre change l'empreinte de tous les PDF déjà générés.
+with open(
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "pdf.html"),
+    "rb",
+) as template_file:
+    PDF_TEMPLATE_DIGEST = hashlib.sha256(
+        template_file.read() + PDF_CSS.encode("utf-8")
+    ).hexdigest()
+
+# Version de la mise en page écrite par `write_reward_pdf`, reprise de `pdf.html` et
+# `pdf.css` : à incrémenter à chaque modification pour changer l'empreinte des PDF.
+NATIVE_LAYOUT_VERSION = 1
+
+# Réserve de processus wkhtmltopdf de ce processus, créée au premier rendu.
+_renderer = None
+_lock = threading.Lock()
+
+
+def get_pdf_renderer():
+    """
+    Retourne la réserve de processus wkhtmltopdf du processus courant.
+
+    La réserve est créée au premier appel à partir de la configuration
+    (`Config.PDF_RENDER_WARM`, `Config.PDF_RENDER_CONCURRENCY`).
+
+    Returns:
+        PdfRendererPool: La réserve partagée par les requêtes du processus.
+    """
+    global _renderer
+    with _lock:
+        if _renderer is None:
+            _renderer = PdfRendererPool.from_config()
+        return _renderer
+
+
+def reward_pdf_digest(user_name, reward, draw_name):
+    """
+    Calcule l'empreinte du PDF de récompense d'un utilisateur.
+
+    Le PDF ne dépend que du nom de l'utilisateur, du montant arrondi de la
+    récompense, du nom du tirage, du modèle (`PDF_TEMPLATE_DIGEST`) et du moteur de
+    rendu (`Config.PDF_BACKEND`) : deux PDF de même empreinte ont le même contenu.
+
+    Args:
+        user_name (str): Le nom de l'utilisateur qui a gagné.
+        reward (float): Le montant de la récompense gagnée.
+        draw_name (str): Le nom du tirage auquel l'utilisateur a participé.
+
+    Returns:
+        str: L'empreinte SHA-256, en hexadécimal.
+
+    Example:
+        reward_pdf_digest("John Doe", 12.5, "Tirage du vendredi")  # "9f86d0..."
+    """
+    content = json.dumps(
+        [
+            PDF_TEMPLATE_DIGEST,
+            Config.PDF_BACKEND,
+            NATIVE_LAYOUT_VERSION,
+            user_name,
+            round(reward, 2),
+            draw_name,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def reward_qr_data(user_name, reward, draw_name):
+    """
+    Retourne le texte du code QR d'un PDF de récompense.
+
+    Args:
+        user_name (str): Le nom de l'utilisateur qui a gagné.
+        reward (float): Le montant arrondi de la récompense.
+        draw_name (str): Le nom du tirage.
+
+    Returns:
+        str: Le texte encodé dans le code QR.
+    """
+    return f"Récompense: {reward} | Tirage: {draw_name} | Utilisateur: {user_name}"
+
+
+def render_pdf_html(user_name, reward, draw_name):
+    """
+    Construit le document HTML d'une récompense, feuille de style et code QR inclus.
+
+    Le code QR est inclus en image SVG (voir `cached_qr_code`), sans image PNG
+    encodée en base64.
+
+    Args:
+        user_name (str): Le nom de l'utilisateur qui a gagné.
+        reward (float): Le montant de la récompense gagnée.
+        draw_name (str): Le nom du tirage auquel l'utilisateur a participé.
+
+    Returns:
+        str: Le document HTML, sans référence à un fichier local.
+    """
+    reward = round(reward, 2)
+    qr_code = cached_qr_code(reward_qr_data(user_name, reward, draw_name))
+
+    return render_template(
+        "pdf.html",
+        user_name=user_name,
+        id=generate_id(),
+        reward=reward,
+        draw_name=draw_name,
+        css=PDF_CSS,
+        qr_code=qr_code.svg_uri,
+    )
 
 
 def generate_pdf(user_name, reward, draw_name):
@@ -16,8 +136,9 @@ def generate_pdf(user_name, reward, draw_name):
 
     Cette fonction crée un PDF à partir d'un modèle HTML qui contient des informations
     sur la récompense de l'utilisateur, le nom du tirage, ainsi qu'un code QR
-    représentant ces informations. Le PDF est ensuite retourné en tant que réponse
-    HTTP, prêt à être téléchargé par l'utilisateur.
+    représentant ces informations. Le rendu est confié au moteur choisi par
+    `Config.PDF_BACKEND` (voir `get_pdf_backend`) et le PDF est envoyé par blocs dans
+    la réponse HTTP, prêt à être téléchargé par l'utilisateur.
 
     Args:
         user_name (str): Le nom de l'utilisateur qui a gagné.
@@ -28,51 +149,21 @@ def generate_pdf(user_name, reward, draw_name):
         response: Un objet de réponse Flask contenant le PDF à télécharger.
 
     Raises:
+        TimeoutError: Si trop de PDF sont déjà en cours de génération.
         Exception: Si une erreur se produit lors de la génération du PDF.
     """
     try:
-        reward = round(reward, 2)
-        qr_data = (
-            f"Récompense: {reward} | Tirage: {draw_name} | Utilisateur: {user_name}"
+        stream = get_pdf_backend()(user_name, reward, draw_name)
+        return Response(
+            stream,
+            mimetype="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename=recompense_{draw_name}_{user_name}.pdf"
+            },
         )
-        qr_img = qrcode.make(qr_data)
-
-        qr_buffer = BytesIO()
-        qr_img.save(qr_buffer, format="PNG")
-        qr_buffer.seek(0)
-
-        qr_code_base64 = (
-            f"data:image/png;base64,{base64.b64encode(qr_buffer.getvalue()).decode()}"
-        )
-
-        css_path = os.path.join(os.getcwd(), "app", "static", "pdf.css")
-        render_html = render_template(
-            "pdf.html",
-            user_name=user_name,
-            id=generate_id(),
-            reward=reward,
-            draw_name=draw_name,
-            css_path=css_path,
-            qr_code=qr_code_base64,
-        )
-
-        options = {
-            "enable-local-file-access": None,
-            "no-stop-slow-scripts": None,
-        }
-
-        pdf = pdfkit.from_string(
-            render_html, False, configuration=pdf_config, options=options, css=css_path
-        )
-
-        response = make_response(pdf)
-        response.headers["Content-Type"] = "application/pdf"
-        response.headers[
-            "Content-Disposition"
-        ] = f"attachment; filename=recompense_{draw_name}_{user_name}.pdf"
-
-        return response
 
+    except TimeoutError:
+        raise
     except Exception as e:
         raise Exception(str(e))
 
@@ -88,3 +179,205 @@ def generate_id():
         str: Une chaîne représentant un identifiant aléatoire unique de 10 chiffres.
     """
     return "".join(str(n) for n in random.sample(range(50), 10))
+
+
+def render_pdf_wkhtmltopdf(user_name, reward, draw_name):
+    """
+    Rend le PDF de récompense à partir de `pdf.html` avec wkhtmltopdf.
+
+    Args:
+        user_name (str): Le nom de l'utilisateur qui a gagné.
+        reward (float): Le montant de la récompense gagnée.
+        draw_name (str): Le nom du tirage.
+
+    Returns:
+        PdfStream: Le flux du PDF, produit par un processus de `get_pdf_renderer`.
+    """
+    return get_pdf_renderer().render(render_pdf_html(user_name, reward, draw_name))
+
+
+def write_reward_pdf(user_name, reward, draw_name, certificate_id=None):
+    """
+    Écrit directement le PDF de récompense, sans rendu HTML ni processus externe.
+
+    La mise en page reprend celle de `pdf.html` et `pdf.css` (bandeau, identifiant,
+    encadré central, pied de page) en opérations de dessin PDF, avec les polices
+    standard Helvetica et Courier. Le code QR, construit une fois par
+    `cached_qr_code`, est dessiné en tracés vectoriels. Les caractères absents du
+    codage WinAnsi sont remplacés par "?".
+
+    Args:
+        user_name (str): Le nom de l'utilisateur qui a gagné.
+        reward (float): Le montant de la récompense gagnée.
+        draw_name (str): Le nom du tirage.
+        certificate_id (str, optional): L'identifiant affiché. Par défaut
+            `generate_id()`.
+
+    Returns:
+        bytes: Le document PDF.
+
+    Example:
+        pdf = write_reward_pdf("John Doe", 12.5, "Tirage du vendredi")
+    """
+    reward = round(reward, 2)
+    page = PdfPage()
+    width = page.width
+    regular, bold = "Helvetica", "Helvetica-Bold"
+    text_color = "#34495e"
+
+    page.rect(0, 0, width, page.height, "#f5f5f5")
+    page.rect(0, 0, width, 96, "#3498db")
+    page.centered_text(width / 2, 48, [("LotoApp", bold)], 27, "#ffffff")
+    page.centered_text(
+        width / 2,
+        76,
+        [("L'application de loterie la plus excitante !", regular)],
+        12,
+        "#ffffff",
+    )
+
+    id_text = f"ID : {certificate_id or generate_id()}"
+    id_width = text_width(id_text, "Courier", 10.5) + 15
+    page.rect(width - 15 - id_width, 15, id_width, 26, "#cccccc", radius=3.75)
+    page.rect(width - 14.25 - id_width, 15.75, id_width - 1.5, 24.5, "#f5f5f5", 3)
+    page.text(width - 7.5 - id_width, 32, id_text, 10.5, "#7f8c8d", "Courier")
+
+    box_width, padding = 450, 22.5
+    inner_width = box_width - 2 * padding
+    blocks = []
+
+    def paragraph(runs, size, color=text_color, gap=10):
+        """Ajoute un paragraphe centré, coupé en lignes entre deux mots."""
+        lines, line_width = [[]], 0
+        for text, font in runs:
+            for word in text.split(" "):
+                word_width = text_width(f"{word} ", font, size)
+                if lines[-1] and line_width + word_width > inner_width:
+                    lines.append([])
+                    line_width = 0
+                if lines[-1] and lines[-1][-1][1] == font:
+                    lines[-1][-1] = (f"{lines[-1][-1][0]}{word} ", font)
+                else:
+                    lines[-1].append((f"{word} ", font))
+                line_width += word_width
+        blocks.append(("text", lines, size, color, gap))
+
+    paragraph([(f"Félicitations, {user_name} !", bold)], 18, "#2c3e50", 14)
+    paragraph([("Vous avez participé au tirage :", regular), (draw_name, bold)], 13.5)
+    paragraph(
+        [("Nous sommes ravis de vous annoncer que vous avez gagné :", regular)], 13.5
+    )
+    paragraph([(f"{reward} €", bold)], 18, "#27ae60", 16)
+    blocks.append(("qr", 112.5))
+    paragraph([("Encaissement de votre gain", bold)], 14, "#000000")
+    paragraph(
+        [
+            (
+                "Pour encaisser votre gain, veuillez vous rapprocher de l'une de nos "
+                "agences. Nos agents sont là pour vous aider et vous guider dans le "
+                "processus d'encaissement.",
+                regular,
+            )
+        ],
+        13.5,
+    )
+    paragraph([("Adresse de l'agence la plus proche :", bold)], 13.5)
+    paragraph([("123 Rue des Gagnants, 75000 Paris", regular)], 13.5)
+    paragraph(
+        [("Horaires :", bold), ("Du lundi au vendredi, de 9h à 18h.", regular)], 13.5
+    )
+
+    def block_height(block):
+        """Hauteur d'un bloc de l'encadré, marge comprise."""
+        if block[0] == "qr":
+            return block[1] + 16
+        _, lines, size, _, gap = block
+        return len(lines) * size * 1.25 + gap
+
+    box_top = 96 + 37.5
+    box_height = 2 * padding + sum(block_height(block) for block in blocks)
+    page.rect(
+        (width - box_width) / 2 - 1.5,
+        box_top - 1,
+        box_width + 3,
+        box_height + 3,
+        "#e8e8e8",
+        9,
+    )
+    page.rect((width - box_width) / 2, box_top, box_width, box_height, "#ffffff", 7.5)
+
+    y = box_top + padding
+    for block in blocks:
+        if block[0] == "qr":
+            qr_code = cached_qr_code(reward_qr_data(user_name, reward, draw_name))
+            page.qr_code((width - block[1]) / 2, y, block[1], qr_code.matrix)
+        else:
+            _, lines, size, color, _ = block
+            for line_index, line in enumerate(lines):
+                runs = line[:-1] + [(line[-1][0].rstrip(), line[-1][1])]
+                baseline = y + size + line_index * size * 1.25
+                page.centered_text(width / 2, baseline, runs, size, color)
+        y += block_height(block)
+
+    footer_top = box_top + box_height + 37.5
+    page.rect(0, footer_top, width, 92, "#c7cfd6")
+    for offset, text, size in (
+        (26, "Merci d'avoir joué à LotoApp !", 13.5),
+        (
+            48,
+            "Continuez à tenter votre chance pour gagner encore plus de récompenses.",
+            13.5,
+        ),
+        (70, "© 2024 LotoApp. Tous droits réservés.", 9),
+    ):
+        for line in wrap_text(text, regular, size, width - 30):
+            page.centered_text(
+                width / 2, footer_top + offset, [(line, regular)], size, "#ecf0f1"
+            )
+
+    return page.to_pdf(title="Récompense - LotoApp")
+
+
+def render_pdf_native(user_name, reward, draw_name):
+    """
+    Rend le PDF de récompense dans le processus courant (voir `write_reward_pdf`).
+
+    Args:
+        user_name (str): Le nom de l'utilisateur qui a gagné.
+        reward (float): Le montant de la récompense gagnée.
+        draw_name (str): Le nom du tirage.
+
+    Returns:
+        list: Le PDF, en un seul bloc.
+    """
+    return [write_reward_pdf(user_name, reward, draw_name)]
+
+
+# Dictionnaire `PDF_BACKENDS` :
+#     Associe le nom d'un moteur de rendu des PDF de récompense (valeur de
+#     `Config.PDF_BACKEND`) à la fonction `(user_name, reward, draw_name)` qui
+#     retourne le PDF en blocs d'octets.
+PDF_BACKENDS = {
+    "wkhtmltopdf": render_pdf_wkhtmltopdf,
+    "native": render_pdf_native,
+}
+
+
+def get_pdf_backend(name=None):
+    """
+    Retourne la fonction de rendu des PDF de récompense du moteur demandé.
+
+    Args:
+        name (str, optional): Le nom du moteur. Par défaut `Config.PDF_BACKEND`.
+
+    Returns:
+        Callable: Une fonction `(user_name, reward, draw_name) -> itérable de bytes`.
+
+    Raises:
+        ValueError: Si le moteur demandé n'existe pas.
+    """
+    name = name or Config.PDF_BACKEND
+    try:
+        return PDF_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Moteur de rendu des PDF inconnu : {name}")
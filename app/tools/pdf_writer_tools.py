@@ -0,0 +1,324 @@
+import zlib
+from .qr_tools import qr_runs
+
+# Format A4 portrait, en points (1/72 de pouce).
+A4_WIDTH, A4_HEIGHT = 595.28, 841.89
+
+# Constante des courbes de Bézier approchant un quart de cercle.
+_KAPPA = 0.5523
+
+# Chasse des caractères 32 à 255 (codage WinAnsi) des polices standard Helvetica et
+# Helvetica-Bold, en millièmes de la taille de police. Valeurs relevées dans les
+# fichiers de métriques (AFM) des 14 polices standard PDF publiés par Adobe. Courier
+# est à chasse fixe (600).
+# fmt: off
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584, 278,
+    556, 278, 222, 556, 333, 1000, 556, 556, 333, 1000, 667, 333, 1000, 278, 611, 278,
+    278, 222, 222, 333, 333, 350, 556, 1000, 333, 1000, 500, 333, 944, 278, 500, 667,
+    278, 333, 556, 556, 556, 556, 260, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+    400, 584, 333, 333, 333, 556, 537, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+    667, 667, 667, 667, 667, 667, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+    722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+    556, 556, 556, 556, 556, 556, 889, 500, 556, 556, 556, 556, 278, 278, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 584, 611, 556, 556, 556, 556, 500, 556, 500,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584, 278,
+    556, 278, 278, 556, 500, 1000, 556, 556, 333, 1000, 667, 333, 1000, 278, 611, 278,
+    278, 278, 278, 500, 500, 350, 556, 1000, 333, 1000, 556, 333, 944, 278, 500, 667,
+    278, 333, 556, 556, 556, 556, 280, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+    400, 584, 333, 333, 333, 611, 556, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+    722, 722, 722, 722, 722, 722, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+    722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+    556, 556, 556, 556, 556, 556, 889, 556, 556, 556, 556, 556, 278, 278, 278, 278,
+    611, 611, 611, 611, 611, 611, 611, 584, 611, 611, 611, 611, 611, 556, 611, 556,
+)
+# fmt: on
+
+# Dictionnaire `PDF_FONTS` :
+#     Associe le nom d'une police standard PDF, qu'aucun fichier n'a besoin
+#     d'embarquer, à son nom de ressource dans la page et à la chasse de ses
+#     caractères (`None` pour une police à chasse fixe).
+PDF_FONTS = {
+    "Helvetica": ("F1", _HELVETICA_WIDTHS),
+    "Helvetica-Bold": ("F2", _HELVETICA_BOLD_WIDTHS),
+    "Courier": ("F3", None),
+}
+
+
+def _encode(text):
+    """
+    Code un texte en WinAnsi ; les caractères absents de ce codage deviennent "?".
+    """
+    return text.encode("cp1252", "replace")
+
+
+def _color(color):
+    """
+    Convertit une couleur "#rrggbb" en composantes PDF comprises entre 0 et 1.
+    """
+    color = color.lstrip("#")
+    return " ".join(
+        f"{int(color[index:index + 2], 16) / 255:.3f}" for index in (0, 2, 4)
+    )
+
+
+def _number(value):
+    """
+    Écrit un nombre PDF sans zéros inutiles.
+    """
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def text_width(text, font, size):
+    """
+    Calcule la largeur d'un texte écrit dans une police standard.
+
+    Paramètres:
+        text (str): Le texte.
+        font (str): Le nom de la police (clé de `PDF_FONTS`).
+        size (float): La taille de police, en points.
+
+    Retourne:
+        float: La largeur du texte, en points.
+
+    Exemple:
+        >>> text_width("LotoApp", "Helvetica", 10)
+        37.25
+    """
+    widths = PDF_FONTS[font][1]
+    if widths is None:
+        return len(_encode(text)) * 600 * size / 1000
+    return sum(widths[code - 32] for code in _encode(text) if code >= 32) * size / 1000
+
+
+def wrap_text(text, font, size, max_width):
+    """
+    Coupe un texte en lignes d'au plus `max_width` points, entre deux mots.
+
+    Un mot plus large que `max_width` occupe seul sa ligne.
+
+    Paramètres:
+        text (str): Le texte.
+        font (str): Le nom de la police.
+        size (float): La taille de police, en points.
+        max_width (float): La largeur maximale d'une ligne, en points.
+
+    Retourne:
+        list: Les lignes du texte.
+
+    Exemple:
+        >>> wrap_text("Merci d'avoir joué", "Helvetica", 12, 60)
+        ["Merci d'avoir", 'joué']
+    """
+    lines = []
+    for word in text.split():
+        if lines and text_width(f"{lines[-1]} {word}", font, size) <= max_width:
+            lines[-1] = f"{lines[-1]} {word}"
+        else:
+            lines.append(word)
+    return lines
+
+
+class PdfPage:
+    """
+    Page PDF construite par opérations de dessin, puis écrite en un document d'une
+    page.
+
+    Les coordonnées sont en points, mesurées depuis le coin supérieur gauche de la
+    page ; l'ordonnée d'un texte est celle de sa ligne de base. Les textes utilisent
+    les polices standard PDF (`PDF_FONTS`), codées en WinAnsi : aucune police n'est
+    embarquée. Le document produit ne dépend que des opérations de dessin.
+
+    Attributs:
+        width (float): La largeur de la page.
+        height (float): La hauteur de la page.
+
+    Exemple:
+        >>> page = PdfPage()
+        >>> page.rect(0, 0, page.width, 80, "#3498db")
+        >>> page.text(40, 50, "LotoApp", 24, "#ffffff", "Helvetica-Bold")
+        >>> pdf = page.to_pdf(title="Récompense")
+    """
+
+    def __init__(self, width=A4_WIDTH, height=A4_HEIGHT):
+        self.width = width
+        self.height = height
+        self._operations = []
+
+    def rect(self, x, y, width, height, color, radius=0):
+        """
+        Dessine un rectangle plein, aux coins arrondis si `radius` est positif.
+
+        Paramètres:
+            x (float): L'abscisse du coin supérieur gauche.
+            y (float): L'ordonnée du coin supérieur gauche.
+            width (float): La largeur.
+            height (float): La hauteur.
+            color (str): La couleur de remplissage, "#rrggbb".
+            radius (float): Le rayon des coins.
+        """
+        bottom = self.height - y - height
+        self._operations.append(f"{_color(color)} rg")
+        if radius <= 0:
+            self._operations.append(
+                f"{_number(x)} {_number(bottom)} {_number(width)} {_number(height)} re f"
+            )
+            return
+        radius = min(radius, width / 2, height / 2)
+        curve = radius * _KAPPA
+        left, right, top = x, x + width, bottom + height
+        points = [
+            f"{_number(left + radius)} {_number(bottom)} m",
+            f"{_number(right - radius)} {_number(bottom)} l",
+            f"{_number(right - radius + curve)} {_number(bottom)} "
+            f"{_number(right)} {_number(bottom + radius - curve)} "
+            f"{_number(right)} {_number(bottom + radius)} c",
+            f"{_number(right)} {_number(top - radius)} l",
+            f"{_number(right)} {_number(top - radius + curve)} "
+            f"{_number(right - radius + curve)} {_number(top)} "
+            f"{_number(right - radius)} {_number(top)} c",
+            f"{_number(left + radius)} {_number(top)} l",
+            f"{_number(left + radius - curve)} {_number(top)} "
+            f"{_number(left)} {_number(top - radius + curve)} "
+            f"{_number(left)} {_number(top - radius)} c",
+            f"{_number(left)} {_number(bottom + radius)} l",
+            f"{_number(left)} {_number(bottom + radius - curve)} "
+            f"{_number(left + radius - curve)} {_number(bottom)} "
+            f"{_number(left + radius)} {_number(bottom)} c",
+            "h f",
+        ]
+        self._operations.extend(points)
+
+    def text(self, x, y, text, size, color, font="Helvetica"):
+        """
+        Écrit un texte sur une ligne.
+
+        Paramètres:
+            x (float): L'abscisse du début du texte.
+            y (float): L'ordonnée de la ligne de base.
+            text (str): Le texte.
+            size (float): La taille de police, en points.
+            color (str): La couleur du texte, "#rrggbb".
+            font (str): Le nom de la police (clé de `PDF_FONTS`).
+        """
+        escaped = (
+            _encode(text)
+            .replace(b"\\", b"\\\\")
+            .replace(b"(", b"\\(")
+            .replace(b")", b"\\)")
+            .decode("latin-1")
+        )
+        self._operations.append(
+            f"BT /{PDF_FONTS[font][0]} {_number(size)} Tf {_color(color)} rg "
+            f"{_number(x)} {_number(self.height - y)} Td ({escaped}) Tj ET"
+        )
+
+    def centered_text(self, center_x, y, runs, size, color):
+        """
+        Écrit une ligne centrée, composée de morceaux de polices différentes.
+
+        Paramètres:
+            center_x (float): L'abscisse du centre de la ligne.
+            y (float): L'ordonnée de la ligne de base.
+            runs (list): Les morceaux de la ligne, couples `(texte, police)`.
+            size (float): La taille de police, en points.
+            color (str): La couleur du texte, "#rrggbb".
+        """
+        x = center_x - sum(text_width(text, font, size) for text, font in runs) / 2
+        for text, font in runs:
+            self.text(x, y, text, size, color, font)
+            x += text_width(text, font, size)
+
+    def qr_code(self, x, y, size, matrix, color="#000000"):
+        """
+        Dessine un code QR en tracés vectoriels.
+
+        Les modules sombres consécutifs d'une même rangée forment un seul rectangle,
+        remplis ensemble en une seule opération. Les rectangles sont écrits en
+        modules entiers, dans un repère mis à l'échelle du code.
+
+        Paramètres:
+            x (float): L'abscisse du coin supérieur gauche.
+            y (float): L'ordonnée du coin supérieur gauche.
+            size (float): La largeur et la hauteur du code.
+            matrix (list): Les rangées de modules, `True` pour un module sombre
+                           (voir `qrcode.QRCode.get_matrix`).
+            color (str): La couleur des modules sombres, "#rrggbb".
+        """
+        module = size / len(matrix)
+        paths = [
+            f"{column} {row} {length} 1 re" for column, row, length in qr_runs(matrix)
+        ]
+        if paths:
+            self._operations.append(
+                f"q {_number(module)} 0 0 {_number(-module)} {_number(x)} "
+                f"{_number(self.height - y)} cm {_color(color)} rg"
+            )
+            self._operations.extend(paths)
+            self._operations.append("f Q")
+
+    def to_pdf(self, title=None):
+        """
+        Écrit le document PDF d'une page.
+
+        Paramètres:
+            title (str, optional): Le titre du document.
+
+        Retourne:
+            bytes: Le document PDF.
+        """
+        content = zlib.compress("\n".join(self._operations).encode("latin-1"))
+        fonts = " ".join(
+            f"/{resource} {index} 0 R"
+            for index, (resource, _) in enumerate(PDF_FONTS.values(), start=5)
+        )
+        info = "/Producer (LotoApp)"
+        if title:
+            info += f" /Title <FEFF{title.encode('utf-16-be').hex().upper()}>"
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_number(self.width)} "
+                f"{_number(self.height)}] /Resources << /Font << {fonts} >> >> "
+                f"/Contents 4 0 R >>"
+            ).encode("ascii"),
+            f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode(
+                "ascii"
+            )
+            + content
+            + b"\nendstream",
+            *(
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} "
+                f"/Encoding /WinAnsiEncoding >>".encode("ascii")
+                for font in PDF_FONTS
+            ),
+            f"<< {info} >>".encode("ascii"),
+        ]
+
+        document = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(document))
+            document += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+        xref = len(document)
+        document += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+        for offset in offsets:
+            document += f"{offset:010d} 00000 n \n".encode("ascii")
+        document += (
+            f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R "
+            f"/Info {len(objects)} 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+        ).encode("ascii")
+        return bytes(document)
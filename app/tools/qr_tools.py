@@ -0,0 +1,171 @@
+import threading
+from collections import OrderedDict, namedtuple
+from urllib.parse import quote
+import qrcode
+from app import Config
+
+# Code QR prêt à dessiner : ses rangées de modules (`True` pour un module sombre,
+# marge comprise) et son image SVG sous forme d'URI `data:`.
+QrCode = namedtuple("QrCode", ["matrix", "svg_uri"])
+
+# Codes QR déjà construits par ce processus, du moins au plus récemment lu.
+_qr_codes = OrderedDict()
+_qr_codes_lock = threading.Lock()
+_qr_stats = {"hits": 0, "misses": 0}
+
+
+def qr_matrix(data, border=4):
+    """
+    Construit les rangées de modules du code QR d'un texte.
+
+    Le masque est fixe : le choix du meilleur des huit masques, valide mais non
+    requis par la norme, coûte plusieurs fois la construction du code.
+
+    Paramètres:
+        data (str): Le texte à encoder.
+        border (int): La largeur de la marge blanche, en modules.
+
+    Retourne:
+        tuple: Les rangées de modules, `True` pour un module sombre.
+
+    Exemple:
+        >>> len(qr_matrix("LotoApp"))
+        29
+    """
+    qr = qrcode.QRCode(border=border, mask_pattern=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return tuple(tuple(row) for row in qr.get_matrix())
+
+
+def qr_runs(matrix):
+    """
+    Parcourt les suites de modules sombres consécutifs de chaque rangée.
+
+    Paramètres:
+        matrix (list): Les rangées de modules, `True` pour un module sombre.
+
+    Retourne:
+        generator: Des triplets (colonne, rangée, longueur), rangée par rangée.
+
+    Exemple:
+        >>> list(qr_runs([[True, True, False, True]]))
+        [(0, 0, 2), (3, 0, 1)]
+    """
+    for row_index, row in enumerate(matrix):
+        column = 0
+        while column < len(row):
+            if not row[column]:
+                column += 1
+                continue
+            start = column
+            while column < len(row) and row[column]:
+                column += 1
+            yield start, row_index, column - start
+
+
+def qr_svg(matrix):
+    """
+    Dessine un code QR en une image SVG d'un seul tracé.
+
+    Chaque suite de modules sombres est un trait horizontal d'un module
+    d'épaisseur ; les traits d'une même rangée sont reliés par des déplacements
+    relatifs, ce qui garde le tracé court. Le repère est en modules : l'image
+    prend la taille que lui donne la page.
+
+    Paramètres:
+        matrix (list): Les rangées de modules, `True` pour un module sombre.
+
+    Retourne:
+        str: Le document SVG.
+
+    Exemple:
+        >>> qr_svg([[True, True, False, True]])
+        "<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 1' ..."
+    """
+    path = []
+    current_row, end = None, 0
+    for column, row, length in qr_runs(matrix):
+        if row != current_row:
+            path.append(f"M{column},{row}.5h{length}")
+        else:
+            path.append(f"m{column - end},0h{length}")
+        current_row, end = row, column + length
+    return (
+        "<svg xmlns='http://www.w3.org/2000/svg' "
+        f"viewBox='0 0 {len(matrix[0]) if matrix else 0} {len(matrix)}' "
+        "shape-rendering='crispEdges'>"
+        f"<path stroke='#000' d='{''.join(path)}'/></svg>"
+    )
+
+
+def svg_data_uri(svg):
+    """
+    Encode une image SVG en URI `data:`, sans base64.
+
+    Seuls les caractères réservés des URI sont échappés : le texte du SVG reste
+    lisible et n'est pas allongé d'un tiers comme en base64.
+
+    Paramètres:
+        svg (str): Le document SVG.
+
+    Retourne:
+        str: L'URI, à utiliser comme `src` d'une image.
+    """
+    return f"data:image/svg+xml;charset=utf-8,{quote(svg, safe=',/:=')}"
+
+
+def cached_qr_code(data):
+    """
+    Retourne le code QR d'un texte, depuis le cache du processus si possible.
+
+    Les codes sont gardés par texte encodé, en retirant les moins récemment lus
+    au-delà de `Config.QR_CACHE_SIZE` codes. Le code retourné est partagé entre les
+    appels et ne doit pas être modifié.
+
+    Paramètres:
+        data (str): Le texte à encoder.
+
+    Retourne:
+        QrCode: Les rangées de modules et l'image SVG du code.
+
+    Exemple:
+        >>> cached_qr_code("Récompense: 12.5 | Tirage: Tirage 1 | Utilisateur: John Doe").svg_uri
+        'data:image/svg+xml;charset=utf-8,%3Csvg...'
+    """
+    with _qr_codes_lock:
+        if data in _qr_codes:
+            _qr_codes.move_to_end(data)
+            _qr_stats["hits"] += 1
+            return _qr_codes[data]
+        _qr_stats["misses"] += 1
+
+    matrix = qr_matrix(data)
+    code = QrCode(matrix, svg_data_uri(qr_svg(matrix)))
+    with _qr_codes_lock:
+        _qr_codes[data] = code
+        _qr_codes.move_to_end(data)
+        while len(_qr_codes) > Config.QR_CACHE_SIZE:
+            _qr_codes.popitem(last=False)
+    return code
+
+
+def qr_cache_info():
+    """
+    Retourne l'état du cache des codes QR de ce processus.
+
+    Retourne:
+        dict: Les lectures servies par le cache (`hits`), les codes construits
+              (`misses`) et le nombre de codes gardés (`size`).
+    """
+    with _qr_codes_lock:
+        return {**_qr_stats, "size": len(_qr_codes)}
+
+
+def clear_qr_cache():
+    """
+    Vide le cache des codes QR de ce processus et remet ses compteurs à zéro.
+    """
+    with _qr_codes_lock:
+        _qr_codes.clear()
+        _qr_stats.update(hits=0, misses=0)
@@ -1,4 +1,13 @@
+from functools import lru_cache
 from app.constants import share_gain
+from app.tools.mask_tools import numbers_to_mask, ticket_masks
+
+NUMBER_WEIGHT = 0.80
+STAR_WEIGHT = 0.20
+
+# Format standard d'un ticket : 5 numéros et 2 numéros chance.
+STANDARD_NUMBER_COUNT = 5
+STANDARD_STAR_COUNT = 2
 
 
 def jaccard_similarity(set_a, set_b):
@@ -53,18 +62,99 @@ def calculate_jaccard_similarity(
         >>> calculate_jaccard_similarity([1, 2, 3], [1], [1, 2, 4], [1])
         80
     """
-    number_weight = 0.80
-    star_weight = 0.20
-
     number_similarity = jaccard_similarity(draw_numbers, player_numbers)
     star_similarity = jaccard_similarity(draw_stars, player_stars)
 
     final_similarity = (
-        number_similarity * number_weight + star_similarity * star_weight
+        number_similarity * NUMBER_WEIGHT + star_similarity * STAR_WEIGHT
+    ) * 100
+    return round(final_similarity)
+
+
+def mask_jaccard_similarity(mask_a, mask_b):
+    """
+    Calcule la similarité de Jaccard entre deux ensembles encodés en masques binaires.
+
+    L'intersection et l'union sont obtenues par `&` et `|`, et leur cardinal par
+    `int.bit_count()`, sans construire d'ensemble Python.
+
+    Paramètres:
+        mask_a (int): Le premier ensemble, sous forme de masque (voir `numbers_to_mask`).
+        mask_b (int): Le deuxième ensemble, sous forme de masque.
+
+    Retourne:
+        float: La similarité de Jaccard entre les deux ensembles.
+               Renvoie 0 si les deux ensembles sont vides.
+
+    Exemple:
+        >>> mask_jaccard_similarity(numbers_to_mask([1, 2, 3]), numbers_to_mask([2, 3, 4]))
+        0.5
+    """
+    union = (mask_a | mask_b).bit_count()
+    return (mask_a & mask_b).bit_count() / union if union > 0 else 0
+
+
+def calculate_mask_similarity(draw_mask, draw_stars_mask, numbers_mask, stars_mask):
+    """
+    Calcule la similarité Jaccard pondérée à partir des masques d'un tirage et d'un ticket.
+
+    Le résultat est identique à celui de `calculate_jaccard_similarity` appliqué aux
+    ensembles correspondants.
+
+    Paramètres:
+        draw_mask (int): Le masque des numéros du tirage.
+        draw_stars_mask (int): Le masque des étoiles du tirage.
+        numbers_mask (int): Le masque des numéros du joueur.
+        stars_mask (int): Le masque des étoiles du joueur.
+
+    Retourne:
+        int: La similarité Jaccard pondérée, exprimée en pourcentage et arrondie.
+
+    Exemple:
+        >>> calculate_mask_similarity(14, 2, 22, 2)
+        60
+    """
+    number_similarity = mask_jaccard_similarity(draw_mask, numbers_mask)
+    star_similarity = mask_jaccard_similarity(draw_stars_mask, stars_mask)
+
+    final_similarity = (
+        number_similarity * NUMBER_WEIGHT + star_similarity * STAR_WEIGHT
     ) * 100
     return round(final_similarity)
 
 
+def ticket_score(draw_mask, draw_stars_mask, numbers_mask, stars_mask):
+    """
+    Calcule le score d'un ticket par simple lecture dans la table de son format.
+
+    Le score ne dépend que du format du ticket et du tirage et du nombre de numéros
+    trouvés : il est lu dans `score_table`, mise en cache, après quatre comptages de
+    bits. Le résultat est identique à celui de `calculate_mask_similarity`.
+
+    Paramètres:
+        draw_mask (int): Le masque des numéros du tirage.
+        draw_stars_mask (int): Le masque des étoiles du tirage.
+        numbers_mask (int): Le masque des numéros du joueur.
+        stars_mask (int): Le masque des étoiles du joueur.
+
+    Retourne:
+        int: La similarité Jaccard pondérée, exprimée en pourcentage et arrondie.
+
+    Exemple:
+        >>> ticket_score(14, 2, 22, 2)
+        60
+    """
+    table = score_table(
+        draw_mask.bit_count(),
+        draw_stars_mask.bit_count(),
+        numbers_mask.bit_count(),
+        stars_mask.bit_count(),
+    )
+    return table[(numbers_mask & draw_mask).bit_count()][
+        (stars_mask & draw_stars_mask).bit_count()
+    ]
+
+
 def structure_scores(participants, draw_numbers, draw_stars):
     """
     Structure les scores des participants en fonction de leur similarité avec les numéros
@@ -74,6 +164,11 @@ def structure_scores(participants, draw_numbers, draw_stars):
     tirage et ceux de chaque participant. Les scores sont ensuite organisés en fonction
     de leur valeur, et les participants ayant obtenu un score supérieur ou égal à 10 sont
     inclus dans le classement. Le classement est limité aux 10 meilleurs scores.
+    Les masques binaires stockés sur les inscriptions sont utilisés lorsqu'ils existent,
+    ce qui évite de relire les chaînes de numéros. Chaque combinaison distincte n'est notée
+    qu'une fois, les tickets identiques reprenant son score ; les combinaisons au format
+    standard (5 numéros et 2 numéros chance) sont notées par simple lecture dans
+    `score_table`.
 
     Paramètres:
         participants (list): Une liste d'objets participants, où chaque objet contient
@@ -98,22 +193,113 @@ def structure_scores(participants, draw_numbers, draw_stars):
         >>> structure_scores(participants, draw_numbers, draw_stars)
         {1: [[1, 2], 80], 2: [[3], 60]}
     """
+    draw_mask = numbers_to_mask(draw_numbers)
+    draw_stars_mask = numbers_to_mask(draw_stars)
+    table = score_table(draw_mask.bit_count(), draw_stars_mask.bit_count())
+
     scores_dict = {}
     limit = 10
+    ticket_scores = {}
 
     for participant in participants:
-        player_numbers = set(map(int, participant.numbers.split(",")))
-        player_stars = set(map(int, participant.lucky_numbers.split(",")))
-
-        score = calculate_jaccard_similarity(
-            draw_numbers, draw_stars, player_numbers, player_stars
-        )
+        masks = ticket_masks(participant)
+        score = ticket_scores.get(masks)
+
+        if score is None:
+            numbers_mask, stars_mask = masks
+            if (
+                numbers_mask.bit_count() == STANDARD_NUMBER_COUNT
+                and stars_mask.bit_count() == STANDARD_STAR_COUNT
+            ):
+                score = table[(numbers_mask & draw_mask).bit_count()][
+                    (stars_mask & draw_stars_mask).bit_count()
+                ]
+            else:
+                score = calculate_mask_similarity(
+                    draw_mask, draw_stars_mask, numbers_mask, stars_mask
+                )
+            ticket_scores[masks] = score
 
         if score >= 10:
             if score not in scores_dict:
                 scores_dict[score] = []
             scores_dict[score].append(participant.user_id)
 
+    return build_ranking(scores_dict, limit)
+
+
+@lru_cache(maxsize=None)
+def score_table(
+    draw_number_count,
+    draw_star_count,
+    number_count=STANDARD_NUMBER_COUNT,
+    star_count=STANDARD_STAR_COUNT,
+):
+    """
+    Précalcule les scores possibles d'un ticket d'un format donné pour un tirage.
+
+    Pour un ticket de `number_count` numéros et `star_count` numéros chance (par défaut
+    le format standard), le score ne dépend que du nombre de numéros et de numéros
+    chance trouvés : l'union se déduit de l'intersection et de la taille des deux
+    ensembles. Les scores sont calculés avec les mêmes opérations que
+    `calculate_jaccard_similarity` et sont donc identiques. Les tables sont mises en
+    cache par taille de tirage et de ticket.
+
+    Paramètres:
+        draw_number_count (int): Le nombre de numéros du tirage.
+        draw_star_count (int): Le nombre d'étoiles du tirage.
+        number_count (int): Le nombre de numéros du ticket.
+        star_count (int): Le nombre de numéros chance du ticket.
+
+    Retourne:
+        tuple: La table `table[numéros trouvés][étoiles trouvées]` des scores.
+
+    Exemple:
+        >>> score_table(5, 2)[5][2]
+        100
+    """
+
+    def similarity(matches, count, draw_count):
+        union = count + draw_count - matches
+        return matches / union if union > 0 else 0
+
+    return tuple(
+        tuple(
+            round(
+                (
+                    similarity(number_matches, number_count, draw_number_count)
+                    * NUMBER_WEIGHT
+                    + similarity(star_matches, star_count, draw_star_count)
+                    * STAR_WEIGHT
+                )
+                * 100
+            )
+            for star_matches in range(star_count + 1)
+        )
+        for number_matches in range(number_count + 1)
+    )
+
+
+def build_ranking(scores_dict, limit=10):
+    """
+    Construit le classement final à partir des joueurs regroupés par score.
+
+    Les scores sont parcourus du plus élevé au plus faible. Les joueurs ex aequo
+    partagent le même rang et le rang suivant est décalé du nombre d'ex aequo.
+    Le parcours s'arrête dès que `limit` joueurs ont été classés.
+
+    Paramètres:
+        scores_dict (dict): Un dictionnaire dont la clé est le score et la valeur la liste
+                            des identifiants des joueurs ayant obtenu ce score.
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+
+    Retourne:
+        dict: Le classement au format `{rang: [identifiants, score]}` attendu par `compute_gain`.
+
+    Exemple:
+        >>> build_ranking({60: [3], 80: [1, 2]})
+        {1: [[1, 2], 80], 3: [[3], 60]}
+    """
     scores_dict = dict(
         sorted(scores_dict.items(), key=lambda item: item[0], reverse=True)
     )
@@ -136,6 +322,91 @@ def structure_scores(participants, draw_numbers, draw_stars):
     return final_ranking
 
 
+class StreamingRanker:
+    """
+    Classement incrémental à mémoire bornée des meilleurs scores d'un tirage.
+
+    Les joueurs sont ajoutés un par un et regroupés par score (les scores sont des
+    entiers de 0 à 100). Seuls les groupes pouvant encore atteindre les rangs payés
+    sont conservés : un groupe est abandonné dès que `limit` joueurs ont un score
+    strictement supérieur, et les scores inférieurs ou égaux ne sont plus suivis.
+    La mémoire utilisée ne dépend donc que du nombre de joueurs classés, quel que
+    soit le nombre de tickets parcourus.
+
+    Attributs:
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+        floor (int): Le score minimal qu'un joueur doit atteindre pour être suivi.
+        buckets (dict): Les joueurs suivis, regroupés par score, dans l'ordre d'ajout.
+
+    Exemple:
+        >>> ranker = StreamingRanker()
+        >>> ranker.add(1, 80)
+        >>> ranker.add(2, 60)
+        >>> ranker.ranking()
+        {1: [[1], 80], 2: [[2], 60]}
+    """
+
+    def __init__(self, limit=10, threshold=10):
+        self.limit = limit
+        self.floor = threshold
+        self.buckets = {}
+        self._tracked = 0
+
+    def add(self, player_id, score):
+        """
+        Ajoute un joueur au classement s'il peut encore atteindre un rang payé.
+
+        Paramètres:
+            player_id (int): L'identifiant du joueur.
+            score (int): Le score du joueur.
+        """
+        if score < self.floor:
+            return
+
+        if score not in self.buckets:
+            self.buckets[score] = []
+        self.buckets[score].append(player_id)
+        self._tracked += 1
+        self._prune()
+
+    def add_bucket(self, score, players):
+        """
+        Ajoute d'un coup un groupe de joueurs ayant le même score.
+
+        Paramètres:
+            score (int): Le score commun aux joueurs.
+            players (list): Les identifiants des joueurs, dans l'ordre de classement.
+        """
+        if score < self.floor or not players:
+            return
+
+        if score not in self.buckets:
+            self.buckets[score] = []
+        self.buckets[score].extend(players)
+        self._tracked += len(players)
+        self._prune()
+
+    def _prune(self):
+        """
+        Abandonne le groupe le plus faible tant qu'il ne peut plus être classé.
+
+        Le groupe le plus faible est celui qui a le plus de joueurs au-dessus de lui :
+        s'il reste atteignable, tous les autres groupes le sont aussi.
+        """
+        while self.buckets:
+            lowest = min(self.buckets)
+            if self._tracked - len(self.buckets[lowest]) < self.limit:
+                return
+            self._tracked -= len(self.buckets.pop(lowest))
+            self.floor = lowest + 1
+
+    def ranking(self):
+        """
+        Retourne le classement courant au format `{rang: [identifiants, score]}`.
+        """
+        return build_ranking(self.buckets, self.limit)
+
+
 def compute_gain(scores_dict, reward_price):
     """
     Calcule les gains des joueurs en fonction de leur classement et du prix de la récompense.
@@ -201,6 +472,77 @@ def compute_gain(scores_dict, reward_price):
     return gain_per_players, total_distributed, remainder
 
 
+def build_rank_counts(score_counts, limit=10):
+    """
+    Construit le classement d'un tirage à partir du seul nombre de joueurs par score.
+
+    Le classement est celui de `build_ranking` (seuil de 10 points, ex aequo, clôture
+    à `limit` joueurs), les listes d'identifiants étant remplacées par leur taille.
+
+    Paramètres:
+        score_counts (dict): Un dictionnaire associant un score au nombre de joueurs
+                             l'ayant obtenu.
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+
+    Retourne:
+        dict: Le classement au format `{rang: [nombre de joueurs, score]}`.
+
+    Exemple:
+        >>> build_rank_counts({80: 2, 60: 1, 5: 40})
+        {1: [2, 80], 3: [1, 60]}
+    """
+    rank_counts = {}
+    current_rank = 1
+
+    for score in sorted(score_counts, reverse=True):
+        count = score_counts[score]
+        if score < 10 or count == 0:
+            continue
+        if current_rank > limit:
+            break
+        rank_counts[current_rank] = [count, score]
+        current_rank += count
+
+    return rank_counts
+
+
+def compute_rank_gains(rank_counts, reward_price):
+    """
+    Calcule le gain de chaque joueur d'un rang à partir d'un classement par effectifs.
+
+    Les gains sont ceux de `compute_gain` suivi de `distribute_remainder` : les
+    joueurs ex aequo se partagent les parts `share_gain` des rangs qu'ils occupent,
+    puis le reliquat est redistribué proportionnellement aux gains.
+
+    Paramètres:
+        rank_counts (dict): Le classement au format `{rang: [nombre de joueurs, score]}`.
+        reward_price (float): Le montant total de la récompense.
+
+    Retourne:
+        dict: Un dictionnaire associant chaque rang au gain d'un joueur de ce rang.
+
+    Exemple:
+        >>> compute_rank_gains({1: [2, 80], 3: [1, 60]}, 1000)
+        {1: 416.66..., 3: 166.66...}
+    """
+    gains = {}
+    for rank, (count, score) in rank_counts.items():
+        end = min(rank + count, 11)
+        gains[rank] = (
+            sum(reward_price * share_gain[level] for level in range(rank, end)) / count
+        )
+
+    total_distributed = sum(gains[rank] * rank_counts[rank][0] for rank in gains)
+    if total_distributed == 0:
+        return gains
+
+    remainder = reward_price - total_distributed
+    return {
+        rank: gain + (gain / total_distributed) * remainder
+        for rank, gain in gains.items()
+    }
+
+
 def distribute_remainder(gain_per_players, remainder):
     """
     Distribue le montant restant de la récompense aux joueurs proportionnellement à leurs gains.
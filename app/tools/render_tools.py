@@ -0,0 +1,219 @@
+import subprocess
+import threading
+from app import Config
+
+
+class PdfStream:
+    """
+    Sortie d'un rendu PDF en cours, lue par blocs au fur et à mesure de son envoi.
+
+    Le flux se ferme en fin de lecture ou par `close`, appelé par Flask à la fin de la
+    réponse même si le client s'est déconnecté : le processus est alors arrêté s'il
+    tourne encore et sa place dans la réserve est libérée.
+
+    Attributs:
+        process (subprocess.Popen): Le processus wkhtmltopdf qui produit le PDF.
+        first_chunk (bytes): Le premier bloc du PDF, lu avant l'envoi de la réponse.
+    """
+
+    def __init__(self, process, first_chunk, chunk_size, release):
+        self.process = process
+        self.first_chunk = first_chunk
+        self.chunk_size = chunk_size
+        self._release = release
+
+    def __iter__(self):
+        try:
+            yield self.first_chunk
+            while chunk := self.process.stdout.read(self.chunk_size):
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Arrête le processus s'il tourne encore et libère sa place dans la réserve.
+        """
+        if self._release is None:
+            return
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout, self.process.stderr):
+            pipe.close()
+        self._release()
+        self._release = None
+
+
+class PdfRendererPool:
+    """
+    Réserve de processus wkhtmltopdf démarrés à l'avance pour le rendu des PDF.
+
+    wkhtmltopdf ne rend qu'un document par processus : la réserve garde donc `warm`
+    processus déjà lancés, en attente du HTML sur leur entrée standard, et en relance
+    un à chaque rendu. Le lancement du processus et l'initialisation du moteur de
+    rendu se font ainsi hors du chemin de la requête. Le PDF est lu sur la sortie
+    standard et envoyé par blocs de `chunk_size` octets, sans être gardé en mémoire.
+
+    Au plus `max_concurrency` rendus tournent en même temps : une requête attend
+    qu'une place se libère pendant `queue_timeout` secondes, puis est refusée. Un
+    rendu qui dure plus de `render_timeout` secondes est arrêté.
+
+    La réserve est utilisable par plusieurs threads.
+
+    Attributs:
+        binary (str): Le chemin de l'exécutable wkhtmltopdf.
+        options (list): Les options passées à wkhtmltopdf.
+        warm (int): Le nombre de processus démarrés à l'avance.
+        max_concurrency (int): Le nombre maximal de rendus simultanés.
+        spawned (int): Le nombre de processus lancés depuis la création.
+
+    Exemple:
+        >>> renderer = PdfRendererPool(Config.PATH_WHHTMLTOPDF)
+        >>> stream = renderer.render(html)
+        >>> pdf = b"".join(stream)
+    """
+
+    def __init__(
+        self,
+        binary,
+        options=(),
+        warm=2,
+        max_concurrency=4,
+        queue_timeout=10,
+        render_timeout=30,
+        chunk_size=64 * 1024,
+    ):
+        self.binary = binary
+        self.options = list(options)
+        self.warm = warm
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.render_timeout = render_timeout
+        self.chunk_size = chunk_size
+        self.spawned = 0
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crée une réserve à partir de la configuration de l'application.
+
+        Retourne:
+            PdfRendererPool: La réserve, sans processus démarré.
+        """
+        return cls(
+            Config.PATH_WHHTMLTOPDF,
+            options=["--quiet", "--encoding", "UTF-8", "--no-stop-slow-scripts"],
+            warm=Config.PDF_RENDER_WARM,
+            max_concurrency=Config.PDF_RENDER_CONCURRENCY,
+            queue_timeout=Config.PDF_RENDER_QUEUE_TIMEOUT,
+            render_timeout=Config.PDF_RENDER_TIMEOUT,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _spawn(self):
+        """
+        Lance un processus qui lit le HTML sur son entrée standard et écrit le PDF sur
+        sa sortie standard.
+        """
+        process = subprocess.Popen(
+            [self.binary, *self.options, "-", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        with self._lock:
+            self.spawned += 1
+        return process
+
+    def _checkout(self):
+        """
+        Retourne un processus démarré à l'avance, ou en lance un nouveau.
+        """
+        with self._lock:
+            while self._idle:
+                process = self._idle.pop()
+                if process.poll() is None:
+                    return process
+        return self._spawn()
+
+    def _replenish(self):
+        """
+        Relance des processus jusqu'à en avoir `warm` en attente.
+        """
+        while True:
+            with self._lock:
+                if len(self._idle) >= self.warm:
+                    return
+            process = self._spawn()
+            with self._lock:
+                self._idle.append(process)
+
+    def render(self, html):
+        """
+        Lance le rendu d'un document HTML en PDF.
+
+        Le premier bloc du PDF est lu avant le retour de la méthode. wkhtmltopdf
+        n'écrivant sa sortie qu'en fin de rendu, une erreur est levée ici, avant
+        l'envoi de la réponse, et le flux retourné ne fait que lire le PDF produit.
+
+        Paramètres:
+            html (str): Le document HTML, feuilles de style comprises.
+
+        Retourne:
+            PdfStream: Le flux du PDF, à lire ou à fermer.
+
+        Lève:
+            TimeoutError: Si aucune place ne s'est libérée dans la réserve à temps.
+            RuntimeError: Si wkhtmltopdf n'a produit aucun PDF.
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise TimeoutError(
+                "Trop de PDF sont en cours de génération, veuillez réessayer."
+            )
+        process = None
+        try:
+            process = self._checkout()
+            self._replenish()
+            timer = threading.Timer(self.render_timeout, process.kill)
+            timer.start()
+            try:
+                process.stdin.write(html.encode("utf-8"))
+                process.stdin.close()
+                first_chunk = process.stdout.read(self.chunk_size)
+            finally:
+                timer.cancel()
+            if not first_chunk:
+                process.wait()
+                error = process.stderr.read().decode("utf-8", "replace").strip()
+                raise RuntimeError(
+                    f"wkhtmltopdf n'a produit aucun PDF (code {process.returncode}) : "
+                    f"{error}"
+                )
+        except BaseException:
+            if process is not None:
+                PdfStream(process, b"", self.chunk_size, self._slots.release).close()
+            else:
+                self._slots.release()
+            raise
+        return PdfStream(process, first_chunk, self.chunk_size, self._slots.release)
+
+    def close(self):
+        """
+        Arrête les processus démarrés à l'avance.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for process in idle:
+            process.kill()
+            process.wait()
+            for pipe in (process.stdin, process.stdout, process.stderr):
+                pipe.close()
@@ -0,0 +1,315 @@
+from itertools import combinations
+from math import comb
+import numpy as np
+from app.tools.rank_tools import (
+    NUMBER_WEIGHT,
+    STAR_WEIGHT,
+    build_rank_counts,
+    compute_rank_gains,
+)
+from app.tools.numpy_rank_tools import compute_scores
+from app.tools.mask_tools import mask_to_numbers
+
+# Nombre de numéros d'un tirage : un ticket ne peut pas en trouver davantage.
+DRAW_NUMBER_COUNT = 5
+SUBSET_SHIFT = 50
+
+
+def _single_bits(masks, count):
+    """
+    Retourne, pour chaque masque ayant `count` bits à 1, les masques de ses bits.
+    """
+    remaining = masks.copy()
+    singles = np.empty((len(masks), count), dtype=np.uint64)
+    for index in range(count):
+        singles[:, index] = remaining & (~remaining + np.uint64(1))
+        remaining ^= singles[:, index]
+    return singles
+
+
+def _subset_masks(masks, count):
+    """
+    Retourne les masques de tous les sous-ensembles non vides de taille au plus
+    `DRAW_NUMBER_COUNT` de chaque masque, et la taille de chaque sous-ensemble.
+    """
+    singles = _single_bits(masks, count)
+    columns, sizes = [], []
+    for size in range(1, min(count, DRAW_NUMBER_COUNT) + 1):
+        for subset in combinations(range(count), size):
+            columns.append(np.bitwise_or.reduce(singles[:, subset], axis=1))
+            sizes.append(size)
+    return np.stack(columns, axis=1), np.array(sizes)
+
+
+def _count_subsets(masks, count, chunk_size=65536):
+    """
+    Compte, par blocs de tickets, le nombre de tickets contenant chaque sous-ensemble.
+    """
+    keys, counts = [], []
+    for start in range(0, len(masks), chunk_size):
+        subsets, _ = _subset_masks(masks[start : start + chunk_size], count)
+        chunk_keys, chunk_counts = np.unique(subsets, return_counts=True)
+        keys.append(chunk_keys)
+        counts.append(chunk_counts)
+
+    if len(keys) == 1:
+        return keys[0], counts[0]
+    unique_keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    return unique_keys, np.bincount(inverse, weights=np.concatenate(counts)).astype(
+        np.int64
+    )
+
+
+def _class_scores(matches, number_count, star_matches, star_count):
+    """
+    Calcule le score d'un ticket de `number_count` numéros et `star_count` numéros
+    chance ayant `matches` numéros et `star_matches` numéros chance en commun avec un
+    tirage de 5 numéros et 2 numéros chance, avec les opérations de
+    `calculate_jaccard_similarity`.
+    """
+    number_union = (number_count + DRAW_NUMBER_COUNT - matches).astype(np.float64)
+    star_union = (star_count + 2 - star_matches).astype(np.float64)
+    number_similarity = np.divide(
+        matches.astype(np.float64),
+        number_union,
+        out=np.zeros(np.broadcast(matches, number_union).shape),
+        where=number_union > 0,
+    )
+    star_similarity = np.divide(
+        star_matches.astype(np.float64),
+        star_union,
+        out=np.zeros(np.broadcast(star_matches, star_union).shape),
+        where=star_union > 0,
+    )
+    final_similarity = (
+        number_similarity * NUMBER_WEIGHT + star_similarity * STAR_WEIGHT
+    ) * 100
+    return np.rint(final_similarity).astype(np.int64)
+
+
+class TicketSubsetCounts:
+    """
+    Comptage des sous-ensembles de numéros des tickets d'une loterie.
+
+    Les tickets sont regroupés en classes de même nombre de numéros et de mêmes numéros
+    chance. Pour chaque classe, le nombre de tickets contenant chaque sous-ensemble de
+    numéros (de taille 1 à 5) est compté une fois pour toutes. Pour un tirage, la somme
+    de ces compteurs sur les sous-ensembles de taille `m` du tirage vaut
+    `E_m = somme des C(k, m)` sur les tickets, `k` étant leurs numéros trouvés ; le
+    nombre exact de tickets ayant `k` numéros trouvés s'en déduit par inclusion-exclusion.
+    Le coût d'un tirage ne dépend donc que du nombre de classes, pas du nombre de tickets.
+    Les tickets de plus de 5 numéros, hors format, sont notés directement.
+
+    Attributs:
+        ticket_count (int): Le nombre de tickets comptés.
+
+    Exemple:
+        >>> counts = TicketSubsetCounts(number_masks, star_masks)
+        >>> histograms = counts.score_histograms(draw_masks, draw_star_masks)
+        >>> histograms[0][100]  # tickets ayant tout trouvé au premier tirage
+    """
+
+    def __init__(self, number_masks, star_masks):
+        number_masks = np.asarray(number_masks, dtype=np.uint64)
+        star_masks = np.asarray(star_masks, dtype=np.uint16)
+        number_counts = np.bitwise_count(number_masks).astype(np.int64)
+
+        self.ticket_count = len(number_masks)
+
+        direct = number_counts > DRAW_NUMBER_COUNT
+        self._direct_numbers = number_masks[direct]
+        self._direct_stars = star_masks[direct]
+
+        classes = np.unique(
+            np.stack((number_counts[~direct], star_masks[~direct].astype(np.int64))),
+            axis=1,
+        )
+        self._number_counts = classes[0]
+        self._star_masks = classes[1].astype(np.uint16)
+        self._star_counts = np.bitwise_count(self._star_masks).astype(np.int64)
+        self._class_sizes = np.zeros(classes.shape[1], dtype=np.int64)
+
+        keys, counts = [], []
+        for index, (number_count, star_mask) in enumerate(classes.T):
+            members = number_masks[
+                ~direct & (number_counts == number_count) & (star_masks == star_mask)
+            ]
+            self._class_sizes[index] = len(members)
+            if number_count == 0:
+                continue
+            class_keys, class_counts = _count_subsets(members, int(number_count))
+            keys.append(class_keys | np.uint64(index << SUBSET_SHIFT))
+            counts.append(class_counts)
+
+        self._keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.uint64)
+        self._counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.int64)
+
+        # inclusion[k, m] = (-1)^(m - k) * C(m, k) : passage des E_m aux comptes exacts.
+        self._inclusion = np.array(
+            [
+                [(-1) ** (m - k) * comb(m, k) for m in range(DRAW_NUMBER_COUNT + 1)]
+                for k in range(DRAW_NUMBER_COUNT + 1)
+            ],
+            dtype=np.int64,
+        )
+
+    def _lookup(self, keys):
+        """
+        Retourne le compteur de chaque clé, 0 pour les sous-ensembles absents.
+        """
+        if len(self._keys) == 0:
+            return np.zeros(keys.shape, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[positions] == keys, self._counts[positions], 0)
+
+    def score_histograms(self, draw_masks, draw_star_masks):
+        """
+        Calcule, pour chaque tirage, le nombre de tickets ayant obtenu chaque score.
+
+        Paramètres:
+            draw_masks (numpy.ndarray): Les masques des 5 numéros de chaque tirage.
+            draw_star_masks (numpy.ndarray): Les masques des 2 numéros chance de
+                                             chaque tirage.
+
+        Retourne:
+            numpy.ndarray: Un tableau `(tirages, 101)` dont la case `[t, s]` est le
+                           nombre de tickets ayant obtenu le score `s` au tirage `t`.
+        """
+        draw_masks = np.asarray(draw_masks, dtype=np.uint64)
+        draw_star_masks = np.asarray(draw_star_masks, dtype=np.uint16)
+        draws = len(draw_masks)
+        histograms = np.zeros((draws, 101), dtype=np.int64)
+        class_count = len(self._class_sizes)
+
+        if class_count:
+            subsets, sizes = _subset_masks(draw_masks, DRAW_NUMBER_COUNT)
+            class_keys = np.arange(class_count, dtype=np.uint64) << np.uint64(
+                SUBSET_SHIFT
+            )
+            found = self._lookup(subsets[:, None, :] | class_keys[None, :, None])
+
+            at_least = np.empty((draws, class_count, DRAW_NUMBER_COUNT + 1), np.int64)
+            at_least[:, :, 0] = self._class_sizes
+            for size in range(1, DRAW_NUMBER_COUNT + 1):
+                at_least[:, :, size] = found[:, :, sizes == size].sum(axis=2)
+            exact = at_least @ self._inclusion.T
+
+            matches = np.arange(DRAW_NUMBER_COUNT + 1)
+            star_matches = np.bitwise_count(
+                draw_star_masks[:, None] & self._star_masks[None, :]
+            ).astype(np.int64)
+            scores = np.where(
+                matches[None, None, :] <= self._number_counts[None, :, None],
+                _class_scores(
+                    matches[None, None, :],
+                    self._number_counts[None, :, None],
+                    star_matches[:, :, None],
+                    self._star_counts[None, :, None],
+                ),
+                0,
+            )
+
+            rows = np.broadcast_to(np.arange(draws)[:, None, None], exact.shape)
+            histograms += (
+                np.bincount(
+                    (rows * 101 + scores).ravel(),
+                    weights=exact.ravel(),
+                    minlength=draws * 101,
+                )
+                .reshape(draws, 101)
+                .astype(np.int64)
+            )
+
+        for index in range(draws if len(self._direct_numbers) else 0):
+            histograms[index] += np.bincount(
+                compute_scores(
+                    self._direct_numbers,
+                    self._direct_stars,
+                    mask_to_numbers(int(draw_masks[index])),
+                    mask_to_numbers(int(draw_star_masks[index])),
+                ),
+                minlength=101,
+            )
+
+        return histograms
+
+
+def _distribution(values):
+    """
+    Résume une série de valeurs par sa moyenne, ses extrêmes et ses percentiles.
+    """
+    if len(values) == 0:
+        return {}
+    p5, p50, p95 = np.percentile(values, [5, 50, 95])
+    return {
+        "mean": float(np.mean(values)),
+        "min": float(np.min(values)),
+        "p5": float(p5),
+        "p50": float(p50),
+        "p95": float(p95),
+        "max": float(np.max(values)),
+    }
+
+
+def summarize_simulation(histograms, reward_price, limit=10):
+    """
+    Résume les classements et les gains d'une série de tirages simulés.
+
+    Pour chaque tirage, le classement est construit à partir du nombre de joueurs par
+    score (`build_rank_counts`) et les gains avec les règles de `compute_gain` et
+    `distribute_remainder` (`compute_rank_gains`).
+
+    Paramètres:
+        histograms (numpy.ndarray): Le nombre de tickets par score de chaque tirage,
+                                    tel que renvoyé par `TicketSubsetCounts.score_histograms`.
+        reward_price (float): Le montant total de la récompense.
+        limit (int): Le nombre de joueurs à partir duquel le classement est clos.
+
+    Retourne:
+        dict: Un rapport contenant :
+            - draws: le nombre de tirages simulés.
+            - winners_per_rank: pour chaque rang, le nombre moyen et maximal de joueurs
+              classés à ce rang.
+            - paid_players: la distribution du nombre de joueurs payés.
+            - top_prize: la distribution du gain d'un joueur classé premier.
+            - top_score: la distribution du meilleur score.
+            - top_prize_split_probability: la probabilité que le premier rang soit partagé.
+            - no_winner_probability: la probabilité qu'aucun joueur ne soit classé.
+    """
+    draws = len(histograms)
+    winners_per_rank = np.zeros((draws, limit), dtype=np.int64)
+    top_prizes, top_scores = [], []
+
+    for index, histogram in enumerate(histograms):
+        scores = np.flatnonzero(histogram[10:])[::-1][:limit] + 10
+        rank_counts = build_rank_counts(
+            {int(score): int(histogram[score]) for score in scores}, limit
+        )
+        if not rank_counts:
+            continue
+
+        gains = compute_rank_gains(rank_counts, reward_price)
+        for rank, (count, score) in rank_counts.items():
+            winners_per_rank[index, rank - 1] = count
+        top_prizes.append(gains[1])
+        top_scores.append(rank_counts[1][1])
+
+    paid_players = winners_per_rank.sum(axis=1)
+
+    return {
+        "draws": draws,
+        "winners_per_rank": {
+            rank: {
+                "mean": float(winners_per_rank[:, rank - 1].mean()) if draws else 0.0,
+                "max": int(winners_per_rank[:, rank - 1].max()) if draws else 0,
+            }
+            for rank in range(1, limit + 1)
+        },
+        "paid_players": _distribution(paid_players),
+        "top_prize": _distribution(top_prizes),
+        "top_score": _distribution(top_scores),
+        "top_prize_split_probability": (
+            float(np.mean(winners_per_rank[:, 0] > 1)) if draws else 0.0
+        ),
+        "no_winner_probability": float(np.mean(paid_players == 0)) if draws else 0.0,
+    }
@@ -0,0 +1,180 @@
+import smtplib
+import ssl
+import threading
+from contextlib import ExitStack
+from app import Config
+
+# Erreurs après lesquelles une connexion est considérée comme perdue : elle est
+# fermée et l'envoi est repris une fois sur une nouvelle connexion.
+SMTP_RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class _SMTPConnection:
+    """
+    Connexion SMTP authentifiée d'un `SMTPPool` et nombre de messages envoyés.
+    """
+
+    def __init__(self, stack, smtp):
+        self.stack = stack
+        self.smtp = smtp
+        self.sent = 0
+
+    def close(self):
+        try:
+            self.stack.close()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+
+class SMTPPool:
+    """
+    Réserve de connexions SMTP authentifiées, réutilisées d'un message à l'autre.
+
+    Une connexion est ouverte (connexion TLS et `login`) à la première demande puis
+    rendue à la réserve après chaque message : les messages suivants ne refont ni la
+    négociation TLS ni l'authentification. Au plus `size` connexions sont ouvertes en
+    même temps ; un envoi attend qu'une connexion se libère. Une connexion est fermée
+    après `max_messages` messages, limite que la plupart des serveurs imposent. Une
+    connexion perdue (`SMTP_RECONNECT_ERRORS`), par exemple fermée par le serveur
+    pendant son inactivité, est remplacée et le message renvoyé une fois.
+
+    La réserve est utilisable par plusieurs threads. Elle se ferme en sortie d'un
+    bloc `with`.
+
+    Attributs:
+        size (int): Le nombre maximal de connexions ouvertes.
+        max_messages (int): Le nombre de messages envoyés par connexion.
+        opened (int): Le nombre de connexions ouvertes depuis la création.
+
+    Exemple:
+        >>> with SMTPPool.from_config() as pool:
+        ...     for receiver in receivers:
+        ...         pool.sendmail(Config.MAIL_APP, receiver, message)
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        username,
+        password,
+        size=1,
+        max_messages=100,
+        use_ssl=True,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.max_messages = max_messages
+        self.use_ssl = use_ssl
+        self.opened = 0
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, size=None):
+        """
+        Crée une réserve à partir de la configuration de l'application.
+
+        Paramètres:
+            size (int, optional): Le nombre maximal de connexions. Par défaut
+                                  `Config.SMTP_POOL_SIZE`.
+
+        Retourne:
+            SMTPPool: La réserve, sans connexion ouverte.
+        """
+        return cls(
+            Config.SMTP_HOST,
+            Config.SMTP_PORT,
+            Config.MAIL_APP,
+            Config.APP_EMAIL_PASSWORD,
+            size=size or Config.SMTP_POOL_SIZE,
+            max_messages=Config.SMTP_MAX_MESSAGES,
+            use_ssl=Config.SMTP_SSL,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _connect(self):
+        """
+        Ouvre et authentifie une nouvelle connexion.
+        """
+        with ExitStack() as stack:
+            if self.use_ssl:
+                smtp = stack.enter_context(
+                    smtplib.SMTP_SSL(
+                        self.host, self.port, context=ssl.create_default_context()
+                    )
+                )
+            else:
+                smtp = stack.enter_context(smtplib.SMTP(self.host, self.port))
+            smtp.login(self.username, self.password)
+            with self._lock:
+                self.opened += 1
+            return _SMTPConnection(stack.pop_all(), smtp)
+
+    def _checkout(self):
+        """
+        Retourne une connexion libre, ou en ouvre une nouvelle.
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def _checkin(self, connection):
+        """
+        Rend une connexion à la réserve, ou la ferme si elle a atteint sa limite de
+        messages.
+        """
+        if connection.sent >= self.max_messages:
+            connection.close()
+            return
+        with self._lock:
+            self._idle.append(connection)
+
+    def sendmail(self, from_addr, to_addrs, message):
+        """
+        Envoie un message sur une connexion de la réserve.
+
+        Paramètres:
+            from_addr (str): L'adresse de l'expéditeur.
+            to_addrs (str | list): Le ou les destinataires.
+            message (str): Le message complet, en-têtes compris.
+
+        Lève:
+            smtplib.SMTPException: Si le serveur refuse le message, ou si l'envoi
+                                   échoue aussi sur une nouvelle connexion.
+        """
+        with self._slots:
+            connection = self._checkout()
+            for attempt in range(2):
+                try:
+                    connection.smtp.sendmail(from_addr, to_addrs, message)
+                    break
+                except SMTP_RECONNECT_ERRORS:
+                    connection.close()
+                    if attempt:
+                        raise
+                    connection = self._connect()
+                except smtplib.SMTPException:
+                    self._checkin(connection)
+                    raise
+            connection.sent += 1
+            self._checkin(connection)
+
+    def close(self):
+        """
+        Ferme les connexions libres de la réserve.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+SNAPSHOT_MAGIC = b"LOTOSNAP"
+SNAPSHOT_VERSION = 1
+# Colonnes d'un instantané, dans l'ordre du fichier, et leur type à largeur fixe.
+SNAPSHOT_COLUMNS = (
+    ("entry_ids", "<i8"),
+    ("user_ids", "<i8"),
+    ("number_masks", "<u8"),
+    ("star_masks", "<u2"),
+)
+SNAPSHOT_ALIGNMENT = 64
+SNAPSHOT_HASH_BLOCK = 1 << 24
+
+
+def _aligned(offset):
+    """
+    Arrondit une position au multiple supérieur de `SNAPSHOT_ALIGNMENT`.
+    """
+    return -(-offset // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+
+def _checksum(column):
+    """
+    Calcule l'empreinte SHA-256 des octets d'une colonne, par blocs.
+    """
+    digest = hashlib.sha256()
+    data = np.ascontiguousarray(column).reshape(-1).view(np.uint8)
+    for start in range(0, len(data), SNAPSHOT_HASH_BLOCK):
+        digest.update(data[start : start + SNAPSHOT_HASH_BLOCK])
+    return digest.hexdigest()
+
+
+def write_snapshot(path, columns):
+    """
+    Écrit un instantané en colonnes des tickets d'une loterie.
+
+    Le fichier commence par `SNAPSHOT_MAGIC`, la taille de l'en-tête (4 octets) et un
+    en-tête JSON décrivant chaque colonne (type, position, empreinte SHA-256). Les
+    colonnes suivent, à largeur fixe et alignées sur `SNAPSHOT_ALIGNMENT` octets, pour
+    être projetées en mémoire sans copie par `TicketSnapshot`. Le fichier est écrit à
+    côté de sa destination puis renommé : un lecteur ne voit jamais d'instantané
+    partiel.
+
+    Paramètres:
+        path (str): Le chemin du fichier.
+        columns (dict): Les tableaux de même longueur de chaque colonne de
+                        `SNAPSHOT_COLUMNS`.
+
+    Retourne:
+        int: Le nombre de tickets écrits.
+
+    Exemple:
+        >>> write_snapshot("lottery_1.snapshot", {"entry_ids": ids, "user_ids": users,
+        ...     "number_masks": numbers, "star_masks": stars})
+        3
+    """
+    arrays = [
+        np.ascontiguousarray(columns[name], dtype=dtype)
+        for name, dtype in SNAPSHOT_COLUMNS
+    ]
+    rows = len(arrays[0])
+    if any(len(array) != rows for array in arrays):
+        raise ValueError("Les colonnes d'un instantané doivent avoir la même longueur.")
+
+    offset = 0
+    descriptions = []
+    for (name, dtype), array in zip(SNAPSHOT_COLUMNS, arrays):
+        descriptions.append(
+            {
+                "name": name,
+                "dtype": dtype,
+                "offset": offset,
+                "sha256": _checksum(array),
+            }
+        )
+        offset = _aligned(offset + array.nbytes)
+
+    header = json.dumps(
+        {"version": SNAPSHOT_VERSION, "rows": rows, "columns": descriptions}
+    ).encode()
+    data_offset = _aligned(len(SNAPSHOT_MAGIC) + 4 + len(header))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(len(header).to_bytes(4, "little"))
+        file.write(header)
+        for description, array in zip(descriptions, arrays):
+            file.seek(data_offset + description["offset"])
+            file.write(array.tobytes())
+        file.truncate(data_offset + offset)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+    return rows
+
+
+class TicketSnapshot:
+    """
+    Instantané en colonnes des tickets d'une loterie, projeté en mémoire.
+
+    Les colonnes sont des `numpy.memmap` en lecture seule : leur ouverture ne copie
+    aucune donnée, les pages du fichier sont chargées par le système à la lecture.
+    Les empreintes des colonnes sont vérifiées à l'ouverture, sauf si `verify` vaut
+    `False`.
+
+    Attributs:
+        rows (int): Le nombre de tickets.
+        entry_ids (numpy.ndarray): Les identifiants des inscriptions, croissants.
+        user_ids (numpy.ndarray): Les identifiants des joueurs.
+        number_masks (numpy.ndarray): Les masques des numéros (`uint64`).
+        star_masks (numpy.ndarray): Les masques des numéros chance (`uint16`).
+
+    Exemple:
+        >>> snapshot = TicketSnapshot("lottery_1.snapshot")
+        >>> compute_scores(snapshot.number_masks, snapshot.star_masks, draw, stars)
+    """
+
+    def __init__(self, path, verify=True):
+        with open(path, "rb") as file:
+            magic = file.read(len(SNAPSHOT_MAGIC))
+            header_size = int.from_bytes(file.read(4), "little")
+            try:
+                header = json.loads(file.read(header_size))
+            except ValueError:
+                header = None
+
+        if (
+            magic != SNAPSHOT_MAGIC
+            or not isinstance(header, dict)
+            or header.get("version") != SNAPSHOT_VERSION
+            or [column.get("name") for column in header.get("columns", [])]
+            != [name for name, _ in SNAPSHOT_COLUMNS]
+        ):
+            raise ValueError(f"Instantané invalide : {path}")
+
+        self.rows = header["rows"]
+        data_offset = _aligned(len(SNAPSHOT_MAGIC) + 4 + header_size)
+        file_size = os.path.getsize(path)
+
+        for description in header["columns"]:
+            dtype = np.dtype(description["dtype"])
+            offset = data_offset + description["offset"]
+            if offset + dtype.itemsize * self.rows > file_size:
+                raise ValueError(f"Instantané tronqué : {path}")
+            column = (
+                np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=self.rows)
+                if self.rows
+                else np.empty(0, dtype=dtype)
+            )
+            if verify and _checksum(column) != description["sha256"]:
+                raise ValueError(
+                    f"Empreinte invalide pour la colonne {description['name']} : {path}"
+                )
+            setattr(self, description["name"], column)
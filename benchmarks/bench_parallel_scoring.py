@@ -0,0 +1,99 @@
+"""
+Mesure le passage à l'échelle du moteur de calcul des scores "parallel".
+
+Une base SQLite temporaire est remplie de tickets aléatoires, puis le classement est
+calculé avec 1 à N processus. Le moteur "stream" (un seul cœur) sert de référence et
+chaque classement est comparé au sien.
+
+Utilisation :
+    $ python benchmarks/bench_parallel_scoring.py --tickets 1000000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.extensions import db
+from app.models import Entry
+from app.helpers import structure_scores_stream, structure_scores_parallel
+from app.tools import numbers_to_mask
+
+
+def populate(tickets, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for user_id in range(1, tickets + 1):
+        numbers = rng.sample(range(1, 50), 5)
+        lucky_numbers = rng.sample(range(1, 10), 2)
+        rows.append(
+            {
+                "user_id": user_id,
+                "lottery_id": 1,
+                "numbers": ",".join(map(str, numbers)),
+                "lucky_numbers": ",".join(map(str, lucky_numbers)),
+                "numbers_mask": numbers_to_mask(numbers),
+                "lucky_numbers_mask": numbers_to_mask(lucky_numbers),
+            }
+        )
+        if len(rows) == 50000:
+            db.session.execute(Entry.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.session.execute(Entry.__table__.insert(), rows)
+    db.session.commit()
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=500000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{directory}/bench.db"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            _, elapsed = timed(populate, args.tickets)
+            print(f"{args.tickets} tickets insérés en {elapsed:.2f} s")
+
+            draw_numbers, draw_stars = [3, 11, 25, 38, 47], [2, 8]
+            reference, elapsed = timed(
+                structure_scores_stream, 1, draw_numbers, draw_stars, db
+            )
+            print(f"stream (1 cœur)      : {elapsed:.3f} s")
+
+            workers = 1
+            while workers <= args.workers:
+                shard_size = args.shard_size or -(-args.tickets // workers)
+                ranking, elapsed = timed(
+                    structure_scores_parallel,
+                    1,
+                    draw_numbers,
+                    draw_stars,
+                    db,
+                    workers=workers,
+                    shard_size=shard_size,
+                )
+                assert ranking == reference
+                print(f"parallel {workers:>2} processus : {elapsed:.3f} s")
+                workers *= 2
+
+
+if __name__ == "__main__":
+    main()
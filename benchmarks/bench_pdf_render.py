@@ -0,0 +1,119 @@
+"""
+Mesure la latence de génération des PDF de récompense avec et sans réserve de
+processus wkhtmltopdf, et par écriture directe du PDF.
+
+Chaque requête rend le même document de deux façons : par `pdfkit.from_string`, qui
+lance un nouveau processus wkhtmltopdf et relit `pdf.css` à chaque appel (ancienne
+version de `generate_pdf`), puis par `PdfRendererPool`, dont les processus sont
+lancés à l'avance et dont la feuille de style est déjà incluse dans le HTML. Les
+requêtes sont envoyées par `--clients` threads simultanés, chacun marquant une pause
+de `--pause` secondes entre deux requêtes ; la réserve en rend au plus `--concurrency`
+à la fois. Sans pause, dès que les `--warm` processus lancés à l'avance sont
+consommés, chaque requête attend à nouveau le démarrage d'un processus. La dernière
+ligne mesure `write_reward_pdf`, qui écrit le PDF dans le processus courant ; elle
+est la seule mesurée lorsque wkhtmltopdf est introuvable.
+
+Utilisation :
+    $ python benchmarks/bench_pdf_render.py --binary /usr/bin/wkhtmltopdf --requests 50 --clients 4 --pause 0.5
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pdfkit
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.tools import PdfRendererPool, render_pdf_html, write_reward_pdf
+from app.tools.pdf_tools import PDF_CSS_PATH
+from bench_parallel_scoring import timed
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def render_with_pdfkit(app, configuration):
+    with app.app_context():
+        html = render_pdf_html("Jean Dupont", 123.45, "Tirage du vendredi")
+    return pdfkit.from_string(
+        html,
+        False,
+        configuration=configuration,
+        options={"enable-local-file-access": None, "no-stop-slow-scripts": None},
+        css=PDF_CSS_PATH,
+    )
+
+
+def render_with_pool(app, renderer):
+    with app.app_context():
+        html = render_pdf_html("Jean Dupont", 123.45, "Tirage du vendredi")
+    return b"".join(renderer.render(html))
+
+
+def render_natively():
+    return write_reward_pdf("Jean Dupont", 123.45, "Tirage du vendredi")
+
+
+def run(render, requests, clients, pause):
+    def one(_):
+        pdf, elapsed = timed(render)
+        assert pdf.startswith(b"%PDF")
+        time.sleep(pause)
+        return elapsed
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        return sorted(executor.map(one, range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--binary", default=shutil.which("wkhtmltopdf"))
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--warm", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pause", type=float, default=0.5)
+    args = parser.parse_args()
+
+    modes = []
+    renderer = None
+    if args.binary:
+        app = Flask(__name__, template_folder=os.path.join(ROOT, "app", "templates"))
+        configuration = pdfkit.configuration(wkhtmltopdf=args.binary)
+        renderer = PdfRendererPool(
+            args.binary,
+            options=["--quiet", "--encoding", "UTF-8", "--no-stop-slow-scripts"],
+            warm=args.warm,
+            max_concurrency=args.concurrency,
+            queue_timeout=None,
+        )
+        renderer._replenish()
+        time.sleep(1)
+        modes = [
+            ("pdfkit.from_string", lambda: render_with_pdfkit(app, configuration)),
+            ("réserve de processus", lambda: render_with_pool(app, renderer)),
+        ]
+    else:
+        print("wkhtmltopdf est introuvable : seule l'écriture directe est mesurée")
+    modes.append(("écriture directe", render_natively))
+
+    print(f"{'mode':<24} {'p50':>9} {'p95':>9} {'max':>9}")
+    try:
+        for label, render in modes:
+            latencies = run(render, args.requests, args.clients, args.pause)
+            p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+            print(
+                f"{label:<24} {statistics.median(latencies) * 1000:>7.1f}ms "
+                f"{p95 * 1000:>7.1f}ms {latencies[-1] * 1000:>7.1f}ms"
+            )
+    finally:
+        if renderer is not None:
+            renderer.close()
+
+
+if __name__ == "__main__":
+    main()
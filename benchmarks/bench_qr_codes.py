@@ -0,0 +1,81 @@
+"""
+Mesure le temps de construction et la taille des codes QR des PDF de récompense.
+
+Trois versions sont comparées pour `--winners` gagnants distincts, chacun demandé
+`--repeat` fois (téléchargements répétés, génération à la validation puis à la
+demande) :
+
+- image PNG encodée en base64 (`qrcode.make`, ancienne version de `generate_pdf`) ;
+- image SVG en URI `data:`, construite à chaque demande ;
+- image SVG en URI `data:`, lue dans le cache des codes QR (`cached_qr_code`).
+
+La taille est celle du texte inclus dans le HTML pour un code.
+
+Utilisation :
+    $ python benchmarks/bench_qr_codes.py --winners 200 --repeat 3
+"""
+
+import argparse
+import base64
+import os
+import sys
+from io import BytesIO
+
+import qrcode
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app import Config
+from app.tools import (
+    cached_qr_code,
+    clear_qr_cache,
+    qr_cache_info,
+    qr_matrix,
+    qr_svg,
+    reward_qr_data,
+    svg_data_uri,
+)
+from bench_parallel_scoring import timed
+
+
+def png_base64(data):
+    buffer = BytesIO()
+    qrcode.make(data).save(buffer, format="PNG")
+    return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def svg_uri(data):
+    return svg_data_uri(qr_svg(qr_matrix(data)))
+
+
+def cached_svg_uri(data):
+    return cached_qr_code(data).svg_uri
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--winners", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payloads = [
+        reward_qr_data(f"Joueur{index} Dupont", 10 + index * 1.25, "Tirage du vendredi")
+        for index in range(args.winners)
+    ] * args.repeat
+    Config.QR_CACHE_SIZE = max(Config.QR_CACHE_SIZE, args.winners)
+    clear_qr_cache()
+
+    print(f"{'mode':<22} {'par code':>10} {'taille':>9}")
+    for label, build in (
+        ("PNG base64", png_base64),
+        ("SVG", svg_uri),
+        ("SVG en cache", cached_svg_uri),
+    ):
+        codes, elapsed = timed(lambda: [build(data) for data in payloads])
+        size = sum(len(code) for code in codes) / len(codes)
+        print(f"{label:<22} {elapsed / len(payloads) * 1000:>8.3f}ms {size:>7.0f} o")
+    info = qr_cache_info()
+    print(f"cache : {info['hits']} lectures, {info['misses']} codes construits")
+
+
+if __name__ == "__main__":
+    main()
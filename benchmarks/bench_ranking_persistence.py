@@ -0,0 +1,112 @@
+"""
+Mesure le temps d'enregistrement du classement d'un tirage selon le nombre de gagnants.
+
+Pour chaque nombre de gagnants, le classement est enregistré dans une base SQLite
+temporaire de deux façons : ligne par ligne, avec une validation du schéma et une
+transaction par joueur (ancienne version de `validate_lottery`), puis par
+`save_lottery_rankings`, validé en lot et inséré en une seule transaction. Les deux
+méthodes doivent produire les mêmes lignes.
+
+Utilisation :
+    $ python benchmarks/bench_ranking_persistence.py --winners 10 100 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.extensions import db
+from app.models import LotteryResult, LotteryRanking
+from app.schemas import LotteryRankingSchema
+from app.helpers import save_lottery_rankings
+from bench_parallel_scoring import timed
+
+
+def make_results(winners):
+    return [
+        {
+            "player_id": player_id,
+            "rank": player_id,
+            "score": max(10, 100 - player_id % 90),
+            "winnings": 1000 / winners,
+        }
+        for player_id in range(1, winners + 1)
+    ]
+
+
+def persist_row_by_row(lottery_result_id, formatted_results):
+    for result in formatted_results:
+        ranking_data = LotteryRankingSchema().load(
+            {
+                "lottery_result_id": lottery_result_id,
+                "player_id": result["player_id"],
+                "rank": result["rank"],
+                "score": result["score"],
+                "winnings": result["winnings"],
+            }
+        )
+        db.session.add(LotteryRanking(**ranking_data))
+        db.session.commit()
+
+
+def persist_bulk(lottery_result_id, formatted_results):
+    save_lottery_rankings(lottery_result_id, formatted_results, db)
+    db.session.commit()
+
+
+def stored_rows(lottery_result_id):
+    return [
+        (row.player_id, row.rank, row.score, row.winnings)
+        for row in LotteryRanking.query.filter_by(
+            lottery_result_id=lottery_result_id
+        ).order_by(LotteryRanking.player_id)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--winners", type=int, nargs="+", default=[10, 100, 1000, 10000]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{directory}/bench.db"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            print(f"{'gagnants':>9} {'ligne par ligne':>16} {'en lot':>9} {'gain':>7}")
+
+            for winners in args.winners:
+                formatted_results = make_results(winners)
+                timings = []
+                rows = []
+                for persist in (persist_row_by_row, persist_bulk):
+                    lottery_result = LotteryResult(
+                        lottery_id=1,
+                        winning_numbers="1,2,3,4,5",
+                        winning_lucky_numbers="1,2",
+                    )
+                    db.session.add(lottery_result)
+                    db.session.commit()
+                    _, elapsed = timed(persist, lottery_result.id, formatted_results)
+                    timings.append(elapsed)
+                    rows.append(stored_rows(lottery_result.id))
+
+                assert rows[0] == rows[1]
+                print(
+                    f"{winners:>9} {timings[0]:>14.3f} s {timings[1]:>7.3f} s "
+                    f"{timings[0] / timings[1]:>6.1f}x"
+                )
+
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
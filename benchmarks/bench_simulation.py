@@ -0,0 +1,64 @@
+"""
+Mesure la durée d'une simulation des gains sur un grand nombre de tickets.
+
+Les tickets aléatoires sont générés directement en mémoire (sans base de données),
+puis `TicketSubsetCounts` et `summarize_simulation` évaluent les tirages simulés.
+
+Utilisation :
+    $ python benchmarks/bench_simulation.py --tickets 1000000 --draws 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.tools import TicketSubsetCounts, summarize_simulation, numbers_to_mask
+from app.helpers import generate_wining_numbers, generate_luck_numbers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=1000000)
+    parser.add_argument("--draws", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    number_masks = np.array(
+        [numbers_to_mask(generate_wining_numbers(rng)) for _ in range(args.tickets)],
+        dtype=np.uint64,
+    )
+    star_masks = np.array(
+        [numbers_to_mask(generate_luck_numbers(rng)) for _ in range(args.tickets)],
+        dtype=np.uint16,
+    )
+
+    start = time.perf_counter()
+    counts = TicketSubsetCounts(number_masks, star_masks)
+    print(f"{args.tickets} tickets comptés en {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    histograms = []
+    for first in range(0, args.draws, args.batch_size):
+        size = min(args.batch_size, args.draws - first)
+        histograms.append(
+            counts.score_histograms(
+                [numbers_to_mask(generate_wining_numbers(rng)) for _ in range(size)],
+                [numbers_to_mask(generate_luck_numbers(rng)) for _ in range(size)],
+            )
+        )
+    report = summarize_simulation(np.concatenate(histograms), 1000)
+    print(f"{args.draws} tirages simulés en {time.perf_counter() - start:.2f} s")
+    print(
+        f"premier prix partagé : {report['top_prize_split_probability']:.1%}, "
+        f"joueurs payés (moyenne) : {report['paid_players']['mean']:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Mesure le débit d'envoi des emails avec et sans réserve de connexions SMTP.
+
+Les messages sont envoyés à un serveur SMTP local (aiosmtpd) de trois façons : une
+connexion authentifiée par message (ancienne version de `email_tools`), une seule
+connexion réutilisée par `SMTPPool`, puis une réserve de `--pool-size` connexions
+partagée par autant de threads. `--login-delay` ajoute à chaque authentification un
+délai simulant la négociation TLS et le `login` auprès d'un serveur distant.
+
+Utilisation :
+    $ python benchmarks/bench_smtp_pool.py --messages 200 --pool-size 4 --login-delay 0.05
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.tools import SMTPPool
+from bench_parallel_scoring import timed
+
+MESSAGE = "Subject: Les resultats du tirage sont disponibles\n\nBonjour"
+
+
+class LocalServer:
+    def __init__(self, login_delay):
+        self.login_delay = login_delay
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+    def __call__(self, server, session, envelope, mechanism, auth_data):
+        time.sleep(self.login_delay)
+        return AuthResult(success=True)
+
+
+def send_all(pool, messages, threads):
+    receivers = [f"joueur{index}@example.com" for index in range(messages)]
+    with pool:
+        if threads == 1:
+            for receiver in receivers:
+                pool.sendmail("app@example.com", receiver, MESSAGE)
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(
+                    executor.map(
+                        lambda receiver: pool.sendmail(
+                            "app@example.com", receiver, MESSAGE
+                        ),
+                        receivers,
+                    )
+                )
+    return pool.opened
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--login-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    local = LocalServer(args.login_delay)
+    server = Controller(
+        local,
+        hostname="127.0.0.1",
+        port=port,
+        authenticator=local,
+        auth_require_tls=False,
+    )
+    server.start()
+
+    try:
+        print(f"{'mode':<28} {'connexions':>10} {'durée':>9} {'messages/s':>11}")
+        for label, size, max_messages, threads in (
+            ("une connexion par message", 1, 1, 1),
+            ("réserve, 1 connexion", 1, args.messages, 1),
+            (
+                f"réserve, {args.pool_size} connexions",
+                args.pool_size,
+                args.messages,
+                args.pool_size,
+            ),
+        ):
+            local.received = 0
+            pool = SMTPPool(
+                "127.0.0.1",
+                port,
+                "app",
+                "secret",
+                size=size,
+                max_messages=max_messages,
+                use_ssl=False,
+            )
+            opened, elapsed = timed(send_all, pool, args.messages, threads)
+            assert local.received == args.messages
+            print(
+                f"{label:<28} {opened:>10} {elapsed:>7.3f} s "
+                f"{args.messages / elapsed:>11.0f}"
+            )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare le classement lu dans l'index inversé des tickets à `structure_scores`.
+
+Une base SQLite temporaire est remplie de tickets aléatoires et indexée, puis le
+classement de plusieurs tirages est calculé en chargeant toutes les inscriptions
+(`structure_scores`) et en lisant les 7 listes de l'index (`structure_scores_index`).
+Les deux classements sont comparés à chaque tirage.
+
+Utilisation :
+    $ python benchmarks/bench_ticket_index.py --tickets 500000 --draws 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.extensions import db
+from app.models import Entry, TicketIndex
+from app.helpers import rebuild_ticket_index, structure_scores_index
+from app.tools import structure_scores
+from bench_parallel_scoring import populate, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=500000)
+    parser.add_argument("--draws", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{directory}/bench.db"
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            _, elapsed = timed(populate, args.tickets)
+            print(f"{args.tickets} tickets insérés en {elapsed:.2f} s")
+
+            _, elapsed = timed(rebuild_ticket_index, 1, db)
+            db.session.commit()
+            size = sum(len(row.postings) for row in TicketIndex.query)
+            print(f"index construit en {elapsed:.2f} s ({size / 2**20:.1f} Mio)")
+
+            rng = random.Random(1)
+            for _ in range(args.draws):
+                draw_numbers = rng.sample(range(1, 50), 5)
+                draw_stars = rng.sample(range(1, 10), 2)
+
+                def scan():
+                    participants = (
+                        Entry.query.filter_by(lottery_id=1).order_by(Entry.id).all()
+                    )
+                    return structure_scores(participants, draw_numbers, draw_stars)
+
+                reference, scan_time = timed(scan)
+                db.session.expunge_all()
+                ranking, index_time = timed(
+                    structure_scores_index, 1, draw_numbers, draw_stars, db
+                )
+                assert ranking == reference
+                print(
+                    f"tirage {draw_numbers} {draw_stars} : "
+                    f"structure_scores {scan_time:.3f} s, index {index_time:.3f} s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Mesure le coût de la vérification de révocation des jetons JWT, avec et sans cache.
+
+`--tokens` jetons sont enregistrés dans une base SQLite temporaire (ou dans
+`--database`), puis `--checks` vérifications sont faites sur des jetons tirés au
+hasard, comme autant de requêtes authentifiées. Sans cache (`TOKEN_CACHE_TTL` à 0),
+chaque vérification interroge la base de données ; avec le cache, seule la première
+vérification de chaque jeton le fait, et une révocation sur `--revoke-every`
+vérifications est publiée sur le canal d'invalidation.
+
+Utilisation :
+    $ python benchmarks/bench_token_checks.py --tokens 1000 --checks 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app import Config
+from app.extensions import db
+from app.models import TokenBlockList
+from app.helpers import (
+    is_token_revoked,
+    revoke_token,
+    token_cache_info,
+    clear_token_cache,
+)
+from bench_parallel_scoring import timed
+
+
+def run(payloads, checks, revoke_every, seed):
+    rng = random.Random(seed)
+    for check in range(1, checks + 1):
+        payload = rng.choice(payloads)
+        is_token_revoked(payload)
+        if revoke_every and check % revoke_every == 0:
+            revoke_token(payload["jti"], payload["user_id"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--revoke-every", type=int, default=500)
+    parser.add_argument("--database", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = (
+            args.database or f"sqlite:///{directory}/bench.db"
+        )
+        app.config["JWT_IDENTITY_CLAIM"] = Config.JWT_IDENTITY_CLAIM
+        db.init_app(app)
+        Config.TOKEN_REVOCATION_LOG = os.path.join(directory, "revocations.log")
+
+        print(
+            f"{'mode':<10} {'par vérification':>17} {'lectures SQL':>13} {'succès':>8}"
+        )
+        for label, ttl in (("sans cache", 0), ("cache", 60)):
+            with app.app_context():
+                db.drop_all()
+                db.create_all()
+                expires = datetime.utcnow() + timedelta(minutes=20)
+                db.session.add_all(
+                    TokenBlockList(
+                        jti=f"jti-{index}",
+                        token_type="access",
+                        user_id=1,
+                        expires=expires,
+                    )
+                    for index in range(args.tokens)
+                )
+                db.session.commit()
+                payloads = [
+                    {
+                        "jti": f"jti-{index}",
+                        Config.JWT_IDENTITY_CLAIM: 1,
+                        "exp": time.time() + 1200,
+                    }
+                    for index in range(args.tokens)
+                ]
+
+                Config.TOKEN_CACHE_TTL = ttl
+                clear_token_cache()
+                _, elapsed = timed(
+                    run, payloads, args.checks, args.revoke_every, seed=1
+                )
+                info = token_cache_info()
+                print(
+                    f"{label:<10} {elapsed / args.checks * 1e6:>14.1f}µs "
+                    f"{info['misses']:>13} {info['hit_rate']:>7.1%}"
+                )
+                db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
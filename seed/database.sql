@@ -6,6 +6,10 @@ DROP TABLE IF EXISTS users CASCADE;
 DROP TABLE IF EXISTS roles CASCADE;
 DROP TABLE IF EXISTS token_block_list CASCADE;
 DROP TABLE IF EXISTS lottery_rankings CASCADE;
+DROP TABLE IF EXISTS ticket_index CASCADE;
+DROP TABLE IF EXISTS live_draws CASCADE;
+DROP TABLE IF EXISTS jobs CASCADE;
+DROP TABLE IF EXISTS email_outbox CASCADE;
 
 -- Table pour stocker les rôles
 CREATE TABLE roles (
@@ -46,6 +50,8 @@ CREATE TABLE entries (
     lottery_id INT REFERENCES lotteries(id) ON DELETE CASCADE,  -- Référence au tirage
     numbers VARCHAR NOT NULL,                                   -- Numero classique
     lucky_numbers VARCHAR,                                      -- Numero chance
+    numbers_mask BIGINT NOT NULL,                               -- Masque binaire des numeros (bit n = numero n)
+    lucky_numbers_mask SMALLINT NOT NULL,                       -- Masque binaire des numeros chance
     UNIQUE (user_id, lottery_id)                                -- Un utilisateur ne peut participer qu'une seule fois à un tirage
 );
 
@@ -54,7 +60,9 @@ CREATE TABLE lottery_results (
     id SERIAL PRIMARY KEY,                                      -- Identifiant unique du résultat
     lottery_id INT REFERENCES lotteries(id) ON DELETE CASCADE,  -- Référence au tirage
     winning_numbers VARCHAR NOT NULL,                           -- Numéros gagnants
-    winning_lucky_numbers VARCHAR NOT NULL                      -- Numero chance gagnants
+    winning_lucky_numbers VARCHAR NOT NULL,                     -- Numero chance gagnants
+    winning_numbers_mask BIGINT NOT NULL,                       -- Masque binaire des numeros gagnants
+    winning_lucky_numbers_mask SMALLINT NOT NULL                -- Masque binaire des numeros chance gagnants
 );
 
 -- Table pour stocker les classements des loteries
@@ -67,6 +75,68 @@ CREATE TABLE lottery_rankings (
     winnings FLOAT NOT NULL                                                 -- Montant gagné par le joueur
 );
 
+-- Index de lecture du résultat d'un tirage et de la ligne de classement d'un joueur
+CREATE UNIQUE INDEX ix_lottery_results_lottery_id ON lottery_results (lottery_id);
+CREATE INDEX ix_lottery_rankings_result_player ON lottery_rankings (lottery_result_id, player_id);
+
+-- Table pour stocker l'index inversé des tickets (numéro -> inscriptions qui le contiennent)
+CREATE TABLE ticket_index (
+    id SERIAL PRIMARY KEY,                                      -- Identifiant unique de la liste
+    lottery_id INT REFERENCES lotteries(id) ON DELETE CASCADE,  -- Référence au tirage
+    kind VARCHAR NOT NULL,                                      -- Type de liste (number, lucky, irregular)
+    number SMALLINT NOT NULL,                                   -- Numero indexé (0 pour irregular)
+    segment INT NOT NULL DEFAULT 0,                             -- Segment de la liste (0 pour la liste compactée)
+    entry_count INT NOT NULL DEFAULT 0,                         -- Nombre d'inscriptions du segment
+    last_entry_id INT NOT NULL DEFAULT 0,                       -- Plus grand identifiant du segment
+    postings BYTEA NOT NULL DEFAULT '',                         -- Identifiants compressés (écarts en entiers de longueur variable)
+    UNIQUE (lottery_id, kind, number, segment)                  -- Un segment par numéro, par tirage et par premier identifiant
+);
+
+-- Table pour stocker les numéros dévoilés d'un tirage en direct
+CREATE TABLE live_draws (
+    id SERIAL PRIMARY KEY,                                      -- Identifiant unique du tirage en direct
+    lottery_id INT UNIQUE REFERENCES lotteries(id) ON DELETE CASCADE, -- Référence au tirage
+    numbers VARCHAR NOT NULL DEFAULT '',                        -- Numéros dévoilés, dans l'ordre
+    lucky_numbers VARCHAR NOT NULL DEFAULT ''                   -- Numéros chance dévoilés, dans l'ordre
+);
+
+-- Table pour stocker les tâches de fond (validation des tirages)
+CREATE TABLE jobs (
+    id SERIAL PRIMARY KEY,                                      -- Identifiant unique de la tâche
+    kind VARCHAR NOT NULL,                                      -- Type de tâche (validate_lottery, announce_lottery)
+    lottery_id INT NOT NULL REFERENCES lotteries(id) ON DELETE CASCADE, -- Référence au tirage
+    payload TEXT NOT NULL DEFAULT '{}',                         -- Paramètres de la tâche (JSON)
+    status VARCHAR NOT NULL DEFAULT 'PENDING',                  -- PENDING, RUNNING, DONE, FAILED
+    stage VARCHAR NOT NULL DEFAULT 'QUEUED',                    -- Dernière étape terminée
+    entry_count INT NOT NULL DEFAULT 0,                         -- Inscriptions lues
+    winner_count INT NOT NULL DEFAULT 0,                        -- Joueurs classés
+    persisted_count INT NOT NULL DEFAULT 0,                     -- Lignes de classement enregistrées
+    notified_count INT NOT NULL DEFAULT 0,                      -- Gagnants traités lors de l'envoi des emails
+    attempts INT NOT NULL DEFAULT 0,                            -- Nombre de prises en charge
+    error TEXT,                                                 -- Dernière erreur
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),                -- Date de création
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),                -- Dernier signe de vie
+    finished_at TIMESTAMP                                       -- Date de fin
+);
+CREATE INDEX ix_jobs_lottery_id ON jobs (lottery_id);
+
+-- Table pour stocker les emails à envoyer (file d'envoi)
+CREATE TABLE email_outbox (
+    id SERIAL PRIMARY KEY,                                      -- Identifiant unique de l'email
+    kind VARCHAR NOT NULL,                                      -- Type d'email (new_tirage, results_available, contact_us)
+    receiver VARCHAR NOT NULL,                                  -- Adresse(s) du ou des destinataires
+    message TEXT NOT NULL,                                      -- Message complet, en-têtes compris
+    status VARCHAR NOT NULL DEFAULT 'PENDING',                  -- PENDING, SENDING, SENT, DEAD
+    attempts INT NOT NULL DEFAULT 0,                            -- Nombre de tentatives d'envoi
+    available_at TIMESTAMP NOT NULL DEFAULT NOW(),              -- Date d'envoi au plus tôt
+    claim_token VARCHAR,                                        -- Jeton du processus d'envoi
+    claimed_until TIMESTAMP,                                    -- Expiration de la réservation
+    last_error TEXT,                                            -- Dernière erreur d'envoi
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),                -- Date de création
+    sent_at TIMESTAMP                                           -- Date d'envoi
+);
+CREATE INDEX ix_email_outbox_status_available_at ON email_outbox (status, available_at);
+
 -- Table pour stocker les token d'authentification
 CREATE TABLE token_block_list (
     id SERIAL PRIMARY KEY,                                        -- Identifiant unique du token bloqué
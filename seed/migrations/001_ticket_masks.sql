@@ -0,0 +1,46 @@
+-- Ajout des masques binaires des tickets et des résultats.
+-- Le numéro n est représenté par le bit n : les numéros 1 à 49 tiennent dans un BIGINT,
+-- les numéros chance 1 à 9 dans un SMALLINT. Les lignes existantes sont complétées
+-- à partir des chaînes séparées par des virgules avant de poser la contrainte NOT NULL ;
+-- une chaîne absente ou vide, ou un élément vide ("1,2,"), est ignoré, comme dans
+-- `numbers_to_mask`.
+
+BEGIN;
+
+ALTER TABLE entries ADD COLUMN IF NOT EXISTS numbers_mask BIGINT;
+ALTER TABLE entries ADD COLUMN IF NOT EXISTS lucky_numbers_mask SMALLINT;
+ALTER TABLE lottery_results ADD COLUMN IF NOT EXISTS winning_numbers_mask BIGINT;
+ALTER TABLE lottery_results ADD COLUMN IF NOT EXISTS winning_lucky_numbers_mask SMALLINT;
+
+UPDATE entries SET
+    numbers_mask = (
+        SELECT COALESCE(bit_or(1::BIGINT << trim(n)::INT), 0)
+        FROM unnest(string_to_array(COALESCE(numbers, ''), ',')) AS n
+        WHERE trim(n) <> ''
+    ),
+    lucky_numbers_mask = (
+        SELECT COALESCE(bit_or(1 << trim(n)::INT), 0)::SMALLINT
+        FROM unnest(string_to_array(COALESCE(lucky_numbers, ''), ',')) AS n
+        WHERE trim(n) <> ''
+    )
+WHERE numbers_mask IS NULL OR lucky_numbers_mask IS NULL;
+
+UPDATE lottery_results SET
+    winning_numbers_mask = (
+        SELECT COALESCE(bit_or(1::BIGINT << trim(n)::INT), 0)
+        FROM unnest(string_to_array(COALESCE(winning_numbers, ''), ',')) AS n
+        WHERE trim(n) <> ''
+    ),
+    winning_lucky_numbers_mask = (
+        SELECT COALESCE(bit_or(1 << trim(n)::INT), 0)::SMALLINT
+        FROM unnest(string_to_array(COALESCE(winning_lucky_numbers, ''), ',')) AS n
+        WHERE trim(n) <> ''
+    )
+WHERE winning_numbers_mask IS NULL OR winning_lucky_numbers_mask IS NULL;
+
+ALTER TABLE entries ALTER COLUMN numbers_mask SET NOT NULL;
+ALTER TABLE entries ALTER COLUMN lucky_numbers_mask SET NOT NULL;
+ALTER TABLE lottery_results ALTER COLUMN winning_numbers_mask SET NOT NULL;
+ALTER TABLE lottery_results ALTER COLUMN winning_lucky_numbers_mask SET NOT NULL;
+
+COMMIT;
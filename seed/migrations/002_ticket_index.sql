@@ -0,0 +1,20 @@
+-- Ajout de l'index inversé des tickets.
+-- Chaque ligne associe un numéro (ou un numéro chance) d'un tirage aux identifiants
+-- compressés des inscriptions qui le contiennent. La table est créée vide : les index
+-- des tirages existants sont construits par `flask ticket-index rebuild`, ou à la
+-- première lecture d'un tirage non indexé.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS ticket_index (
+    id SERIAL PRIMARY KEY,
+    lottery_id INT REFERENCES lotteries(id) ON DELETE CASCADE,
+    kind VARCHAR NOT NULL,
+    number SMALLINT NOT NULL,
+    entry_count INT NOT NULL DEFAULT 0,
+    last_entry_id INT NOT NULL DEFAULT 0,
+    postings BYTEA NOT NULL DEFAULT '',
+    UNIQUE (lottery_id, kind, number)
+);
+
+COMMIT;
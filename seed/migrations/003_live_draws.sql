@@ -0,0 +1,14 @@
+-- Ajout des tirages en direct.
+-- Chaque ligne conserve les numéros déjà dévoilés d'un tirage, dans l'ordre, à partir
+-- desquels le classement provisoire est reconstruit.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS live_draws (
+    id SERIAL PRIMARY KEY,
+    lottery_id INT UNIQUE REFERENCES lotteries(id) ON DELETE CASCADE,
+    numbers VARCHAR NOT NULL DEFAULT '',
+    lucky_numbers VARCHAR NOT NULL DEFAULT ''
+);
+
+COMMIT;
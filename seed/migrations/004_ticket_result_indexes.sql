@@ -0,0 +1,12 @@
+-- Ajout des index de consultation du résultat d'un ticket.
+-- Le résultat d'un tirage est lu par `lottery_id`, puis la ligne de classement d'un
+-- joueur par `(lottery_result_id, player_id)`, sans parcourir tout le classement.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS ix_lottery_results_lottery_id
+    ON lottery_results (lottery_id);
+CREATE INDEX IF NOT EXISTS ix_lottery_rankings_result_player
+    ON lottery_rankings (lottery_result_id, player_id);
+
+COMMIT;
@@ -0,0 +1,30 @@
+-- Ajout des tâches de fond de validation des tirages.
+-- L'état de chaque tâche est enregistré à chaque étape pour suivre sa progression et
+-- la reprendre après un redémarrage. L'index sur `lottery_results.lottery_id` devient
+-- unique : une tâche relancée ne peut pas créer un second résultat pour un tirage.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR NOT NULL,
+    lottery_id INT NOT NULL REFERENCES lotteries(id) ON DELETE CASCADE,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status VARCHAR NOT NULL DEFAULT 'PENDING',
+    stage VARCHAR NOT NULL DEFAULT 'QUEUED',
+    entry_count INT NOT NULL DEFAULT 0,
+    winner_count INT NOT NULL DEFAULT 0,
+    persisted_count INT NOT NULL DEFAULT 0,
+    notified_count INT NOT NULL DEFAULT 0,
+    attempts INT NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_lottery_id ON jobs (lottery_id);
+
+DROP INDEX IF EXISTS ix_lottery_results_lottery_id;
+CREATE UNIQUE INDEX ix_lottery_results_lottery_id ON lottery_results (lottery_id);
+
+COMMIT;
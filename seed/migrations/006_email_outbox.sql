@@ -0,0 +1,24 @@
+-- Ajout de la file d'envoi des emails.
+-- Les emails sont enregistrés dans la même transaction que l'opération qui les
+-- déclenche, puis envoyés par un processus de fond (`flask outbox run`).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR NOT NULL,
+    receiver VARCHAR NOT NULL,
+    message TEXT NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'PENDING',
+    attempts INT NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    claim_token VARCHAR,
+    claimed_until TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    sent_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_status_available_at
+    ON email_outbox (status, available_at);
+
+COMMIT;
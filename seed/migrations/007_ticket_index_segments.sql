@@ -0,0 +1,14 @@
+-- Découpage des listes de l'index inversé en segments.
+-- Chaque inscription ajoute un segment (numéroté par son plus petit identifiant)
+-- au lieu de réécrire et de verrouiller la liste entière. Le segment 0 est la liste
+-- construite ou compactée ; les lignes existantes deviennent ce segment.
+
+BEGIN;
+
+ALTER TABLE ticket_index ADD COLUMN IF NOT EXISTS segment INT NOT NULL DEFAULT 0;
+ALTER TABLE ticket_index DROP CONSTRAINT IF EXISTS ticket_index_lottery_id_kind_number_key;
+ALTER TABLE ticket_index
+    ADD CONSTRAINT ticket_index_lottery_id_kind_number_segment_key
+    UNIQUE (lottery_id, kind, number, segment);
+
+COMMIT;
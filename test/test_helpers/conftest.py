@@ -0,0 +1,74 @@
+import sys
+import os
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.extensions import db as _db
+from app.helpers import invalidate_leaderboard_cache, clear_token_cache
+
+
+def make_app(database_uri):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
+    app.config["TESTING"] = True
+    _db.init_app(app)
+    return app
+
+
+@pytest.fixture
+def app():
+    """Application Flask minimale reliée à une base SQLite en mémoire."""
+    app = make_app("sqlite://")
+
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.session.remove()
+        _db.drop_all()
+
+
+@pytest.fixture
+def db(app):
+    """Instance SQLAlchemy liée à l'application de test."""
+    return _db
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Instance SQLAlchemy liée à une base SQLite sur disque, partageable entre processus."""
+    app = make_app(f"sqlite:///{tmp_path / 'lottery.db'}")
+
+    with app.app_context():
+        _db.create_all()
+        yield _db
+        _db.session.remove()
+        _db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    """Répertoire temporaire des instantanés de tickets, propre à chaque test."""
+    directory = tmp_path / "snapshots"
+    monkeypatch.setattr(Config, "SNAPSHOT_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def leaderboard_cache():
+    """Cache des classements vidé avant chaque test, les bases de test réutilisant les identifiants."""
+    invalidate_leaderboard_cache()
+    yield
+    invalidate_leaderboard_cache()
+
+
+@pytest.fixture(autouse=True)
+def token_cache(tmp_path, monkeypatch):
+    """Cache des jetons révoqués vidé avant chaque test, avec un canal d'invalidation propre."""
+    monkeypatch.setattr(
+        Config, "TOKEN_REVOCATION_LOG", str(tmp_path / "revocations.log")
+    )
+    clear_token_cache()
+    yield
+    clear_token_cache()
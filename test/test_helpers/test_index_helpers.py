@@ -0,0 +1,203 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.models import Entry, TicketIndex, User
+from app.helpers import (
+    add_entries_to_index,
+    remove_entries_from_index,
+    start_ticket_index,
+    rebuild_ticket_index,
+    compact_ticket_index,
+    number_statistics,
+    count_tickets_containing,
+    structure_scores_index,
+    rank_lottery_entries,
+)
+from app.tools import structure_scores, decode_postings
+from test_scoring_helpers import populate, entries_of
+
+
+def index_snapshot(db, lottery_id):
+    return {
+        (row.kind, row.number, row.segment): (
+            decode_postings(row.postings).tolist(),
+            row.entry_count,
+            row.last_entry_id,
+        )
+        for row in TicketIndex.query.filter_by(lottery_id=lottery_id)
+    }
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_structure_scores_index_matches_structure_scores(db, seed):
+    """Teste que le classement lu dans l'index est celui de `structure_scores`."""
+    populate(db, lottery_id=1, count=500, seed=seed)
+    populate(db, lottery_id=2, count=50, seed=seed + 100)
+    rebuild_ticket_index(1, db)
+    rebuild_ticket_index(2, db)
+    db.session.commit()
+
+    rng = random.Random(seed)
+    draw_numbers = set(rng.sample(range(1, 50), 5))
+    draw_stars = set(rng.sample(range(1, 10), 2))
+
+    expected = structure_scores(entries_of(db, 1), draw_numbers, draw_stars)
+    assert structure_scores_index(1, draw_numbers, draw_stars, db) == expected
+    assert rank_lottery_entries(1, draw_numbers, draw_stars, db, "index") == expected
+
+
+def test_structure_scores_index_builds_missing_index(db):
+    """Teste qu'un tirage non indexé est indexé à la première lecture."""
+    populate(db, lottery_id=1, count=200, seed=7)
+    draw_numbers, draw_stars = [4, 8, 15, 16, 23], [4, 2]
+
+    expected = structure_scores(entries_of(db, 1), draw_numbers, draw_stars)
+    assert structure_scores_index(1, draw_numbers, draw_stars, db) == expected
+    assert TicketIndex.query.filter_by(lottery_id=1).count() > 0
+
+
+def test_index_started_by_new_entries_is_rebuilt(db):
+    """Teste qu'un tirage antérieur à l'index est reconstruit entièrement, même si de
+    nouvelles inscriptions y ont déjà ajouté des segments."""
+    populate(db, lottery_id=1, count=200, seed=8)
+    entries = entries_of(db, 1)
+    add_entries_to_index(entries[-3:], db)
+    db.session.commit()
+    draw_numbers, draw_stars = [4, 8, 15, 16, 23], [4, 2]
+
+    expected = structure_scores(entries, draw_numbers, draw_stars)
+    assert structure_scores_index(1, draw_numbers, draw_stars, db) == expected
+    assert sum(number_statistics(1, db)["numbers"].values()) == sum(
+        len(set(entry.numbers.split(","))) for entry in entries
+    )
+
+
+def test_add_entries_to_index_matches_rebuild(db):
+    """Teste que l'index tenu à jour à chaque inscription, une fois compacté, est
+    celui reconstruit."""
+    populate(db, lottery_id=1, count=300, seed=11)
+    entries = entries_of(db, 1)
+    start_ticket_index(1, db)
+
+    for start in range(0, len(entries), 7):
+        add_entries_to_index(entries[start : start + 7], db)
+    db.session.commit()
+    assert compact_ticket_index(1, db) > 0
+    db.session.commit()
+    incremental = index_snapshot(db, 1)
+
+    rebuild_ticket_index(1, db)
+    db.session.commit()
+    assert index_snapshot(db, 1) == incremental
+    assert compact_ticket_index(1, db) == 0
+
+
+def test_segments_are_read_before_compaction(db):
+    """Teste que les lectures réunissent les segments ajoutés par les inscriptions."""
+    populate(db, lottery_id=1, count=300, seed=15)
+    entries = entries_of(db, 1)
+    rebuild_ticket_index(1, db)
+    db.session.commit()
+
+    rng = random.Random(16)
+    new_entries = []
+    for index in range(40):
+        user = User(
+            _first_name=f"Nouveau{index}",
+            _last_name="fake",
+            _email=f"nouveau{index}@example.com",
+            _password_hash="hash",
+            _role_id=3,
+        )
+        db.session.add(user)
+        db.session.flush()
+        entry = Entry(
+            user_id=user.id,
+            lottery_id=1,
+            numbers=",".join(map(str, rng.sample(range(1, 50), rng.randint(5, 6)))),
+            lucky_numbers=",".join(map(str, rng.sample(range(1, 10), 2))),
+        )
+        db.session.add(entry)
+        add_entries_to_index([entry], db)
+        new_entries.append(entry)
+    remove_entries_from_index(new_entries[:3] + entries[:3], db)
+    for entry in new_entries[:3] + entries[:3]:
+        db.session.delete(entry)
+    db.session.commit()
+    assert TicketIndex.query.filter(TicketIndex.segment > 0).count() > 0
+
+    remaining = entries_of(db, 1)
+    draw_numbers, draw_stars = [3, 9, 17, 28, 44], [2, 5]
+    expected = structure_scores(remaining, draw_numbers, draw_stars)
+    statistics = number_statistics(1, db)
+    assert structure_scores_index(1, draw_numbers, draw_stars, db) == expected
+    assert sum(statistics["lucky_numbers"].values()) == sum(
+        entry.lucky_numbers_mask.bit_count() for entry in remaining
+    )
+
+    compact_ticket_index(1, db)
+    db.session.commit()
+    assert TicketIndex.query.filter(TicketIndex.segment > 0).count() == 0
+    assert structure_scores_index(1, draw_numbers, draw_stars, db) == expected
+    assert number_statistics(1, db) == statistics
+
+
+def test_remove_entries_from_index(db):
+    """Teste le retrait d'inscriptions de l'index et l'oubli des inscriptions supprimées."""
+    populate(db, lottery_id=1, count=300, seed=12)
+    rebuild_ticket_index(1, db)
+    db.session.commit()
+
+    entries = entries_of(db, 1)
+    removed, deleted = entries[:20], entries[20:40]
+    remove_entries_from_index(removed, db)
+    for entry in removed + deleted:
+        db.session.delete(entry)
+    db.session.commit()
+
+    remaining = entries_of(db, 1)
+    draw_numbers, draw_stars = [1, 2, 3, 4, 5], [1, 2]
+    assert structure_scores_index(1, draw_numbers, draw_stars, db) == (
+        structure_scores(remaining, draw_numbers, draw_stars)
+    )
+    removed_ids = {entry.id for entry in removed}
+    for entry_ids, _, _ in index_snapshot(db, 1).values():
+        assert not removed_ids & set(entry_ids)
+
+
+def test_number_statistics(db):
+    """Teste les compteurs de tickets par numéro lus dans l'index."""
+    populate(db, lottery_id=1, count=300, seed=13)
+    entries = entries_of(db, 1)
+
+    statistics = number_statistics(1, db)
+
+    for number in range(1, 50):
+        assert statistics["numbers"][number] == sum(
+            str(number) in entry.numbers.split(",") for entry in entries
+        )
+    for number in range(1, 10):
+        assert statistics["lucky_numbers"][number] == sum(
+            str(number) in entry.lucky_numbers.split(",") for entry in entries
+        )
+
+
+def test_count_tickets_containing(db):
+    """Teste le comptage des tickets contenant plusieurs numéros."""
+    populate(db, lottery_id=1, count=300, seed=14)
+    entries = entries_of(db, 1)
+
+    def expected(numbers, lucky_numbers):
+        return sum(
+            set(map(str, numbers)) <= set(entry.numbers.split(","))
+            and set(map(str, lucky_numbers)) <= set(entry.lucky_numbers.split(","))
+            for entry in entries
+        )
+
+    for numbers, lucky_numbers in [([7], []), ([7, 21], []), ([3], [2]), ([], [5])]:
+        assert count_tickets_containing(1, numbers, lucky_numbers, db) == expected(
+            numbers, lucky_numbers
+        )
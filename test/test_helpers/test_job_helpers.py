@@ -0,0 +1,288 @@
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.models import (
+    Job,
+    Lottery,
+    LotteryResult,
+    LotteryRanking,
+    OutboxEmail,
+    Role,
+    User,
+)
+from app.helpers import (
+    create_announcement_job,
+    create_validation_job,
+    claim_job,
+    run_job,
+    retry_job,
+    submit_job,
+    pending_job_ids,
+    validation_numbers,
+    validation_numbers_match,
+)
+from app.helpers import job_helpers, leaderboard_helpers
+from app.schemas import JobOverviewSchema
+from app.tools import JobStage, JobStatus, Roles, structure_scores
+from test_scoring_helpers import populate, entries_of
+
+WINNING_NUMBERS, LUCKY_NUMBERS = "4,9,17,30,41", "3,6"
+
+
+def stored_ranking(db):
+    return [
+        (row.player_id, row.rank, row.score)
+        for row in LotteryRanking.query.order_by(LotteryRanking.id)
+    ]
+
+
+def expected_ranking(db, lottery_id):
+    ranking = structure_scores(entries_of(db, lottery_id), [4, 9, 17, 30, 41], [3, 6])
+    return [
+        (player_id, rank, score)
+        for rank, (players, score) in ranking.items()
+        for player_id in players
+    ]
+
+
+def test_validation_job_runs_every_stage(db):
+    """Teste qu'une tâche de validation enregistre le résultat et chaque étape."""
+    populate(db, lottery_id=1, count=150, seed=51)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+
+    assert run_job(job.id, db)
+
+    job = db.session.get(Job, job.id)
+    assert job.status == JobStatus.DONE.value
+    assert job.stage == JobStage.NOTIFIED.value
+    assert job.entry_count == 150
+    assert job.winner_count == job.persisted_count == job.notified_count
+    assert stored_ranking(db) == expected_ranking(db, 1)
+    assert db.session.get(Lottery, 1).status == "TERMINE"
+    assert not run_job(job.id, db)
+
+
+def test_validation_job_is_reused_while_unfinished(db):
+    """Teste qu'un tirage n'a qu'une tâche de validation non terminée."""
+    populate(db, lottery_id=1, count=10, seed=52)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+
+    assert create_validation_job(1, "1,2,3,4,5", "1,2", db).id == job.id
+    assert Job.query.count() == 1
+
+
+def test_reused_validation_job_keeps_its_numbers(db):
+    """Teste que les numéros d'une tâche de validation reprise sont ceux de sa création."""
+    populate(db, lottery_id=1, count=10, seed=52)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+
+    reused = create_validation_job(1, "1,2,3,4,5", "1,2", db)
+    assert validation_numbers(reused) == (WINNING_NUMBERS, LUCKY_NUMBERS)
+    assert validation_numbers_match(job, "41,30,17,9,4", "6,3")
+    assert not validation_numbers_match(reused, "1,2,3,4,5", "1,2")
+
+
+def test_resumed_job_does_not_create_a_second_result(db):
+    """Teste qu'une tâche reprise après l'enregistrement ne crée pas de second résultat."""
+    populate(db, lottery_id=1, count=80, seed=53)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+    run_job(job.id, db)
+    ranking = stored_ranking(db)
+
+    job.status = JobStatus.RUNNING.value
+    job.notified_count = 0
+    job.updated_at = datetime.utcnow() - timedelta(days=1)
+    db.session.commit()
+
+    assert pending_job_ids(db) == [job.id]
+    assert run_job(job.id, db)
+    assert LotteryResult.query.count() == 1
+    assert stored_ranking(db) == ranking
+    assert db.session.get(Job, job.id).attempts == 2
+
+
+def test_job_abandoned_before_persisting_is_resumed(db):
+    """Teste qu'une tâche arrêtée avant l'enregistrement repart du calcul."""
+    populate(db, lottery_id=1, count=80, seed=54)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+    job.status = JobStatus.RUNNING.value
+    job.stage = JobStage.SCORED.value
+    job.updated_at = datetime.utcnow() - timedelta(days=1)
+    db.session.commit()
+
+    assert run_job(job.id, db)
+    assert LotteryResult.query.count() == 1
+    assert stored_ranking(db) == expected_ranking(db, 1)
+
+
+def test_running_job_cannot_be_claimed_twice(db):
+    """Teste qu'une tâche en cours, encore vivante, n'est pas réservée une seconde fois."""
+    populate(db, lottery_id=1, count=5, seed=55)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+
+    assert claim_job(job.id, db)
+    assert not claim_job(job.id, db)
+    assert pending_job_ids(db) == []
+
+
+def test_failed_job_keeps_error_and_can_be_retried(db):
+    """Teste qu'une tâche en échec conserve son erreur et peut être relancée."""
+    populate(db, lottery_id=1, count=5, seed=56)
+    db.session.get(Lottery, 1).status = "EN_COUR"
+    db.session.commit()
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+
+    run_job(job.id, db)
+    job = db.session.get(Job, job.id)
+    assert job.status == JobStatus.FAILED.value
+    assert "validation" in job.error
+    assert LotteryResult.query.count() == 0
+
+    db.session.get(Lottery, 1).status = "EN_VALIDATION"
+    retry_job(job, db)
+    assert run_job(job.id, db)
+    assert db.session.get(Job, job.id).status == JobStatus.DONE.value
+
+
+def test_submitted_job_runs_in_background(db):
+    """Teste qu'une tâche soumise est exécutée par l'exécuteur de fond."""
+    populate(db, lottery_id=1, count=40, seed=57)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+
+    assert submit_job(job.id, db)
+    deadline = time.time() + 10
+    while job.id in job_helpers._submitted and time.time() < deadline:
+        time.sleep(0.05)
+
+    db.session.expire_all()
+    assert db.session.get(Job, job.id).status == JobStatus.DONE.value
+    assert LotteryResult.query.count() == 1
+
+
+def test_pending_jobs_are_resumed_when_executor_starts(db, monkeypatch):
+    """Teste que les tâches laissées par un processus arrêté sont reprises au démarrage de l'exécuteur."""
+    monkeypatch.setattr(job_helpers, "_executor", None)
+    populate(db, lottery_id=1, count=40, seed=61)
+    announcement = create_announcement_job(1, db)
+    db.session.commit()
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+
+    assert submit_job(job.id, db)
+    deadline = time.time() + 10
+    while job_helpers._submitted and time.time() < deadline:
+        time.sleep(0.05)
+
+    db.session.expire_all()
+    assert db.session.get(Job, announcement.id).status == JobStatus.DONE.value
+    assert db.session.get(Job, job.id).status == JobStatus.DONE.value
+
+
+def add_notified_users(db, count):
+    db.session.add(Role(id=2, role_name=Roles.USER.value))
+    db.session.add(Role(id=3, role_name=Roles.ADMIN.value))
+    for index in range(count):
+        db.session.add(
+            User(
+                _first_name=f"Joueur{index}",
+                _last_name="fake",
+                _email=f"annonce{index}@example.com",
+                _password_hash="hash",
+                _role_id=3 if index % 7 == 0 else 2,
+                _notification=index % 5 != 0,
+            )
+        )
+    db.session.commit()
+    return sorted(
+        user.email
+        for user in User.query.all()
+        if user.notification and user.role_name == Roles.USER.value
+    )
+
+
+def announced_receivers(db):
+    return [
+        email.receiver.split(",")
+        for email in OutboxEmail.query.filter_by(kind="new_tirage").order_by(
+            OutboxEmail.id
+        )
+    ]
+
+
+def test_announcement_job_enqueues_chunked_bcc_emails(db, monkeypatch):
+    """Teste que l'annonce d'un tirage est placée dans la file par blocs de destinataires."""
+    monkeypatch.setattr(Config, "ANNOUNCEMENT_CHUNK_SIZE", 10)
+    receivers = add_notified_users(db, 60)
+    populate(db, lottery_id=1, count=1, seed=58)
+    job = create_announcement_job(1, db)
+    db.session.commit()
+
+    assert run_job(job.id, db)
+
+    chunks = announced_receivers(db)
+    assert len(receivers) == 41
+    assert [len(chunk) for chunk in chunks] == [10, 10, 10, 10, 1]
+    assert sorted(sum(chunks, [])) == receivers
+    assert len({email.message for email in OutboxEmail.query}) == 1
+    job = db.session.get(Job, job.id)
+    assert job.status == JobStatus.DONE.value
+    assert job.notified_count == len(receivers)
+
+
+def test_announcement_job_resumes_after_last_chunk(db, monkeypatch):
+    """Teste qu'une annonce interrompue reprend sans prévenir deux fois un utilisateur."""
+    monkeypatch.setattr(Config, "ANNOUNCEMENT_CHUNK_SIZE", 10)
+    receivers = add_notified_users(db, 60)
+    populate(db, lottery_id=1, count=1, seed=59)
+    job = create_announcement_job(1, db)
+    db.session.commit()
+
+    enqueue_email = job_helpers.enqueue_email
+    calls = []
+
+    def failing_enqueue(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            raise RuntimeError("arrêt du processus")
+        return enqueue_email(*args)
+
+    monkeypatch.setattr(job_helpers, "enqueue_email", failing_enqueue)
+    run_job(job.id, db)
+    assert db.session.get(Job, job.id).status == JobStatus.FAILED.value
+    assert len(announced_receivers(db)) == 2
+
+    monkeypatch.setattr(job_helpers, "enqueue_email", enqueue_email)
+    retry_job(db.session.get(Job, job.id), db)
+    assert run_job(job.id, db)
+
+    chunks = announced_receivers(db)
+    assert sorted(sum(chunks, [])) == receivers
+    assert db.session.get(Job, job.id).notified_count == len(receivers)
+
+
+def test_results_emails_are_staggered_top_ranks_first(db, monkeypatch):
+    """Teste que les emails de résultats sont répartis sur la fenêtre, par rang."""
+    monkeypatch.setattr(Config, "RESULTS_NOTIFICATION_WINDOW", 600)
+    db.session.add(Role(id=3, role_name=Roles.USER.value))
+    populate(db, lottery_id=1, count=120, seed=60)
+    job = create_validation_job(1, WINNING_NUMBERS, LUCKY_NUMBERS, db)
+    start = datetime.utcnow()
+
+    assert run_job(job.id, db)
+
+    ranks = {row.player_id: row.rank for row in LotteryRanking.query}
+    emails = {user.email: ranks[user.id] for user in User.query if user.id in ranks}
+    queued = OutboxEmail.query.filter_by(kind="results_available").all()
+    queued.sort(key=lambda email: (email.available_at, email.id))
+    assert len(queued) == len(ranks)
+    assert [emails[email.receiver] for email in queued] == sorted(ranks.values())
+    assert queued[0].available_at - start < timedelta(seconds=5)
+    assert queued[-1].available_at - queued[0].available_at < timedelta(seconds=600)
+
+    notification = JobOverviewSchema().dump(db.session.get(Job, job.id))["notification"]
+    assert notification["emails"] == len(ranks)
+    assert notification["expected_per_minute"] == round(len(ranks) / 10, 2)
+    assert 1 in leaderboard_helpers._leaderboards
@@ -0,0 +1,136 @@
+import sys
+import os
+from contextlib import contextmanager
+from sqlalchemy import delete, event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.models import User, LotteryResult, LotteryRanking
+from app.helpers import (
+    load_leaderboard,
+    load_player_names,
+    format_ranking_results,
+    cached_leaderboard,
+    warm_leaderboard_cache,
+    invalidate_leaderboard_cache,
+)
+from test_scoring_helpers import populate, entries_of
+
+
+@contextmanager
+def count_queries(db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def publish_ranking(db, lottery_id, player_ids):
+    lottery_result = LotteryResult(
+        lottery_id=lottery_id, winning_numbers="1,2,3,4,5", winning_lucky_numbers="1,2"
+    )
+    db.session.add(lottery_result)
+    db.session.flush()
+    for rank, player_id in enumerate(player_ids, start=1):
+        db.session.add(
+            LotteryRanking(
+                lottery_result_id=lottery_result.id,
+                player_id=player_id,
+                rank=rank,
+                score=100 - rank % 90,
+                winnings=10.0,
+            )
+        )
+    db.session.commit()
+    return lottery_result.id
+
+
+def test_load_leaderboard_query_count_does_not_grow(db):
+    """Teste que le classement est chargé en une requête, quel que soit le nombre de gagnants."""
+    populate(db, lottery_id=1, count=3, seed=4)
+    populate(db, lottery_id=2, count=300, seed=5)
+    small = publish_ranking(db, 1, [entry.user_id for entry in entries_of(db, 1)])
+    large = publish_ranking(db, 2, [entry.user_id for entry in entries_of(db, 2)])
+    db.session.expire_all()
+
+    with count_queries(db) as small_queries:
+        small_board = load_leaderboard(small, db)
+    with count_queries(db) as large_queries:
+        large_board = load_leaderboard(large, db)
+
+    assert len(small_board) == 3 and len(large_board) == 300
+    assert len(small_queries) == len(large_queries) == 1
+
+
+def test_load_leaderboard_rows(db):
+    """Teste le contenu et l'ordre des lignes du classement."""
+    populate(db, lottery_id=1, count=20, seed=6)
+    player_ids = [entry.user_id for entry in entries_of(db, 1)]
+    lottery_result_id = publish_ranking(db, 1, player_ids)
+    users = {user.id: user.full_name for user in User.query.all()}
+
+    leaderboard = load_leaderboard(lottery_result_id, db)
+
+    assert [row["player_id"] for row in leaderboard] == player_ids
+    assert [row["rank"] for row in leaderboard] == list(range(1, 21))
+    assert all(row["name"] == users[row["player_id"]] for row in leaderboard)
+    assert load_leaderboard(lottery_result_id + 1, db) == []
+
+
+def test_load_leaderboard_unknown_player(db):
+    """Teste qu'un joueur supprimé apparaît sous un nom par défaut."""
+    populate(db, lottery_id=1, count=5, seed=7)
+    player_ids = [entry.user_id for entry in entries_of(db, 1)]
+    lottery_result_id = publish_ranking(db, 1, player_ids)
+    db.session.execute(delete(User).where(User.id == player_ids[0]))
+    db.session.commit()
+
+    leaderboard = load_leaderboard(lottery_result_id, db)
+
+    assert leaderboard[0]["name"] == "Inconnu"
+    assert len(load_player_names(player_ids, db)) == 4
+
+
+def test_format_ranking_results_query_count_does_not_grow(db):
+    """Teste que la mise en forme d'un classement charge les noms en une requête."""
+    populate(db, lottery_id=1, count=300, seed=8)
+    player_ids = [entry.user_id for entry in entries_of(db, 1)]
+    db.session.expire_all()
+
+    with count_queries(db) as small_queries:
+        small = format_ranking_results(
+            {1: [player_ids[:1], 100], 2: [player_ids[1:3], 50]}, 1000, db
+        )
+    with count_queries(db) as large_queries:
+        large = format_ranking_results(
+            {1: [player_ids[:1], 100], 2: [player_ids[1:], 50]}, 1000, db
+        )
+
+    assert len(small) == 3 and len(large) == 300
+    assert len(small_queries) == len(large_queries) == 1
+    names = {user.id: user.full_name for user in User.query.all()}
+    assert all(result["name"] == names[result["player_id"]] for result in large)
+
+
+def test_cached_leaderboard_is_loaded_once(db):
+    """Teste qu'un classement en cache est servi sans requête jusqu'à son invalidation."""
+    populate(db, lottery_id=1, count=20, seed=9)
+    lottery_result_id = publish_ranking(
+        db, 1, [entry.user_id for entry in entries_of(db, 1)]
+    )
+
+    assert warm_leaderboard_cache(lottery_result_id, db) == 20
+    with count_queries(db) as queries:
+        leaderboard = cached_leaderboard(lottery_result_id, db)
+    assert queries == []
+    assert leaderboard == load_leaderboard(lottery_result_id, db)
+
+    invalidate_leaderboard_cache(lottery_result_id)
+    with count_queries(db) as queries:
+        assert cached_leaderboard(lottery_result_id, db) == leaderboard
+    assert len(queries) == 1
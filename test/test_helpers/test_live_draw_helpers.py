@@ -0,0 +1,107 @@
+import sys
+import os
+from collections import OrderedDict
+import pytest
+from marshmallow import ValidationError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.models import Entry, Lottery, TicketIndex
+from app.helpers import (
+    get_live_leaderboard,
+    reveal_live_number,
+    get_live_draw_numbers,
+    rank_lottery_entries,
+    add_entries_to_index,
+)
+from app.helpers import live_draw_helpers
+from test_scoring_helpers import populate
+
+
+def test_live_draw_final_ranking_matches_batch(db):
+    """Teste que le classement après le dernier numéro est celui de la validation."""
+    populate(db, lottery_id=1, count=300, seed=31)
+
+    for number in [7, 21, 3]:
+        reveal_live_number(1, number, False, db)
+    reveal_live_number(1, 4, True, db)
+    assert get_live_draw_numbers(1, db) is None
+    for number in [44, 12]:
+        reveal_live_number(1, number, False, db)
+    board = reveal_live_number(1, 9, True, db)
+    db.session.commit()
+
+    assert board.complete
+    assert get_live_draw_numbers(1, db) == ("7,21,3,44,12", "4,9")
+    assert board.ranking() == rank_lottery_entries(
+        1, {7, 21, 3, 44, 12}, {4, 9}, db, engine="python"
+    )
+
+
+@pytest.mark.parametrize(
+    "number, lucky", [(0, False), (50, False), (10, True), (7, False)]
+)
+def test_reveal_live_number_rejects_invalid_numbers(db, number, lucky):
+    """Teste que les numéros hors limites ou déjà dévoilés sont refusés."""
+    populate(db, lottery_id=1, count=20, seed=32)
+    reveal_live_number(1, 7, False, db)
+
+    with pytest.raises(ValidationError):
+        reveal_live_number(1, number, lucky, db)
+
+
+def test_reveal_live_number_rejects_extra_numbers(db):
+    """Teste qu'au plus 2 numéros chance peuvent être dévoilés."""
+    populate(db, lottery_id=1, count=20, seed=33)
+    reveal_live_number(1, 1, True, db)
+    reveal_live_number(1, 2, True, db)
+
+    with pytest.raises(ValidationError):
+        reveal_live_number(1, 3, True, db)
+
+
+def test_live_leaderboard_follows_new_entries(db):
+    """Teste que le classement provisoire est reconstruit quand un ticket est ajouté."""
+    populate(db, lottery_id=1, count=50, seed=34)
+    reveal_live_number(1, 1, False, db)
+    reveal_live_number(1, 2, False, db)
+    db.session.commit()
+    get_live_leaderboard(1, db)
+
+    entry = Entry(user_id=1, lottery_id=1, numbers="1,2,3,4,5", lucky_numbers="1,2")
+    db.session.add(entry)
+    add_entries_to_index([entry], db)
+    db.session.commit()
+
+    ranking = get_live_leaderboard(1, db).ranking()
+    assert ranking[1][1] == 20
+    assert 1 in ranking[1][0]
+
+
+def test_live_leaderboard_read_does_not_build_index(db):
+    """Teste que l'index n'est construit qu'au premier numéro dévoilé, pas à la lecture."""
+    populate(db, lottery_id=1, count=30, seed=35)
+
+    get_live_leaderboard(1, db)
+    assert TicketIndex.query.count() == 0
+
+    reveal_live_number(1, 7, False, db)
+    assert TicketIndex.query.count() > 0
+
+
+def test_live_boards_are_bounded_and_dropped_after_validation(db, monkeypatch):
+    """Teste que les classements provisoires gardés sont limités et retirés une fois le tirage validé."""
+    monkeypatch.setattr(live_draw_helpers, "_live_boards", OrderedDict())
+    monkeypatch.setattr(Config, "LIVE_BOARD_CACHE_SIZE", 1)
+    populate(db, lottery_id=1, count=20, seed=36)
+    populate(db, lottery_id=2, count=20, seed=37)
+
+    reveal_live_number(1, 7, False, db)
+    reveal_live_number(2, 7, False, db)
+    db.session.commit()
+    assert list(live_draw_helpers._live_boards) == [2]
+
+    db.session.get(Lottery, 2).status = "TERMINE"
+    db.session.commit()
+    assert get_live_leaderboard(2, db).numbers == [7]
+    assert not live_draw_helpers._live_boards
@@ -0,0 +1,112 @@
+import sys
+import os
+import pytest
+from marshmallow import ValidationError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.models import Lottery, LotteryResult, LotteryRanking
+from app.helpers import (
+    get_ticket_result,
+    format_ranking_results,
+    save_lottery_rankings,
+)
+from app.tools import structure_scores, calculate_jaccard_similarity
+from test_scoring_helpers import populate, entries_of
+
+DRAW_NUMBERS, DRAW_STARS = [4, 9, 17, 30, 41], [3, 6]
+
+
+def publish_results(db, lottery_id):
+    entries = entries_of(db, lottery_id)
+    lottery_result = LotteryResult(
+        lottery_id=lottery_id,
+        winning_numbers=",".join(map(str, DRAW_NUMBERS)),
+        winning_lucky_numbers=",".join(map(str, DRAW_STARS)),
+    )
+    db.session.add(lottery_result)
+    db.session.flush()
+    ranking = structure_scores(entries, DRAW_NUMBERS, DRAW_STARS)
+    for result in format_ranking_results(
+        ranking, db.session.get(Lottery, lottery_id).reward_price, db
+    ):
+        db.session.add(
+            LotteryRanking(
+                lottery_result_id=lottery_result.id,
+                player_id=result["player_id"],
+                rank=result["rank"],
+                score=result["score"],
+                winnings=result["winnings"],
+            )
+        )
+    db.session.commit()
+    return entries
+
+
+def test_get_ticket_result_matches_published_ranking(db):
+    """Teste que le résultat d'un ticket est celui du classement publié."""
+    populate(db, lottery_id=1, count=200, seed=41)
+    entries = publish_results(db, 1)
+    rankings = {ranking.player_id: ranking for ranking in LotteryRanking.query.all()}
+
+    for entry in entries:
+        result = get_ticket_result(1, entry.user_id, db)
+        numbers = [int(n) for n in entry.numbers.split(",")]
+        lucky_numbers = [int(n) for n in entry.lucky_numbers.split(",")]
+
+        assert result["score"] == calculate_jaccard_similarity(
+            DRAW_NUMBERS, DRAW_STARS, numbers, lucky_numbers
+        )
+        assert result["matched_numbers"] == sorted(set(numbers) & set(DRAW_NUMBERS))
+        ranking = rankings.get(entry.user_id)
+        if ranking is None:
+            assert result["rank"] is None and result["winnings"] == 0
+        else:
+            assert result["rank"] == ranking.rank
+            assert result["score"] == ranking.score
+            assert result["winnings"] == ranking.winnings
+
+
+def test_get_ticket_result_without_entry_or_results(db):
+    """Teste qu'un joueur sans ticket ou un tirage sans résultat ne donne rien."""
+    populate(db, lottery_id=1, count=5, seed=42)
+    user_id = entries_of(db, 1)[0].user_id
+
+    assert get_ticket_result(1, user_id, db) is None
+    publish_results(db, 1)
+    assert get_ticket_result(1, user_id, db) is not None
+    assert get_ticket_result(1, 10**6, db) is None
+
+
+def test_save_lottery_rankings_inserts_all_rows(db):
+    """Teste que le classement est inséré en lot, avec les valeurs de chaque joueur."""
+    populate(db, lottery_id=1, count=100, seed=43)
+    ranking = structure_scores(entries_of(db, 1), DRAW_NUMBERS, DRAW_STARS)
+    formatted_results = format_ranking_results(ranking, 1000, db)
+    lottery_result = LotteryResult(
+        lottery_id=1, winning_numbers="4,9,17,30,41", winning_lucky_numbers="3,6"
+    )
+    db.session.add(lottery_result)
+    db.session.flush()
+
+    assert save_lottery_rankings(lottery_result.id, formatted_results, db) == len(
+        formatted_results
+    )
+    db.session.commit()
+
+    stored = LotteryRanking.query.order_by(LotteryRanking.id).all()
+    assert [(row.player_id, row.rank, row.score, row.winnings) for row in stored] == [
+        (r["player_id"], r["rank"], r["score"], r["winnings"])
+        for r in formatted_results
+    ]
+
+
+def test_save_lottery_rankings_rejects_invalid_batch(db):
+    """Teste qu'une ligne invalide empêche l'insertion de tout le classement."""
+    formatted_results = [
+        {"player_id": 1, "rank": 1, "score": 90, "winnings": 500.0},
+        {"player_id": 2, "rank": "deux", "score": 80, "winnings": 250.0},
+    ]
+
+    with pytest.raises(ValidationError):
+        save_lottery_rankings(1, formatted_results, db)
+    assert LotteryRanking.query.count() == 0
@@ -0,0 +1,127 @@
+import sys
+import os
+import smtplib
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.models import OutboxEmail
+from app.helpers import (
+    enqueue_email,
+    claim_outbox_batch,
+    deliver_outbox_batch,
+    requeue_dead_emails,
+)
+from app.tools import OutboxStatus, RateLimiter, new_tirage_message
+
+
+class RecordingPool:
+    """Réserve SMTP de test : garde les destinataires et échoue pour ceux de `errors`."""
+
+    def __init__(self, errors=None):
+        self.sent = []
+        self.errors = errors or {}
+
+    def sendmail(self, from_addr, to_addrs, message):
+        receivers = ",".join(to_addrs)
+        if receivers in self.errors:
+            raise self.errors[receivers]
+        self.sent.append(receivers)
+
+
+def enqueue(db, count):
+    for index in range(count):
+        receiver = f"joueur{index}@example.com"
+        enqueue_email("new_tirage", new_tirage_message(receiver), receiver, db)
+    db.session.commit()
+
+
+def statuses(db):
+    return {
+        email.receiver: email.status
+        for email in OutboxEmail.query.order_by(OutboxEmail.id)
+    }
+
+
+def test_enqueue_is_part_of_the_caller_transaction(db):
+    """Teste qu'un email n'est enregistré qu'avec la transaction de l'appelant."""
+    enqueue_email(
+        "new_tirage", new_tirage_message("a@example.com"), "a@example.com", db
+    )
+    db.session.rollback()
+    assert OutboxEmail.query.count() == 0
+
+    enqueue(db, 1)
+    assert statuses(db) == {"joueur0@example.com": OutboxStatus.PENDING.value}
+
+
+def test_deliver_outbox_batch_sends_pending_emails(db):
+    """Teste que les emails en attente sont envoyés par lots puis marqués envoyés."""
+    enqueue(db, 5)
+    pool = RecordingPool()
+
+    assert deliver_outbox_batch(db, pool, RateLimiter(0), batch_size=3) == {
+        "sent": 3,
+        "retried": 0,
+        "dead": 0,
+    }
+    assert deliver_outbox_batch(db, pool, RateLimiter(0), batch_size=3)["sent"] == 2
+    assert deliver_outbox_batch(db, pool, RateLimiter(0))["sent"] == 0
+
+    assert pool.sent == [f"joueur{index}@example.com" for index in range(5)]
+    assert set(statuses(db).values()) == {OutboxStatus.SENT.value}
+
+
+def test_transient_failure_is_retried_with_backoff(db, monkeypatch):
+    """Teste qu'un échec temporaire est réessayé plus tard puis mis à l'écart."""
+    monkeypatch.setattr(Config, "OUTBOX_MAX_ATTEMPTS", 2)
+    enqueue(db, 2)
+    pool = RecordingPool(
+        {"joueur0@example.com": smtplib.SMTPServerDisconnected("coupé")}
+    )
+
+    counts = deliver_outbox_batch(db, pool, RateLimiter(0))
+
+    assert counts == {"sent": 1, "retried": 1, "dead": 0}
+    email = OutboxEmail.query.filter_by(receiver="joueur0@example.com").one()
+    assert email.status == OutboxStatus.PENDING.value
+    assert email.attempts == 1
+    assert email.available_at > datetime.utcnow()
+    assert claim_outbox_batch(db) == []
+
+    email.available_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert deliver_outbox_batch(db, pool, RateLimiter(0))["dead"] == 1
+    assert email.status == OutboxStatus.DEAD.value
+    assert "coupé" in email.last_error
+
+
+def test_permanent_failure_is_dead_lettered_and_requeued(db):
+    """Teste qu'un refus définitif est mis à l'écart sans nouvel essai."""
+    enqueue(db, 1)
+    pool = RecordingPool(
+        {
+            "joueur0@example.com": smtplib.SMTPRecipientsRefused(
+                {"joueur0@example.com": (550, b"Utilisateur inconnu")}
+            )
+        }
+    )
+
+    assert deliver_outbox_batch(db, pool, RateLimiter(0))["dead"] == 1
+    assert statuses(db) == {"joueur0@example.com": OutboxStatus.DEAD.value}
+
+    assert requeue_dead_emails(db) == 1
+    assert deliver_outbox_batch(db, RecordingPool(), RateLimiter(0))["sent"] == 1
+
+
+def test_claimed_emails_are_not_claimed_twice(db):
+    """Teste qu'un email réservé n'est repris qu'après l'expiration de sa réservation."""
+    enqueue(db, 3)
+
+    first = claim_outbox_batch(db)
+    assert len(first) == 3
+    assert claim_outbox_batch(db) == []
+
+    first[0].claimed_until = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert [email.id for email in claim_outbox_batch(db)] == [first[0].id]
@@ -0,0 +1,193 @@
+import sys
+import os
+from urllib.parse import urlsplit
+import pytest
+from jinja2 import FileSystemLoader
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.models import LotteryRanking
+from app.helpers import (
+    ensure_reward_pdf,
+    prerender_reward_pdfs,
+    delete_reward_pdfs,
+    reward_pdf_dir,
+    reward_pdf_path,
+    reward_pdf_response,
+    signed_reward_pdf_url,
+    create_validation_job,
+    run_job,
+)
+from app.controllers.user_controller import user_bp
+from app.tools import PdfRendererPool, reward_pdf_digest
+from app.tools import pdf_tools
+from test_scoring_helpers import populate
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+FAKE_RENDERER = """#!{python}
+import sys
+
+sys.stdout.buffer.write(b"%PDF-1.4\\n" + sys.stdin.buffer.read())
+"""
+
+
+@pytest.fixture
+def renderer(app, tmp_path, monkeypatch):
+    """Réserve dont l'exécutable remplace wkhtmltopdf en recopiant le HTML reçu."""
+    binary = tmp_path / "fake-wkhtmltopdf"
+    binary.write_text(FAKE_RENDERER.format(python=sys.executable))
+    binary.chmod(0o755)
+    app.jinja_loader = FileSystemLoader(os.path.join(ROOT, "app", "templates"))
+    monkeypatch.setattr(Config, "PDF_CACHE_DIR", str(tmp_path / "reward_pdfs"))
+
+    with PdfRendererPool(str(binary), warm=0) as renderer:
+        monkeypatch.setattr(pdf_tools, "_renderer", renderer)
+        yield renderer
+
+
+def test_reward_pdf_digest_depends_on_content():
+    """Teste que l'empreinte ne change qu'avec le contenu du PDF."""
+    digest = reward_pdf_digest("Joueur0 fake", 12.5, "Tirage 1")
+
+    assert reward_pdf_digest("Joueur0 fake", 12.499999, "Tirage 1") == digest
+    assert reward_pdf_digest("Joueur0 fake", 13, "Tirage 1") != digest
+    assert reward_pdf_digest("Joueur1 fake", 12.5, "Tirage 1") != digest
+    assert reward_pdf_digest("Joueur0 fake", 12.5, "Tirage 2") != digest
+
+
+def test_reward_pdf_is_rendered_once(renderer):
+    """Teste que le PDF est généré à la première demande puis relu."""
+    path, digest = ensure_reward_pdf(1, "Joueur0 fake", 12.5, "Tirage 1")
+
+    assert os.path.basename(path) == f"{digest}.pdf"
+    with open(path, "rb") as file:
+        content = file.read()
+    assert content.startswith(b"%PDF-1.4")
+    assert b"Joueur0 fake" in content
+    assert os.listdir(reward_pdf_dir(1)) == [f"{digest}.pdf"]
+
+    assert ensure_reward_pdf(1, "Joueur0 fake", 12.5, "Tirage 1") == (path, digest)
+    assert renderer.spawned == 1
+
+
+def test_prerender_and_delete_reward_pdfs(db, renderer):
+    """Teste la génération des PDF des gagnants et leur suppression."""
+    populate(db, lottery_id=1, count=30, seed=61)
+    job = create_validation_job(1, "4,9,17,30,41", "3,6", db)
+    run_job(job.id, db)
+    rankings = LotteryRanking.query.all()
+    winners = [ranking for ranking in rankings if ranking.winnings > 0]
+    lottery_result_id = rankings[0].lottery_result_id
+    assert renderer.spawned == 0
+
+    lottery = winners[0].lottery_result.lottery
+    assert prerender_reward_pdfs(lottery, lottery_result_id, db) == len(winners)
+    assert len(os.listdir(reward_pdf_dir(1))) == len(winners)
+    assert prerender_reward_pdfs(lottery, lottery_result_id, db) == len(winners)
+    assert renderer.spawned == len(winners)
+
+    delete_reward_pdfs(1)
+    assert not os.path.exists(reward_pdf_dir(1))
+
+
+def test_validation_job_prerenders_reward_pdfs(db, renderer, monkeypatch):
+    """Teste que la validation génère les PDF des gagnants lorsque c'est configuré."""
+    monkeypatch.setattr(Config, "PDF_PRERENDER", True)
+    populate(db, lottery_id=1, count=30, seed=62)
+    os.makedirs(reward_pdf_dir(1))
+    with open(os.path.join(reward_pdf_dir(1), "ancien.pdf"), "wb") as file:
+        file.write(b"%PDF-1.4\n")
+
+    run_job(create_validation_job(1, "4,9,17,30,41", "3,6", db).id, db)
+
+    winners = LotteryRanking.query.filter(LotteryRanking.winnings > 0).count()
+    assert winners > 0
+    assert len(os.listdir(reward_pdf_dir(1))) == winners
+    assert "ancien.pdf" not in os.listdir(reward_pdf_dir(1))
+
+
+@pytest.fixture
+def stored_pdf(app, tmp_path, monkeypatch):
+    """PDF de récompense déjà généré pour le tirage 1, servi par les routes utilisateur."""
+    monkeypatch.setattr(Config, "PDF_CACHE_DIR", str(tmp_path / "reward_pdfs"))
+    monkeypatch.setattr(Config, "PDF_URL_SECRET", "secret")
+    app.register_blueprint(user_bp, url_prefix="/user")
+    digest = reward_pdf_digest("Joueur0 fake", 12.5, "Tirage 1")
+    os.makedirs(reward_pdf_dir(1))
+    with open(reward_pdf_path(1, digest), "wb") as file:
+        file.write(b"%PDF-1.4\n")
+    return digest
+
+
+def test_response_sent_by_application(app, stored_pdf):
+    """Teste que le PDF est envoyé par l'application sans en-tête de redirection."""
+    with app.test_request_context():
+        response = reward_pdf_response(1, stored_pdf, "recompense.pdf")
+        response.direct_passthrough = False
+
+        assert response.get_data() == b"%PDF-1.4\n"
+        assert response.get_etag() == (stored_pdf, False)
+        assert "X-Accel-Redirect" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("X-Accel-Redirect", "/protected/reward_pdfs/lottery_1/{digest}.pdf"),
+        ("X-Sendfile", "{cache_dir}/lottery_1/{digest}.pdf"),
+    ],
+)
+def test_response_offloaded_to_proxy(app, stored_pdf, monkeypatch, header, expected):
+    """Teste que la réponse est vide et désigne le fichier au proxy."""
+    monkeypatch.setattr(Config, "PDF_OFFLOAD_HEADER", header)
+
+    with app.test_request_context():
+        response = reward_pdf_response(1, stored_pdf, "récompense.pdf")
+
+    assert response.status_code == 200
+    assert response.get_data() == b""
+    assert response.headers[header] == expected.format(
+        digest=stored_pdf, cache_dir=os.path.abspath(Config.PDF_CACHE_DIR)
+    )
+    assert response.headers["Content-Type"] == "application/pdf"
+    assert "Content-Length" not in response.get_wsgi_headers({})
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=\"recompense.pdf\"; filename*=UTF-8''r%C3%A9compense.pdf"
+    )
+    assert response.get_etag() == (stored_pdf, False)
+    assert "private" in response.headers["Cache-Control"]
+
+
+def test_offloaded_response_is_conditional(app, stored_pdf, monkeypatch):
+    """Teste qu'une requête portant l'empreinte du PDF reçoit une réponse 304."""
+    monkeypatch.setattr(Config, "PDF_OFFLOAD_HEADER", "X-Accel-Redirect")
+
+    with app.test_request_context(headers={"If-None-Match": f'"{stored_pdf}"'}):
+        response = reward_pdf_response(1, stored_pdf, "recompense.pdf")
+
+    assert response.status_code == 304
+
+
+def test_signed_url_downloads_until_expiry(app, stored_pdf, monkeypatch):
+    """Teste qu'une URL signée donne le fichier jusqu'à son expiration seulement."""
+    monkeypatch.setattr(Config, "PDF_OFFLOAD_HEADER", "X-Accel-Redirect")
+    client = app.test_client()
+    with app.test_request_context():
+        url, _ = signed_reward_pdf_url(1, stored_pdf, "recompense.pdf")
+        monkeypatch.setattr(Config, "PDF_URL_TTL", -1)
+        expired_url, _ = signed_reward_pdf_url(1, stored_pdf, "recompense.pdf")
+    path = urlsplit(url)
+    path = f"{path.path}?{path.query}"
+
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["X-Accel-Redirect"].endswith(f"/{stored_pdf}.pdf")
+
+    expired = urlsplit(expired_url)
+    assert client.get(f"{expired.path}?{expired.query}").status_code == 403
+    assert client.get(path.replace("recompense", "autre")).status_code == 403
+    assert client.get(path.replace("/1/", "/2/")).status_code == 403
+
+    delete_reward_pdfs(1)
+    assert client.get(path).status_code == 404
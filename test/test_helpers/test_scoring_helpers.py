@@ -0,0 +1,138 @@
+import sys
+import os
+import random
+import pytest
+from sqlalchemy import literal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.models import Entry, Lottery, User
+from app.helpers import (
+    structure_scores_sql,
+    structure_scores_stream,
+    structure_scores_parallel,
+    rank_lottery_entries,
+)
+from app.helpers.scoring_helpers import _round_half_even, _worker_database_url
+from app.tools import structure_scores
+
+
+def populate(db, lottery_id, count, seed):
+    rng = random.Random(seed)
+    db.session.add(
+        Lottery(
+            id=lottery_id,
+            _name=f"Tirage {lottery_id}",
+            _status="EN_VALIDATION",
+            _reward_price=1000,
+            _max_participants=count,
+        )
+    )
+    for index in range(count):
+        user = User(
+            _first_name=f"Joueur{index}",
+            _last_name="fake",
+            _email=f"joueur{lottery_id}_{index}@example.com",
+            _password_hash="hash",
+            _role_id=3,
+        )
+        db.session.add(user)
+        db.session.flush()
+        numbers = ",".join(str(rng.randint(1, 49)) for _ in range(rng.randint(5, 6)))
+        lucky_numbers = ",".join(str(rng.randint(1, 9)) for _ in range(2))
+        db.session.add(
+            Entry(
+                user_id=user.id,
+                lottery_id=lottery_id,
+                numbers=numbers,
+                lucky_numbers=lucky_numbers,
+            )
+        )
+    db.session.commit()
+
+
+def entries_of(db, lottery_id):
+    return Entry.query.filter_by(lottery_id=lottery_id).order_by(Entry.id).all()
+
+
+@pytest.mark.parametrize("value, expected", [(2.5, 2), (3.5, 4), (2.4, 2), (2.6, 3)])
+def test_round_half_even_sqlite(db, value, expected):
+    """Teste que l'arrondi SQLite reproduit l'arrondi au pair de `round`."""
+    assert db.session.query(_round_half_even(literal(value), "sqlite")).scalar() == (
+        expected
+    )
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+def test_structure_scores_sql_matches_structure_scores(db, seed):
+    """Teste que le classement calculé par la base est celui de `structure_scores`."""
+    populate(db, lottery_id=1, count=400, seed=seed)
+    populate(db, lottery_id=2, count=50, seed=seed + 100)
+
+    rng = random.Random(seed)
+    draw_numbers = set(rng.sample(range(1, 50), 5))
+    draw_stars = set(rng.sample(range(1, 10), 2))
+
+    expected = structure_scores(entries_of(db, 1), draw_numbers, draw_stars)
+    assert structure_scores_sql(1, draw_numbers, draw_stars, db) == expected
+
+
+def test_rank_lottery_entries_engines_agree(db):
+    """Teste que tous les moteurs renvoient le même classement pour un tirage."""
+    populate(db, lottery_id=1, count=200, seed=7)
+    draw_numbers, draw_stars = {3, 14, 15, 26, 35}, {8, 9}
+
+    expected = rank_lottery_entries(1, draw_numbers, draw_stars, db, engine="python")
+    for engine in ("numpy", "sql", "stream"):
+        assert rank_lottery_entries(1, draw_numbers, draw_stars, db, engine) == expected
+
+
+def test_structure_scores_sql_without_entries(db):
+    """Teste le classement d'un tirage sans inscription."""
+    assert structure_scores_sql(42, [1, 2, 3, 4, 5], [1, 2], db) == {}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_structure_scores_stream_matches_structure_scores(db, chunk_size):
+    """Teste que le parcours par blocs donne le classement de `structure_scores`."""
+    populate(db, lottery_id=1, count=300, seed=11)
+    draw_numbers, draw_stars = {2, 9, 17, 28, 44}, {1, 6}
+
+    expected = structure_scores(entries_of(db, 1), draw_numbers, draw_stars)
+    assert (
+        structure_scores_stream(1, draw_numbers, draw_stars, db, chunk_size) == expected
+    )
+
+
+@pytest.mark.parametrize("workers, shard_size", [(1, 1000), (2, 37), (4, 10)])
+def test_structure_scores_parallel_matches_structure_scores(
+    file_db, workers, shard_size
+):
+    """Teste que la fusion des plages notées en parallèle donne le classement de référence."""
+    populate(file_db, lottery_id=1, count=250, seed=21)
+    populate(file_db, lottery_id=2, count=40, seed=22)
+    draw_numbers, draw_stars = {5, 10, 20, 30, 40}, {4, 7}
+
+    expected = structure_scores(entries_of(file_db, 1), draw_numbers, draw_stars)
+    assert (
+        structure_scores_parallel(
+            1, draw_numbers, draw_stars, file_db, workers, shard_size
+        )
+        == expected
+    )
+
+
+def test_worker_database_url_reads_password_from_config(monkeypatch):
+    """Teste que le mot de passe de la base est relu dans la configuration du processus."""
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", "postgresql://loto:secret@db:5432/loto"
+    )
+
+    url = _worker_database_url("postgresql://loto@db:5432/loto")
+    assert url.password == "secret"
+    assert url.database == "loto"
+
+
+def test_structure_scores_parallel_without_entries(file_db):
+    """Teste le classement parallèle d'un tirage sans inscription."""
+    assert structure_scores_parallel(42, [1, 2, 3, 4, 5], [1, 2], file_db) == {}
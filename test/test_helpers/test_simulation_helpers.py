@@ -0,0 +1,83 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.models import Lottery
+from app.helpers import (
+    simulate_lottery,
+    estimate_lottery,
+    ticket_format_counts,
+    generate_wining_numbers,
+    generate_luck_numbers,
+)
+from app.tools import structure_scores, compute_gain, distribute_remainder
+from test_scoring_helpers import populate, entries_of
+
+
+def test_simulate_lottery_matches_validation(db):
+    """Teste que la simulation reproduit les classements et gains de la validation."""
+    populate(db, lottery_id=1, count=300, seed=21)
+    lottery = db.session.get(Lottery, 1)
+    entries = entries_of(db, 1)
+
+    report = simulate_lottery(lottery, db, draws=40, seed=5, batch_size=16)
+
+    rng = random.Random(5)
+    winners_first, splits, top_prizes = 0, 0, []
+    for _ in range(40):
+        ranking = structure_scores(
+            entries, generate_wining_numbers(rng), generate_luck_numbers(rng)
+        )
+        if not ranking:
+            continue
+        gains, _, remainder = compute_gain(ranking, lottery.reward_price)
+        gains = distribute_remainder(gains, remainder)
+        winners_first += len(ranking[1][0])
+        splits += len(ranking[1][0]) > 1
+        top_prizes.append(gains[ranking[1][0][0]])
+
+    assert report["tickets"] == 300
+    assert report["draws"] == 40
+    assert report["winners_per_rank"][1]["mean"] == pytest.approx(winners_first / 40)
+    assert report["top_prize_split_probability"] == pytest.approx(splits / 40)
+    assert report["top_prize"]["mean"] == pytest.approx(
+        sum(top_prizes) / len(top_prizes)
+    )
+
+
+def test_simulate_lottery_is_reproducible(db):
+    """Teste qu'une simulation avec la même graine donne le même rapport."""
+    populate(db, lottery_id=1, count=100, seed=22)
+    lottery = db.session.get(Lottery, 1)
+
+    assert simulate_lottery(lottery, db, draws=30, seed=1) == simulate_lottery(
+        lottery, db, draws=30, seed=1
+    )
+
+
+def test_ticket_format_counts_match_entries(db):
+    """Teste que le comptage par format de l'index correspond aux inscriptions."""
+    populate(db, lottery_id=1, count=200, seed=23)
+    formats = {}
+    for entry in entries_of(db, 1):
+        key = (entry.numbers_mask.bit_count(), entry.lucky_numbers_mask.bit_count())
+        formats[key] = formats.get(key, 0) + 1
+
+    assert ticket_format_counts(1, db) == formats
+
+
+def test_estimate_lottery_report(db):
+    """Teste le rapport de distribution exacte des scores d'une loterie."""
+    populate(db, lottery_id=1, count=200, seed=24)
+    lottery = db.session.get(Lottery, 1)
+
+    report = estimate_lottery(lottery, db)
+
+    assert report["tickets"] == 200
+    assert report["reward_price"] == lottery.reward_price
+    assert sum(report["expected_tickets_per_score"].values()) == pytest.approx(200)
+    assert sum(
+        level["payout"] for level in report["expected_winners_per_rank"]
+    ) == pytest.approx(lottery.reward_price)
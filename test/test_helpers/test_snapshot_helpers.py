@@ -0,0 +1,95 @@
+import sys
+import os
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.models import Lottery
+from app.helpers import (
+    snapshot_path,
+    ensure_lottery_snapshot,
+    delete_lottery_snapshot,
+    lottery_ticket_columns,
+    rank_lottery_entries,
+    load_lottery_masks,
+)
+from app.tools import TicketSnapshot, structure_scores
+from test_scoring_helpers import populate, entries_of
+
+DRAW_NUMBERS, DRAW_STARS = [3, 11, 19, 27, 42], [2, 7]
+
+
+def test_snapshot_engine_matches_structure_scores(db):
+    """Teste que le moteur "snapshot" donne le classement de `structure_scores`."""
+    populate(db, lottery_id=1, count=400, seed=31)
+
+    expected = structure_scores(entries_of(db, 1), DRAW_NUMBERS, DRAW_STARS)
+
+    assert (
+        rank_lottery_entries(1, DRAW_NUMBERS, DRAW_STARS, db, engine="snapshot")
+        == expected
+    )
+    assert os.path.exists(snapshot_path(1))
+
+
+def test_closed_lottery_columns_come_from_snapshot(db):
+    """Teste que les tickets d'un tirage clos sont lus dans son instantané."""
+    populate(db, lottery_id=1, count=50, seed=32)
+    ensure_lottery_snapshot(1, db)
+
+    columns = lottery_ticket_columns(1, db)
+    number_masks, star_masks = load_lottery_masks(1, db)
+
+    assert isinstance(columns["number_masks"], np.memmap)
+    assert columns["entry_ids"].tolist() == [e.id for e in entries_of(db, 1)]
+    assert number_masks.tolist() == [e.numbers_mask for e in entries_of(db, 1)]
+    assert star_masks.tolist() == [e.lucky_numbers_mask for e in entries_of(db, 1)]
+
+
+def test_closed_lottery_snapshot_is_written_on_first_read(db):
+    """Teste que l'instantané d'un tirage clos est écrit à la première lecture."""
+    populate(db, lottery_id=1, count=30, seed=34)
+    assert not os.path.exists(snapshot_path(1))
+
+    columns = lottery_ticket_columns(1, db)
+
+    assert os.path.exists(snapshot_path(1))
+    assert columns["entry_ids"].tolist() == [e.id for e in entries_of(db, 1)]
+
+
+def test_open_lottery_columns_come_from_database(db):
+    """Teste qu'un tirage en cours n'est pas figé."""
+    populate(db, lottery_id=1, count=20, seed=33)
+    db.session.get(Lottery, 1).status = "EN_COUR"
+    db.session.commit()
+
+    columns = lottery_ticket_columns(1, db)
+
+    assert not isinstance(columns["number_masks"], np.memmap)
+    assert not os.path.exists(snapshot_path(1))
+
+
+def test_snapshot_is_rebuilt_when_entries_change(db):
+    """Teste qu'un instantané périmé par une inscription supprimée est réécrit."""
+    populate(db, lottery_id=1, count=30, seed=34)
+    ensure_lottery_snapshot(1, db)
+    db.session.delete(entries_of(db, 1)[-1])
+    db.session.commit()
+
+    columns = lottery_ticket_columns(1, db)
+
+    assert len(columns["entry_ids"]) == 29
+    assert TicketSnapshot(snapshot_path(1)).rows == 29
+
+
+def test_corrupt_snapshot_is_rebuilt(db):
+    """Teste qu'un instantané illisible est réécrit à partir de la base."""
+    populate(db, lottery_id=1, count=30, seed=35)
+    os.makedirs(os.path.dirname(snapshot_path(1)), exist_ok=True)
+    with open(snapshot_path(1), "wb") as file:
+        file.write(b"corrompu")
+
+    columns = lottery_ticket_columns(1, db)
+
+    assert columns["user_ids"].tolist() == [e.user_id for e in entries_of(db, 1)]
+    delete_lottery_snapshot(1)
+    assert not os.path.exists(snapshot_path(1))
@@ -0,0 +1,134 @@
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.models import TokenBlockList
+from app.helpers import (
+    is_token_revoked,
+    revoke_token,
+    token_cache_info,
+)
+from app.tools import InvalidationChannel
+from test_leaderboard_helpers import count_queries
+
+
+@pytest.fixture
+def tokens(app, db):
+    """Trois jetons enregistrés et non révoqués de l'utilisateur 1, par JTI."""
+    app.config["JWT_IDENTITY_CLAIM"] = "user_id"
+    expires = datetime.utcnow() + timedelta(minutes=20)
+    for jti in ("a1", "b2", "c3"):
+        db.session.add(
+            TokenBlockList(jti=jti, token_type="access", user_id=1, expires=expires)
+        )
+    db.session.commit()
+    return {
+        jti: {"jti": jti, "user_id": 1, "exp": time.time() + 1200}
+        for jti in ("a1", "b2", "c3")
+    }
+
+
+def test_repeated_checks_are_served_from_cache(db, tokens):
+    """Teste qu'un jeton n'est lu qu'une fois dans la base de données."""
+    with count_queries(db) as statements:
+        for _ in range(10):
+            assert is_token_revoked(tokens["a1"]) is False
+
+    assert len(statements) == 1
+    assert token_cache_info() == {
+        "hits": 9,
+        "misses": 1,
+        "invalidations": 0,
+        "hit_rate": 0.9,
+        "size": 1,
+    }
+
+
+def test_revocation_is_seen_immediately(db, tokens):
+    """Teste que `revoke_token` retire le jeton du cache de ce processus."""
+    assert is_token_revoked(tokens["a1"]) is False
+
+    revoke_token("a1", 1)
+
+    assert is_token_revoked(tokens["a1"]) is True
+    with count_queries(db) as statements:
+        assert is_token_revoked(tokens["a1"]) is True
+    assert statements == []
+    assert token_cache_info()["invalidations"] == 1
+
+
+def test_revocation_by_another_process_is_seen(db, tokens):
+    """Teste qu'une révocation publiée sur le canal par un autre processus est vue."""
+    assert is_token_revoked(tokens["a1"]) is False
+    assert is_token_revoked(tokens["b2"]) is False
+    token = TokenBlockList.query.filter_by(jti="a1").one()
+    token.revoked_at = datetime.utcnow()
+    db.session.commit()
+
+    assert is_token_revoked(tokens["a1"]) is False
+    InvalidationChannel(Config.TOKEN_REVOCATION_LOG).publish("a1")
+
+    with count_queries(db) as statements:
+        assert is_token_revoked(tokens["a1"]) is True
+        assert is_token_revoked(tokens["b2"]) is False
+    assert len(statements) == 1
+
+
+def test_emptied_channel_clears_cache(db, tokens):
+    """Teste que le cache est vidé lorsque le canal d'invalidation est vidé."""
+    revoke_token("c3", 1)
+    assert is_token_revoked(tokens["a1"]) is False
+    assert token_cache_info()["size"] == 1
+
+    open(Config.TOKEN_REVOCATION_LOG, "w").close()
+
+    with count_queries(db) as statements:
+        assert is_token_revoked(tokens["a1"]) is False
+    assert len(statements) == 1
+
+
+def test_entries_expire_with_ttl_and_token(db, tokens, monkeypatch):
+    """Teste qu'une entrée ne dure pas plus que `TOKEN_CACHE_TTL` ni que le jeton."""
+    monkeypatch.setattr(Config, "TOKEN_CACHE_TTL", 0.05)
+    assert is_token_revoked(tokens["a1"]) is False
+    time.sleep(0.1)
+    with count_queries(db) as statements:
+        assert is_token_revoked(tokens["a1"]) is False
+    assert len(statements) == 1
+
+    monkeypatch.setattr(Config, "TOKEN_CACHE_TTL", 60)
+    revoke_token("b2", 1)
+    expired = {**tokens["b2"], "exp": time.time() - 1}
+    with count_queries(db) as statements:
+        assert is_token_revoked(expired) is True
+        assert is_token_revoked(expired) is True
+    assert len(statements) == 2
+
+
+def test_cache_is_bounded(db, tokens, monkeypatch):
+    """Teste que le cache garde au plus `TOKEN_CACHE_SIZE` jetons."""
+    monkeypatch.setattr(Config, "TOKEN_CACHE_SIZE", 2)
+    for jti in ("a1", "b2", "a1", "c3"):
+        is_token_revoked(tokens[jti])
+
+    assert token_cache_info()["size"] == 2
+    with count_queries(db) as statements:
+        is_token_revoked(tokens["a1"])
+        is_token_revoked(tokens["b2"])
+    assert len(statements) == 1
+
+
+def test_unknown_token_is_not_cached(db, tokens):
+    """Teste qu'un jeton absent de la base de données lève une erreur à chaque fois."""
+    unknown = {"jti": "z9", "user_id": 1, "exp": time.time() + 1200}
+    for _ in range(2):
+        with pytest.raises(Exception, match="z9"):
+            is_token_revoked(unknown)
+
+    assert token_cache_info()["size"] == 0
+    with pytest.raises(Exception):
+        is_token_revoked({**tokens["a1"], "user_id": 2})
@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import url_signature, check_url_signature, offload_header
+
+
+def test_signature_is_valid_until_expiry():
+    """Teste qu'une signature est acceptée jusqu'à sa date d'expiration."""
+    expires = int(time.time()) + 60
+    signature = url_signature("1/abc/recompense.pdf", expires, "secret")
+
+    assert check_url_signature("1/abc/recompense.pdf", expires, signature, "secret")
+    assert check_url_signature(
+        "1/abc/recompense.pdf", str(expires), signature, "secret", now=expires
+    )
+    assert not check_url_signature(
+        "1/abc/recompense.pdf", expires, signature, "secret", now=expires + 1
+    )
+
+
+@pytest.mark.parametrize(
+    "message, expires_delta, signature_secret, check_secret",
+    [
+        ("1/abd/recompense.pdf", 0, "secret", "secret"),
+        ("1/abc/recompense.pdf", 3600, "secret", "secret"),
+        ("1/abc/recompense.pdf", 0, "autre", "secret"),
+    ],
+)
+def test_tampered_signature_is_rejected(
+    message, expires_delta, signature_secret, check_secret
+):
+    """Teste qu'un message, une expiration ou une clé modifiés invalident la signature."""
+    expires = int(time.time()) + 60
+    signature = url_signature("1/abc/recompense.pdf", expires, signature_secret)
+
+    assert not check_url_signature(
+        message, expires + expires_delta, signature, check_secret
+    )
+
+
+@pytest.mark.parametrize("expires, signature", [(None, "abc"), ("demain", "abc")])
+def test_malformed_signature_is_rejected(expires, signature):
+    """Teste qu'une URL sans expiration lisible est refusée."""
+    assert not check_url_signature("1/abc", expires, signature, "secret")
+    assert not check_url_signature("1/abc", int(time.time()) + 60, None, "secret")
+
+
+def test_offload_header():
+    """Teste les en-têtes de redirection interne de nginx et d'Apache."""
+    assert offload_header(
+        "X-Accel-Redirect", "lottery_1/abc.pdf", "/protected/reward_pdfs/"
+    ) == ("X-Accel-Redirect", "/protected/reward_pdfs/lottery_1/abc.pdf")
+    assert offload_header("X-Sendfile", "/srv/pdf/lottery_1/abc.pdf", "") == (
+        "X-Sendfile",
+        "/srv/pdf/lottery_1/abc.pdf",
+    )
+    with pytest.raises(ValueError):
+        offload_header("X-Lighttpd-Send-File", "abc.pdf", "")
@@ -0,0 +1,106 @@
+import sys
+import os
+from collections import Counter
+from itertools import combinations
+from math import comb
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import (
+    class_draw_counts,
+    ticket_format_classes,
+    expected_score_counts,
+    expected_rank_payouts,
+    estimate_score_distribution,
+    build_rank_counts,
+    compute_rank_gains,
+    calculate_jaccard_similarity,
+)
+from app.tools.estimation_tools import DRAW_COUNT
+
+
+@pytest.mark.parametrize("number_count, star_count", [(5, 2), (7, 3), (4, 1)])
+def test_class_draw_counts_cover_all_draws(number_count, star_count):
+    """Teste que les classes d'un format couvrent exactement tous les tirages."""
+    counts = class_draw_counts(number_count, star_count)
+
+    assert sum(map(sum, counts)) == DRAW_COUNT == comb(49, 5) * comb(9, 2)
+
+
+def test_class_draw_counts_match_enumeration():
+    """Teste le dénombrement hypergéométrique contre l'énumération des tirages."""
+    ticket_numbers, ticket_stars = set(range(1, 8)), {2, 5, 8}
+    number_matches = Counter(
+        len(ticket_numbers.intersection(draw)) for draw in combinations(range(1, 50), 5)
+    )
+    star_matches = Counter(
+        len(ticket_stars.intersection(draw)) for draw in combinations(range(1, 10), 2)
+    )
+
+    counts = class_draw_counts(7, 3)
+
+    for matches, row in enumerate(counts):
+        for stars, count in enumerate(row):
+            assert count == number_matches[matches] * star_matches[stars]
+
+
+def test_ticket_format_classes_scores_match_jaccard():
+    """Teste que le score de chaque classe est celui d'un tirage de cette classe."""
+    ticket_numbers, ticket_stars = [1, 2, 3, 4, 5, 6], [1, 2, 3]
+    others = [40, 41, 42, 43, 44]
+
+    for format_class in ticket_format_classes(6, 3):
+        matches = format_class["matched_numbers"]
+        stars = format_class["matched_lucky_numbers"]
+        draw_numbers = ticket_numbers[:matches] + others[: 5 - matches]
+        draw_stars = ticket_stars[:stars] + [8, 9][: 2 - stars]
+
+        assert format_class["score"] == calculate_jaccard_similarity(
+            draw_numbers, draw_stars, ticket_numbers, ticket_stars
+        )
+    assert sum(c["probability"] for c in ticket_format_classes(6, 3)) == (
+        pytest.approx(1)
+    )
+
+
+def test_expected_score_counts_sum_to_ticket_count():
+    """Teste que les nombres moyens de tickets par score totalisent les tickets."""
+    expected = expected_score_counts({(5, 2): 1000, (6, 2): 7})
+
+    assert sum(expected.values()) == 1007
+    assert expected[100] * DRAW_COUNT == 1000
+
+
+def test_expected_rank_payouts_match_integer_counts():
+    """Teste que le partage des gains avec des effectifs entiers est celui de `compute_rank_gains`."""
+    score_counts = {90: 1, 80: 3, 60: 2, 40: 6, 5: 100}
+
+    levels = expected_rank_payouts(score_counts, 1000)
+    rank_counts = build_rank_counts(score_counts)
+    gains = compute_rank_gains(rank_counts, 1000)
+
+    assert [level["rank"] for level in levels] == list(rank_counts)
+    for level in levels:
+        assert level["payout_per_winner"] == pytest.approx(gains[int(level["rank"])])
+
+
+def test_expected_rank_payouts_distribute_reward():
+    """Teste que les gains attendus totalisent la récompense."""
+    levels = expected_rank_payouts({100: 0.01, 73: 3.2, 60: 45.5, 16: 9000}, 1000)
+
+    assert sum(level["payout"] for level in levels) == pytest.approx(1000)
+    assert levels[0]["payout_per_winner"] == pytest.approx(400)
+
+
+def test_estimate_score_distribution_report():
+    """Teste le rapport de distribution exacte des scores."""
+    report = estimate_score_distribution({(5, 2): 100000, (6, 2): 50}, 1000)
+
+    assert report["draws"] == DRAW_COUNT
+    assert report["tickets"] == 100050
+    assert [f["tickets"] for f in report["ticket_formats"]] == [100000, 50]
+    assert sum(report["expected_tickets_per_score"].values()) == pytest.approx(100050)
+    assert report["payout_exposure"]["top_score"] == 100
+    assert report["payout_exposure"]["expected_jackpot_winners"] == pytest.approx(
+        100000 / DRAW_COUNT
+    )
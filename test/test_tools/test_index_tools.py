@@ -0,0 +1,34 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import encode_postings, decode_postings
+
+
+def test_encode_decode_postings():
+    """Teste la compression et la décompression d'une liste d'identifiants."""
+    assert encode_postings([3, 5, 300]) == b"\x03\x02\xa7\x02"
+    assert decode_postings(b"\x03\x02\xa7\x02").tolist() == [3, 5, 300]
+    assert decode_postings(b"").tolist() == []
+
+    rng = random.Random(0)
+    entry_ids = sorted(rng.sample(range(1, 2**40), 5000))
+    assert decode_postings(encode_postings(entry_ids)).tolist() == entry_ids
+
+
+def test_encode_postings_appends_to_existing_list():
+    """Teste l'ajout d'identifiants à la fin d'une liste compressée."""
+    head = encode_postings([1, 20, 150])
+    tail = encode_postings([151, 4000], previous_id=150)
+
+    assert decode_postings(head + tail).tolist() == [1, 20, 150, 151, 4000]
+
+
+def test_encode_postings_rejects_unsorted_ids():
+    """Teste le refus d'identifiants non strictement croissants."""
+    with pytest.raises(ValueError):
+        encode_postings([5, 5])
+    with pytest.raises(ValueError):
+        encode_postings([3], previous_id=10)
@@ -0,0 +1,75 @@
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import InvalidationChannel
+
+
+def test_keys_published_by_another_process_are_read_once(tmp_path):
+    """Teste que chaque lecteur reçoit une fois les clés publiées après son démarrage."""
+    path = str(tmp_path / "canal" / "revocations.log")
+    reader = InvalidationChannel(path)
+    publisher = InvalidationChannel(path)
+
+    assert reader.poll() == []
+    publisher.publish("a1")
+    publisher.publish("b2")
+    assert reader.poll() == ["a1", "b2"]
+    assert reader.poll() == []
+
+    late_reader = InvalidationChannel(path)
+    assert late_reader.poll() == []
+    publisher.publish("c3")
+    assert reader.poll() == ["c3"]
+    assert late_reader.poll() == ["c3"]
+
+
+def test_partial_line_is_read_when_complete(tmp_path):
+    """Teste qu'une ligne en cours d'écriture n'est lue qu'une fois terminée."""
+    path = tmp_path / "revocations.log"
+    path.write_bytes(b"")
+    reader = InvalidationChannel(str(path))
+    reader.poll()
+
+    with open(path, "ab") as file:
+        file.write(b"a1\nb")
+    assert reader.poll() == ["a1"]
+    with open(path, "ab") as file:
+        file.write(b"2\n")
+    assert reader.poll() == ["b2"]
+
+
+def test_truncated_or_replaced_channel_is_reported(tmp_path):
+    """Teste qu'un canal vidé ou remplacé est signalé par `None`."""
+    path = tmp_path / "revocations.log"
+    reader = InvalidationChannel(str(path))
+    assert reader.poll() == []
+
+    InvalidationChannel(str(path)).publish("a1")
+    assert reader.poll() == ["a1"]
+
+    path.write_bytes(b"")
+    assert reader.poll() is None
+    assert reader.poll() == []
+
+    path.unlink()
+    assert reader.poll() is None
+    InvalidationChannel(str(path)).publish("b2")
+    assert reader.poll() == ["b2"]
+
+
+def test_expired_channel_is_replaced_on_publish(tmp_path):
+    """Teste que le fichier est remplacé quand sa plus ancienne ligne a expiré."""
+    path = tmp_path / "revocations.log"
+    path.write_bytes(f"a1 {time.time() - 7200:.0f}\n".encode())
+    reader = InvalidationChannel(str(path))
+    assert reader.poll() == []
+
+    InvalidationChannel(str(path), max_age=3600).publish("b2")
+    assert reader.poll() is None
+    assert [line.split()[0] for line in path.read_text().splitlines()] == ["b2"]
+
+    InvalidationChannel(str(path), max_age=3600).publish("c3")
+    assert reader.poll() == ["c3"]
+    assert len(path.read_text().splitlines()) == 2
@@ -0,0 +1,118 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import (
+    LiveLeaderboard,
+    numbers_to_mask,
+    score_table,
+    structure_scores,
+    build_ranking,
+)
+
+
+class FakeEntry:
+    def __init__(self, entry_id, user_id, numbers, lucky_numbers):
+        self.id = entry_id
+        self.user_id = user_id
+        self.numbers = ",".join(map(str, numbers))
+        self.lucky_numbers = ",".join(map(str, lucky_numbers))
+        self.numbers_mask = numbers_to_mask(numbers)
+        self.lucky_numbers_mask = numbers_to_mask(lucky_numbers)
+
+
+def random_entries(count, seed):
+    rng = random.Random(seed)
+    return [
+        FakeEntry(
+            index * 2 + 1,
+            1000 + index,
+            [rng.randint(1, 49) for _ in range(rng.choice([4, 5, 5, 5, 6, 7]))],
+            [rng.randint(1, 9) for _ in range(rng.choice([1, 2, 2, 3]))],
+        )
+        for index in range(count)
+    ]
+
+
+def new_board(entries):
+    return LiveLeaderboard(
+        [entry.id for entry in entries],
+        [entry.user_id for entry in entries],
+        [entry.numbers_mask.bit_count() for entry in entries],
+        [entry.lucky_numbers_mask.bit_count() for entry in entries],
+    )
+
+
+def reveal(board, entries, lucky, number):
+    if lucky:
+        board.reveal_lucky_number(
+            number,
+            [e.id for e in entries if e.lucky_numbers_mask >> number & 1],
+        )
+    else:
+        board.reveal_number(
+            number, [e.id for e in entries if e.numbers_mask >> number & 1]
+        )
+
+
+def provisional_ranking(entries, numbers, lucky_numbers):
+    scores = {}
+    for entry in entries:
+        table = score_table(
+            5, 2, entry.numbers_mask.bit_count(), entry.lucky_numbers_mask.bit_count()
+        )
+        score = table[sum(entry.numbers_mask >> n & 1 for n in numbers)][
+            sum(entry.lucky_numbers_mask >> n & 1 for n in lucky_numbers)
+        ]
+        if score >= 10:
+            scores.setdefault(score, []).append(entry.user_id)
+    return build_ranking(scores)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_live_leaderboard_matches_batch_ranking(seed):
+    """Teste que chaque classement provisoire est exact et que le classement final est celui de `structure_scores`."""
+    entries = random_entries(2000, seed)
+    rng = random.Random(seed)
+    numbers, lucky_numbers = rng.sample(range(1, 50), 5), rng.sample(range(1, 10), 2)
+    reveals = [(False, n) for n in numbers] + [(True, n) for n in lucky_numbers]
+    rng.shuffle(reveals)
+
+    board = new_board(entries)
+    for lucky, number in reveals:
+        assert not board.complete
+        reveal(board, entries, lucky, number)
+        assert board.ranking() == provisional_ranking(
+            entries, board.numbers, board.lucky_numbers
+        )
+
+    assert board.complete
+    assert board.ranking() == structure_scores(entries, numbers, lucky_numbers)
+
+
+def test_live_leaderboard_ignores_unknown_entries():
+    """Teste que les inscriptions inconnues du classement sont ignorées."""
+    entries = random_entries(50, 4)
+    board = new_board(entries)
+
+    board.reveal_number(7, [2, 4, 10**6])
+
+    assert board.numbers == [7]
+    assert board.ranking() == {}
+
+
+def test_live_leaderboard_summary():
+    """Teste le résumé du tirage en direct."""
+    entries = [FakeEntry(1, 10, [1, 2, 3, 4, 5], [1, 2])]
+    board = new_board(entries)
+    for number in [1, 2, 3, 4, 5]:
+        reveal(board, entries, False, number)
+
+    assert board.leaderboard() == {
+        "numbers": [1, 2, 3, 4, 5],
+        "lucky_numbers": [],
+        "complete": False,
+        "ranking": [{"rank": 1, "score": 80, "player_ids": [10]}],
+    }
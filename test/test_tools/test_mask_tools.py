@@ -0,0 +1,73 @@
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import (
+    numbers_to_mask,
+    mask_to_numbers,
+    ticket_masks,
+    mask_jaccard_similarity,
+    calculate_mask_similarity,
+    calculate_jaccard_similarity,
+    jaccard_similarity,
+)
+from app.models import Entry, LotteryResult
+
+
+def test_mask_round_trip():
+    """Teste la conversion aller-retour entre numéros et masque."""
+    assert mask_to_numbers(numbers_to_mask("45,5,12")) == [5, 12, 45]
+    assert mask_to_numbers(0) == []
+
+
+def test_missing_numbers_give_empty_mask():
+    """Teste qu'une valeur absente ou vide donne le masque 0, comme la migration."""
+    assert numbers_to_mask(None) == 0
+    assert numbers_to_mask("") == 0
+    assert numbers_to_mask([]) == 0
+
+
+def test_ticket_masks_prefers_stored_masks():
+    """Teste que les masques stockés sont utilisés sans relire les chaînes."""
+
+    class Participant:
+        numbers = "invalide"
+        lucky_numbers = "invalide"
+        numbers_mask = 6
+        lucky_numbers_mask = 2
+
+    assert ticket_masks(Participant()) == (6, 2)
+
+
+def test_entry_and_result_masks_are_populated():
+    """Teste que les masques sont renseignés à l'affectation des numéros."""
+    entry = Entry(user_id=1, lottery_id=1, numbers="1,2,3,4,5", lucky_numbers="1,9")
+    assert entry.numbers_mask == 0b111110
+    assert entry.lucky_numbers_mask == (1 << 1) | (1 << 9)
+
+    result = LotteryResult(
+        lottery_id=1, winning_numbers="49,1,2,3,4", winning_lucky_numbers="2,3"
+    )
+    assert result.winning_numbers_mask == numbers_to_mask([1, 2, 3, 4, 49])
+    assert result.winning_lucky_numbers_mask == 0b1100
+
+
+def test_mask_similarity_matches_set_similarity():
+    """Teste que la similarité calculée sur les masques est celle des ensembles."""
+    rng = random.Random(0)
+    for _ in range(1000):
+        draw_numbers = rng.sample(range(1, 50), 5)
+        draw_stars = rng.sample(range(1, 10), 2)
+        numbers = {rng.randint(1, 49) for _ in range(rng.randint(1, 8))}
+        stars = {rng.randint(1, 9) for _ in range(2)}
+
+        assert mask_jaccard_similarity(
+            numbers_to_mask(draw_numbers), numbers_to_mask(numbers)
+        ) == jaccard_similarity(draw_numbers, numbers)
+        assert calculate_mask_similarity(
+            numbers_to_mask(draw_numbers),
+            numbers_to_mask(draw_stars),
+            numbers_to_mask(numbers),
+            numbers_to_mask(stars),
+        ) == calculate_jaccard_similarity(draw_numbers, draw_stars, numbers, stars)
@@ -0,0 +1,98 @@
+import sys
+import os
+import random
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import (
+    structure_scores,
+    structure_scores_numpy,
+    numbers_to_mask,
+    load_ticket_arrays,
+    compute_scores,
+    calculate_jaccard_similarity,
+    get_scoring_engine,
+)
+
+
+class Participant:
+    def __init__(self, user_id, numbers, lucky_numbers):
+        self.user_id = user_id
+        self.numbers = numbers
+        self.lucky_numbers = lucky_numbers
+
+
+def random_participants(count, seed):
+    rng = random.Random(seed)
+    participants = []
+    for user_id in range(1, count + 1):
+        numbers = ",".join(str(rng.randint(1, 49)) for _ in range(rng.randint(5, 7)))
+        lucky_numbers = ",".join(str(rng.randint(1, 9)) for _ in range(2))
+        participants.append(Participant(user_id, numbers, lucky_numbers))
+    return participants
+
+
+def test_numbers_to_mask():
+    """Teste la conversion des numéros en masque binaire."""
+    assert numbers_to_mask("1,3") == 0b1010
+    assert numbers_to_mask([49]) == 1 << 49
+    assert numbers_to_mask("2,2") == numbers_to_mask("2")
+
+
+def test_compute_scores_matches_calculate_jaccard_similarity():
+    """Teste que chaque score vectorisé est identique au score Python."""
+    participants = random_participants(500, seed=1)
+    draw_numbers, draw_stars = [4, 8, 15, 16, 23], [4, 2]
+
+    _, number_masks, star_masks = load_ticket_arrays(participants)
+    scores = compute_scores(number_masks, star_masks, draw_numbers, draw_stars)
+
+    for participant, score in zip(participants, scores):
+        expected = calculate_jaccard_similarity(
+            draw_numbers,
+            draw_stars,
+            set(map(int, participant.numbers.split(","))),
+            set(map(int, participant.lucky_numbers.split(","))),
+        )
+        assert score == expected
+
+
+def test_structure_scores_numpy_example():
+    """Teste le classement vectorisé sur l'exemple de `structure_scores`."""
+    participants = [
+        Participant(user_id=1, numbers="1,2,3", lucky_numbers="1"),
+        Participant(user_id=2, numbers="1,2,4", lucky_numbers="1"),
+        Participant(user_id=3, numbers="1,3,5", lucky_numbers="2"),
+    ]
+
+    assert structure_scores_numpy(participants, [1, 2, 3], [1]) == {
+        1: [[1], 100],
+        2: [[2], 60],
+        3: [[3], 40],
+    }
+
+
+@pytest.mark.parametrize("seed", [2, 3, 4])
+def test_structure_scores_numpy_matches_structure_scores(seed):
+    """Teste que le moteur NumPy produit exactement le classement de référence."""
+    participants = random_participants(2000, seed=seed)
+    rng = random.Random(seed)
+    draw_numbers = set(rng.sample(range(1, 50), 5))
+    draw_stars = set(rng.sample(range(1, 10), 2))
+
+    assert structure_scores_numpy(
+        participants, draw_numbers, draw_stars
+    ) == structure_scores(participants, draw_numbers, draw_stars)
+
+
+def test_structure_scores_numpy_without_participants():
+    """Teste le classement vectorisé sans participant."""
+    assert structure_scores_numpy([], [1, 2, 3, 4, 5], [1, 2]) == {}
+
+
+def test_get_scoring_engine():
+    """Teste la sélection du moteur de calcul des scores."""
+    assert get_scoring_engine("python") is structure_scores
+    assert get_scoring_engine("numpy") is structure_scores_numpy
+    with pytest.raises(ValueError):
+        get_scoring_engine("inconnu")
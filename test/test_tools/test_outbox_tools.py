@@ -0,0 +1,54 @@
+import sys
+import os
+import smtplib
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import (
+    RateLimiter,
+    is_permanent_smtp_error,
+    retry_delay,
+    stagger_offsets,
+)
+
+
+def test_retry_delay_doubles_up_to_maximum():
+    """Teste que le délai avant un nouvel essai double à chaque tentative."""
+    assert [retry_delay(attempts, 60) for attempts in range(1, 5)] == [
+        60,
+        120,
+        240,
+        480,
+    ]
+    assert retry_delay(20, 60, max_seconds=3600) == 3600
+
+
+def test_is_permanent_smtp_error():
+    """Teste la distinction entre erreurs SMTP définitives et temporaires."""
+    assert is_permanent_smtp_error(smtplib.SMTPRecipientsRefused({}))
+    assert is_permanent_smtp_error(smtplib.SMTPDataError(554, b"Refus"))
+    assert not is_permanent_smtp_error(smtplib.SMTPDataError(451, b"Plus tard"))
+    assert not is_permanent_smtp_error(smtplib.SMTPServerDisconnected())
+    assert not is_permanent_smtp_error(ConnectionRefusedError())
+
+
+def test_rate_limiter_spaces_calls():
+    """Teste que le limiteur espace les appels selon le débit demandé."""
+    limiter = RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.wait()
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+    unlimited = RateLimiter(0)
+    start = time.monotonic()
+    for _ in range(1000):
+        unlimited.wait()
+    assert time.monotonic() - start < 0.5
+
+
+def test_stagger_offsets_spread_over_window():
+    """Teste que les envois sont répartis régulièrement sur la fenêtre."""
+    assert stagger_offsets(4, 60) == [0.0, 15.0, 30.0, 45.0]
+    assert stagger_offsets(3, 0) == [0.0, 0.0, 0.0]
+    assert stagger_offsets(0, 60) == []
@@ -0,0 +1,107 @@
+import sys
+import os
+import shutil
+import subprocess
+import zlib
+import pytest
+from flask import Flask
+from PIL import Image, ImageChops, ImageStat
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.tools import (
+    PdfRendererPool,
+    get_pdf_backend,
+    render_pdf_html,
+    write_reward_pdf,
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+WKHTMLTOPDF = Config.PATH_WHHTMLTOPDF or shutil.which("wkhtmltopdf")
+
+
+def reward_html():
+    """Construit le HTML de récompense de référence avec les modèles de l'application."""
+    app = Flask(__name__, template_folder=os.path.join(ROOT, "app", "templates"))
+    with app.app_context():
+        return render_pdf_html("Jean Dupont", 123.45, "Tirage du vendredi")
+
+
+def content_of(pdf):
+    """Retourne le flux de contenu décompressé de l'unique page d'un PDF."""
+    start = pdf.index(b"stream\n") + len(b"stream\n")
+    return zlib.decompress(pdf[start : pdf.index(b"\nendstream")])
+
+
+def test_native_pdf_contains_reward_details():
+    """Teste que le PDF écrit sans wkhtmltopdf contient les informations du gain."""
+    pdf = write_reward_pdf("Jean Dupont", 123.456, "Tirage du vendredi", "0123456789")
+
+    assert pdf.startswith(b"%PDF-1.4")
+    content = content_of(pdf)
+    assert b"(F\xe9licitations, Jean Dupont !) Tj" in content
+    assert b"(Tirage du vendredi) Tj" in content
+    assert b"(123.46 \x80) Tj" in content
+    assert b"(ID : 0123456789) Tj" in content
+    assert content.count(b" 1 re") > 100
+    assert (
+        write_reward_pdf("Jean Dupont", 123.456, "Tirage du vendredi", "0123456789")
+        == pdf
+    )
+
+
+def test_html_includes_svg_qr_code():
+    """Teste que le HTML inclut le code QR en image SVG, sans PNG en base64."""
+    html = reward_html()
+
+    assert 'src="data:image/svg+xml;charset=utf-8,%3Csvg' in html
+    assert "base64" not in html
+
+
+def test_get_pdf_backend():
+    """Teste le choix du moteur de rendu par son nom ou par la configuration."""
+    assert get_pdf_backend("native")("Jean", 1, "Tirage")[0].startswith(b"%PDF")
+    assert get_pdf_backend() is get_pdf_backend(Config.PDF_BACKEND)
+    with pytest.raises(ValueError):
+        get_pdf_backend("reportlab")
+
+
+def rasterize(pdf, tmp_path, name):
+    """Convertit la première page d'un PDF en image grise de 100 points de large."""
+    path = tmp_path / f"{name}.pdf"
+    path.write_bytes(pdf)
+    subprocess.run(
+        [
+            "pdftoppm",
+            "-png",
+            "-r",
+            "36",
+            "-singlefile",
+            str(path),
+            str(tmp_path / name),
+        ],
+        check=True,
+    )
+    with Image.open(tmp_path / f"{name}.png") as image:
+        return image.convert("L").resize((100, 141))
+
+
+@pytest.mark.skipif(
+    not (
+        WKHTMLTOPDF
+        and os.path.basename(WKHTMLTOPDF).startswith("wkhtmltopdf")
+        and shutil.which("pdftoppm")
+    ),
+    reason="wkhtmltopdf et pdftoppm sont nécessaires à la comparaison visuelle",
+)
+def test_native_pdf_looks_like_html_pdf(tmp_path):
+    """Teste que les deux moteurs donnent des pages visuellement proches."""
+    with PdfRendererPool(WKHTMLTOPDF, options=["--quiet"], warm=0) as renderer:
+        reference = b"".join(renderer.render(reward_html()))
+    native = write_reward_pdf("Jean Dupont", 123.45, "Tirage du vendredi")
+
+    difference = ImageChops.difference(
+        rasterize(reference, tmp_path, "wkhtmltopdf"),
+        rasterize(native, tmp_path, "native"),
+    )
+    assert ImageStat.Stat(difference).mean[0] < 12
@@ -0,0 +1,90 @@
+import sys
+import os
+import re
+import zlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import PdfPage, text_width, wrap_text
+
+
+def content_of(pdf):
+    """Retourne le flux de contenu décompressé de l'unique page d'un PDF."""
+    start = pdf.index(b"stream\n") + len(b"stream\n")
+    return zlib.decompress(pdf[start : pdf.index(b"\nendstream")])
+
+
+def test_text_width_uses_font_metrics():
+    """Teste la largeur des textes en Helvetica, Helvetica-Bold et Courier."""
+    assert text_width("LotoApp", "Helvetica", 10) == 37.25
+    assert text_width("LotoApp", "Helvetica-Bold", 10) > 37.25
+    assert text_width("€é", "Helvetica", 10) == 11.12
+    assert text_width("ID : 42", "Courier", 10) == 42
+
+
+def test_wrap_text_breaks_between_words():
+    """Teste qu'aucune ligne ne dépasse la largeur demandée, sauf un mot trop long."""
+    text = (
+        "Pour encaisser votre gain, veuillez vous rapprocher de l'une de nos agences."
+    )
+    lines = wrap_text(text, "Helvetica", 12, 150)
+
+    assert " ".join(lines) == text
+    assert len(lines) > 1
+    assert all(text_width(line, "Helvetica", 12) <= 150 for line in lines)
+    assert wrap_text("Anticonstitutionnellement", "Helvetica", 12, 20) == [
+        "Anticonstitutionnellement"
+    ]
+
+
+def test_document_structure_and_cross_references():
+    """Teste que chaque entrée de la table des références désigne son objet."""
+    page = PdfPage()
+    page.rect(0, 0, page.width, 80, "#3498db", radius=5)
+    page.text(40, 50, "Récompense (100 €)", 12, "#ffffff", "Helvetica-Bold")
+    pdf = page.to_pdf(title="Récompense")
+
+    assert pdf.startswith(b"%PDF-1.4")
+    assert pdf.endswith(b"%%EOF\n")
+    xref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    assert pdf[xref:].startswith(b"xref\n0 9\n")
+    offsets = re.findall(rb"(\d{10}) 00000 n ", pdf[xref:])
+    for number, offset in enumerate(offsets, start=1):
+        assert pdf[int(offset) :].startswith(f"{number} 0 obj".encode())
+
+    content = content_of(pdf)
+    assert b"(R\xe9compense \\(100 \x80\\)) Tj" in content
+    assert b"/F2 12 Tf" in content
+
+
+def test_qr_code_is_drawn_as_merged_module_runs():
+    """Teste qu'un code QR est dessiné en un rectangle par suite de modules sombres."""
+    matrix = [
+        [True, True, False, True],
+        [False, False, False, False],
+        [True, False, True, True],
+        [True, True, True, True],
+    ]
+    page = PdfPage()
+    page.qr_code(100, 200, 40, matrix)
+
+    content = content_of(page.to_pdf()).decode("latin-1")
+    assert "q 10 0 0 -10 100 641.89 cm" in content
+    assert re.findall(r"\d+ \d+ \d+ 1 re", content) == [
+        "0 0 2 1 re",
+        "3 0 1 1 re",
+        "0 2 1 1 re",
+        "2 2 2 1 re",
+        "0 3 4 1 re",
+    ]
+
+
+def test_document_is_deterministic():
+    """Teste que les mêmes opérations de dessin donnent le même document."""
+
+    def draw():
+        page = PdfPage()
+        page.rect(10, 10, 100, 50, "#27ae60")
+        page.text(20, 40, "Joueur", 14, "#000000")
+        return page.to_pdf()
+
+    assert draw() == draw()
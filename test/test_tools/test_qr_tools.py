@@ -0,0 +1,81 @@
+import sys
+import os
+import re
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import Config
+from app.tools import (
+    cached_qr_code,
+    clear_qr_cache,
+    qr_cache_info,
+    qr_matrix,
+    qr_runs,
+    qr_svg,
+    svg_data_uri,
+)
+
+
+def modules_of(svg, size):
+    """Relit les modules sombres dessinés par les traits d'une image SVG."""
+    matrix = [[False] * size for _ in range(size)]
+    path = re.search(r"d='([^']*)'", svg).group(1)
+    x = y = 0
+    for command, dx, dy, length in re.findall(
+        r"([Mm])(-?\d+),(\d+)(?:\.5)?h(\d+)", path
+    ):
+        if command == "M":
+            x, y = int(dx), int(dy)
+        else:
+            x += int(dx)
+        for column in range(x, x + int(length)):
+            matrix[y][column] = True
+        x += int(length)
+    return matrix
+
+
+def test_qr_runs_merge_consecutive_modules():
+    """Teste le découpage des rangées en suites de modules sombres."""
+    matrix = [[True, True, False, True], [False] * 4, [False, True, True, True]]
+
+    assert list(qr_runs(matrix)) == [(0, 0, 2), (3, 0, 1), (1, 2, 3)]
+
+
+def test_svg_draws_every_dark_module():
+    """Teste que l'image SVG reproduit exactement les modules du code."""
+    matrix = qr_matrix("Récompense: 12.5 | Tirage: Tirage 1 | Utilisateur: John Doe")
+    svg = qr_svg(matrix)
+
+    assert f"viewBox='0 0 {len(matrix)} {len(matrix)}'" in svg
+    assert modules_of(svg, len(matrix)) == [list(row) for row in matrix]
+
+
+def test_svg_data_uri_is_not_base64():
+    """Teste que l'URI garde le texte du SVG, seuls les caractères réservés échappés."""
+    svg = qr_svg([[True, False, True]])
+    uri = svg_data_uri(svg)
+
+    assert uri.startswith("data:image/svg+xml;charset=utf-8,%3Csvg")
+    assert "M0,0.5h1m1,0h1" in uri
+    assert not re.search(r"[\s<>#'\"]", uri)
+    assert unquote(uri.split(",", 1)[1]) == svg
+
+
+def test_cache_reuses_codes_and_evicts_least_recent(monkeypatch):
+    """Teste que le cache sert les codes déjà construits et reste borné."""
+    monkeypatch.setattr(Config, "QR_CACHE_SIZE", 2)
+    clear_qr_cache()
+
+    first = cached_qr_code("A")
+    assert cached_qr_code("A") is first
+    cached_qr_code("B")
+    cached_qr_code("A")
+    cached_qr_code("C")
+    assert qr_cache_info() == {"hits": 2, "misses": 3, "size": 2}
+
+    assert cached_qr_code("A") is first
+    cached_qr_code("B")
+    assert qr_cache_info() == {"hits": 3, "misses": 4, "size": 2}
+
+    clear_qr_cache()
+    assert qr_cache_info() == {"hits": 0, "misses": 0, "size": 0}
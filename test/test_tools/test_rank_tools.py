@@ -1,5 +1,6 @@
 import sys
 import os
+import random
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 from app.tools import (
@@ -9,6 +10,11 @@ from app.tools import (
     structure_scores,
     compute_gain,
     distribute_remainder,
+    StreamingRanker,
+    build_ranking,
+    score_table,
+    ticket_score,
+    calculate_mask_similarity,
 )
 
 
@@ -51,6 +57,81 @@ def test_structure_scores():
     assert structure_scores(participants, draw_numbers, draw_stars) == expected_output
 
 
+def test_score_table_matches_calculate_jaccard_similarity():
+    """Teste que chaque score précalculé est celui de la similarité pondérée."""
+    draw_numbers, draw_stars = [1, 2, 3, 4, 5], [1, 2]
+    table = score_table(5, 2)
+
+    for number_matches in range(6):
+        for star_matches in range(3):
+            player_numbers = list(range(1, number_matches + 1)) + list(
+                range(10, 15 - number_matches)
+            )
+            player_stars = list(range(1, star_matches + 1)) + list(
+                range(5, 7 - star_matches)
+            )
+            assert table[number_matches][star_matches] == calculate_jaccard_similarity(
+                draw_numbers, draw_stars, player_numbers, player_stars
+            )
+
+
+def test_ticket_score_matches_calculate_mask_similarity():
+    """Teste que la lecture dans la table donne le score calculé, pour tout format."""
+    rng = random.Random(12)
+    for _ in range(2000):
+        draw_mask = sum(1 << n for n in rng.sample(range(1, 50), rng.randint(0, 7)))
+        draw_stars_mask = sum(
+            1 << n for n in rng.sample(range(1, 10), rng.randint(0, 3))
+        )
+        numbers_mask = sum(1 << n for n in rng.sample(range(1, 50), rng.randint(0, 8)))
+        stars_mask = sum(1 << n for n in rng.sample(range(1, 10), rng.randint(0, 4)))
+
+        assert ticket_score(
+            draw_mask, draw_stars_mask, numbers_mask, stars_mask
+        ) == calculate_mask_similarity(
+            draw_mask, draw_stars_mask, numbers_mask, stars_mask
+        )
+
+
+def test_structure_scores_groups_identical_tickets():
+    """Teste le regroupement des tickets identiques et l'ordre des ex aequo."""
+
+    class Participant:
+        def __init__(self, user_id, numbers, lucky_numbers):
+            self.user_id = user_id
+            self.numbers = numbers
+            self.lucky_numbers = lucky_numbers
+
+    rng = random.Random(1)
+    combinations = [
+        (
+            ",".join(map(str, rng.sample(range(1, 50), 5))),
+            ",".join(map(str, rng.sample(range(1, 10), 2))),
+        )
+        for _ in range(40)
+    ]
+    combinations.append(("7,11,21,33", "3"))
+    participants = [
+        Participant(user_id, *rng.choice(combinations)) for user_id in range(1, 2001)
+    ]
+    draw_numbers, draw_stars = [7, 11, 21, 33, 42], [3, 5]
+
+    scores_dict = {}
+    for participant in participants:
+        score = calculate_jaccard_similarity(
+            draw_numbers,
+            draw_stars,
+            set(map(int, participant.numbers.split(","))),
+            set(map(int, participant.lucky_numbers.split(","))),
+        )
+        if score >= 10:
+            scores_dict.setdefault(score, []).append(participant.user_id)
+
+    assert structure_scores(participants, draw_numbers, draw_stars) == build_ranking(
+        scores_dict
+    )
+
+
 def test_compute_gain():
     """Teste le calcul des gains des joueurs."""
     scores = {
@@ -75,3 +156,66 @@ def test_distribute_remainder():
         3: 166.66666666666666,
     }
     assert distribute_remainder(gains, remainder) == expected_output
+
+
+def test_streaming_ranker_matches_build_ranking():
+    """Teste que le classement incrémental est celui de `structure_scores`."""
+
+    class Participant:
+        def __init__(self, user_id, numbers, lucky_numbers):
+            self.user_id = user_id
+            self.numbers = numbers
+            self.lucky_numbers = lucky_numbers
+
+    rng = random.Random(0)
+    participants = [
+        Participant(
+            user_id,
+            ",".join(str(rng.randint(1, 49)) for _ in range(5)),
+            ",".join(str(rng.randint(1, 9)) for _ in range(2)),
+        )
+        for user_id in range(1, 3001)
+    ]
+    draw_numbers, draw_stars = [7, 11, 21, 33, 42], [3, 5]
+
+    ranker = StreamingRanker()
+    for participant in participants:
+        ranker.add(
+            participant.user_id,
+            calculate_jaccard_similarity(
+                draw_numbers,
+                draw_stars,
+                set(map(int, participant.numbers.split(","))),
+                set(map(int, participant.lucky_numbers.split(","))),
+            ),
+        )
+
+    assert ranker.ranking() == structure_scores(participants, draw_numbers, draw_stars)
+
+
+def test_streaming_ranker_drops_unreachable_scores():
+    """Teste que les scores ne pouvant plus être payés ne sont plus suivis."""
+    ranker = StreamingRanker(limit=3)
+    ranker.add(1, 50)
+    ranker.add(2, 40)
+    ranker.add(3, 90)
+    ranker.add(4, 90)
+    ranker.add(5, 90)
+
+    assert ranker.buckets == {90: [3, 4, 5]}
+    assert ranker.floor == 51
+
+    ranker.add(6, 20)
+    ranker.add(7, 90)
+    assert ranker.ranking() == {1: [[3, 4, 5, 7], 90]}
+
+
+def test_streaming_ranker_keeps_ties_crossing_the_limit():
+    """Teste que les ex aequo du dernier rang payé sont conservés."""
+    ranker = StreamingRanker(limit=2)
+    ranker.add(1, 80)
+    ranker.add(2, 60)
+    ranker.add(3, 60)
+    ranker.add(4, 10)
+
+    assert ranker.ranking() == {1: [[1], 80], 2: [[2, 3], 60]}
@@ -0,0 +1,91 @@
+import sys
+import os
+import threading
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import PdfRendererPool
+
+FAKE_RENDERER = """#!{python}
+import sys
+
+html = sys.stdin.buffer.read()
+if b"erreur" in html:
+    sys.stderr.write("page introuvable")
+    sys.exit(1)
+sys.stdout.buffer.write(b"%PDF-1.4\\n" + html)
+"""
+
+
+@pytest.fixture
+def renderer_binary(tmp_path):
+    """Exécutable qui remplace wkhtmltopdf : recopie le HTML reçu après un en-tête PDF."""
+    binary = tmp_path / "fake-wkhtmltopdf"
+    binary.write_text(FAKE_RENDERER.format(python=sys.executable))
+    binary.chmod(0o755)
+    return str(binary)
+
+
+def test_render_streams_pdf_in_chunks(renderer_binary):
+    """Teste que le PDF est lu par blocs sur la sortie du processus."""
+    with PdfRendererPool(renderer_binary, warm=1, chunk_size=8) as renderer:
+        chunks = list(renderer.render("<p>Félicitations</p>"))
+
+    assert b"".join(chunks) == b"%PDF-1.4\n" + "<p>Félicitations</p>".encode()
+    assert len(chunks) > 1
+    assert max(len(chunk) for chunk in chunks) == 8
+
+
+def test_processes_are_started_ahead_of_requests(renderer_binary):
+    """Teste que chaque rendu utilise un processus déjà lancé et en relance un."""
+    with PdfRendererPool(renderer_binary, warm=2) as renderer:
+        b"".join(renderer.render("<p>1</p>"))
+        assert renderer.spawned == 3
+        assert len(renderer._idle) == 2
+
+        assert b"".join(renderer.render("<p>2</p>")).endswith(b"<p>2</p>")
+        assert renderer.spawned == 4
+        assert len(renderer._idle) == 2
+
+    assert renderer._idle == []
+
+
+def test_concurrency_limit_rejects_burst(renderer_binary):
+    """Teste qu'une demande est refusée tant que toutes les places sont occupées."""
+    with PdfRendererPool(
+        renderer_binary, warm=0, max_concurrency=1, queue_timeout=0.1
+    ) as renderer:
+        stream = renderer.render("<p>1</p>")
+        with pytest.raises(TimeoutError):
+            renderer.render("<p>2</p>")
+
+        stream.close()
+        assert b"".join(renderer.render("<p>2</p>")).endswith(b"<p>2</p>")
+
+
+def test_waiting_request_gets_freed_slot(renderer_binary):
+    """Teste qu'une demande en attente obtient la place libérée par un rendu terminé."""
+    with PdfRendererPool(
+        renderer_binary, warm=0, max_concurrency=1, queue_timeout=5
+    ) as renderer:
+        stream = renderer.render("<p>1</p>")
+        results = []
+        waiting = threading.Thread(
+            target=lambda: results.append(b"".join(renderer.render("<p>2</p>")))
+        )
+        waiting.start()
+        b"".join(stream)
+        waiting.join()
+
+    assert results[0].endswith(b"<p>2</p>")
+
+
+def test_render_error_is_raised_and_frees_slot(renderer_binary):
+    """Teste qu'un échec de wkhtmltopdf est signalé sans garder sa place."""
+    with PdfRendererPool(
+        renderer_binary, warm=0, max_concurrency=1, queue_timeout=0.1
+    ) as renderer:
+        with pytest.raises(RuntimeError, match="page introuvable"):
+            renderer.render("<p>erreur</p>")
+
+        assert b"".join(renderer.render("<p>ok</p>")).endswith(b"<p>ok</p>")
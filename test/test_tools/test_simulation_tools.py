@@ -0,0 +1,108 @@
+import sys
+import os
+import random
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import (
+    TicketSubsetCounts,
+    summarize_simulation,
+    build_rank_counts,
+    compute_rank_gains,
+    build_ranking,
+    compute_gain,
+    distribute_remainder,
+    compute_scores,
+    numbers_to_mask,
+)
+
+
+def random_masks(count, seed):
+    rng = random.Random(seed)
+    number_masks, star_masks = [], []
+    for _ in range(count):
+        numbers = [rng.randint(1, 49) for _ in range(rng.choice([4, 5, 5, 5, 6, 7]))]
+        stars = [rng.randint(1, 9) for _ in range(2)]
+        number_masks.append(numbers_to_mask(numbers))
+        star_masks.append(numbers_to_mask(stars))
+    return (
+        np.array(number_masks, dtype=np.uint64),
+        np.array(star_masks, dtype=np.uint16),
+    )
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_score_histograms_match_direct_scoring(seed):
+    """Teste que les histogrammes par comptage de sous-ensembles sont exacts."""
+    number_masks, star_masks = random_masks(3000, seed)
+    counts = TicketSubsetCounts(number_masks, star_masks)
+
+    rng = random.Random(seed)
+    draws = [
+        (rng.sample(range(1, 50), 5), rng.sample(range(1, 10), 2)) for _ in range(50)
+    ]
+    histograms = counts.score_histograms(
+        [numbers_to_mask(numbers) for numbers, _ in draws],
+        [numbers_to_mask(stars) for _, stars in draws],
+    )
+
+    for histogram, (numbers, stars) in zip(histograms, draws):
+        expected = np.bincount(
+            compute_scores(number_masks, star_masks, numbers, stars), minlength=101
+        )
+        assert histogram.tolist() == expected.tolist()
+
+
+def test_score_histograms_without_tickets():
+    """Teste la simulation d'une loterie sans ticket."""
+    counts = TicketSubsetCounts([], [])
+    histograms = counts.score_histograms([numbers_to_mask([1, 2, 3, 4, 5])], [6])
+
+    assert histograms.sum() == 0
+
+
+def test_build_rank_counts_matches_build_ranking():
+    """Teste que le classement par effectifs est celui de `build_ranking`."""
+    scores_dict = {90: [1], 70: [2, 3, 4], 50: [5] * 8, 30: [6], 5: [7, 8]}
+    ranking = build_ranking(
+        {score: ids for score, ids in scores_dict.items() if score >= 10}
+    )
+
+    assert build_rank_counts(
+        {score: len(ids) for score, ids in scores_dict.items()}
+    ) == {rank: [len(ids), score] for rank, (ids, score) in ranking.items()}
+
+
+def test_compute_rank_gains_matches_compute_gain():
+    """Teste que les gains par rang sont ceux de `compute_gain` et `distribute_remainder`."""
+    ranking = {1: [[1, 2], 80], 3: [[3], 60], 4: [[4, 5, 6, 7, 8, 9, 10, 11], 40]}
+    gains, _, remainder = compute_gain(ranking, 1000)
+    gains = distribute_remainder(gains, remainder)
+
+    rank_gains = compute_rank_gains(
+        {rank: [len(ids), score] for rank, (ids, score) in ranking.items()}, 1000
+    )
+
+    for rank, (ids, _) in ranking.items():
+        for player in ids:
+            assert rank_gains[rank] == pytest.approx(gains[player])
+
+
+def test_summarize_simulation():
+    """Teste le résumé d'une série de tirages simulés."""
+    histograms = np.zeros((4, 101), dtype=np.int64)
+    histograms[0, 100] = 1
+    histograms[0, 40] = 3
+    histograms[1, 80] = 2
+    histograms[2, 5] = 10
+    histograms[3, 60] = 1
+
+    report = summarize_simulation(histograms, 1000)
+
+    assert report["draws"] == 4
+    assert report["winners_per_rank"][1]["mean"] == pytest.approx((1 + 2 + 0 + 1) / 4)
+    assert report["winners_per_rank"][2]["max"] == 3
+    assert report["top_prize_split_probability"] == 0.25
+    assert report["no_winner_probability"] == 0.25
+    assert report["top_prize"]["max"] == pytest.approx(1000)
@@ -0,0 +1,105 @@
+import sys
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import SMTPPool
+
+controller = pytest.importorskip("aiosmtpd.controller")
+smtp_server_module = pytest.importorskip("aiosmtpd.smtp")
+
+
+class LocalServer:
+    """Serveur SMTP local qui garde les messages reçus et compte les authentifications."""
+
+    def __init__(self):
+        self.messages = []
+        self.logins = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope.rcpt_tos)
+        return "250 OK"
+
+    def __call__(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        return smtp_server_module.AuthResult(success=True)
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    local = LocalServer()
+    server = controller.Controller(
+        local,
+        hostname="127.0.0.1",
+        port=port,
+        authenticator=local,
+        auth_require_tls=False,
+    )
+    server.start()
+    yield local, port
+    server.stop()
+
+
+def make_pool(port, **kwargs):
+    return SMTPPool("127.0.0.1", port, "app", "secret", use_ssl=False, **kwargs)
+
+
+def test_pool_reuses_authenticated_connection(smtp_server):
+    """Teste que les messages d'une série partagent une seule connexion authentifiée."""
+    local, port = smtp_server
+    with make_pool(port) as pool:
+        for index in range(20):
+            pool.sendmail(
+                "app@example.com", f"user{index}@example.com", "Subject: t\n\nx"
+            )
+
+    assert len(local.messages) == 20
+    assert pool.opened == local.logins == 1
+
+
+def test_pool_renews_connection_after_max_messages(smtp_server):
+    """Teste qu'une connexion est remplacée après `max_messages` messages."""
+    local, port = smtp_server
+    with make_pool(port, max_messages=5) as pool:
+        for index in range(12):
+            pool.sendmail(
+                "app@example.com", f"user{index}@example.com", "Subject: t\n\nx"
+            )
+
+    assert len(local.messages) == 12
+    assert pool.opened == local.logins == 3
+
+
+def test_pool_reconnects_after_lost_connection(smtp_server):
+    """Teste qu'un message envoyé sur une connexion perdue est renvoyé sur une nouvelle."""
+    local, port = smtp_server
+    with make_pool(port) as pool:
+        pool.sendmail("app@example.com", "first@example.com", "Subject: t\n\nx")
+        pool._idle[0].smtp.close()
+        pool.sendmail("app@example.com", "second@example.com", "Subject: t\n\nx")
+
+    assert local.messages == [["first@example.com"], ["second@example.com"]]
+    assert pool.opened == 2
+
+
+def test_pool_limits_concurrent_connections(smtp_server):
+    """Teste que des envois concurrents n'ouvrent pas plus de `size` connexions."""
+    local, port = smtp_server
+    with make_pool(port, size=2) as pool:
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(
+                executor.map(
+                    lambda index: pool.sendmail(
+                        "app@example.com", f"user{index}@example.com", "Subject: t\n\nx"
+                    ),
+                    range(40),
+                )
+            )
+
+    assert len(local.messages) == 40
+    assert 1 <= pool.opened <= 2
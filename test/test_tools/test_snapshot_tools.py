@@ -0,0 +1,97 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.tools import TicketSnapshot, write_snapshot, rank_ticket_arrays
+
+
+def make_columns(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "entry_ids": np.arange(1, count + 1) * 3,
+        "user_ids": rng.integers(1, 10**6, count),
+        "number_masks": rng.integers(0, 1 << 50, count).astype(np.uint64),
+        "star_masks": rng.integers(0, 1 << 10, count).astype(np.uint16),
+    }
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Teste que les colonnes relues sont identiques aux colonnes écrites."""
+    columns = make_columns(1001)
+    path = str(tmp_path / "lottery.snapshot")
+
+    assert write_snapshot(path, columns) == 1001
+    snapshot = TicketSnapshot(path)
+
+    assert snapshot.rows == 1001
+    for name, values in columns.items():
+        np.testing.assert_array_equal(getattr(snapshot, name), values)
+    assert snapshot.number_masks.dtype == np.uint64
+    assert snapshot.star_masks.dtype == np.uint16
+
+
+def test_snapshot_columns_are_read_only_memory_maps(tmp_path):
+    """Teste que les colonnes sont projetées en mémoire, sans copie."""
+    path = str(tmp_path / "lottery.snapshot")
+    write_snapshot(path, make_columns(64))
+    snapshot = TicketSnapshot(path)
+
+    assert isinstance(snapshot.number_masks, np.memmap)
+    assert snapshot.number_masks.offset % 64 == 0
+    with pytest.raises(ValueError):
+        snapshot.user_ids[0] = 1
+
+
+def test_snapshot_detects_corruption(tmp_path):
+    """Teste qu'une colonne modifiée est détectée par son empreinte."""
+    path = str(tmp_path / "lottery.snapshot")
+    write_snapshot(path, make_columns(100))
+    offset = TicketSnapshot(path).star_masks.offset
+    with open(path, "r+b") as file:
+        file.seek(offset)
+        file.write(b"\xff\xff\xff")
+
+    with pytest.raises(ValueError):
+        TicketSnapshot(path)
+    assert TicketSnapshot(path, verify=False).rows == 100
+
+
+def test_snapshot_detects_truncation_and_bad_header(tmp_path):
+    """Teste qu'un fichier tronqué ou étranger est refusé."""
+    path = str(tmp_path / "lottery.snapshot")
+    write_snapshot(path, make_columns(100))
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 200)
+    with pytest.raises(ValueError):
+        TicketSnapshot(path, verify=False)
+
+    with open(path, "wb") as file:
+        file.write(b"not a snapshot")
+    with pytest.raises(ValueError):
+        TicketSnapshot(path)
+
+
+def test_empty_snapshot(tmp_path):
+    """Teste l'instantané d'un tirage sans ticket."""
+    path = str(tmp_path / "lottery.snapshot")
+    write_snapshot(path, make_columns(0))
+    snapshot = TicketSnapshot(path)
+
+    assert snapshot.rows == 0
+    assert (
+        rank_ticket_arrays(
+            snapshot.user_ids, snapshot.number_masks, snapshot.star_masks, [1], [1]
+        )
+        == {}
+    )
+
+
+def test_write_snapshot_rejects_unequal_columns(tmp_path):
+    """Teste que des colonnes de longueurs différentes sont refusées."""
+    columns = make_columns(10)
+    columns["star_masks"] = columns["star_masks"][:5]
+
+    with pytest.raises(ValueError):
+        write_snapshot(str(tmp_path / "lottery.snapshot"), columns)